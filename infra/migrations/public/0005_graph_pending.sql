@@ -0,0 +1,8 @@
+-- Public graph writes are batched after the Postgres rows are stored. A row
+-- keeps graph_pending set until its document has reached the graph, so a
+-- failed graph batch is written again by the next ingestion run even though
+-- the content hash no longer changes.
+ALTER TABLE public_documents ADD COLUMN IF NOT EXISTS graph_pending boolean NOT NULL DEFAULT false;
+
+CREATE INDEX IF NOT EXISTS public_documents_graph_pending
+    ON public_documents (doc_id) WHERE graph_pending;
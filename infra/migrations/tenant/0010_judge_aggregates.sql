@@ -0,0 +1,32 @@
+-- Materialized judge-aware history (AI service). Judge-aware retrieval used
+-- to scan every Matter node in the tenant's graph partition per query; the AI
+-- service now maintains these facts as it ingests submissions/rulings and
+-- reads one judge_aggregates row instead. matter_key is the graph Matter id
+-- (an explicit matter uuid or a slug of the case reference), hence text.
+
+CREATE TABLE IF NOT EXISTS judge_matters (
+    matter_key  text PRIMARY KEY,
+    judge_name  text NOT NULL DEFAULT '',
+    result      text NOT NULL DEFAULT '',   -- latest extracted outcome: won|lost|settled|''
+    updated_at  timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS judge_matters_judge ON judge_matters (judge_name);
+
+-- Public authorities each filing cited (by title), per matter.
+CREATE TABLE IF NOT EXISTS judge_matter_citations (
+    matter_key     text NOT NULL REFERENCES judge_matters(matter_key) ON DELETE CASCADE,
+    submission_id  text NOT NULL,
+    title          text NOT NULL,
+    PRIMARY KEY (matter_key, submission_id, title)
+);
+CREATE INDEX IF NOT EXISTS judge_matter_citations_submission ON judge_matter_citations (submission_id);
+
+-- One row per judge, recomputed from the two tables above whenever a filing
+-- touches one of the judge's matters.
+CREATE TABLE IF NOT EXISTS judge_aggregates (
+    judge_name       text PRIMARY KEY,
+    matters          int   NOT NULL DEFAULT 0,
+    favorable        int   NOT NULL DEFAULT 0,
+    top_authorities  jsonb NOT NULL DEFAULT '[]',  -- [[title, count], ...] from favourable matters
+    updated_at       timestamptz NOT NULL DEFAULT now()
+);
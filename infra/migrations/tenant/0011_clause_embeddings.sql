@@ -0,0 +1,26 @@
+-- Clause-library embeddings for drafting. The AI service embeds clauses whose
+-- embedding is NULL (new rows, and rows whose text changed — the trigger below
+-- clears it) and drafting picks the clauses nearest the instructions.
+
+ALTER TABLE clause_library ADD COLUMN IF NOT EXISTS embedding vector(1024);
+
+CREATE INDEX IF NOT EXISTS clause_library_embedding_hnsw ON clause_library
+    USING hnsw (embedding vector_cosine_ops);
+-- The embedding worker's queue.
+CREATE INDEX IF NOT EXISTS clause_library_unembedded ON clause_library (created_at)
+    WHERE embedding IS NULL;
+
+CREATE OR REPLACE FUNCTION clause_library_reembed() RETURNS trigger AS $$
+BEGIN
+    IF NEW.title IS DISTINCT FROM OLD.title
+       OR NEW.category IS DISTINCT FROM OLD.category
+       OR NEW.body IS DISTINCT FROM OLD.body THEN
+        NEW.embedding := NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS clause_library_reembed ON clause_library;
+CREATE TRIGGER clause_library_reembed BEFORE UPDATE ON clause_library
+    FOR EACH ROW EXECUTE FUNCTION clause_library_reembed();
@@ -0,0 +1,16 @@
+-- In-flight drafts (AI service). DraftDocument generation runs in a
+-- background task detached from the gateway's stream and appends its tokens
+-- here in coalesced flushes, so ResumeDraft can replay a draft after the
+-- client drops. Keyed by the draft_id the stream announces; the gateway keeps
+-- inserting the finished document into drafts under that same id (drafts
+-- needs created_by/title, which only the gateway knows).
+
+CREATE TABLE IF NOT EXISTS draft_streams (
+    id               uuid PRIMARY KEY,
+    content          text  NOT NULL DEFAULT '',
+    status           text  NOT NULL DEFAULT 'streaming',  -- streaming|complete|failed|abandoned
+    citations        jsonb NOT NULL DEFAULT '[]',
+    degraded_stages  jsonb NOT NULL DEFAULT '[]',
+    created_at       timestamptz NOT NULL DEFAULT now(),
+    updated_at       timestamptz NOT NULL DEFAULT now()
+);
@@ -0,0 +1,8 @@
+-- Judge aggregates (0010) are maintained by tenant ingestion from the moment
+-- they exist; matters filed before that live only in the tenant's graph
+-- partition. The AI service backfills them once per tenant, in a background
+-- pass at startup, and records here that it has.
+CREATE TABLE IF NOT EXISTS judge_backfill (
+    singleton  boolean PRIMARY KEY DEFAULT true CHECK (singleton),
+    done_at    timestamptz NOT NULL DEFAULT now()
+);
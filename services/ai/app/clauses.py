@@ -0,0 +1,88 @@
+"""Clause-library embedding worker.
+
+Drafting ranks a firm's clauses by similarity to the instructions, so every
+clause needs an embedding in its tenant schema. Clauses are written by the
+gateway; a new row has no embedding, and editing a clause's text clears it
+(tenant migration 0011). This worker polls every active tenant for those rows
+and embeds them in batches, so only what changed is ever re-embedded. Same
+background-task shape as ``RecordingProcessor``.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from . import db as dbx
+from .config import Config
+from .embeddings import EmbeddingProvider
+from .logging_setup import log
+from .tenancy import validate_tenant_id
+
+_BATCH = 64
+
+
+def clause_text(clause: dict[str, Any]) -> str:
+    """What a clause is embedded as."""
+    head = " — ".join(p for p in (clause.get("category"), clause.get("title")) if p)
+    return f"{head}\n{clause.get('body') or ''}"
+
+
+class ClauseEmbedder:
+    def __init__(self, pool, embedder: EmbeddingProvider, cfg: Config) -> None:
+        self.pool = pool
+        self.embedder = embedder
+        self.cfg = cfg
+        self._task = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        self._stopping = False
+
+        async def _loop() -> None:
+            while not self._stopping:
+                try:
+                    await self.run_once()
+                except Exception:  # noqa: BLE001 — a bad tenant must not kill the loop
+                    log().exception("clause embedding pass failed")
+                await asyncio.sleep(max(5, self.cfg.clause_embed_poll_seconds))
+
+        self._task = asyncio.create_task(_loop())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run_once(self) -> int:
+        """Embed every pending clause across all active tenants. Returns the
+        number embedded."""
+        async with self.pool.acquire() as conn:
+            tenants = await conn.fetch(
+                "SELECT id::text AS id FROM public.tenants WHERE status = 'active'")
+        done = 0
+        for row in tenants:
+            try:
+                done += await self.embed_tenant(row["id"])
+            except Exception:  # noqa: BLE001
+                log().exception("clause embedding failed for one tenant")
+        return done
+
+    async def embed_tenant(self, tenant_id: str) -> int:
+        validate_tenant_id(tenant_id)
+        done = 0
+        while True:
+            async with dbx.tenant_tx(self.pool, tenant_id) as conn:
+                pending = await dbx.unembedded_clauses(conn, _BATCH)
+            if not pending:
+                return done
+            # Embed outside the transaction: no connection held during the call.
+            embeddings = await self.embedder.embed([clause_text(c) for c in pending])
+            async with dbx.tenant_tx(self.pool, tenant_id) as conn:
+                await dbx.set_clause_embeddings(conn, pending, embeddings)
+            done += len(pending)
+            if len(pending) < _BATCH:
+                return done
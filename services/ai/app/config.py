@@ -49,12 +49,33 @@ class Config:
     # Claude Opus 4.8 for drafting/reasoning; Haiku for cheap intent classification.
     anthropic_model: str = field(default_factory=lambda: _env("ANTHROPIC_MODEL", "claude-opus-4-8"))
     anthropic_fast_model: str = field(default_factory=lambda: _env("ANTHROPIC_FAST_MODEL", "claude-haiku-4-5"))
+    # Pooled HTTP client each HTTP provider (Ollama, GMI) keeps for its lifetime.
+    # HTTP/2 is used when h2 is installed and the endpoint supports it.
+    llm_http2: bool = field(default_factory=lambda: _env_bool("LLM_HTTP2", True))
+    llm_http_max_connections: int = field(default_factory=lambda: int(_env("LLM_HTTP_MAX_CONNECTIONS", "32")))
+    llm_http_max_keepalive: int = field(default_factory=lambda: int(_env("LLM_HTTP_MAX_KEEPALIVE", "16")))
+    llm_http_keepalive_seconds: float = field(default_factory=lambda: float(_env("LLM_HTTP_KEEPALIVE_SECONDS", "120")))
+    llm_http_connect_timeout: float = field(default_factory=lambda: float(_env("LLM_HTTP_CONNECT_TIMEOUT", "5")))
+    llm_http_read_timeout: float = field(default_factory=lambda: float(_env("LLM_HTTP_READ_TIMEOUT", "300")))
+    # Priority-aware concurrency limits per provider (<= 0: unlimited). Calls
+    # queue interactive > streaming > background, round-robin across tenants;
+    # background summaries wait until foreground work has been idle for a
+    # while, unless they have already waited the max.
+    enable_llm_scheduler: bool = field(default_factory=lambda: _env_bool("ENABLE_LLM_SCHEDULER", True))
+    llm_concurrency_anthropic: int = field(default_factory=lambda: int(_env("LLM_CONCURRENCY_ANTHROPIC", "32")))
+    llm_concurrency_gmi: int = field(default_factory=lambda: int(_env("LLM_CONCURRENCY_GMI", "16")))
+    llm_concurrency_ollama: int = field(default_factory=lambda: int(_env("LLM_CONCURRENCY_OLLAMA", "2")))
+    llm_background_concurrency: int = field(default_factory=lambda: int(_env("LLM_BACKGROUND_CONCURRENCY", "1")))
+    llm_background_idle_seconds: float = field(default_factory=lambda: float(_env("LLM_BACKGROUND_IDLE_SECONDS", "2")))
+    llm_background_max_wait_seconds: float = field(default_factory=lambda: float(_env("LLM_BACKGROUND_MAX_WAIT_SECONDS", "120")))
 
     # Local llama3 via Ollama (on-prem / data-residency deployments). Empty base
     # url or unreachable server => auto falls through to the mock.
     ollama_base_url: str = field(default_factory=lambda: _env("OLLAMA_BASE_URL", "http://localhost:11434"))
     ollama_model: str = field(default_factory=lambda: _env("OLLAMA_MODEL", "llama3"))
     ollama_fast_model: str = field(default_factory=lambda: _env("OLLAMA_FAST_MODEL", "llama3.2:1b"))
+    # How long Ollama keeps the model (and its prompt KV cache) loaded after a call.
+    ollama_keep_alive: str = field(default_factory=lambda: _env("OLLAMA_KEEP_ALIVE", "30m"))
 
     # GMI Cloud — OpenAI-compatible hosted inference. Used to evaluate multiple
     # hosted models (DeepSeek-R1 distill vs Qwen3-235B) before picking one for
@@ -93,6 +114,24 @@ class Config:
     # Meeting-recording processor: how often to scan tenants for pending audio.
     recordings_poll_seconds: int = field(default_factory=lambda: int(_env("RECORDINGS_POLL_SECONDS", "20")))
 
+    # Drafting puts the firm's clauses nearest the request into the prompt;
+    # new/edited clauses are embedded by a background poller.
+    draft_clause_top_k: int = field(default_factory=lambda: int(_env("DRAFT_CLAUSE_TOP_K", "6")))
+    clause_embed_poll_seconds: int = field(default_factory=lambda: int(_env("CLAUSE_EMBED_POLL_SECONDS", "60")))
+    # Drafts generate in the background and are appended to the tenant's
+    # draft_streams table every DRAFT_FLUSH_MS; a draft nobody is following
+    # keeps generating for DRAFT_DETACHED_SECONDS so ResumeDraft can attach.
+    draft_flush_ms: int = field(default_factory=lambda: int(_env("DRAFT_FLUSH_MS", "250")))
+    draft_detached_seconds: float = field(default_factory=lambda: float(_env("DRAFT_DETACHED_SECONDS", "300")))
+    # DraftChunk coalescing: first token immediately, then one frame per window
+    # or per DRAFT_COALESCE_BYTES of text.
+    draft_coalesce_ms: int = field(default_factory=lambda: int(_env("DRAFT_COALESCE_MS", "40")))
+    draft_coalesce_bytes: int = field(default_factory=lambda: int(_env("DRAFT_COALESCE_BYTES", "1024")))
+    # Contracts and pleadings are drafted section by section, concurrently.
+    draft_section_parallel: bool = field(default_factory=lambda: _env_bool("DRAFT_SECTION_PARALLEL", True))
+    draft_section_concurrency: int = field(default_factory=lambda: int(_env("DRAFT_SECTION_CONCURRENCY", "3")))
+    draft_section_max_tokens: int = field(default_factory=lambda: int(_env("DRAFT_SECTION_MAX_TOKENS", "2048")))
+
     # Embeddings — voyage-law-2 (legal-domain, 1024-dim) when a key is present,
     # otherwise a deterministic hashing embedder so dev/tests run offline.
     embedding_provider: str = field(default_factory=lambda: _env("EMBEDDING_PROVIDER", "auto"))  # auto|voyage|hash
@@ -107,6 +146,11 @@ class Config:
     mtls_server_key: str = field(default_factory=lambda: _env("MTLS_SERVER_KEY", "/certs/ai.key"))
     mtls_disabled: bool = field(default_factory=lambda: _env_bool("MTLS_DISABLED", False))  # tests only
 
+    # Deadline-aware degradation: seconds of the per-RPC gRPC deadline held
+    # back for answer synthesis. Optional stages (graph annotations, judge
+    # context, extra reasoning hops) are skipped when they would eat into it.
+    deadline_reserve_seconds: float = field(default_factory=lambda: float(_env("DEADLINE_RESERVE_SECONDS", "8")))
+
     # Health/metrics sidecar port (internal only)
     health_port: int = field(default_factory=lambda: int(_env("HEALTH_PORT", "8081")))
 
@@ -116,6 +160,31 @@ class Config:
     ingest_offline_samples: bool = field(default_factory=lambda: _env_bool("INGEST_OFFLINE_SAMPLES", True))
     ingest_daily_seconds: int = field(default_factory=lambda: int(_env("INGEST_DAILY_SECONDS", str(24 * 3600))))
     ingest_weekly_seconds: int = field(default_factory=lambda: int(_env("INGEST_WEEKLY_SECONDS", str(7 * 24 * 3600))))
+    # Public-graph writes are buffered and flushed as UNWIND batches in one
+    # transaction every N documents (and at the end of each crawler run).
+    ingest_graph_batch_docs: int = field(default_factory=lambda: int(_env("INGEST_GRAPH_BATCH_DOCS", "200")))
+    # Tenant ingestion resolves citations against an in-memory index of public
+    # titles; rebuilt after each corpus pass and at most this stale otherwise.
+    citation_resolver_ttl_seconds: int = field(default_factory=lambda: int(_env("CITATION_RESOLVER_TTL_SECONDS", "3600")))
+    # Multi-hop reasoning expands public hops over an in-process CSR snapshot
+    # of the public graph (rebuilt after each corpus pass) instead of Neo4j.
+    enable_graph_snapshot: bool = field(default_factory=lambda: _env_bool("ENABLE_GRAPH_SNAPSHOT", True))
+    # Public judge profiling runs in bulk: cases are classified this many at a
+    # time (one text query, one UNWIND write each) across a process pool of
+    # this many workers (1 = classify inline on the event loop).
+    judge_profile_batch_cases: int = field(default_factory=lambda: int(_env("JUDGE_PROFILE_BATCH_CASES", "2000")))
+    judge_profile_workers: int = field(default_factory=lambda: int(_env("JUDGE_PROFILE_WORKERS", "4")))
+    # Judge-aware retrieval caches each judge's public profile and each
+    # tenant's pattern for that judge (invalidated on writes; the TTL bounds
+    # staleness from other replicas).
+    judge_context_cache_size: int = field(default_factory=lambda: int(_env("JUDGE_CONTEXT_CACHE_SIZE", "1024")))
+    judge_context_cache_ttl_seconds: int = field(default_factory=lambda: int(_env("JUDGE_CONTEXT_CACHE_TTL_SECONDS", "600")))
+    # Tenant-partitioned cache of LLM completions at the opted-in call sites
+    # (intent classification, answer synthesis). Dropped per tenant on firm
+    # ingestion/erasure and entirely after each public-corpus pass.
+    enable_llm_cache: bool = field(default_factory=lambda: _env_bool("ENABLE_LLM_CACHE", True))
+    llm_cache_size: int = field(default_factory=lambda: int(_env("LLM_CACHE_SIZE", "2048")))
+    llm_cache_ttl_seconds: int = field(default_factory=lambda: int(_env("LLM_CACHE_TTL_SECONDS", "3600")))
 
     # Feature flags — each new capability ships dark and is enabled per pilot
     # firm incrementally rather than all at once.
@@ -96,6 +96,195 @@ async def search_tenant_chunks(
     return [dict(r) for r in rows]
 
 
+# --- tenant clause library (drafting) ---
+
+async def search_clauses(conn: asyncpg.Connection, query_vec: Sequence[float],
+                         top_k: int) -> list[dict[str, Any]]:
+    """The embedded clauses nearest the query (HNSW index scan)."""
+    rows = await conn.fetch(
+        """SELECT title, body FROM clause_library
+           WHERE embedding IS NOT NULL
+           ORDER BY embedding <=> $1::vector
+           LIMIT $2""",
+        vec_literal(query_vec), top_k,
+    )
+    return [dict(r) for r in rows]
+
+
+async def unembedded_clauses(conn: asyncpg.Connection, limit: int) -> list[dict[str, Any]]:
+    rows = await conn.fetch(
+        """SELECT id::text AS id, title, category, body FROM clause_library
+           WHERE embedding IS NULL ORDER BY created_at LIMIT $1""", limit)
+    return [dict(r) for r in rows]
+
+
+async def set_clause_embeddings(conn: asyncpg.Connection, clauses: Sequence[dict[str, Any]],
+                                embeddings: Sequence[Sequence[float]]) -> None:
+    """Store embeddings, skipping any clause edited since it was read (its
+    text no longer matches; the edit already queued it again)."""
+    await conn.executemany(
+        """UPDATE clause_library SET embedding = $2::vector
+           WHERE id = $1::uuid AND title = $3 AND category = $4 AND body = $5""",
+        [(c["id"], vec_literal(e), c["title"], c["category"], c["body"])
+         for c, e in zip(clauses, embeddings)],
+    )
+
+
+# --- tenant judge aggregates (judge-aware retrieval) ---
+
+async def record_judge_matter(
+    conn: asyncpg.Connection, matter_key: str, submission_id: str, judge_name: str,
+    result: str, cited_titles: Sequence[str], favorable: Sequence[str],
+) -> None:
+    """Fold one filing into its matter's facts (an empty judge/result keeps
+    the stored one, as the graph MERGE does) and recompute the aggregate of
+    every judge whose matters it touched. Idempotent under re-ingest."""
+    touched = set(await _judges_of_submission(conn, submission_id))
+    prev = await conn.fetchval("SELECT judge_name FROM judge_matters WHERE matter_key = $1",
+                               matter_key)
+    await conn.execute(
+        """INSERT INTO judge_matters (matter_key, judge_name, result) VALUES ($1, $2, $3)
+           ON CONFLICT (matter_key) DO UPDATE SET
+               judge_name = COALESCE(NULLIF(EXCLUDED.judge_name, ''), judge_matters.judge_name),
+               result = COALESCE(NULLIF(EXCLUDED.result, ''), judge_matters.result),
+               updated_at = now()""",
+        matter_key, judge_name or "", result or "")
+    await conn.execute("DELETE FROM judge_matter_citations WHERE submission_id = $1", submission_id)
+    if cited_titles:
+        await conn.executemany(
+            """INSERT INTO judge_matter_citations (matter_key, submission_id, title)
+               VALUES ($1, $2, $3) ON CONFLICT DO NOTHING""",
+            [(matter_key, submission_id, t) for t in dict.fromkeys(cited_titles)])
+    touched.update(n for n in (prev, judge_name) if n)
+    await _refresh_judge_aggregates(conn, touched, favorable)
+
+
+async def forget_judge_submissions(conn: asyncpg.Connection, submission_ids: Sequence[str],
+                                   favorable: Sequence[str]) -> None:
+    """Erasure: drop what the given filings cited and re-aggregate their judges."""
+    if not submission_ids:
+        return
+    judges = set()
+    for sid in submission_ids:
+        judges.update(await _judges_of_submission(conn, sid))
+    await conn.execute("DELETE FROM judge_matter_citations WHERE submission_id = ANY($1::text[])",
+                       list(submission_ids))
+    await _refresh_judge_aggregates(conn, judges, favorable)
+
+
+async def _judges_of_submission(conn: asyncpg.Connection, submission_id: str) -> list[str]:
+    return [r["judge_name"] for r in await conn.fetch(
+        """SELECT DISTINCT m.judge_name FROM judge_matter_citations c
+           JOIN judge_matters m USING (matter_key)
+           WHERE c.submission_id = $1 AND m.judge_name <> ''""", submission_id)]
+
+
+async def _refresh_judge_aggregates(conn: asyncpg.Connection, judge_names: Sequence[str],
+                                    favorable: Sequence[str]) -> None:
+    """Recompute each judge's aggregate row. Filings for one judge commit in
+    parallel (the firm queue runs several workers), so each recompute first
+    takes a per-(schema, judge) transaction lock: under READ COMMITTED the
+    count that follows then sees every filing committed before it, instead of
+    overwriting a concurrent one's row with a stale total. Sorted names keep
+    the lock order deadlock-free."""
+    for name in sorted(judge_names):
+        await conn.execute(
+            "SELECT pg_advisory_xact_lock(hashtext(current_schema()), hashtext($1))", name)
+        await conn.execute(
+            """INSERT INTO judge_aggregates (judge_name, matters, favorable, top_authorities)
+               SELECT $1, count(*) FILTER (WHERE m.result <> ''),
+                      count(*) FILTER (WHERE m.result = ANY($2::text[])),
+                      COALESCE((SELECT jsonb_agg(jsonb_build_array(t.title, t.n) ORDER BY t.n DESC, t.title)
+                                FROM (SELECT c.title, count(*) AS n
+                                      FROM judge_matter_citations c
+                                      JOIN judge_matters w USING (matter_key)
+                                      WHERE w.judge_name = $1 AND w.result = ANY($2::text[])
+                                      GROUP BY c.title ORDER BY n DESC, c.title LIMIT 5) t), '[]')
+               FROM judge_matters m WHERE m.judge_name = $1
+               ON CONFLICT (judge_name) DO UPDATE SET
+                   matters = EXCLUDED.matters, favorable = EXCLUDED.favorable,
+                   top_authorities = EXCLUDED.top_authorities, updated_at = now()""",
+            name, list(favorable))
+
+
+async def judge_history_backfilled(conn: asyncpg.Connection) -> bool:
+    return bool(await conn.fetchval("SELECT EXISTS (SELECT 1 FROM judge_backfill)"))
+
+
+async def backfill_judge_matters(conn: asyncpg.Connection, matters: Sequence[dict[str, Any]],
+                                 citations: Sequence[dict[str, Any]],
+                                 favorable: Sequence[str]) -> bool:
+    """Seed the judge tables with the tenant's graph history (matters filed
+    before they existed), re-aggregate those judges and mark the tenant done.
+    What ingestion already recorded wins: a known matter or a submission
+    with recorded citations is left as it is. Serialised per tenant schema;
+    returns False, writing nothing, when another process got there first."""
+    await conn.execute("SELECT pg_advisory_xact_lock(hashtext(current_schema()))")
+    if await judge_history_backfilled(conn):
+        return False
+    if matters:
+        await conn.executemany(
+            """INSERT INTO judge_matters (matter_key, judge_name, result) VALUES ($1, $2, $3)
+               ON CONFLICT (matter_key) DO NOTHING""",
+            [(m["matter_key"], m["judge_name"], m["result"] or "") for m in matters])
+    if citations:
+        known = {r["submission_id"] for r in await conn.fetch(
+            """SELECT DISTINCT submission_id FROM judge_matter_citations
+               WHERE submission_id = ANY($1::text[])""",
+            list({c["submission_id"] for c in citations}))}
+        rows = list(dict.fromkeys((c["matter_key"], c["submission_id"], c["title"])
+                                  for c in citations if c["submission_id"] not in known))
+        if rows:
+            await conn.executemany(
+                """INSERT INTO judge_matter_citations (matter_key, submission_id, title)
+                   VALUES ($1, $2, $3) ON CONFLICT DO NOTHING""", rows)
+    await _refresh_judge_aggregates(conn, {m["judge_name"] for m in matters}, favorable)
+    await conn.execute("INSERT INTO judge_backfill DEFAULT VALUES ON CONFLICT DO NOTHING")
+    return True
+
+
+async def judge_aggregate(conn: asyncpg.Connection, judge_name: str) -> Optional[dict[str, Any]]:
+    row = await conn.fetchrow(
+        """SELECT matters, favorable, top_authorities::text AS top_authorities
+           FROM judge_aggregates WHERE judge_name = $1""", judge_name)
+    if row is None:
+        return None
+    out = dict(row)
+    out["top_authorities"] = json.loads(out["top_authorities"] or "[]")
+    return out
+
+
+# --- tenant draft streams (resumable drafting) ---
+
+async def append_draft_stream(
+    conn: asyncpg.Connection, draft_id: str, text: str, status: str,
+    citations: Sequence[dict[str, Any]], degraded_stages: Sequence[str],
+) -> None:
+    """Append streamed text to a draft (creating its row on the first flush)
+    and record its status. Citations are fixed when the stream starts."""
+    await conn.execute(
+        """INSERT INTO draft_streams (id, content, status, citations, degraded_stages)
+           VALUES ($1::uuid, $2, $3, $4::jsonb, $5::jsonb)
+           ON CONFLICT (id) DO UPDATE SET
+               content = draft_streams.content || EXCLUDED.content,
+               status = EXCLUDED.status, updated_at = now()""",
+        draft_id, text, status, json.dumps(list(citations)), json.dumps(list(degraded_stages)),
+    )
+
+
+async def get_draft_stream(conn: asyncpg.Connection, draft_id: str) -> Optional[dict[str, Any]]:
+    row = await conn.fetchrow(
+        """SELECT content, status, citations::text AS citations,
+                  degraded_stages::text AS degraded_stages
+           FROM draft_streams WHERE id = $1::uuid""", draft_id)
+    if row is None:
+        return None
+    out = dict(row)
+    out["citations"] = json.loads(out["citations"] or "[]")
+    out["degraded_stages"] = json.loads(out["degraded_stages"] or "[]")
+    return out
+
+
 # --- shared public corpus ---
 
 async def search_public_chunks(
@@ -135,6 +324,34 @@ async def search_public_chunks(
     return [dict(r) for r in rows]
 
 
+async def best_public_chunks(
+    pool: asyncpg.Pool, doc_ids: Sequence[str], query_vec: Sequence[float],
+) -> list[dict[str, Any]]:
+    """The chunk of each document closest to ``query_vec``, in ``doc_ids``
+    order, in one round trip: a LATERAL top-1 per doc_id, which walks that
+    document's chunks via ``public_vectors_doc`` instead of the global HNSW
+    graph. Used for authorities found by graph traversal rather than by the
+    vector search itself."""
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            """SELECT c.chunk_id, q.doc_id, c.chunk_text, c.score,
+                      d.title, d.citation, d.source_url, d.court, d.year, d.status
+               FROM unnest($1::text[]) WITH ORDINALITY AS q(doc_id, ord)
+               JOIN public.public_documents d ON d.doc_id = q.doc_id
+               CROSS JOIN LATERAL (
+                   SELECT v.id::text AS chunk_id, v.chunk_text,
+                          1 - (v.embedding <=> $2::vector) AS score
+                   FROM public.public_vectors v
+                   WHERE v.doc_id = q.doc_id
+                   ORDER BY v.embedding <=> $2::vector
+                   LIMIT 1
+               ) c
+               ORDER BY q.ord""",
+            list(doc_ids), vec_literal(query_vec),
+        )
+    return [dict(r) for r in rows]
+
+
 async def docs_in_force_as_of(pool: asyncpg.Pool, as_of: str) -> list[dict[str, Any]]:
     """Metadata-only helper: which public documents were in force on ``as_of``."""
     async with pool.acquire() as conn:
@@ -173,24 +390,31 @@ async def get_public_document(pool: asyncpg.Pool, doc_id: str) -> Optional[dict[
     return dict(row) if row else None
 
 
-async def public_doc_text(pool: asyncpg.Pool, doc_id: str, max_chunks: int = 6) -> str:
-    """Concatenate a public document's leading chunks (for judge-profile outcome
-    classification). Public data only — no tenant scope involved."""
+async def public_docs_text(pool: asyncpg.Pool, doc_ids: Sequence[str],
+                           max_chunks: int = 6) -> dict[str, str]:
+    """Each public document's leading chunks, concatenated (for judge-profile
+    outcome classification), for many documents in one ``= ANY($1)`` round
+    trip. Documents without chunks are absent. Public data only — no tenant
+    scope involved."""
     async with pool.acquire() as conn:
         rows = await conn.fetch(
-            """SELECT chunk_text FROM public.public_vectors
-               WHERE doc_id = $1 ORDER BY id LIMIT $2""",
-            doc_id, max_chunks,
+            """SELECT doc_id, string_agg(chunk_text, E'\n' ORDER BY id) AS text
+               FROM (SELECT doc_id, id, chunk_text,
+                            row_number() OVER (PARTITION BY doc_id ORDER BY id) AS rn
+                     FROM public.public_vectors
+                     WHERE doc_id = ANY($1::text[])) leading
+               WHERE rn <= $2
+               GROUP BY doc_id""",
+            list(doc_ids), max_chunks,
         )
-    return "\n".join(r["chunk_text"] for r in rows)
+    return {r["doc_id"]: r["text"] for r in rows}
 
 
-async def find_public_docs_by_title(pool: asyncpg.Pool, needle: str, limit: int = 3) -> list[dict[str, Any]]:
+async def current_public_titles(pool: asyncpg.Pool) -> list[dict[str, Any]]:
+    """Every in-force public document's identifying fields — the snapshot the
+    in-memory citation resolver indexes."""
     async with pool.acquire() as conn:
         rows = await conn.fetch(
             """SELECT doc_id, title, doc_type, citation, source_url, court, year, status
-               FROM public.public_documents
-               WHERE title ILIKE '%' || $1 || '%' AND status = 'current' LIMIT $2""",
-            needle, limit,
-        )
+               FROM public.public_documents WHERE status = 'current' ORDER BY doc_id""")
     return [dict(r) for r in rows]
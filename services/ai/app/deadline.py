@@ -0,0 +1,78 @@
+"""Per-RPC time budget derived from the gRPC deadline.
+
+The gateway sets a deadline on every call; when Neo4j or the LLM is slow the
+whole RPC used to run past it and everything already computed was discarded.
+A :class:`Budget` turns ``context.time_remaining()`` into something the
+orchestrators consult: optional stages (graph status annotations, matter
+expansion, judge context, extra reasoning hops) are skipped when the remaining
+time cannot cover them plus the reserve kept back for answer synthesis, and
+downstream calls get the remaining time as their own timeout.
+
+A budget built without a deadline never degrades anything, so engines called
+from scripts/tests behave exactly as before.
+"""
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+# Rough wall-clock cost of each optional stage (seconds). A stage only runs if
+# the budget can cover its cost on top of the synthesis reserve.
+STAGE_COST_SECONDS: dict[str, float] = {
+    "matter_expansion": 0.5,
+    "status_annotations": 0.5,
+    "judge_context": 1.5,
+    "tenant_traversal": 1.0,
+    "reasoning_hop": 1.0,
+    "graph_evidence": 0.5,
+    "draft_grounding": 2.0,
+}
+
+
+class Budget:
+    def __init__(self, seconds: Optional[float] = None, reserve: float = 0.0) -> None:
+        self._deadline = time.monotonic() + seconds if seconds is not None else None
+        self.reserve = max(0.0, reserve)
+        self.degraded: list[str] = []
+
+    @classmethod
+    def from_context(cls, context, reserve: float = 0.0) -> "Budget":
+        """Budget for a grpc.aio ServicerContext; unbounded if the caller set
+        no deadline."""
+        try:
+            remaining = context.time_remaining()
+        except Exception:
+            remaining = None
+        return cls(remaining, reserve)
+
+    @property
+    def bounded(self) -> bool:
+        return self._deadline is not None
+
+    def remaining(self) -> Optional[float]:
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def allows(self, stage: str) -> bool:
+        """Whether optional ``stage`` fits; records it as degraded if not."""
+        remaining = self.remaining()
+        if remaining is None or remaining - self.reserve >= STAGE_COST_SECONDS.get(stage, 0.0):
+            return True
+        self.degrade(stage)
+        return False
+
+    def degrade(self, stage: str) -> None:
+        if stage not in self.degraded:
+            self.degraded.append(stage)
+
+    def timeout(self, reserve: bool = False) -> Optional[float]:
+        """Remaining time to hand a downstream call as its own timeout. With
+        ``reserve`` the synthesis reserve is held back (for optional stages
+        that must not eat into the answer's time)."""
+        remaining = self.remaining()
+        if remaining is None:
+            return None
+        if reserve:
+            remaining -= self.reserve
+        return max(0.05, remaining)
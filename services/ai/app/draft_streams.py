@@ -0,0 +1,240 @@
+"""Resumable draft generation.
+
+A draft is generated by a background task owned by the service rather than
+by the ``DraftDocument`` call that started it. If the gateway's stream drops,
+generation carries on (for up to ``DRAFT_DETACHED_SECONDS`` with nobody
+attached) and ``ResumeDraft`` picks it up again instead of paying for a full
+regeneration. Tokens are appended to the tenant's ``draft_streams`` row
+(tenant migration 0012) in flushes coalesced every ``DRAFT_FLUSH_MS``, so a
+finished or abandoned draft can still be replayed after its session is gone;
+the in-memory session only serves followers of a live generation.
+
+What a follower receives is coalesced (``coalesce``): the first token goes out
+at once, later ones are batched per ``DRAFT_COALESCE_MS`` window or
+``DRAFT_COALESCE_BYTES``, so a long draft is tens of gRPC messages rather than
+one per provider token.
+"""
+from __future__ import annotations
+
+import asyncio
+import uuid
+from contextlib import aclosing
+from dataclasses import asdict
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from . import db as dbx
+from .config import Config
+from .logging_setup import log
+from .retrieval import RankedChunk
+from .tenancy import validate_tenant_id
+
+STREAMING, COMPLETE, FAILED, ABANDONED = "streaming", "complete", "failed", "abandoned"
+
+
+async def coalesce(texts: AsyncIterator[str], window_seconds: float,
+                   max_bytes: int) -> AsyncIterator[str]:
+    """Batch a token stream into fewer, larger pieces. The first piece is
+    passed through immediately (time-to-first-token is unchanged); after
+    that, text is held until ``window_seconds`` has passed since the first
+    held token or ``max_bytes`` have accumulated, whichever comes first."""
+    loop = asyncio.get_running_loop()
+    held: list[str] = []
+    size, flush_at, first = 0, 0.0, True
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(texts.__anext__())
+            timeout = max(0.0, flush_at - loop.time()) if held else None
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:  # window elapsed with nothing new: flush what's held
+                yield "".join(held)
+                held, size = [], 0
+                continue
+            future, pending = pending, None
+            try:
+                text = future.result()
+            except StopAsyncIteration:
+                break
+            if first:
+                first = False
+                yield text
+                continue
+            if not held:
+                flush_at = loop.time() + window_seconds
+            held.append(text)
+            size += len(text.encode())
+            if size >= max_bytes:
+                yield "".join(held)
+                held, size = [], 0
+        if held:
+            yield "".join(held)
+    finally:
+        # The source can only be closed once its in-flight __anext__ is done.
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+
+
+def skip_bytes(text: str, skip: int) -> tuple[str, int]:
+    """``text`` past its first ``skip`` UTF-8 bytes, and how many bytes are
+    still to skip after it. Resume offsets count bytes, as the gateway does;
+    an offset inside a multi-byte character resumes at the next whole one."""
+    if skip <= 0:
+        return text, 0
+    raw = text.encode()
+    return raw[skip:].decode("utf-8", "ignore"), max(0, skip - len(raw))
+
+
+class DraftSession:
+    """One live generation: the tokens so far and whoever is following them."""
+
+    def __init__(self, tenant_id: str, draft_id: str, citations: list[RankedChunk],
+                 degraded_stages: list[str]) -> None:
+        self.tenant_id = tenant_id
+        self.draft_id = draft_id
+        self.citations = citations
+        self.degraded_stages = degraded_stages
+        self.status = STREAMING
+        self.parts: list[str] = []
+        self.flushed = 0  # parts already appended to draft_streams
+        self.followers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._expiry: Optional[asyncio.TimerHandle] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status != STREAMING
+
+    async def _append(self, token: str) -> None:
+        async with self._changed:
+            self.parts.append(token)
+            self._changed.notify_all()
+
+    async def _finish(self, status: str) -> None:
+        async with self._changed:
+            self.status = status
+            self._changed.notify_all()
+
+    async def follow(self, offset: int = 0, detached_seconds: float = 0) -> AsyncIterator[str]:
+        """Text from UTF-8 byte ``offset`` on until the generation ends.
+        Whatever accumulated since the last piece is yielded as one, so a
+        resumed follower gets the backlog at once and a live one each token.
+        When the last follower leaves mid-generation, the generation is
+        abandoned unless someone re-attaches within ``detached_seconds``."""
+        self.followers += 1
+        if self._expiry is not None:
+            self._expiry.cancel()
+            self._expiry = None
+        try:
+            seen, skip = 0, max(0, offset)
+            while True:
+                async with self._changed:
+                    await self._changed.wait_for(lambda: len(self.parts) > seen or self.done)
+                    fresh = self.parts[seen:]
+                    seen = len(self.parts)
+                text, skip = skip_bytes("".join(fresh), skip)
+                if text:
+                    yield text
+                if self.done and seen == len(self.parts):
+                    return
+        finally:
+            self.followers -= 1
+            if not self.followers and not self.done and self.task is not None:
+                self._expiry = asyncio.get_running_loop().call_later(
+                    detached_seconds, self.task.cancel)
+
+
+class DraftStreams:
+    """Registry of live generations, keyed by (tenant, draft_id)."""
+
+    def __init__(self, pool, cfg: Config) -> None:
+        self.pool = pool
+        self.cfg = cfg
+        self._sessions: dict[tuple[str, str], DraftSession] = {}
+
+    def start(self, tenant_id: str, stream: AsyncIterator[str], citations: list[RankedChunk],
+              degraded_stages: Sequence[str] = ()) -> DraftSession:
+        """Run ``stream`` to completion in the background under a new draft id."""
+        validate_tenant_id(tenant_id)
+        session = DraftSession(tenant_id, str(uuid.uuid4()), citations, list(degraded_stages))
+        self._sessions[(tenant_id, session.draft_id)] = session
+        session.task = asyncio.create_task(self._run(session, stream))
+        return session
+
+    async def follow(self, session: DraftSession, offset: int = 0) -> AsyncIterator[str]:
+        """``session.follow`` coalesced for the wire."""
+        async with aclosing(session.follow(offset, self.cfg.draft_detached_seconds)) as texts:
+            async with aclosing(coalesce(texts, self.cfg.draft_coalesce_ms / 1000,
+                                         self.cfg.draft_coalesce_bytes)) as pieces:
+                async for piece in pieces:
+                    yield piece
+
+    def live(self, tenant_id: str, draft_id: str) -> Optional[DraftSession]:
+        return self._sessions.get((tenant_id, draft_id))
+
+    async def persisted(self, tenant_id: str, draft_id: str) -> Optional[dict[str, Any]]:
+        """The stored draft, with its citations rebuilt as ``RankedChunk``s."""
+        validate_tenant_id(tenant_id)
+        async with dbx.tenant_tx(self.pool, tenant_id) as conn:
+            row = await dbx.get_draft_stream(conn, draft_id)
+        if row is not None:
+            row["citations"] = [RankedChunk(**c) for c in row["citations"]]
+        return row
+
+    async def close(self) -> None:
+        """Abandon every live generation (service shutdown); what has been
+        generated so far is flushed first."""
+        tasks = [s.task for s in self._sessions.values() if s.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, session: DraftSession, stream: AsyncIterator[str]) -> None:
+        stop = asyncio.Event()
+        flusher = asyncio.create_task(self._flush_every(session, stop))
+        status = FAILED
+        try:
+            async with aclosing(stream) as tokens:
+                async for token in tokens:
+                    await session._append(token)
+            status = COMPLETE
+        except asyncio.CancelledError:
+            status = ABANDONED
+            log().info("draft %s abandoned after %d tokens", session.draft_id, len(session.parts))
+        except Exception:  # noqa: BLE001 — followers see the status, not the exception
+            log().exception("draft generation failed")
+        finally:
+            # Generation is over: nothing left to expire. Let an in-flight
+            # flush land rather than cancel it half-written.
+            if session._expiry is not None:
+                session._expiry.cancel()
+            session.task = None
+            stop.set()
+            await flusher
+            await self._flush(session, status)
+            await session._finish(status)
+            self._sessions.pop((session.tenant_id, session.draft_id), None)
+
+    async def _flush_every(self, session: DraftSession, stop: asyncio.Event) -> None:
+        interval = max(0.01, self.cfg.draft_flush_ms / 1000)
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), interval)
+            except asyncio.TimeoutError:
+                if len(session.parts) > session.flushed:
+                    await self._flush(session, STREAMING)
+
+    async def _flush(self, session: DraftSession, status: str) -> None:
+        """Append the tokens generated since the last flush. A failed write is
+        retried with the next flush (nothing is marked flushed)."""
+        upto = len(session.parts)
+        try:
+            async with dbx.tenant_tx(self.pool, session.tenant_id) as conn:
+                await dbx.append_draft_stream(
+                    conn, session.draft_id, "".join(session.parts[session.flushed:upto]), status,
+                    [asdict(c) for c in session.citations], session.degraded_stages)
+            session.flushed = upto
+        except Exception:  # noqa: BLE001 — persistence must not break the live stream
+            log().exception("draft %s flush failed", session.draft_id)
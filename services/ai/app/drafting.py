@@ -1,15 +1,24 @@
 """AI document drafting: Kenyan legal templates + tenant clause library +
 retrieval-grounded context, streamed token-by-token over gRPC.
+
+Long instruments (contracts, pleadings) are drafted section by section: the
+template skeleton is expanded into ``SECTIONS``, each section is generated
+concurrently with its own grounding retrieval, and the sections are streamed
+back in document order.
 """
 from __future__ import annotations
 
-from typing import AsyncIterator, Optional
+import asyncio
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional, Sequence
 
 import asyncpg
 
 from . import db as dbx
 from .config import Config
-from .llm import CONFIDENTIALITY_PREAMBLE, LLMProvider
+from .deadline import Budget
+from .llm import CONFIDENTIALITY_PREAMBLE, LLMProvider, PromptSegment, llm_call_site
 from .logging_setup import log
 from .retrieval import RankedChunk, RetrievalOrchestrator
 
@@ -133,6 +142,63 @@ For: {firm_name}""",
 }
 
 
+@dataclass(frozen=True)
+class Section:
+    heading: str
+    brief: str            # what the section covers
+    grounded: bool = False  # gets its own grounding retrieval
+
+
+# The section-by-section expansion of the long templates. Each section is
+# drafted on its own, so numbering must not depend on another section's length.
+SECTIONS: dict[str, list[Section]] = {
+    "contract": [
+        Section("AGREEMENT, PARTIES AND RECITALS",
+                "the title, date line, the parties with their descriptions, and the "
+                "recitals (A), (B), ... ending with 'NOW THEREFORE IT IS AGREED as follows:'"),
+        Section("1. DEFINITIONS AND INTERPRETATION",
+                "defined terms (1.1) and rules of interpretation (1.2)"),
+        Section("2. OPERATIVE CLAUSES",
+                "the substantive obligations, consideration and payment, term and "
+                "termination, numbered 2.1, 2.2, ...", grounded=True),
+        Section("3. GOVERNING LAW",
+                "governing law of Kenya and submission to the jurisdiction of the Kenyan courts",
+                grounded=True),
+        Section("4. DISPUTE RESOLUTION",
+                "negotiation, then mediation or arbitration under the Arbitration Act, "
+                "1995, with seat and appointment of the arbitrator", grounded=True),
+        Section("5. DATA PROTECTION",
+                "each party's obligations as data controller/processor under the Data "
+                "Protection Act, 2019", grounded=True),
+        Section("EXECUTION", "the IN WITNESS WHEREOF clause and signature blocks"),
+    ],
+    "pleading": [
+        Section("HEADING, PARTIES AND MATERIAL FACTS",
+                "the court heading, parties and pleading title, then the numbered "
+                "paragraphs on the parties and the material facts in chronological order"),
+        Section("LEGAL BASIS",
+                "the legal foundation of the claim citing the specific statutory "
+                "provisions and authorities, as lettered paragraphs (a), (b), ...",
+                grounded=True),
+        Section("PRAYERS AND FILING",
+                "the 'REASONS WHEREFORE' prayers including costs, the dated line and the "
+                "'DRAWN & FILED BY' block"),
+    ],
+}
+
+_SECTION_GROUNDING_TOP_K = 3
+
+DRAFTING_SYSTEM = (
+    "You are Advocatus's drafting engine for Kenyan legal documents. Produce a "
+    "complete, professional draft in the house style of Kenyan practice. Use the "
+    "provided template as the structural skeleton, fill in what the instructions "
+    "and matter facts support, and leave square-bracket placeholders for anything "
+    "unknown. Ground legal assertions in the provided authorities and cite them "
+    "inline as [n]. Do not invent citations. "
+    + CONFIDENTIALITY_PREAMBLE
+)
+
+
 class DraftingEngine:
     def __init__(self, pool: asyncpg.Pool, retriever: RetrievalOrchestrator,
                  llm: LLMProvider, cfg: Config) -> None:
@@ -141,37 +207,85 @@ class DraftingEngine:
         self.llm = llm
         self.cfg = cfg
 
-    async def _matter_facts(self, tenant_id: str, matter_id: str) -> str:
+    @staticmethod
+    async def _matter_facts(conn: asyncpg.Connection, matter_id: str) -> str:
+        row = await conn.fetchrow(
+            """SELECT m.reference, m.title, m.description, m.practice_area, m.court,
+                      m.court_case_number, COALESCE(c.name,'') AS client_name
+               FROM matters m LEFT JOIN clients c ON c.id = m.client_id
+               WHERE m.id = $1""", matter_id)
+        if not row:
+            return ""
+        return (f"Matter reference: {row['reference']}\nMatter: {row['title']}\n"
+                f"Client: {row['client_name']}\nPractice area: {row['practice_area']}\n"
+                f"Court: {row['court']} {row['court_case_number']}\n"
+                f"Background: {row['description']}")
+
+    @staticmethod
+    async def _clauses(conn: asyncpg.Connection, template_id: Optional[str],
+                       query_vec: Optional[list[float]], top_k: int) -> str:
+        """The chosen template clause, else the ``top_k`` clauses nearest the
+        draft request. Until the firm's clauses are embedded (see
+        ``app.clauses``) the oldest ones stand in."""
+        if template_id:
+            rows = await conn.fetch(
+                "SELECT title, body FROM clause_library WHERE id::text = $1", template_id)
+        else:
+            rows = await dbx.search_clauses(conn, query_vec, top_k) if query_vec else []
+            if not rows:
+                rows = await conn.fetch(
+                    "SELECT title, body FROM clause_library ORDER BY created_at LIMIT $1", top_k)
+        return "\n\n".join(f"[{r['title']}]\n{r['body']}" for r in rows)
+
+    @staticmethod
+    async def _savepoint(conn: asyncpg.Connection, what: str, lookup, *args) -> str:
         try:
-            async with dbx.tenant_tx(self.pool, tenant_id) as conn:
-                row = await conn.fetchrow(
-                    """SELECT m.reference, m.title, m.description, m.practice_area, m.court,
-                              m.court_case_number, COALESCE(c.name,'') AS client_name
-                       FROM matters m LEFT JOIN clients c ON c.id = m.client_id
-                       WHERE m.id = $1""", matter_id)
-            if not row:
-                return ""
-            return (f"Matter reference: {row['reference']}\nMatter: {row['title']}\n"
-                    f"Client: {row['client_name']}\nPractice area: {row['practice_area']}\n"
-                    f"Court: {row['court']} {row['court_case_number']}\n"
-                    f"Background: {row['description']}")
+            async with conn.transaction():
+                return await lookup(conn, *args)
         except Exception as exc:
-            log().warning("matter facts lookup failed: %s", exc)
+            log().warning("%s lookup failed: %s", what, exc)
             return ""
 
-    async def _clauses(self, tenant_id: str, template_id: Optional[str]) -> str:
+    async def _clause_query_vec(self, doc_type: str, instructions: str) -> Optional[list[float]]:
+        try:
+            [vec] = await self.retriever.embedder.embed(
+                [f"{doc_type.replace('_', ' ')}: {instructions}"])
+            return vec
+        except Exception as exc:
+            log().warning("clause query embedding failed: %s", exc)
+            return None
+
+    async def _tenant_context(self, tenant_id: str, matter_id: Optional[str],
+                              template_id: Optional[str], doc_type: str = "",
+                              instructions: str = "") -> tuple[str, str]:
+        """(matter facts, clause library) from one tenant transaction on one
+        pooled connection. Each lookup runs in its own savepoint, so one that
+        fails still leaves the other usable."""
+        query_vec = None if template_id else await self._clause_query_vec(doc_type, instructions)
+        facts = clauses = ""
         try:
             async with dbx.tenant_tx(self.pool, tenant_id) as conn:
-                if template_id:
-                    rows = await conn.fetch(
-                        "SELECT title, body FROM clause_library WHERE id::text = $1", template_id)
-                else:
-                    rows = await conn.fetch(
-                        "SELECT title, body FROM clause_library ORDER BY created_at LIMIT 6")
-            return "\n\n".join(f"[{r['title']}]\n{r['body']}" for r in rows)
+                if matter_id:
+                    facts = await self._savepoint(conn, "matter facts",
+                                                  self._matter_facts, matter_id)
+                clauses = await self._savepoint(conn, "clause library", self._clauses,
+                                                template_id, query_vec,
+                                                self.cfg.draft_clause_top_k)
         except Exception as exc:
-            log().warning("clause library lookup failed: %s", exc)
-            return ""
+            log().warning("draft tenant context lookup failed: %s", exc)
+        return facts, clauses
+
+    async def _grounding(self, tenant_id: str, query: str, matter_id: Optional[str],
+                         budget: Budget, top_k: int = 6) -> list[RankedChunk]:
+        if not budget.allows("draft_grounding"):
+            return []
+        try:
+            chunks, _ = await self.retriever.retrieve(
+                tenant_id, query, top_k=top_k, matter_id=matter_id, budget=budget)
+            return chunks
+        except Exception as exc:
+            log().warning("draft grounding retrieval failed: %s", exc)
+            return []
 
     async def draft(
         self,
@@ -181,39 +295,119 @@ class DraftingEngine:
         matter_id: Optional[str] = None,
         template_id: Optional[str] = None,
         context_query: Optional[str] = None,
+        budget: Optional[Budget] = None,
     ) -> tuple[AsyncIterator[str], list[RankedChunk]]:
-        """Returns (token stream, provenance-tagged citations used)."""
+        """Returns (token stream, provenance-tagged citations used). Grounding
+        retrieval is skipped when ``budget`` cannot cover it — an ungrounded
+        draft that arrives beats a grounded one the gateway has given up on.
+        The tenant lookups and grounding retrieval run concurrently, so the
+        stream starts after the slowest of them rather than their sum.
+        Sectioned doc types (``SECTIONS``) are generated section-parallel when
+        ``draft_section_parallel`` is on."""
+        budget = budget or Budget()
         template = TEMPLATES.get(doc_type, TEMPLATES["correspondence"])
-        facts = await self._matter_facts(tenant_id, matter_id) if matter_id else ""
-        clauses = await self._clauses(tenant_id, template_id)
-
+        system = [PromptSegment(DRAFTING_SYSTEM, cacheable=True)]
+        if doc_type in SECTIONS and self.cfg.draft_section_parallel:
+            sections = SECTIONS[doc_type]
+            (facts, clauses), (citations, shares) = await asyncio.gather(
+                self._tenant_context(tenant_id, matter_id, template_id, doc_type, instructions),
+                self._section_grounding(tenant_id, sections, context_query or instructions,
+                                        matter_id, budget))
+            prompts = [self._prompt(doc_type, template, clauses, facts, share, instructions, section)
+                       for section, share in zip(sections, shares)]
+            return self._sectioned(system, prompts), citations
+
+        (facts, clauses), citations = await asyncio.gather(
+            self._tenant_context(tenant_id, matter_id, template_id, doc_type, instructions),
+            self._grounding(tenant_id, context_query or instructions, matter_id, budget))
+        prompt = self._prompt(doc_type, template, clauses, facts,
+                              list(enumerate(citations, 1)), instructions)
+        with llm_call_site("draft"):
+            return self.llm.stream(system=system, prompt=prompt, max_tokens=8192), citations
+
+    @staticmethod
+    def _prompt(doc_type: str, template: str, clauses: str, facts: str,
+                grounding: Sequence[tuple[int, RankedChunk]], instructions: str,
+                section: Optional[Section] = None) -> list[PromptSegment]:
+        """Stable segments first (marked cacheable, and shared by every
+        section of a sectioned draft), then what changes per draft/section."""
+        law_context = "\n\n".join(
+            f"[{n}] ({c.source_type}) {c.citation or c.source_id}\n{c.text}" for n, c in grounding)
+        prompt = [PromptSegment(f"Document type: {doc_type}\n\nTemplate skeleton:\n{template}\n\n",
+                                cacheable=True)]
+        if clauses:
+            prompt.append(PromptSegment(
+                f"Firm clause library (prefer this language):\n{clauses}\n\n", cacheable=True))
+        prompt.append(PromptSegment(
+            (f"Matter facts:\n{facts}\n\n" if facts else "")
+            + (f"--- CONTEXT ---\n{law_context}\n--- END CONTEXT ---\n\n" if law_context else "")
+            + f"Instructions from the advocate:\n{instructions}\n"
+            + (f"\nDraft ONLY this section of the document: {section.heading} — {section.brief}. "
+               "Begin with the section heading and output the section text alone, with no "
+               "commentary; the other sections are drafted separately.\n" if section else "")))
+        return prompt
+
+    async def _section_grounding(
+        self, tenant_id: str, sections: Sequence[Section], query: str,
+        matter_id: Optional[str], budget: Budget,
+    ) -> tuple[list[RankedChunk], list[list[tuple[int, RankedChunk]]]]:
+        """Grounding retrieval for each grounded section, run concurrently.
+        Returns the citations deduplicated and numbered in document order,
+        and each section's (number, chunk) share of them."""
+        async def one(section: Section) -> list[RankedChunk]:
+            if not section.grounded:
+                return []
+            return await self._grounding(tenant_id, f"{section.heading.title()}: {query}",
+                                         matter_id, budget, top_k=_SECTION_GROUNDING_TOP_K)
+
+        numbers: dict[str, int] = {}
         citations: list[RankedChunk] = []
-        law_context = ""
-        query = context_query or instructions
+        shares = []
+        for chunks in await asyncio.gather(*(one(s) for s in sections)):
+            share = []
+            for c in chunks:
+                if c.chunk_id not in numbers:
+                    citations.append(c)
+                    numbers[c.chunk_id] = len(citations)
+                share.append((numbers[c.chunk_id], c))
+            shares.append(share)
+        return citations, shares
+
+    async def _sectioned(self, system: list[PromptSegment],
+                         prompts: Sequence[list[PromptSegment]]) -> AsyncIterator[str]:
+        """Generate every section concurrently (at most
+        ``draft_section_concurrency`` at once, started in document order) and
+        yield them in document order: the section being read streams live,
+        later ones are buffered until their turn. A failed section fails the
+        draft."""
+        end = object()
+        slots = asyncio.Semaphore(max(1, self.cfg.draft_section_concurrency))
+        queues: list[asyncio.Queue] = [asyncio.Queue() for _ in prompts]
+
+        async def generate(prompt: list[PromptSegment], out: asyncio.Queue) -> None:
+            try:
+                async with slots:
+                    with llm_call_site("draft"):
+                        section = self.llm.stream(system=system, prompt=prompt,
+                                                  max_tokens=self.cfg.draft_section_max_tokens)
+                    async with aclosing(section) as tokens:
+                        async for token in tokens:
+                            out.put_nowait(token)
+            except Exception as exc:  # noqa: BLE001 — re-raised by the reader
+                out.put_nowait(exc)
+            finally:
+                out.put_nowait(end)
+
+        tasks = [asyncio.create_task(generate(p, q)) for p, q in zip(prompts, queues)]
         try:
-            chunks, _ = await self.retriever.retrieve(tenant_id, query, top_k=6, matter_id=matter_id)
-            citations = chunks
-            law_context = "\n\n".join(
-                f"[{i}] ({c.source_type}) {c.citation or c.source_id}\n{c.text}"
-                for i, c in enumerate(chunks, 1)
-            )
-        except Exception as exc:
-            log().warning("draft grounding retrieval failed: %s", exc)
-
-        system = (
-            "You are Advocatus's drafting engine for Kenyan legal documents. Produce a "
-            "complete, professional draft in the house style of Kenyan practice. Use the "
-            "provided template as the structural skeleton, fill in what the instructions "
-            "and matter facts support, and leave square-bracket placeholders for anything "
-            "unknown. Ground legal assertions in the provided authorities and cite them "
-            "inline as [n]. Do not invent citations. "
-            + CONFIDENTIALITY_PREAMBLE
-        )
-        prompt = (
-            f"Document type: {doc_type}\n\nInstructions from the advocate:\n{instructions}\n\n"
-            + (f"Matter facts:\n{facts}\n\n" if facts else "")
-            + (f"Firm clause library (prefer this language):\n{clauses}\n\n" if clauses else "")
-            + (f"--- CONTEXT ---\n{law_context}\n--- END CONTEXT ---\n\n" if law_context else "")
-            + f"Template skeleton:\n{template}\n"
-        )
-        return self.llm.stream(system=system, prompt=prompt, max_tokens=8192), citations
+            for i, out in enumerate(queues):
+                if i:
+                    yield "\n\n"
+                while (item := await out.get()) is not end:
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -5,6 +5,7 @@ from .builders import (
     GraphQuery,
     GraphQueryError,
     PublicGraphQuery,
+    RowField,
     TenantScopedGraphQuery,
 )
 from .client import Graph
@@ -14,6 +15,7 @@ __all__ = [
     "GraphQuery",
     "GraphQueryError",
     "PublicGraphQuery",
+    "RowField",
     "TenantScopedGraphQuery",
     "ALLOWED_TENANT_LABELS",
     "ALLOWED_PUBLIC_LABELS",
@@ -50,7 +50,7 @@ ALLOWED_RELS = frozenset(
 _IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 _RETURN_EXPR_RE = re.compile(
     r"^(?:[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?"
-    r"|labels\([A-Za-z_][A-Za-z0-9_]*\)"
+    r"|(?:labels|type)\([A-Za-z_][A-Za-z0-9_]*\)"
     r"|count\((?:\*|[A-Za-z_][A-Za-z0-9_]*)\))"
     r"(?:\s+AS\s+[A-Za-z_][A-Za-z0-9_]*)?$",
     re.IGNORECASE,
@@ -76,6 +76,15 @@ class GraphQuery:
 _TOKEN = object()  # module-private capability token
 
 
+@dataclass(frozen=True)
+class RowField:
+    """A property value taken from the current ``UNWIND`` row rather than a
+    bound parameter — ``merge_node("a", "Advocate", {"id": RowField("id")})``.
+    Only usable on a builder that has called ``unwind()``."""
+
+    name: str
+
+
 def _check_ident(name: str, what: str) -> str:
     if not _IDENT_RE.match(name or ""):
         raise GraphQueryError(f"invalid {what}: {name!r}")
@@ -101,6 +110,7 @@ def _check_rels(rel_types: Sequence[str]) -> list[str]:
 
 class _BaseBuilder:
     def __init__(self) -> None:
+        self._unwind: Optional[str] = None
         self._matches: list[str] = []
         self._wheres: list[str] = []
         self._writes: list[str] = []
@@ -118,20 +128,31 @@ class _BaseBuilder:
         self._params[key] = value
         return f"${key}"
 
+    def _value(self, value: Any) -> str:
+        """Cypher expression for a property value: a bound parameter, or the
+        field of the UNWIND row for a :class:`RowField`."""
+        if isinstance(value, RowField):
+            if self._unwind is None:
+                raise GraphQueryError("RowField used without unwind()")
+            return f"row.{_check_ident(value.name, 'row field')}"
+        return self._bind(value)
+
     # -- pattern fragments ---------------------------------------------------
     def _node_pattern(self, alias: str, label: Optional[str], public: bool, props: dict) -> str:
         _check_ident(alias, "alias")
+        if self._unwind is not None and alias == "row":
+            raise GraphQueryError("alias 'row' is reserved by unwind()")
         parts = [alias]
         if label is not None:
             parts.append(":" + _check_label(label, public))
-            if public:
-                parts.append(":Public")
+        if public:
+            parts.append(":Public")
         prop_frags = []
         if not public and self._tenant_filtered():
             prop_frags.append("tenant_id: $tenant_id")
         for key, value in props.items():
-            _check_ident(key, "property")
-            prop_frags.append(f"{key}: {self._bind(value)}")
+            self._check_prop(key)
+            prop_frags.append(f"{key}: {self._value(value)}")
         pattern = "".join(parts)
         if prop_frags:
             pattern += " {" + ", ".join(prop_frags) + "}"
@@ -141,6 +162,13 @@ class _BaseBuilder:
     def _tenant_filtered(self) -> bool:
         return False
 
+    def _check_prop(self, key: str) -> str:
+        _check_ident(key, "property")
+        if key == "tenant_id" and self._tenant_filtered():
+            # tenant_id is injected by the builder, never caller-supplied.
+            raise GraphQueryError("tenant_id cannot be set by the caller")
+        return key
+
     # -- clauses -------------------------------------------------------------
     def match(self, alias: str, label: str, public: bool = False, **props: Any) -> "_BaseBuilder":
         self._matches.append("MATCH " + self._node_pattern(alias, label, public, props))
@@ -165,6 +193,45 @@ class _BaseBuilder:
         self._matches.append(f"MATCH ({from_alias}){left}[:{rels}]{right}{to_pat}")
         return self
 
+    def match_labels(self, alias: str, labels: Sequence[str], public: bool = False,
+                     **props: Any) -> "_BaseBuilder":
+        """Multi-label anchor: MATCH (alias) carrying ANY of ``labels``, so one
+        query covers what would otherwise be one query per label."""
+        checked = [_check_label(label, public) for label in labels]
+        if not checked:
+            raise GraphQueryError("at least one label required")
+        self._matches.append("MATCH " + self._node_pattern(alias, None, public, props))
+        self._wheres.append("(" + " OR ".join(f"{alias}:{label}" for label in checked) + ")")
+        return self
+
+    def match_hop(
+        self,
+        from_alias: str,
+        rel_types: Sequence[str],
+        to_alias: str,
+        rel_alias: str = "r",
+        direction: str = "any",
+    ) -> "_BaseBuilder":
+        """Fixed one-hop MATCH (from)-[r:R1|R2]-(to) to a neighbour of any
+        label — a plain relationship pattern, no variable-length path. The
+        neighbour must be public, or (tenant scope) in this tenant's
+        partition; ``type(r)`` is returnable for edge-type weighting."""
+        if from_alias not in self._aliases:
+            raise GraphQueryError(f"unbound alias {from_alias!r}")
+        _check_ident(to_alias, "alias")
+        _check_ident(rel_alias, "alias")
+        rels = "|".join(_check_rels(rel_types))
+        left, right = ("-", "->") if direction == "out" else ("<-", "-") if direction == "in" else ("-", "-")
+        if self._tenant_filtered():
+            to_pat = f"({to_alias})"
+            self._wheres.append(f"({to_alias}:Public OR {to_alias}.tenant_id = $tenant_id)")
+        else:
+            to_pat = f"({to_alias}:Public)"
+        self._matches.append(f"MATCH ({from_alias}){left}[{rel_alias}:{rels}]{right}{to_pat}")
+        self._aliases[to_alias] = not self._tenant_filtered()
+        self._aliases[rel_alias] = not self._tenant_filtered()
+        return self
+
     def expand(
         self,
         from_alias: str,
@@ -201,7 +268,7 @@ class _BaseBuilder:
         _check_ident(prop, "property")
         if op not in ("=", "<>", "<", "<=", ">", ">=", "CONTAINS", "STARTS WITH"):
             raise GraphQueryError(f"operator {op!r} not allowed")
-        self._wheres.append(f"{alias}.{prop} {op} {self._bind(value)}")
+        self._wheres.append(f"{alias}.{prop} {op} {self._value(value)}")
         return self
 
     def where_in(self, alias: str, prop: str, values: Sequence[Any]) -> "_BaseBuilder":
@@ -232,7 +299,7 @@ class _BaseBuilder:
     def _assemble(self) -> str:
         if not self._matches and not self._writes:
             raise GraphQueryError("empty query")
-        clauses = list(self._matches)
+        clauses = ([self._unwind] if self._unwind else []) + list(self._matches)
         if self._wheres:
             clauses.append("WHERE " + " AND ".join(self._wheres))
         clauses.extend(self._writes)
@@ -258,14 +325,25 @@ class TenantScopedGraphQuery(_BaseBuilder):
     def _tenant_filtered(self) -> bool:
         return True
 
+    # -- batching ------------------------------------------------------------
+    def unwind(self, rows: Sequence[dict]) -> "TenantScopedGraphQuery":
+        """Run the rest of the query once per row (``UNWIND $rows AS row``);
+        reference row fields with :class:`RowField`. Rows are a bound
+        parameter, and every pattern/SET still carries the builder-injected
+        ``tenant_id`` — a row can supply values, never the partition."""
+        if self._unwind is not None or self._matches or self._writes:
+            raise GraphQueryError("unwind() must be the first clause, at most once")
+        self._unwind = f"UNWIND {self._bind([dict(r) for r in rows])} AS row"
+        return self
+
     # -- writes (tenant partition only) -----------------------------------
     def merge_node(self, alias: str, label: str, key_props: dict, set_props: Optional[dict] = None) -> "TenantScopedGraphQuery":
         pattern = self._node_pattern(alias, label, public=False, props=key_props)
         self._writes.append("MERGE " + pattern)
         sets = [f"{alias}.tenant_id = $tenant_id"]
         for key, value in (set_props or {}).items():
-            _check_ident(key, "property")
-            sets.append(f"{alias}.{key} = {self._bind(value)}")
+            self._check_prop(key)
+            sets.append(f"{alias}.{key} = {self._value(value)}")
         self._writes.append("SET " + ", ".join(sets))
         return self
 
@@ -323,6 +401,13 @@ class PublicGraphQuery(_BaseBuilder):
             raise GraphQueryError("PublicGraphQuery can only match public nodes")
         return super().match_rel(from_alias, rel_types, to_alias, to_label, True, direction, **to_props)
 
+    def match_labels(self, alias: str, labels: Sequence[str], public: bool = True,
+                     **props: Any) -> "PublicGraphQuery":
+        if not public:
+            raise GraphQueryError("PublicGraphQuery can only match public nodes")
+        super().match_labels(alias, labels, public=True, **props)
+        return self
+
     def build(self) -> GraphQuery:
         if self._writes:
             raise GraphQueryError("PublicGraphQuery is read-only")
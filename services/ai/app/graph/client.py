@@ -1,9 +1,9 @@
 """Neo4j driver wrapper that only executes builder-produced queries."""
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Optional, Sequence
 
-from neo4j import AsyncGraphDatabase
+from neo4j import AsyncGraphDatabase, unit_of_work
 
 from ..config import Config
 from .builders import GraphQuery, GraphQueryError, is_builder_query
@@ -34,7 +34,10 @@ class Graph:
             for stmt in stmts:
                 await session.run(stmt)
 
-    async def read(self, q: GraphQuery) -> list[dict[str, Any]]:
+    async def read(self, q: GraphQuery, timeout: Optional[float] = None) -> list[dict[str, Any]]:
+        """Run a builder read. ``timeout`` (seconds) becomes the server-side
+        transaction timeout, so a deadline-bound caller's query is cancelled
+        in Neo4j rather than left running after the RPC gave up."""
         if not is_builder_query(q):
             raise GraphQueryError("only builder-produced queries may execute")
         if q.write:
@@ -44,6 +47,8 @@ class Graph:
             result = await tx.run(q.cypher, q.params)
             return [dict(record) async for record in result]
 
+        if timeout is not None:
+            work = unit_of_work(timeout=timeout)(work)
         async with self._driver.session() as session:
             return await session.execute_read(work)
 
@@ -67,8 +72,51 @@ class Graph:
         async with self._driver.session() as session:
             return await session.execute_write(work)
 
+    async def write_many(self, queries: Sequence[GraphQuery]) -> dict[str, int]:
+        """Run several tenant-scoped builder writes in ONE transaction (one
+        round trip, all-or-nothing). Every query is validated like
+        ``write()``, and all must target the same tenant."""
+        tenants = set()
+        for q in queries:
+            if not is_builder_query(q):
+                raise GraphQueryError("only builder-produced queries may execute")
+            if not q.write:
+                raise GraphQueryError("read query passed to write_many()")
+            if not q.tenant_scoped:
+                raise GraphQueryError("request-path writes must be tenant-scoped")
+            tenants.add(q.params.get("tenant_id"))
+        if len(tenants) > 1:
+            raise GraphQueryError("write_many() queries must share one tenant")
+        if not queries:
+            return {"nodes_created": 0, "nodes_deleted": 0, "relationships_created": 0}
+
+        async def work(tx):
+            # Fresh totals per attempt: execute_write retries transient failures.
+            totals = {"nodes_created": 0, "nodes_deleted": 0, "relationships_created": 0}
+            for q in queries:
+                result = await tx.run(q.cypher, q.params)
+                summary = await result.consume()
+                totals["nodes_created"] += summary.counters.nodes_created
+                totals["nodes_deleted"] += summary.counters.nodes_deleted
+                totals["relationships_created"] += summary.counters.relationships_created
+            return totals
+
+        async with self._driver.session() as session:
+            return await session.execute_write(work)
+
     # Escape hatch used ONLY by app.ingestion.pipeline.PublicCorpusWriter for
     # batch public-corpus writes; never imported by request-path modules.
     async def _run_internal(self, cypher: str, params: dict) -> None:
         async with self._driver.session() as session:
             await session.run(cypher, params)
+
+    async def _run_internal_batch(self, statements: Sequence[tuple[str, dict]]) -> None:
+        """Same escape hatch, but every statement runs in ONE write
+        transaction — a flush either lands completely or not at all."""
+        async def work(tx):
+            for cypher, params in statements:
+                result = await tx.run(cypher, params)
+                await result.consume()
+
+        async with self._driver.session() as session:
+            await session.execute_write(work)
@@ -0,0 +1,71 @@
+"""Personalized PageRank over the public subgraph a reasoning pass reached.
+
+Traversal decides which authorities are *reachable* from the retrieval
+anchors; this decides which of them deserve one of the few evidence slots.
+The walk restarts at the anchors (weighted by their retrieval rank) and moves
+along edges in proportion to ``EDGE_WEIGHTS``, so an authority that overturns
+or amends an anchor outranks one that merely cites it, and one reached from
+several anchors outranks one hanging off a single weak anchor.
+
+Subgraphs here are at most a few hundred nodes, so a power iteration over
+COO edge arrays (``np.bincount`` as the sparse mat-vec) converges in well
+under a millisecond.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Mapping
+
+import numpy as np
+
+from .snapshot import EDGE_WEIGHTS, Edge
+
+
+def personalized_pagerank(
+    edges: Iterable[Edge],
+    seeds: Mapping[str, float],
+    damping: float = 0.85,
+    tol: float = 1e-9,
+    max_iter: int = 100,
+) -> dict[str, float]:
+    """Scores (summing to 1) for every seed and edge endpoint. Edges are
+    treated as undirected — the expansion that found them is — and parallel
+    edges between the same pair add up. A node with no edges keeps its mass
+    (an implicit self-loop), so every connected component ends up holding
+    exactly the restart mass of its seeds: an anchor traversal found nothing
+    around is not pushed below the neighbours of weaker anchors."""
+    ids: dict[str, int] = {}
+    for doc_id in seeds:
+        ids.setdefault(doc_id, len(ids))
+    src, dst, weight = [], [], []
+    for edge in edges:
+        w = EDGE_WEIGHTS.get(edge[3], 0.0)
+        if w <= 0.0 or edge[0] == edge[1]:
+            continue
+        a, b = ids.setdefault(edge[0], len(ids)), ids.setdefault(edge[1], len(ids))
+        src += (a, b)
+        dst += (b, a)
+        weight += (w, w)
+    n = len(ids)
+    if n == 0:
+        return {}
+
+    restart = np.zeros(n)
+    for doc_id, w in seeds.items():
+        restart[ids[doc_id]] = max(w, 0.0)
+    restart = restart / restart.sum() if restart.sum() > 0 else np.full(n, 1.0 / n)
+
+    src_a, dst_a = np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64)
+    out = np.bincount(src_a, weights=np.array(weight), minlength=n)
+    # Transition probability of each directed edge, i.e. column-normalised W.
+    share = np.array(weight) / out[src_a] if len(src_a) else np.zeros(0)
+    dangling = out == 0
+
+    rank = restart.copy()
+    for _ in range(max_iter):
+        nxt = damping * np.bincount(dst_a, weights=rank[src_a] * share, minlength=n)
+        nxt += damping * np.where(dangling, rank, 0.0) + (1.0 - damping) * restart
+        done = np.abs(nxt - rank).sum() < tol
+        rank = nxt
+        if done:
+            break
+    return {doc_id: float(rank[i]) for doc_id, i in ids.items()}
@@ -0,0 +1,196 @@
+"""Read-only in-process snapshot of the public law graph for multi-hop
+reasoning.
+
+The public graph only changes when the ingestion pipeline runs, yet reasoning
+used to expand its frontier with one Neo4j round trip per anchor label per
+hop. The snapshot interns every public ``doc_id`` to an int and keeps, per
+relationship type, a symmetric CSR adjacency (``indptr``/``indices`` NumPy
+arrays) plus title/status arrays, so a hop is a few array slices.
+
+It is rebuilt after each ingestion pass (scheduler post-run hook) through
+ordinary ``PublicGraphQuery`` reads and swapped in atomically; requests keep
+using whichever snapshot they started with. Tenant partitions are never part
+of it — they still go through ``TenantScopedGraphQuery`` per request.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from ..logging_setup import log
+from .builders import PublicGraphQuery
+
+# Relationship types reasoning expands over, and the labels a node must carry
+# to be expanded FROM (mirrors the per-label Neo4j expansion it replaces).
+REASONING_RELS = ("CITES", "INTERPRETS", "AMENDS", "OVERTURNS", "DISTINGUISHES",
+                  "HAS_OPINION", "AUTHORED", "PART_OF")
+EXPANDABLE_LABELS = ("Statute", "CaseLaw", "Judgment")
+
+# How much a neighbour reached over each edge type is worth to the next hop:
+# treatment edges (is this still good law?) outrank plain citations, which
+# outrank structural links to opinions/judges.
+EDGE_WEIGHTS: dict[str, float] = {
+    "OVERTURNS": 1.0, "AMENDS": 0.95, "INTERPRETS": 0.9, "DISTINGUISHES": 0.85,
+    "CITES": 0.7, "HAS_OPINION": 0.5, "PART_OF": 0.5, "AUTHORED": 0.3,
+}
+
+Edge = tuple[str, str, str, str]  # (src, dst, dst title, rel type)
+
+
+def best_edges(edges: Iterable[Edge], seen: set[str], limit: int = 180) -> list[Edge]:
+    """Keep one edge per unseen neighbour — its highest-weight one — ranked
+    by that weight (discovery order breaks ties). ``seen`` gains the
+    neighbours returned."""
+    best: dict[str, Edge] = {}
+    for edge in edges:
+        dst = edge[1]
+        if dst in seen:
+            continue
+        cur = best.get(dst)
+        if cur is None:
+            if len(best) >= limit:
+                continue
+            best[dst] = edge
+        elif EDGE_WEIGHTS.get(edge[3], 0.0) > EDGE_WEIGHTS.get(cur[3], 0.0):
+            best[dst] = edge
+    seen.update(best)
+    return sorted(best.values(), key=lambda e: EDGE_WEIGHTS.get(e[3], 0.0), reverse=True)
+
+
+@dataclass(frozen=True)
+class _CSR:
+    indptr: np.ndarray   # int64[n + 1]
+    indices: np.ndarray  # int32[nnz], neighbours of i at indices[indptr[i]:indptr[i+1]]
+
+
+def _csr(n: int, pairs: np.ndarray) -> _CSR:
+    """Symmetric, de-duplicated CSR from an (m, 2) array of node ints."""
+    if len(pairs) == 0:
+        return _CSR(np.zeros(n + 1, dtype=np.int64), np.zeros(0, dtype=np.int32))
+    src = np.concatenate([pairs[:, 0], pairs[:, 1]]).astype(np.int64)
+    dst = np.concatenate([pairs[:, 1], pairs[:, 0]]).astype(np.int64)
+    keys = np.unique(src * n + dst)  # sorted by (src, dst)
+    src, dst = keys // n, keys % n
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return _CSR(indptr, dst.astype(np.int32))
+
+
+class PublicGraphSnapshot:
+    def __init__(self, nodes: dict[str, tuple[str, str]], expandable: set[str],
+                 edges: dict[str, set[tuple[str, str]]]) -> None:
+        """``nodes``: doc_id -> (title, status); ``expandable``: doc_ids carrying
+        an EXPANDABLE_LABELS label; ``edges``: rel type -> (doc_id, doc_id)."""
+        self.ids: list[str] = sorted(nodes.keys() | expandable)
+        self._index = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        n = len(self.ids)
+        self.titles = np.array([nodes.get(d, ("", ""))[0] for d in self.ids], dtype=object)
+        self.statuses = np.array([nodes.get(d, ("", ""))[1] for d in self.ids], dtype=object)
+        self.expandable = np.zeros(n, dtype=bool)
+        self.expandable[[self._index[d] for d in expandable]] = True
+        self._csr: dict[str, _CSR] = {}
+        for rel, rel_pairs in edges.items():
+            arr = np.array([(self._index[a], self._index[b]) for a, b in rel_pairs],
+                           dtype=np.int64).reshape(-1, 2)
+            self._csr[rel] = _csr(n, arr)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(c.indices) for c in self._csr.values()) // 2
+
+    def _neighbors(self, i: int, rel: str) -> np.ndarray:
+        csr = self._csr.get(rel)
+        if csr is None:
+            return np.zeros(0, dtype=np.int32)
+        return csr.indices[csr.indptr[i]:csr.indptr[i + 1]]
+
+    def neighbors(self, doc_id: str, rels: Sequence[str] = REASONING_RELS) -> list[int]:
+        i = self._index.get(doc_id)
+        if i is None or not self.expandable[i]:
+            return []
+        return [int(j) for rel in rels for j in self._neighbors(i, rel)]
+
+    def expand(self, frontier: Sequence[str], seen: set[str],
+               rels: Sequence[str] = REASONING_RELS, limit: int = 180) -> list[Edge]:
+        """One BFS hop from the frontier, ranked like the live path (see
+        ``best_edges``). ``seen`` is updated in place."""
+        def edges() -> Iterator[Edge]:
+            for src in frontier:
+                i = self._index.get(src)
+                if i is None or not self.expandable[i]:
+                    continue
+                for rel in rels:
+                    for j in self._neighbors(i, rel).tolist():
+                        yield src, self.ids[j], self.titles[j] or "", rel
+
+        return best_edges(edges(), seen, limit)
+
+    def subgraph(self, doc_ids: Iterable[str],
+                 rels: Sequence[str] = REASONING_RELS) -> list[Edge]:
+        """Every edge among ``doc_ids`` (each undirected pair once per rel),
+        not just the BFS tree ``expand`` reported — the input to evidence
+        ranking."""
+        members = {self._index[d] for d in doc_ids if d in self._index}
+        out: list[Edge] = []
+        for i in sorted(members):
+            for rel in rels:
+                for j in self._neighbors(i, rel).tolist():
+                    if j > i and j in members and (self.expandable[i] or self.expandable[j]):
+                        out.append((self.ids[i], self.ids[j], self.titles[j] or "", rel))
+        return out
+
+    @classmethod
+    async def load(cls, graph) -> "PublicGraphSnapshot":
+        """Build from the live graph with builder reads (no LIMIT: this is the
+        batch path, run once per ingestion pass)."""
+        node_q = (PublicGraphQuery().match_labels("n", EXPANDABLE_LABELS)
+                  .returns("n.doc_id AS doc_id", "n.title AS title", "n.status AS status")
+                  .build())
+        edge_q = (PublicGraphQuery().match_labels("a", EXPANDABLE_LABELS)
+                  .match_hop("a", REASONING_RELS, "b", rel_alias="r")
+                  .returns("a.doc_id AS src", "b.doc_id AS dst", "b.title AS title",
+                           "b.status AS status", "type(r) AS rel")
+                  .build())
+        node_rows, edge_rows = await asyncio.gather(graph.read(node_q), graph.read(edge_q))
+
+        nodes: dict[str, tuple[str, str]] = {}
+        expandable: set[str] = set()
+        for r in node_rows:
+            if r.get("doc_id"):
+                nodes[r["doc_id"]] = (r.get("title") or "", r.get("status") or "")
+                expandable.add(r["doc_id"])
+        edges: dict[str, set[tuple[str, str]]] = {rel: set() for rel in REASONING_RELS}
+        for r in edge_rows:
+            src, dst, rel = r.get("src"), r.get("dst"), r.get("rel")
+            # Judge nodes carry no doc_id and are not frontier material.
+            if src and dst and rel in edges:
+                nodes.setdefault(dst, (r.get("title") or "", r.get("status") or ""))
+                edges[rel].add((src, dst))
+        return cls(nodes, expandable, edges)
+
+
+class PublicGraphCache:
+    """Holds the current snapshot; ``refresh()`` swaps in a rebuilt one and
+    keeps the previous snapshot if the rebuild fails."""
+
+    def __init__(self, graph) -> None:
+        self.graph = graph
+        self.current: Optional[PublicGraphSnapshot] = None
+
+    async def refresh(self) -> None:
+        t0 = time.perf_counter()
+        try:
+            snapshot = await PublicGraphSnapshot.load(self.graph)
+        except Exception:
+            log().exception("public graph snapshot rebuild failed; keeping the previous one")
+            return
+        self.current = snapshot
+        log().info("public graph snapshot: %d nodes, %d edges in %.0f ms",
+                   len(snapshot), snapshot.edge_count, (time.perf_counter() - t0) * 1000)
@@ -24,6 +24,7 @@ from ..logging_setup import log
 from .models import LegalDocument, RunReport
 from .pipeline import IngestionPipeline
 from .registry import all_crawlers, crawlers_for_schedule
+from .scheduler import PostRun
 
 Notifier = Callable[[LegalDocument, str], Awaitable[None]]
 
@@ -49,11 +50,15 @@ class AutoUpdateWatcher:
     SOURCE = "auto_update"
 
     def __init__(self, pool, pipeline: IngestionPipeline, cfg: Config,
-                 notifier: Optional[Notifier] = None) -> None:
+                 notifier: Optional[Notifier] = None, post_run: Optional[PostRun] = None) -> None:
         self.pool = pool
         self.pipeline = pipeline
         self.cfg = cfg
         self.notifier = notifier or _default_notifier
+        # The scheduler's post-run hook, given this run's reports whenever it
+        # ingested something, so derived data (judge profiles, cached
+        # completions, ...) follows watcher updates as it does corpus passes.
+        self.post_run = post_run
         self._task = None
         self._stopping = False
 
@@ -90,24 +95,28 @@ class AutoUpdateWatcher:
         registry = all_crawlers()
         owns_http = http is None
         client = http or httpx.AsyncClient(headers={"User-Agent": "Advocatus-watcher/1.0"})
+        reports: list[RunReport] = []
         try:
             for name in self._watched_sources():
                 crawler_cls = registry.get(name)
                 if crawler_cls is None:
                     continue
+                report = RunReport(source_type=name)
+                reports.append(report)
                 for doc in await self._fetch(crawler_cls(self.cfg), client):
                     try:
                         change = classify_change(doc, await self._existing_hash(doc.doc_id))
                         if change == "unchanged":
                             summary["unchanged"] += 1
                             continue
-                        await self.pipeline._ingest_doc(doc, RunReport(source_type=name))
+                        await self.pipeline._ingest_doc(doc, report)
                         summary[{"new": "new", "amends": "amended", "repeals": "repealed"}[change]].append(doc.doc_id)
                         if change in ("amends", "repeals"):
                             await self.notifier(doc, change)
                     except Exception as exc:
                         summary["errors"].append(f"{doc.doc_id}: {exc}")
                         log().exception("auto-update failed for %s", doc.doc_id)
+                await self.pipeline.flush_graph(summary["errors"])
         finally:
             if owns_http:
                 await client.aclose()
@@ -116,6 +125,11 @@ class AutoUpdateWatcher:
         log().info("auto-update run: new=%d amended=%d repealed=%d unchanged=%d errors=%d",
                    len(summary["new"]), len(summary["amended"]), len(summary["repealed"]),
                    summary["unchanged"], len(summary["errors"]))
+        if self.post_run is not None and any(r.changed_doc_ids for r in reports):
+            try:
+                await self.post_run(reports)
+            except Exception:
+                log().exception("auto-update post_run hook failed")
         return summary
 
     # -- scheduled loop -----------------------------------------------------
@@ -0,0 +1,113 @@
+"""In-memory resolver from extracted citation strings to public documents.
+
+Tenant ingestion used to run one ``title ILIKE '%needle%'`` scan of
+``public_documents`` per extracted act/case citation, so a filing citing 24
+authorities cost 24 sequential scans. The resolver instead loads the in-force
+titles once into a trigram index and answers all of a document's needles in a
+single call without touching Postgres.
+
+Matching keeps the ILIKE semantics — a needle resolves to current documents
+whose title contains it, case-insensitively — but candidates come from the
+posting list of the needle's rarest trigram and are then verified by substring,
+and ties prefer the shortest title (the closest match) instead of whatever row
+the scan met first.
+
+The index is rebuilt after each public ingestion pass (scheduler hook) and
+lazily once it is older than ``citation_resolver_ttl_seconds``, which covers
+auto-update runs and replicas that did not run the pass themselves.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from typing import Any, Optional, Sequence
+
+from .. import db as dbx
+from ..config import Config
+from ..logging_setup import log
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _norm(text: str) -> str:
+    return _WS_RE.sub(" ", (text or "").lower()).strip()
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TitleIndex:
+    """Immutable trigram index over normalized titles."""
+
+    def __init__(self, docs: Sequence[dict[str, Any]]) -> None:
+        # Shortest title first, so every posting list (and hence every
+        # result) is already in preference order.
+        self.docs = sorted(docs, key=lambda d: (len(d.get("title") or ""), d["doc_id"]))
+        self._titles = [_norm(d.get("title") or "") for d in self.docs]
+        postings: dict[str, list[int]] = {}
+        for i, title in enumerate(self._titles):
+            for gram in _trigrams(title):
+                postings.setdefault(gram, []).append(i)
+        self._postings = postings
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def lookup(self, needle: str, limit: int = 1) -> list[dict[str, Any]]:
+        n = _norm(needle)
+        if not n:
+            return []
+        grams = _trigrams(n)
+        if grams:
+            lists = [self._postings.get(g) for g in grams]
+            if any(lst is None for lst in lists):
+                return []
+            candidates = min(lists, key=len)
+        else:  # needle shorter than a trigram: plain scan
+            candidates = range(len(self._titles))
+        out: list[dict[str, Any]] = []
+        for i in candidates:
+            if n in self._titles[i]:
+                out.append(self.docs[i])
+                if len(out) >= limit:
+                    break
+        return out
+
+
+class CitationResolver:
+    def __init__(self, pool, cfg: Config) -> None:
+        self.pool = pool
+        self.ttl = cfg.citation_resolver_ttl_seconds
+        self._index: Optional[TitleIndex] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _stale(self) -> bool:
+        return self._index is None or time.monotonic() - self._loaded_at > self.ttl
+
+    async def _load(self) -> None:
+        docs = await dbx.current_public_titles(self.pool)
+        self._index = TitleIndex(docs)
+        self._loaded_at = time.monotonic()
+        log().info("citation resolver indexed %d public documents", len(docs))
+
+    async def refresh(self) -> int:
+        """Reload the in-force titles; returns the number indexed."""
+        async with self._lock:
+            await self._load()
+        return len(self._index)
+
+    async def _current(self) -> TitleIndex:
+        if self._stale():
+            async with self._lock:
+                if self._stale():  # another caller may have loaded meanwhile
+                    await self._load()
+        return self._index
+
+    async def resolve(self, needles: Sequence[str], limit: int = 1) -> dict[str, list[dict[str, Any]]]:
+        """All needles in one call: needle -> up to ``limit`` current public
+        documents whose title contains it."""
+        index = await self._current()
+        return {needle: index.lookup(needle, limit) for needle in dict.fromkeys(needles)}
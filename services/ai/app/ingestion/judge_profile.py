@@ -11,74 +11,159 @@ per-tenant slice of a judge's history is never mixed in here — that would put
 one firm's data on a node shared with its competitors. Tenant history is
 aggregated at query time inside the tenant partition (see app.judge).
 
-Runs periodically (wired to the ingestion scheduler), never per query.
+Runs periodically (wired to the ingestion scheduler), never per query. After
+a scheduled pass only the judges who AUTHORED a new or changed document are
+recomputed; a full recompute happens when what changed is unknown.
+
+The work is done in bulk: one graph read for every (judge, case) pair, one
+Postgres query per batch of cases for their leading text, outcome extraction
+(each case once, however many judges sat on it), and the RULED_ON edges and
+profile counters written back as UNWIND batches. Extraction runs in a process
+pool only when there is more than one batch of cases; the few cases of an
+incremental pass are aligned in a thread instead of paying for the pool's
+interpreters.
 """
 from __future__ import annotations
 
+import asyncio
+import functools
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence
+
 from .. import db as dbx
 from ..config import Config
 from ..graph import Graph, PublicGraphQuery
+from ..judge import JudgeContextCache
 from ..logging_setup import log
 from .extraction import extract_entities
 
 _ALIGN = {"won": "favored_plaintiff", "lost": "favored_defendant"}
+_CASE_LABELS = ("Judgment", "CaseLaw")
+_WRITE_ROWS = 5000  # rows per UNWIND statement
+
+# RULED_ON is a PUBLIC write — internal batch path only. The case label is
+# from _CASE_LABELS, never from data.
+_RULED_ON = """UNWIND $rows AS row
+MATCH (j:Judge:Public {{name: row.name}}), (c:{label}:Public {{doc_id: row.doc_id}})
+MERGE (j)-[r:RULED_ON]->(c)
+SET r.outcome_alignment = row.align"""
+_COUNTERS = """UNWIND $rows AS row
+MATCH (j:Judge:Public {name: row.name})
+SET j.rulings_count = row.n, j.favored_plaintiff = row.fp,
+    j.favored_defendant = row.fd, j.profile_updated = timestamp()"""
+
+
+def _alignments(cases: list[tuple[str, str]]) -> list[str]:
+    """Process-pool worker: outcome alignment of each (text, title) case."""
+    out = []
+    for text, title in cases:
+        entities = extract_entities(text or title, title)
+        out.append(_ALIGN.get(entities.outcome["result"], "unknown")
+                   if entities.outcome else "unknown")
+    return out
+
+
+def _chunks(rows: list, n: int):
+    for i in range(0, len(rows), n):
+        yield rows[i:i + n]
 
 
 class JudgeProfiler:
-    def __init__(self, pool, graph: Graph, cfg: Config) -> None:
+    def __init__(self, pool, graph: Graph, cfg: Config,
+                 judge_cache: Optional[JudgeContextCache] = None) -> None:
         self.pool = pool
         self.graph = graph
         self.cfg = cfg
+        self.judge_cache = judge_cache
 
-    async def recompute(self) -> int:
-        judges = await self.graph.read(
-            PublicGraphQuery().match("j", "Judge").returns("j.name AS name").limit(1000).build())
-        n = 0
-        for row in judges:
-            name = row.get("name")
-            if name:
-                try:
-                    await self._profile_one(name)
-                    n += 1
-                except Exception:
-                    log().exception("judge profile failed for %r", name)
-        log().info("judge profiler: recomputed %d public judge profile(s)", n)
-        return n
-
-    async def _profile_one(self, name: str) -> None:
-        cases: list[tuple[str, str, str]] = []  # (doc_id, title, label)
-        for label in ("Judgment", "CaseLaw"):
-            rows = await self.graph.read(
+    async def recompute(self, changed_doc_ids: Optional[Sequence[str]] = None) -> int:
+        """Recompute the profiles of the judges who authored
+        ``changed_doc_ids`` — none if it is empty — or of every judge when it
+        is None."""
+        if changed_doc_ids is None:
+            judges = await self.graph.read(
+                PublicGraphQuery().match("j", "Judge").returns("j.name AS name").build())
+        elif changed_doc_ids:
+            judges = await self.graph.read(
                 PublicGraphQuery()
-                .match("j", "Judge", name=name)
-                .match_rel("j", ["AUTHORED"], "c", label, direction="out")
-                .returns("c.doc_id AS doc_id", "c.title AS title")
-                .limit(300).build())
-            cases.extend((r["doc_id"], r.get("title") or "", label)
-                         for r in rows if r.get("doc_id"))
-
-        favored_plaintiff = favored_defendant = 0
-        for doc_id, title, label in cases:
-            text = await dbx.public_doc_text(self.pool, doc_id)
-            entities = extract_entities(text or title, title)
-            alignment = "unknown"
-            if entities.outcome:
-                alignment = _ALIGN.get(entities.outcome["result"], "unknown")
-                if alignment == "favored_plaintiff":
-                    favored_plaintiff += 1
-                elif alignment == "favored_defendant":
-                    favored_defendant += 1
-            # RULED_ON is a PUBLIC write — internal batch path only.
-            await self.graph._run_internal(
-                f"""MATCH (j:Judge:Public {{name: $name}}), (c:{label}:Public {{doc_id: $doc_id}})
-                    MERGE (j)-[r:RULED_ON]->(c)
-                    SET r.outcome_alignment = $align""",
-                {"name": name, "doc_id": doc_id, "align": alignment},
-            )
-
-        await self.graph._run_internal(
-            """MATCH (j:Judge:Public {name: $name})
-               SET j.rulings_count = $n, j.favored_plaintiff = $fp,
-                   j.favored_defendant = $fd, j.profile_updated = timestamp()""",
-            {"name": name, "n": len(cases), "fp": favored_plaintiff, "fd": favored_defendant},
-        )
+                .match_labels("c", _CASE_LABELS)
+                .where_in("c", "doc_id", list(dict.fromkeys(changed_doc_ids)))
+                .match_rel("c", ["AUTHORED"], "j", "Judge", direction="in")
+                .returns("j.name AS name").build())
+        else:
+            log().info("judge profiler: no new or changed documents; nothing to recompute")
+            return 0
+        names = [n for n in dict.fromkeys(row.get("name") for row in judges) if n]
+        if not names:
+            return 0
+        await self._profile(names, restrict=changed_doc_ids is not None)
+        if self.judge_cache is not None:
+            self.judge_cache.invalidate_public()
+        log().info("judge profiler: recomputed %d public judge profile(s)", len(names))
+        return len(names)
+
+    async def _profile(self, names: list[str], restrict: bool) -> None:
+        q = (PublicGraphQuery()
+             .match_labels("c", _CASE_LABELS)
+             .match_rel("c", ["AUTHORED"], "j", "Judge", direction="in"))
+        if restrict:
+            q = q.where_in("j", "name", names)
+        rows = await self.graph.read(
+            q.returns("j.name AS name", "c.doc_id AS doc_id", "c.title AS title",
+                      "labels(c) AS labels").build())
+
+        cases: dict[str, tuple[str, str]] = {}  # doc_id -> (title, label)
+        authors: dict[str, list[str]] = defaultdict(list)
+        for r in rows:
+            doc_id, name = r.get("doc_id"), r.get("name")
+            label = next((lb for lb in _CASE_LABELS if lb in (r.get("labels") or ())), None)
+            if doc_id and name and label:
+                cases.setdefault(doc_id, (r.get("title") or "", label))
+                authors[doc_id].append(name)
+
+        counts = {name: {"name": name, "n": 0, "fp": 0, "fd": 0} for name in names}
+        workers = max(1, self.cfg.judge_profile_workers)
+        batch_cases = max(1, self.cfg.judge_profile_batch_cases)
+        # spawn, not fork: the server process runs gRPC/driver threads.
+        executor = (ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+                    if workers > 1 and len(cases) > batch_cases else None)
+        try:
+            for batch in _chunks(list(cases), batch_cases):
+                texts = await dbx.public_docs_text(self.pool, batch)
+                aligned = await self._align(
+                    [(texts.get(d, ""), cases[d][0]) for d in batch], executor, workers)
+                edges: dict[str, list[dict]] = defaultdict(list)
+                for doc_id, alignment in zip(batch, aligned):
+                    for name in authors[doc_id]:
+                        edges[cases[doc_id][1]].append(
+                            {"name": name, "doc_id": doc_id, "align": alignment})
+                        c = counts.setdefault(name, {"name": name, "n": 0, "fp": 0, "fd": 0})
+                        c["n"] += 1
+                        c["fp"] += alignment == "favored_plaintiff"
+                        c["fd"] += alignment == "favored_defendant"
+                if edges:
+                    await self.graph._run_internal_batch([
+                        (_RULED_ON.format(label=label), {"rows": part})
+                        for label, label_rows in edges.items()
+                        for part in _chunks(label_rows, _WRITE_ROWS)])
+        finally:
+            if executor is not None:
+                # shutdown() joins the workers: keep that off the event loop.
+                await asyncio.get_running_loop().run_in_executor(
+                    None, functools.partial(executor.shutdown, cancel_futures=True))
+        await self.graph._run_internal_batch(
+            [(_COUNTERS, {"rows": part}) for part in _chunks(list(counts.values()), _WRITE_ROWS)])
+
+    @staticmethod
+    async def _align(cases: list[tuple[str, str]], executor: Optional[ProcessPoolExecutor],
+                     workers: int) -> list[str]:
+        if executor is None:
+            return await asyncio.to_thread(_alignments, cases)
+        loop = asyncio.get_running_loop()
+        step = max(1, -(-len(cases) // workers))
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(executor, _alignments, cases[i:i + step])
+            for i in range(0, len(cases), step)))
+        return [a for part in parts for a in part]
@@ -58,3 +58,6 @@ class RunReport:
     superseded_docs: int = 0
     unchanged_docs: int = 0
     errors: list[str] = field(default_factory=list)
+    # doc_ids written this run (new documents and new versions) — what
+    # derived data such as judge profiles needs to revisit.
+    changed_doc_ids: list[str] = field(default_factory=list)
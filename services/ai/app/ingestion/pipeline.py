@@ -27,6 +27,7 @@ from ..chunking import chunk_text
 from ..config import Config
 from ..db import vec_literal
 from ..embeddings import EmbeddingProvider
+from ..graph.builders import ALLOWED_PUBLIC_LABELS, ALLOWED_RELS, GraphQueryError
 from ..graph.client import Graph
 from ..logging_setup import log
 from .models import LegalDocument, RunReport
@@ -52,77 +53,215 @@ _STATUS_FOR_REL = {"AMENDS": "amended", "REPEALS": "repealed", "OVERTURNS": "ove
 _REPEALING_RELS = {"REPEALS", "SUPERSEDED_BY"}
 
 
+_PUBLIC_LINK_RELS = frozenset({"AMENDS", "REPEALS", "OVERTURNS", "DISTINGUISHES", "CITES",
+                               "INTERPRETS", "SUPERSEDED_BY"})
+
+
+def _check_public_label(label: str) -> str:
+    if label not in ALLOWED_PUBLIC_LABELS:
+        raise GraphQueryError(f"label {label!r} not allowed on public graph")
+    return label
+
+
+def _check_public_rel(rel_type: str) -> str:
+    if rel_type not in _PUBLIC_LINK_RELS or rel_type not in ALLOWED_RELS:
+        raise ValueError(f"relation {rel_type} not allowed on public graph")
+    return rel_type
+
+
+class _DocOps:
+    """One document's buffered graph mutations."""
+
+    def __init__(self) -> None:
+        self.renames: list[dict] = []
+        self.nodes: dict[str, list[dict]] = {}
+        self.authored: dict[str, list[dict]] = {}
+        self.opinions: dict[str, list[dict]] = {}
+        self.statuses: list[dict] = []
+        self.repeals: list[dict] = []
+        self.links: dict[str, list[dict]] = {}
+
+
 class PublicCorpusWriter:
     """The ONLY component allowed to write to the public law graph. It lives
     in the batch pipeline; request-path modules import the read-only
-    PublicGraphQuery instead."""
+    PublicGraphQuery instead.
+
+    Mutations are buffered and written by ``flush()`` as a handful of
+    parameterized ``UNWIND $rows`` statements — one per label / relationship
+    type — in a single transaction, instead of one session per node and edge.
+    Labels and relationship types are checked against the public allowlists
+    both when queued and again when interpolated at flush time. A flush applies
+    the buffer phase by phase (renames, nodes, judges, opinions, statuses,
+    repeal stamps, edges), so archived versions are renamed before their
+    successor is merged and every edge's endpoints exist before it is linked.
+
+    Mutations queued after ``begin(doc_id)`` belong to that document, so a
+    batch that fails can be retried document by document. Every statement is
+    idempotent (MERGE, SET, and a rename guarded by the archived version), so
+    writing a document twice is harmless.
+    """
 
     def __init__(self, graph: Graph) -> None:
         self._graph = graph
+        self._reset()
+
+    def _reset(self) -> None:
+        self._docs: dict[Optional[str], _DocOps] = {}
+        self._current: Optional[str] = None
+        self.pending_docs = 0
+
+    def begin(self, doc_id: str) -> None:
+        """Attribute the mutations queued from here on to ``doc_id``."""
+        self._current = doc_id
+
+    def pending_doc_ids(self) -> list[str]:
+        return [d for d in self._docs if d is not None]
+
+    def _ops(self) -> _DocOps:
+        ops = self._docs.get(self._current)
+        if ops is None:
+            ops = self._docs[self._current] = _DocOps()
+        return ops
 
     async def upsert_document(self, doc: LegalDocument) -> None:
-        label = _LABELS.get(doc.doc_type, "Statute")
-        await self._graph._run_internal(
-            f"""MERGE (d:{label}:Public {{doc_id: $doc_id}})
-                SET d.title = $title, d.status = $status, d.version = $version,
-                    d.citation = $citation, d.court = $court, d.year = $year,
-                    d.source_url = $source_url, d.doc_type = $doc_type,
-                    d.effective_date = $effective_date, d.repealed_date = $repealed_date""",
+        label = _check_public_label(_LABELS.get(doc.doc_type, "Statute"))
+        ops = self._ops()
+        ops.nodes.setdefault(label, []).append(
             {"doc_id": doc.doc_id, "title": doc.title, "status": doc.status,
              "version": doc.version, "citation": doc.citation, "court": doc.court,
              "year": doc.year, "source_url": doc.source_url, "doc_type": doc.doc_type,
-             "effective_date": doc.effective_date, "repealed_date": doc.repealed_date},
-        )
+             "effective_date": doc.effective_date, "repealed_date": doc.repealed_date})
         # Bench composition + per-judge opinions as first-class nodes.
-        for judge in doc.authored_by:
-            await self._graph._run_internal(
-                f"""MATCH (d:{label}:Public {{doc_id: $doc_id}})
-                    MERGE (j:Judge:Public {{name: $judge}})
-                    MERGE (j)-[:AUTHORED]->(d)""",
-                {"doc_id": doc.doc_id, "judge": judge},
-            )
-        for i, op in enumerate(doc.opinions):
-            op_id = f"{doc.doc_id}#opinion-{i}-{op.kind}"
-            await self._graph._run_internal(
-                f"""MATCH (d:{label}:Public {{doc_id: $doc_id}})
-                    MERGE (o:Opinion:Public {{doc_id: $op_id}})
-                    SET o.kind = $kind, o.judge = $judge, o.title = $title,
-                        o.status = d.status, o.doc_type = 'opinion'
-                    MERGE (o)-[:PART_OF]->(d)
-                    MERGE (j:Judge:Public {{name: $judge}})
-                    MERGE (j)-[:AUTHORED]->(o)""",
-                {"doc_id": doc.doc_id, "op_id": op_id, "kind": op.kind,
-                 "judge": op.judge, "title": f"{op.kind.title()} opinion of {op.judge} in {doc.title}"},
-            )
+        ops.authored.setdefault(label, []).extend(
+            {"doc_id": doc.doc_id, "judge": judge} for judge in doc.authored_by)
+        ops.opinions.setdefault(label, []).extend(
+            {"doc_id": doc.doc_id, "op_id": f"{doc.doc_id}#opinion-{i}-{op.kind}",
+             "kind": op.kind, "judge": op.judge,
+             "title": f"{op.kind.title()} opinion of {op.judge} in {doc.title}"}
+            for i, op in enumerate(doc.opinions))
+        self.pending_docs += 1
 
     async def set_repealed(self, doc_id: str, repealed_on: str) -> None:
         """Date-stamp a node as no longer in force (graph side)."""
-        await self._graph._run_internal(
-            "MATCH (d:Public {doc_id: $doc_id}) SET d.repealed_date = $on",
-            {"doc_id": doc_id, "on": repealed_on},
-        )
+        self._ops().repeals.append({"doc_id": doc_id, "on": repealed_on})
 
     async def link(self, src_doc_id: str, rel_type: str, dst_doc_id: str) -> None:
-        if rel_type not in ("AMENDS", "REPEALS", "OVERTURNS", "DISTINGUISHES", "CITES",
-                            "INTERPRETS", "SUPERSEDED_BY"):
-            raise ValueError(f"relation {rel_type} not allowed on public graph")
-        await self._graph._run_internal(
-            f"""MATCH (a:Public {{doc_id: $src}}), (b:Public {{doc_id: $dst}})
-                MERGE (a)-[:{rel_type}]->(b)""",
-            {"src": src_doc_id, "dst": dst_doc_id},
-        )
+        self._ops().links.setdefault(_check_public_rel(rel_type), []).append(
+            {"src": src_doc_id, "dst": dst_doc_id})
 
     async def set_status(self, doc_id: str, status: str) -> None:
-        await self._graph._run_internal(
-            "MATCH (d:Public {doc_id: $doc_id}) SET d.status = $status",
-            {"doc_id": doc_id, "status": status},
-        )
+        self._ops().statuses.append({"doc_id": doc_id, "status": status})
 
-    async def rename(self, old_doc_id: str, new_doc_id: str) -> None:
-        await self._graph._run_internal(
-            "MATCH (d:Public {doc_id: $old}) SET d.doc_id = $new",
-            {"old": old_doc_id, "new": new_doc_id},
-        )
+    async def rename(self, old_doc_id: str, new_doc_id: str, version: Optional[int] = None) -> None:
+        """Move ``old_doc_id`` to ``new_doc_id``; with ``version``, only the
+        node still at that version is renamed, so a replay cannot rename the
+        successor."""
+        self._ops().renames.append({"old": old_doc_id, "new": new_doc_id, "version": version})
+
+    def _statements(self, docs: Optional[list[_DocOps]] = None) -> list[tuple[str, dict]]:
+        docs = list(self._docs.values()) if docs is None else docs
+        return self._node_statements(docs) + self._edge_statements(docs)
+
+    @staticmethod
+    def _merged(docs: list[_DocOps], attr: str) -> dict[str, list[dict]]:
+        merged: dict[str, list[dict]] = {}
+        for ops in docs:
+            for key, rows in getattr(ops, attr).items():
+                merged.setdefault(key, []).extend(rows)
+        return merged
+
+    def _node_statements(self, docs: list[_DocOps]) -> list[tuple[str, dict]]:
+        stmts: list[tuple[str, dict]] = []
+        renames = [r for ops in docs for r in ops.renames]
+        if renames:
+            stmts.append(("""UNWIND $rows AS row
+                             MATCH (d:Public {doc_id: row.old})
+                             WHERE row.version IS NULL OR d.version = row.version
+                             SET d.doc_id = row.new""",
+                          {"rows": renames}))
+        for label, rows in self._merged(docs, "nodes").items():
+            stmts.append((f"""UNWIND $rows AS row
+                MERGE (d:{_check_public_label(label)}:Public {{doc_id: row.doc_id}})
+                SET d.title = row.title, d.status = row.status, d.version = row.version,
+                    d.citation = row.citation, d.court = row.court, d.year = row.year,
+                    d.source_url = row.source_url, d.doc_type = row.doc_type,
+                    d.effective_date = row.effective_date, d.repealed_date = row.repealed_date""",
+                          {"rows": rows}))
+        for label, rows in self._merged(docs, "authored").items():
+            if rows:
+                stmts.append((f"""UNWIND $rows AS row
+                    MATCH (d:{_check_public_label(label)}:Public {{doc_id: row.doc_id}})
+                    MERGE (j:Judge:Public {{name: row.judge}})
+                    MERGE (j)-[:AUTHORED]->(d)""", {"rows": rows}))
+        for label, rows in self._merged(docs, "opinions").items():
+            if rows:
+                stmts.append((f"""UNWIND $rows AS row
+                    MATCH (d:{_check_public_label(label)}:Public {{doc_id: row.doc_id}})
+                    MERGE (o:Opinion:Public {{doc_id: row.op_id}})
+                    SET o.kind = row.kind, o.judge = row.judge, o.title = row.title,
+                        o.status = d.status, o.doc_type = 'opinion'
+                    MERGE (o)-[:PART_OF]->(d)
+                    MERGE (j:Judge:Public {{name: row.judge}})
+                    MERGE (j)-[:AUTHORED]->(o)""", {"rows": rows}))
+        statuses = [r for ops in docs for r in ops.statuses]
+        if statuses:
+            stmts.append(("""UNWIND $rows AS row
+                             MATCH (d:Public {doc_id: row.doc_id}) SET d.status = row.status""",
+                          {"rows": statuses}))
+        repeals = [r for ops in docs for r in ops.repeals]
+        if repeals:
+            stmts.append(("""UNWIND $rows AS row
+                             MATCH (d:Public {doc_id: row.doc_id}) SET d.repealed_date = row.on""",
+                          {"rows": repeals}))
+        return stmts
+
+    def _edge_statements(self, docs: list[_DocOps]) -> list[tuple[str, dict]]:
+        return [(f"""UNWIND $rows AS row
+                MATCH (a:Public {{doc_id: row.src}}), (b:Public {{doc_id: row.dst}})
+                MERGE (a)-[:{_check_public_rel(rel_type)}]->(b)""", {"rows": rows})
+                for rel_type, rows in self._merged(docs, "links").items()]
+
+    async def flush(self) -> list[str]:
+        """Write everything buffered; returns the ids of the documents whose
+        mutations could not be written (empty when the batch went through).
+
+        The batch is tried as one transaction. If that fails, each document
+        is written in its own transaction, then the edges of every document
+        written are linked once more, since an edge whose endpoint came later
+        in the batch matched nothing the first time. The buffer is cleared
+        either way; callers keep the failed documents pending themselves."""
+        docs = self._docs
+        self._reset()
+        stmts = self._statements(list(docs.values()))
+        if not stmts:
+            return []
+        try:
+            await self._graph._run_internal_batch(stmts)
+            return []
+        except Exception as exc:
+            if len(docs) == 1:
+                log().warning("public graph batch failed: %s", exc)
+                return [d for d in docs if d is not None]
+            log().warning("public graph batch of %d documents failed (%s); writing them one by one",
+                          len(docs), exc)
+        failed: list[Optional[str]] = []
+        for doc_id, ops in docs.items():
+            try:
+                await self._graph._run_internal_batch(self._statements([ops]))
+            except Exception as exc:
+                failed.append(doc_id)
+                log().warning("public graph write failed for %s: %s", doc_id, exc)
+        for doc_id, ops in docs.items():
+            edges = self._edge_statements([ops])
+            if doc_id in failed or not edges:
+                continue
+            try:
+                await self._graph._run_internal_batch(edges)
+            except Exception as exc:
+                failed.append(doc_id)
+                log().warning("public graph edges failed for %s: %s", doc_id, exc)
+        return [d for d in failed if d is not None]
 
 
 class IngestionPipeline:
@@ -160,77 +299,73 @@ class IngestionPipeline:
                     except Exception as exc:
                         report.errors.append(f"{doc.doc_id}: {exc}")
                         log().exception("ingest failed for %s", doc.doc_id)
+                    if self.writer.pending_docs >= self.cfg.ingest_graph_batch_docs:
+                        await self.flush_graph(report.errors)
+                await self.flush_graph(report.errors)
                 await self._record_run(report)
                 reports.append(report)
         return reports
 
+    async def flush_graph(self, errors: list[str]) -> None:
+        """Write the buffered graph mutations; a failed write is reported on
+        the run rather than aborting it (Postgres already holds the rows).
+        Rows are stored with ``graph_pending`` set and it is cleared only
+        once their document reaches the graph, so a document whose write
+        failed is queued again by the next run although its hash is
+        unchanged."""
+        doc_ids = self.writer.pending_doc_ids()
+        try:
+            failed = set(await self.writer.flush())
+            if failed:
+                errors.append(f"graph write failed for {len(failed)} document(s): "
+                              + ", ".join(sorted(failed)))
+            written = [d for d in doc_ids if d not in failed]
+            if written:
+                async with self.pool.acquire() as conn:
+                    await conn.execute(
+                        """UPDATE public.public_documents SET graph_pending = false
+                           WHERE doc_id = ANY($1::text[])""",
+                        written,
+                    )
+        except Exception as exc:
+            errors.append(f"graph flush failed: {exc}")
+            log().exception("public graph flush failed")
+
     async def _ingest_doc(self, doc: LegalDocument, report: RunReport) -> None:
         new_hash = doc.content_hash
         async with self.pool.acquire() as conn:
             row = await conn.fetchrow(
-                "SELECT content_hash, version, status FROM public.public_documents WHERE doc_id = $1",
+                """SELECT content_hash, version, status, graph_pending
+                   FROM public.public_documents WHERE doc_id = $1""",
                 doc.doc_id,
             )
-            if row and row["content_hash"] == new_hash:
-                report.unchanged_docs += 1
-                return
-
             # The new version's effective date is when the prior version stops
             # being in force (defaults to today if the source gave no date).
             repeal_on = doc.effective_date or date.today().isoformat()
+            replay = bool(row) and row["content_hash"] == new_hash
+            if replay and not row["graph_pending"]:
+                report.unchanged_docs += 1
+                return
+            if replay:
+                # Stored, but its graph write failed: queue the graph side again.
+                doc.version = row["version"]
+                prior_version = doc.version - 1 if doc.version > 1 else None
+            else:
+                prior_version = row["version"] if row else None
+                await self._store_doc(conn, doc, new_hash, repeal_on, prior_version)
+                if row:
+                    report.superseded_docs += 1
 
-            if row:  # content changed -> version the prior node, never overwrite
-                old_version = row["version"]
-                archived_id = f"{doc.doc_id}@v{old_version}"
-                await conn.execute(
-                    """UPDATE public.public_documents
-                       SET doc_id = $2, status = 'superseded', repealed_date = $3
-                       WHERE doc_id = $1""",
-                    doc.doc_id, archived_id, _to_date(repeal_on),
-                )
-                await conn.execute(
-                    "UPDATE public.public_vectors SET doc_id = $2 WHERE doc_id = $1",
-                    doc.doc_id, archived_id,
-                )
-                await self.writer.rename(doc.doc_id, archived_id)
-                await self.writer.set_status(archived_id, "superseded")
-                await self.writer.set_repealed(archived_id, repeal_on)
-                doc.version = old_version + 1
-                report.superseded_docs += 1
-
-            await conn.execute(
-                """INSERT INTO public.public_documents
-                     (doc_id, title, doc_type, source_url, court, citation, year,
-                      status, version, content_hash, authored_by, metadata, full_text,
-                      effective_date, repealed_date)
-                   VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11::jsonb,$12::jsonb,$13,$14,$15)""",
-                doc.doc_id, doc.title, doc.doc_type, doc.source_url, doc.court,
-                doc.citation, doc.year, doc.status, doc.version, new_hash,
-                json.dumps(doc.authored_by), json.dumps(doc.metadata), doc.full_text,
-                _to_date(doc.effective_date), _to_date(doc.repealed_date),
-            )
-
-            # Vectors: opinions are embedded as their own chunks so a dissent
-            # is retrievable independently of the majority holding.
-            texts = chunk_text(doc.full_text)
-            metas = [{"kind": "body"}] * len(texts)
-            for op in doc.opinions:
-                texts.append(f"{op.kind.upper()} opinion of {op.judge} in {doc.title}:\n{op.text}")
-                metas.append({"kind": "opinion", "judge": op.judge, "opinion_kind": op.kind})
-            if texts:
-                embeddings = await self.embedder.embed(texts)
-                await conn.executemany(
-                    """INSERT INTO public.public_vectors (doc_id, chunk_index, chunk_text, embedding, metadata)
-                       VALUES ($1,$2,$3,$4::vector,$5::jsonb)""",
-                    [(doc.doc_id, i, t, vec_literal(e), json.dumps(m))
-                     for i, (t, e, m) in enumerate(zip(texts, embeddings, metas))],
-                )
-
-        # Graph node + explicit treatment edges. The archived prior version
-        # gets a SUPERSEDED_BY edge to the new node.
+        # Graph node + explicit treatment edges. The archived prior version is
+        # renamed, marked superseded and gets a SUPERSEDED_BY edge to the new node.
+        self.writer.begin(doc.doc_id)
+        if prior_version is not None:
+            archived_id = f"{doc.doc_id}@v{prior_version}"
+            await self.writer.rename(doc.doc_id, archived_id, prior_version)
+            await self.writer.set_status(archived_id, "superseded")
+            await self.writer.set_repealed(archived_id, repeal_on)
         await self.writer.upsert_document(doc)
-        if row:
-            archived_id = f"{doc.doc_id}@v{row['version']}"
+        if prior_version is not None:
             await self.writer.link(archived_id, "SUPERSEDED_BY", doc.doc_id)
         for rel in doc.relations:
             try:
@@ -251,11 +386,59 @@ class IngestionPipeline:
                         )
                     if stamp is not None:
                         await self.writer.set_repealed(rel.target_doc_id, repeal_on)
-                if rel.rel_type == "AMENDS":
+                if rel.rel_type == "AMENDS" and not replay:
                     report.amended_docs += 1
             except Exception as exc:
                 report.errors.append(f"edge {doc.doc_id}-{rel.rel_type}->{rel.target_doc_id}: {exc}")
-        report.new_docs += 1
+        if not replay:
+            report.new_docs += 1
+        report.changed_doc_ids.append(doc.doc_id)
+
+    async def _store_doc(self, conn, doc: LegalDocument, new_hash: str, repeal_on: str,
+                         prior_version: Optional[int]) -> None:
+        """Postgres side of a new or changed document: archive the prior
+        version's rows (never overwrite), then insert the row and vectors."""
+        if prior_version is not None:
+            archived_id = f"{doc.doc_id}@v{prior_version}"
+            await conn.execute(
+                """UPDATE public.public_documents
+                   SET doc_id = $2, status = 'superseded', repealed_date = $3
+                   WHERE doc_id = $1""",
+                doc.doc_id, archived_id, _to_date(repeal_on),
+            )
+            await conn.execute(
+                "UPDATE public.public_vectors SET doc_id = $2 WHERE doc_id = $1",
+                doc.doc_id, archived_id,
+            )
+            doc.version = prior_version + 1
+
+        await conn.execute(
+            """INSERT INTO public.public_documents
+                 (doc_id, title, doc_type, source_url, court, citation, year,
+                  status, version, content_hash, authored_by, metadata, full_text,
+                  effective_date, repealed_date, graph_pending)
+               VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11::jsonb,$12::jsonb,$13,$14,$15,true)""",
+            doc.doc_id, doc.title, doc.doc_type, doc.source_url, doc.court,
+            doc.citation, doc.year, doc.status, doc.version, new_hash,
+            json.dumps(doc.authored_by), json.dumps(doc.metadata), doc.full_text,
+            _to_date(doc.effective_date), _to_date(doc.repealed_date),
+        )
+
+        # Vectors: opinions are embedded as their own chunks so a dissent
+        # is retrievable independently of the majority holding.
+        texts = chunk_text(doc.full_text)
+        metas = [{"kind": "body"}] * len(texts)
+        for op in doc.opinions:
+            texts.append(f"{op.kind.upper()} opinion of {op.judge} in {doc.title}:\n{op.text}")
+            metas.append({"kind": "opinion", "judge": op.judge, "opinion_kind": op.kind})
+        if texts:
+            embeddings = await self.embedder.embed(texts)
+            await conn.executemany(
+                """INSERT INTO public.public_vectors (doc_id, chunk_index, chunk_text, embedding, metadata)
+                   VALUES ($1,$2,$3,$4::vector,$5::jsonb)""",
+                [(doc.doc_id, i, t, vec_literal(e), json.dumps(m))
+                 for i, (t, e, m) in enumerate(zip(texts, embeddings, metas))],
+            )
 
     async def _record_run(self, report: RunReport) -> None:
         async with self.pool.acquire() as conn:
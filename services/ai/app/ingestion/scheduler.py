@@ -9,35 +9,61 @@ from typing import Awaitable, Callable, Optional
 
 from ..config import Config
 from ..logging_setup import log
+from .models import RunReport
 from .pipeline import IngestionPipeline
 from .registry import crawlers_for_schedule
 
+PostRun = Callable[[Optional[list[RunReport]]], Awaitable[None]]
+
+
+class PostRunSteps:
+    """A post-run hook made of named steps, run in order. Each step is
+    isolated: one that raises is logged and the rest still run, so a failed
+    citation refresh cannot leave stale judge profiles or cached answers
+    behind."""
+
+    def __init__(self) -> None:
+        self._steps: list[tuple[str, PostRun]] = []
+
+    def add(self, name: str, step: PostRun) -> None:
+        self._steps.append((name, step))
+
+    async def __call__(self, reports: Optional[list[RunReport]]) -> None:
+        for name, step in self._steps:
+            try:
+                await step(reports)
+            except Exception:
+                log().exception("post-run step %s failed", name)
+
 
 class IngestionScheduler:
     def __init__(self, pipeline: IngestionPipeline, cfg: Config,
-                 post_run: Optional[Callable[[], Awaitable[None]]] = None) -> None:
+                 post_run: Optional[PostRun] = None) -> None:
         self.pipeline = pipeline
         self.cfg = cfg
         # Optional hook run after each ingestion pass (e.g. judge-profile
         # recompute) so derived data stays in sync with freshly ingested law.
+        # It gets the pass's reports, or None when the pass failed and what
+        # changed is unknown.
         self.post_run = post_run
         self._tasks: list[asyncio.Task] = []
 
-    async def _run_post(self) -> None:
+    async def _run_post(self, reports: Optional[list[RunReport]]) -> None:
         if self.post_run is None:
             return
         try:
-            await self.post_run()
+            await self.post_run(reports)
         except Exception:
             log().exception("scheduler post_run hook failed")
 
     async def start(self) -> None:
         if self.cfg.ingest_on_start:
+            reports: Optional[list[RunReport]] = None
             try:
-                await self.pipeline.run()  # initial full pass populates fresh deployments
+                reports = await self.pipeline.run()  # initial full pass populates fresh deployments
             except Exception:
                 log().exception("initial corpus ingestion failed")
-            await self._run_post()
+            await self._run_post(reports)
         self._tasks = [
             asyncio.create_task(self._loop("daily", self.cfg.ingest_daily_seconds)),
             asyncio.create_task(self._loop("weekly", self.cfg.ingest_weekly_seconds)),
@@ -54,7 +80,7 @@ class IngestionScheduler:
         while True:
             await asyncio.sleep(interval)
             try:
-                await self.pipeline.run(source_types=names)
-                await self._run_post()
+                reports = await self.pipeline.run(source_types=names)
+                await self._run_post(reports)
             except Exception:
                 log().exception("scheduled ingestion (%s) failed", schedule)
@@ -19,25 +19,43 @@ from .. import db as dbx
 from ..chunking import chunk_text
 from ..config import Config
 from ..embeddings import EmbeddingProvider
-from ..graph import Graph, TenantScopedGraphQuery
+from ..graph import Graph, GraphQuery, RowField, TenantScopedGraphQuery
+from ..judge import FAVORABLE_RESULTS, JudgeContextCache
+from ..llm_cache import CompletionCache
 from ..logging_setup import log
 from ..transcription import TranscriptionProvider, is_audio, make_transcriber
+from .citations import CitationResolver
 from .extraction import ExtractedEntities, classify_doc_kind, extract_entities
 
 
 def _slug(value: str) -> str:
     s = re.sub(r"[^a-z0-9]+", "-", (value or "").lower()).strip("-")
     return s[:80] or "unknown"
+
+
+def _matter_key(matter_id: Optional[str], entities: ExtractedEntities) -> Optional[str]:
+    """Explicit matter_id wins, else a stable key from the case reference so
+    repeat filings land on the same Matter."""
+    return matter_id or (_slug(entities.case_ref) if entities.case_ref else None)
 # NOTE: citation/entity regexes now live in extraction.py (single source).
 
 
 class TenantIngestor:
     def __init__(self, pool: asyncpg.Pool, graph: Graph, embedder: EmbeddingProvider, cfg: Config,
-                 transcriber: Optional[TranscriptionProvider] = None) -> None:
+                 transcriber: Optional[TranscriptionProvider] = None,
+                 citations: Optional[CitationResolver] = None,
+                 judge_cache: Optional[JudgeContextCache] = None,
+                 completion_cache: Optional[CompletionCache] = None) -> None:
         self.pool = pool
         self.graph = graph
         self.embedder = embedder
         self.cfg = cfg
+        self.citations = citations or CitationResolver(pool, cfg)
+        # Judge-aware retrieval caches this tenant's judge patterns; filings
+        # and erasures change them.
+        self.judge_cache = judge_cache
+        # Cached answers in this tenant's partition may rest on what changed.
+        self.completion_cache = completion_cache
         # Audio documents (client-conversation recordings) are transcribed to
         # text before the normal chunk/embed/graph pipeline runs.
         self.transcriber = transcriber or make_transcriber(cfg)
@@ -115,56 +133,68 @@ class TenantIngestor:
 
         yield ("GRAPHING", "updating tenant knowledge graph", 80)
         entities = extract_entities(text, filename)
-        await self._graph_upsert(tenant_id, document_id, filename, matter_id, entities)
+        queries = await self._graph_upsert(tenant_id, document_id, filename, matter_id, entities)
 
         doc_kind = classify_doc_kind(filename, text)
         if doc_kind in ("submission", "ruling"):
             yield ("GRAPHING", "linking advocate / matter / judge / outcome", 90)
-            await self._graph_upsert_submission(
+            queries += await self._graph_upsert_submission(
                 tenant_id, document_id, filename, matter_id, entities)
+        # The whole graph stage is one transaction: one round trip, and a
+        # failure leaves no half-linked document behind.
+        await self.graph.write_many(queries)
+        if doc_kind in ("submission", "ruling"):
+            await self._record_judge_matter(tenant_id, document_id, matter_id, entities)
+        if self.judge_cache is not None and doc_kind in ("submission", "ruling"):
+            # A filing naming no judge can still feed a cached pattern through
+            # its matter, so it drops all of the tenant's entries.
+            self.judge_cache.invalidate_tenant(tenant_id, entities.judge_name or None)
+        if self.completion_cache is not None:
+            self.completion_cache.invalidate(tenant_id)
 
         yield ("DONE", f"ingested {len(chunks)} chunk(s) [{doc_kind}]", 100)
 
     async def _graph_upsert(self, tenant_id: str, document_id: str, filename: str,
-                            matter_id: Optional[str], entities: ExtractedEntities) -> None:
-        q = (TenantScopedGraphQuery(tenant_id)
-             .merge_node("d", "Document", {"id": document_id}, {"filename": filename})
-             .build())
-        await self.graph.write(q)
+                            matter_id: Optional[str], entities: ExtractedEntities) -> list[GraphQuery]:
+        """Queries for the Document node, its Matter link and its CITES edges."""
+        queries = [TenantScopedGraphQuery(tenant_id)
+                   .merge_node("d", "Document", {"id": document_id}, {"filename": filename})
+                   .build()]
 
         if matter_id:
-            q = (TenantScopedGraphQuery(tenant_id)
-                 .merge_node("m", "Matter", {"id": matter_id})
-                 .merge_node("d", "Document", {"id": document_id})
-                 .merge_rel("m", "LINKED_TO", "d")
-                 .build())
-            await self.graph.write(q)
+            queries.append(TenantScopedGraphQuery(tenant_id)
+                           .merge_node("m", "Matter", {"id": matter_id})
+                           .merge_node("d", "Document", {"id": document_id})
+                           .merge_rel("m", "LINKED_TO", "d")
+                           .build())
 
         # Cross-partition CITES edges: tenant Document -> public authority.
-        await self._link_citations(tenant_id, "d", "Document", document_id, entities)
+        queries += await self._link_citations(tenant_id, "d", "Document", document_id, entities)
+        return queries
 
     async def _link_citations(self, tenant_id: str, alias: str, label: str,
-                              node_id: str, entities: ExtractedEntities) -> None:
-        """MERGE CITES edges from a tenant node (Document or Submission) to the
-        public authorities it references. Public nodes are only ever matched,
-        never written, from tenant scope."""
-        for needle in entities.act_citations + entities.case_citations:
-            rows = await dbx.find_public_docs_by_title(self.pool, needle, limit=1)
+                              node_id: str, entities: ExtractedEntities) -> list[GraphQuery]:
+        """CITES edges from a tenant node (Document or Submission) to the
+        public authorities it references — one UNWIND query per public label.
+        Public nodes are only ever matched, never written, from tenant scope;
+        an authority missing from the graph simply yields no edge."""
+        targets: dict[str, dict[str, None]] = {}
+        resolved = await self.citations.resolve(entities.act_citations + entities.case_citations)
+        for rows in resolved.values():
             for r in rows:
                 public_label = "Statute" if r["doc_type"] in ("statute", "constitution") else "CaseLaw"
-                q = (TenantScopedGraphQuery(tenant_id)
-                     .merge_node(alias, label, {"id": node_id})
-                     .match_public("s", public_label, doc_id=r["doc_id"])
-                     .merge_rel(alias, "CITES", "s")
-                     .build())
-                try:
-                    await self.graph.write(q)
-                except Exception as exc:
-                    log().warning("cites edge failed for %s: %s", r["doc_id"], exc)
+                targets.setdefault(public_label, {})[r["doc_id"]] = None
+        return [TenantScopedGraphQuery(tenant_id)
+                .unwind([{"doc_id": doc_id} for doc_id in doc_ids])
+                .merge_node(alias, label, {"id": node_id})
+                .match_public("pub", public_label, doc_id=RowField("doc_id"))
+                .merge_rel(alias, "CITES", "pub")
+                .build()
+                for public_label, doc_ids in targets.items()]
 
     async def _graph_upsert_submission(self, tenant_id: str, document_id: str, filename: str,
-                                       matter_id: Optional[str], entities: ExtractedEntities) -> None:
-        """Build the judge-reasoning subgraph for a court filing:
+                                       matter_id: Optional[str], entities: ExtractedEntities) -> list[GraphQuery]:
+        """Queries for the judge-reasoning subgraph of a court filing:
 
             (Advocate)-[:AUTHORED]->(Submission)-[:FILED_IN]->(Matter)
             (Matter)-[:DECIDED_BY]->(Judge:Public)   # best-effort, if judge known publicly
@@ -181,64 +211,71 @@ class TenantIngestor:
             submission_props["parties"] = entities.parties
         if entities.case_ref:
             submission_props["case_ref"] = entities.case_ref
-        q = (TenantScopedGraphQuery(tenant_id)
-             .merge_node("s", "Submission", {"id": document_id}, submission_props)
-             .build())
-        await self.graph.write(q)
-
-        for advocate in entities.advocates:
-            q = (TenantScopedGraphQuery(tenant_id)
-                 .merge_node("a", "Advocate", {"id": _slug(advocate)}, {"name": advocate})
-                 .merge_node("s", "Submission", {"id": document_id})
-                 .merge_rel("a", "AUTHORED", "s")
-                 .build())
-            await self.graph.write(q)
-
-        # Resolve the case/matter: explicit matter_id wins, else derive a stable
-        # key from the case reference so repeat filings land on the same Matter.
-        matter_key = matter_id or (_slug(entities.case_ref) if entities.case_ref else None)
+        queries = [TenantScopedGraphQuery(tenant_id)
+                   .merge_node("s", "Submission", {"id": document_id}, submission_props)
+                   .build()]
+
+        if entities.advocates:
+            queries.append(TenantScopedGraphQuery(tenant_id)
+                           .unwind([{"id": _slug(a), "name": a} for a in entities.advocates])
+                           .merge_node("a", "Advocate", {"id": RowField("id")}, {"name": RowField("name")})
+                           .merge_node("s", "Submission", {"id": document_id})
+                           .merge_rel("a", "AUTHORED", "s")
+                           .build())
+
+        matter_key = _matter_key(matter_id, entities)
         if matter_key:
             matter_props: dict = {}
             if entities.case_ref:
                 matter_props["case_ref"] = entities.case_ref
             if entities.judge_name:
                 matter_props["judge_name"] = entities.judge_name
-            q = (TenantScopedGraphQuery(tenant_id)
-                 .merge_node("m", "Matter", {"id": matter_key}, matter_props or None)
-                 .merge_node("s", "Submission", {"id": document_id})
-                 .merge_rel("s", "FILED_IN", "m")
-                 .build())
-            await self.graph.write(q)
-
-            # Best-effort DECIDED_BY to the public Judge (only links if present).
+            queries.append(TenantScopedGraphQuery(tenant_id)
+                           .merge_node("m", "Matter", {"id": matter_key}, matter_props or None)
+                           .merge_node("s", "Submission", {"id": document_id})
+                           .merge_rel("s", "FILED_IN", "m")
+                           .build())
+
+            # Best-effort DECIDED_BY: the MATCH on the public Judge yields no
+            # row (so no edge) when that judge is not in the public graph yet.
             if entities.judge_name:
-                try:
-                    q = (TenantScopedGraphQuery(tenant_id)
-                         .merge_node("m", "Matter", {"id": matter_key})
-                         .match_public("j", "Judge", name=entities.judge_name)
-                         .merge_rel("m", "DECIDED_BY", "j")
-                         .build())
-                    await self.graph.write(q)
-                except Exception as exc:
-                    log().info("DECIDED_BY skipped (judge %r not in public graph): %s",
-                               entities.judge_name, exc)
+                queries.append(TenantScopedGraphQuery(tenant_id)
+                               .merge_node("m", "Matter", {"id": matter_key})
+                               .match_public("j", "Judge", name=entities.judge_name)
+                               .merge_rel("m", "DECIDED_BY", "j")
+                               .build())
 
             if entities.outcome:
                 oc = entities.outcome
-                q = (TenantScopedGraphQuery(tenant_id)
-                     .merge_node("o", "Outcome", {"id": f"{matter_key}:outcome"}, {
-                         "result": oc.get("result", ""),
-                         "date": oc.get("date", ""),
-                         "notes": oc.get("notes", ""),
-                         "judge_name": entities.judge_name or "",
-                     })
-                     .merge_node("m", "Matter", {"id": matter_key})
-                     .merge_rel("m", "RESULTED_IN", "o")
-                     .build())
-                await self.graph.write(q)
+                queries.append(TenantScopedGraphQuery(tenant_id)
+                               .merge_node("o", "Outcome", {"id": f"{matter_key}:outcome"}, {
+                                   "result": oc.get("result", ""),
+                                   "date": oc.get("date", ""),
+                                   "notes": oc.get("notes", ""),
+                                   "judge_name": entities.judge_name or "",
+                               })
+                               .merge_node("m", "Matter", {"id": matter_key})
+                               .merge_rel("m", "RESULTED_IN", "o")
+                               .build())
 
         # The Section/Case law the submission cited (for "what wins" reasoning).
-        await self._link_citations(tenant_id, "s", "Submission", document_id, entities)
+        queries += await self._link_citations(tenant_id, "s", "Submission", document_id, entities)
+        return queries
+
+    async def _record_judge_matter(self, tenant_id: str, document_id: str,
+                                   matter_id: Optional[str], entities: ExtractedEntities) -> None:
+        """Fold the filing into the tenant's materialized judge aggregates —
+        the same Matter/Outcome/CITES facts the graph stage just wrote, kept
+        where judge-aware retrieval can read them in one lookup."""
+        matter_key = _matter_key(matter_id, entities)
+        if not matter_key:
+            return
+        resolved = await self.citations.resolve(entities.act_citations + entities.case_citations)
+        titles = [r["title"] for rows in resolved.values() for r in rows if r.get("title")]
+        async with dbx.tenant_tx(self.pool, tenant_id) as conn:
+            await dbx.record_judge_matter(
+                conn, matter_key, document_id, entities.judge_name or "",
+                (entities.outcome or {}).get("result", ""), titles, FAVORABLE_RESULTS)
 
     # --- KDPA erasure cascade (graph + vectors) ---
     async def erase_subject(self, tenant_id: str, subject_type: str, subject_id: str,
@@ -247,6 +284,7 @@ class TenantIngestor:
         if document_ids:
             async with dbx.tenant_tx(self.pool, tenant_id) as conn:
                 vector_rows = await dbx.delete_chunks(conn, document_ids)
+                await dbx.forget_judge_submissions(conn, document_ids, FAVORABLE_RESULTS)
 
         nodes_deleted = 0
         if document_ids:
@@ -264,4 +302,8 @@ class TenantIngestor:
                  .build())
             counters = await self.graph.write(q)
             nodes_deleted += counters.get("nodes_deleted", 0)
+        if self.judge_cache is not None:
+            self.judge_cache.invalidate_tenant(tenant_id)
+        if self.completion_cache is not None:
+            self.completion_cache.invalidate(tenant_id)
         return nodes_deleted, vector_rows
@@ -5,9 +5,12 @@ separated sources and merges them in Python:
 
   * PUBLIC  — the shared judge profile + RULED_ON history (read via
     PublicGraphQuery; visible to every tenant).
-  * TENANT  — this firm's own matters before that judge, the submissions that
-    led to favourable outcomes, and the authorities they cited (read via
-    TenantScopedGraphQuery only; invisible to any other tenant).
+  * TENANT  — this firm's own matters before that judge, how many had a
+    favourable outcome, and the authorities cited in those filings (one
+    ``judge_aggregates`` row in the tenant's own schema, kept current by
+    tenant ingestion and backfilled once from the tenant's graph partition
+    by ``JudgeHistoryBackfill`` at startup, off the query path; invisible to
+    any other tenant).
 
 The result is handed to the LLM clearly labelled as firm-internal historical
 pattern, NOT settled law.
@@ -17,16 +20,30 @@ tech but some jurisdictions restrict it. This is a firm-internal tool; the
 disclaimer below travels with every summary, and it must be reviewed against
 Law Society of Kenya / Judiciary of Kenya guidance before any external-facing
 use. Gated behind ENABLE_JUDGE_REASONING.
+
+Both halves are fetched concurrently and cached (``JudgeContextCache``): the
+tenant half per (tenant, judge), dropped when that tenant files a submission
+for the judge or erases data; the public half per judge, dropped after each
+public profile recompute.
+
+Query-time detection goes through a ``JudgeGazetteer`` compiled from the
+public ``(:Judge)`` nodes after every ingestion/profile pass: a token trie of
+each judge's known forms, so "Onyango J" resolves to "Maureen Onyango J" and a
+capitalised name that is not a known judge costs no graph work at all. The
+``_JUDGE_Q_RE`` regex is only the fallback before the first build.
 """
 from __future__ import annotations
 
+import asyncio
 import re
-from collections import Counter
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterable, Optional
 
+from . import db as dbx
 from .graph import Graph, PublicGraphQuery, TenantScopedGraphQuery
 from .logging_setup import log
+from .lru import LRU
+from .tenancy import validate_tenant_id
 
 JUDICIAL_ANALYTICS_DISCLAIMER = (
     "FIRM-INTERNAL HISTORICAL PATTERN — summarises this firm's own past matters "
@@ -43,7 +60,10 @@ _JUDGE_Q_RE = re.compile(
     r"([A-Z][A-Za-z.\-]+(?:\s+[A-Z][A-Za-z.\-]+){0,2})",
     re.I,
 )
-_FAVORABLE = {"won", "settled"}
+FAVORABLE_RESULTS = ("won", "settled")
+_RANKS = frozenset({"j", "ja", "scj", "cj", "dcj"})
+_TITLES = frozenset({"justice", "judge"})
+_TOKEN_RE = re.compile(r"(?:[A-Za-z]\.){2,}|[A-Za-z][A-Za-z'\-]*")  # "C.J." is one token
 
 
 @dataclass
@@ -59,11 +79,149 @@ class JudgePattern:
         return self.tenant_cases > 0 or bool(self.public.get("rulings_count"))
 
 
+class JudgeContextCache:
+    """Process-wide LRU of judge-pattern halves. Tenant entries are keyed by
+    (tenant_id, judge_name) so one firm's history is only ever served back
+    to that firm; public entries by judge_name. The TTL bounds staleness
+    from writes made by other replicas.
+
+    A fetch that started before an invalidation is not stored afterwards
+    (``generation``), so a write can never be masked by a racing read."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 600.0) -> None:
+        self._tenant = LRU(max_entries, ttl_seconds)
+        self._public = LRU(max_entries, ttl_seconds)
+        self._tenant_gen: dict[str, int] = {}
+        self._public_gen = 0
+
+    def tenant_generation(self, tenant_id: str) -> int:
+        return self._tenant_gen.get(tenant_id, 0)
+
+    def public_generation(self) -> int:
+        return self._public_gen
+
+    def get_tenant(self, tenant_id: str, judge_name: str) -> Optional[tuple[int, int, list]]:
+        return self._tenant.get((tenant_id, judge_name))
+
+    def put_tenant(self, tenant_id: str, judge_name: str, value: tuple[int, int, list],
+                   generation: int) -> None:
+        if generation == self.tenant_generation(tenant_id):
+            self._tenant.put((tenant_id, judge_name), value)
+
+    def get_public(self, judge_name: str) -> Optional[dict]:
+        return self._public.get(judge_name)
+
+    def put_public(self, judge_name: str, value: dict, generation: int) -> None:
+        if generation == self._public_gen:
+            self._public.put(judge_name, value)
+
+    def invalidate_tenant(self, tenant_id: str, judge_name: Optional[str] = None) -> None:
+        """Drop one (tenant, judge) entry, or all of the tenant's entries."""
+        self._tenant_gen[tenant_id] = self.tenant_generation(tenant_id) + 1
+        self._tenant.drop(lambda k: k[0] == tenant_id and judge_name in (None, k[1]))
+
+    def invalidate_public(self) -> None:
+        self._public_gen += 1
+        self._public.drop(lambda k: True)
+
+
+@dataclass(frozen=True)
+class JudgeMatch:
+    name: str                   # the judge's name without rank, for tenant matters
+    public_name: Optional[str]  # the (:Judge:Public) node name; None if ambiguous
+
+
+class JudgeGazetteer:
+    """Immutable token trie over the known forms of every public judge name:
+    the full name and the surname, each optionally followed by the rank
+    ("Maureen Onyango J" -> maureen onyango | onyango, then j). A form only
+    counts as a mention when anchored — preceded by "Justice"/"Judge" or
+    followed by a rank — so a party who shares a judge's surname does not
+    trigger a lookup. ``find`` is a single left-to-right scan taking the
+    longest form at each position."""
+
+    _END = ""  # trie key holding the canonical names a path spells
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self._root: dict = {}
+        self._bare: dict[str, str] = {}
+        self._ranks: dict[str, Optional[str]] = {}
+        for canonical in {n.strip() for n in names if n and n.strip()}:
+            words = canonical.replace(".", " ").split()
+            rank = words[-1].lower() if len(words) > 1 and words[-1].lower() in _RANKS else None
+            base = words[:-1] if rank else words
+            self._bare[canonical] = " ".join(base)
+            self._ranks[canonical] = rank
+            for form in {tuple(w.lower() for w in base), (base[-1].lower(),)}:
+                node = self._root
+                for tok in form:
+                    node = node.setdefault(tok, {})
+                node.setdefault(self._END, set()).add(canonical)
+
+    def __len__(self) -> int:
+        return len(self._bare)
+
+    def find(self, query: str) -> Optional[JudgeMatch]:
+        tokens = [t.replace(".", "").lower() for t in _TOKEN_RE.findall(query or "")]
+        for i, tok in enumerate(tokens):
+            node, hit, end = self._root.get(tok), None, i
+            j = i
+            while node is not None:
+                if self._END in node:
+                    hit, end = node[self._END], j
+                j += 1
+                node = node.get(tokens[j]) if j < len(tokens) else None
+            if hit is None:
+                continue
+            rank = tokens[end + 1] if end + 1 < len(tokens) and tokens[end + 1] in _RANKS else None
+            if rank is None and (i == 0 or tokens[i - 1] not in _TITLES):
+                continue
+            return self._resolve(hit, rank)
+        return None
+
+    def _resolve(self, candidates: set[str], rank: Optional[str]) -> JudgeMatch:
+        if len(candidates) > 1 and rank:
+            candidates = {c for c in candidates if self._ranks[c] == rank} or candidates
+        if len(candidates) == 1:
+            [canonical] = candidates
+            return JudgeMatch(self._bare[canonical], canonical)
+        # Two judges share the surname and nothing told them apart.
+        surname = self._bare[min(candidates)].split()[-1]
+        return JudgeMatch(surname, None)
+
+    @classmethod
+    async def load(cls, graph: Graph) -> "JudgeGazetteer":
+        rows = await graph.read(PublicGraphQuery().match("j", "Judge")
+                                .returns("j.name AS name").build())
+        return cls(r.get("name") or "" for r in rows)
+
+
+class JudgeGazetteerCache:
+    """Holds the current gazetteer; ``refresh()`` swaps in a rebuilt one and
+    keeps the previous one if the rebuild fails. ``current`` is None until
+    the first build, and callers fall back to the regex meanwhile."""
+
+    def __init__(self, graph: Graph) -> None:
+        self.graph = graph
+        self.current: Optional[JudgeGazetteer] = None
+
+    async def refresh(self) -> None:
+        try:
+            gazetteer = await JudgeGazetteer.load(self.graph)
+        except Exception:
+            log().exception("judge gazetteer rebuild failed; keeping the previous one")
+            return
+        self.current = gazetteer
+        log().info("judge gazetteer: %d judges", len(gazetteer))
+
+
 class JudgeReasoner:
-    def __init__(self, pool, graph: Graph, cfg) -> None:
+    def __init__(self, pool, graph: Graph, cfg,
+                 cache: Optional[JudgeContextCache] = None) -> None:
         self.pool = pool
         self.graph = graph
         self.cfg = cfg
+        self.cache = cache
 
     @staticmethod
     def detect_judge_name(query: str) -> Optional[str]:
@@ -76,6 +234,12 @@ class JudgeReasoner:
         return name or None
 
     async def public_profile(self, judge_name: str) -> dict:
+        cache = self.cache
+        if cache is not None:
+            hit = cache.get_public(judge_name)
+            if hit is not None:
+                return hit
+            generation = cache.public_generation()
         try:
             rows = await self.graph.read(
                 PublicGraphQuery().match("j", "Judge", name=judge_name)
@@ -83,52 +247,54 @@ class JudgeReasoner:
                          "j.favored_plaintiff AS favored_plaintiff",
                          "j.favored_defendant AS favored_defendant")
                 .limit(1).build())
-            return rows[0] if rows else {}
         except Exception as exc:
             log().warning("public judge profile read failed: %s", exc)
             return {}
+        profile = rows[0] if rows else {}
+        if cache is not None:
+            cache.put_public(judge_name, profile, generation)
+        return profile
+
+    async def cached_tenant_pattern(self, tenant_id: str, judge_name: str) -> tuple[int, int, list]:
+        cache = self.cache
+        if cache is None:
+            return await self.tenant_pattern(tenant_id, judge_name)
+        hit = cache.get_tenant(tenant_id, judge_name)
+        if hit is not None:
+            return hit
+        generation = cache.tenant_generation(tenant_id)
+        pattern = await self.tenant_pattern(tenant_id, judge_name)
+        cache.put_tenant(tenant_id, judge_name, pattern, generation)
+        return pattern
 
     async def tenant_pattern(self, tenant_id: str, judge_name: str) -> tuple[int, int, list]:
-        """Aggregate THIS tenant's history before the judge. Every query is
-        tenant-scoped; a competitor's matters can never appear here."""
-        rows = await self.graph.read(
-            TenantScopedGraphQuery(tenant_id)
-            .match("m", "Matter")
-            .where_prop("m", "judge_name", "=", judge_name)
-            .match_rel("m", ["RESULTED_IN"], "o", "Outcome", direction="any")
-            .returns("m.id AS matter_id", "o.result AS result")
-            .limit(300).build())
-        total = len(rows)
-        winning_ids = [r["matter_id"] for r in rows if (r.get("result") or "") in _FAVORABLE]
-
-        authorities: Counter[str] = Counter()
-        if winning_ids:
-            for public_label in ("Statute", "CaseLaw"):
-                try:
-                    cited = await self.graph.read(
-                        TenantScopedGraphQuery(tenant_id)
-                        .match("m", "Matter")
-                        .where_in("m", "id", winning_ids)
-                        .match_rel("m", ["FILED_IN"], "s", "Submission", direction="any")
-                        .match_rel("s", ["CITES"], "x", public_label, to_public=True, direction="any")
-                        .returns("x.title AS title")
-                        .limit(300).build())
-                    authorities.update(r["title"] for r in cited if r.get("title"))
-                except Exception as exc:
-                    log().warning("winning-authority read (%s) failed: %s", public_label, exc)
-        return total, len(winning_ids), authorities.most_common(5)
-
-    async def build(self, tenant_id: str, judge_name: str) -> JudgePattern:
-        total, favorable, authorities = await self.tenant_pattern(tenant_id, judge_name)
-        public = await self.public_profile(judge_name)
+        """THIS tenant's history before the judge: a primary-key read of the
+        aggregate tenant ingestion maintains, inside the tenant's schema — a
+        competitor's matters can never appear here."""
+        async with dbx.tenant_tx(self.pool, tenant_id) as conn:
+            row = await dbx.judge_aggregate(conn, judge_name)
+        if row is None:
+            return 0, 0, []
+        authorities = [(title, int(n)) for title, n in row["top_authorities"]]
+        return row["matters"], row["favorable"], authorities
+
+    async def build(self, tenant_id: str, judge_name: str,
+                    public_name: Optional[str] = None) -> JudgePattern:
+        """``public_name`` is the judge's public node name when the gazetteer
+        resolved it ("Maureen Onyango J"); the firm's matters keep the bare
+        name extraction stores."""
+        (total, favorable, authorities), public = await asyncio.gather(
+            self.cached_tenant_pattern(tenant_id, judge_name),
+            self.public_profile(public_name or judge_name))
         return JudgePattern(
             judge_name=judge_name, tenant_cases=total, tenant_favorable=favorable,
             winning_authorities=authorities, public=public,
         )
 
-    async def context_block(self, tenant_id: str, judge_name: str) -> str:
+    async def context_block(self, tenant_id: str, judge_name: str,
+                            public_name: Optional[str] = None) -> str:
         """Labelled context to append to the LLM prompt, or "" if no signal."""
-        p = await self.build(tenant_id, judge_name)
+        p = await self.build(tenant_id, judge_name, public_name)
         if not p.has_signal:
             return ""
         lines = [f"[{JUDICIAL_ANALYTICS_DISCLAIMER}]", f"Judge: {p.judge_name}"]
@@ -146,3 +312,85 @@ class JudgeReasoner:
                 f"({p.public.get('favored_plaintiff') or 0} favoured the plaintiff/"
                 f"petitioner, {p.public.get('favored_defendant') or 0} the defendant/respondent).")
         return "\n".join(lines)
+
+
+class JudgeHistoryBackfill:
+    """Seeds every tenant's judge tables, once, from the Matter/Outcome/CITES
+    history its graph partition held before tenant ingestion started
+    maintaining them. One background pass at startup; a tenant whose graph
+    read fails is retried by the next process start. The ``judge_backfill``
+    marker makes the pass a single cheap read per tenant once done."""
+
+    def __init__(self, pool, graph: Graph, cache: Optional[JudgeContextCache] = None) -> None:
+        self.pool = pool
+        self.graph = graph
+        self.cache = cache
+        self._task = None
+
+    async def start(self) -> None:
+        async def _pass() -> None:
+            try:
+                await self.run_once()
+            except Exception:  # noqa: BLE001 — reads keep working on the live aggregates
+                log().exception("judge history backfill pass failed")
+
+        self._task = asyncio.create_task(_pass())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run_once(self) -> int:
+        """Backfill every active tenant not yet marked done. Returns the
+        number of tenants backfilled."""
+        async with self.pool.acquire() as conn:
+            tenants = await conn.fetch(
+                "SELECT id::text AS id FROM public.tenants WHERE status = 'active'")
+        done = 0
+        for row in tenants:
+            try:
+                done += await self.backfill_tenant(row["id"])
+            except Exception:  # noqa: BLE001
+                log().exception("judge history backfill failed for one tenant")
+        return done
+
+    async def backfill_tenant(self, tenant_id: str) -> bool:
+        validate_tenant_id(tenant_id)
+        async with dbx.tenant_tx(self.pool, tenant_id) as conn:
+            if await dbx.judge_history_backfilled(conn):
+                return False
+        # Read the graph outside the transaction: no connection held meanwhile.
+        matters, citations = await self._graph_history(tenant_id)
+        async with dbx.tenant_tx(self.pool, tenant_id) as conn:
+            written = await dbx.backfill_judge_matters(conn, matters, citations, FAVORABLE_RESULTS)
+        if written:
+            if self.cache is not None:
+                self.cache.invalidate_tenant(tenant_id)
+            log().info("judge history backfilled: %d matter(s)", len(matters))
+        return written
+
+    async def _graph_history(self, tenant_id: str) -> tuple[list[dict], list[dict]]:
+        def matters():
+            return (TenantScopedGraphQuery(tenant_id)
+                    .match("m", "Matter").where_prop("m", "judge_name", "<>", ""))
+
+        judged = await self.graph.read(
+            matters().returns("m.id AS matter_key", "m.judge_name AS judge_name").build())
+        outcomes = await self.graph.read(
+            matters().match_rel("m", ["RESULTED_IN"], "o", "Outcome", direction="any")
+            .returns("m.id AS matter_key", "o.result AS result").build())
+        results = {r["matter_key"]: r.get("result") or "" for r in outcomes}
+        rows = [{"matter_key": r["matter_key"], "judge_name": r["judge_name"],
+                 "result": results.get(r["matter_key"], "")} for r in judged]
+        citations: list[dict] = []
+        for public_label in ("Statute", "CaseLaw"):
+            cited = await self.graph.read(
+                matters().match_rel("m", ["FILED_IN"], "s", "Submission", direction="any")
+                .match_rel("s", ["CITES"], "x", public_label, to_public=True, direction="any")
+                .returns("m.id AS matter_key", "s.id AS submission_id", "x.title AS title").build())
+            citations += [r for r in cited if r.get("title")]
+        return rows, citations
@@ -4,15 +4,113 @@ Business logic never calls a vendor SDK inline — everything goes through
 ``LLMProvider``. The default is Claude (Anthropic API); ``MockProvider``
 keeps the whole platform demoable offline and makes the isolation tests
 independent of any external service.
+
+``make_llm`` wraps whatever it builds in ``MeteredProvider``: latency,
+time-to-first-token, tokens/sec, inter-token gaps, token counts, fallbacks
+and errors, labelled by provider, model and call site. Call sites name
+themselves with ``llm_call_site`` ("intent", "answer", "reason", "draft",
+"summary"); anything unlabelled is "other". Given an ``LLMScheduler``,
+each provider's calls are also queued for its concurrency slots (see
+``llm_scheduler``).
 """
 from __future__ import annotations
 
+import contextvars
+import importlib.util
 import re
-from typing import AsyncIterator, Optional, Protocol
+import time
+from contextlib import aclosing, contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterator, Iterator, Optional, Protocol, Sequence, Union
+
+from prometheus_client import Counter, Histogram
 
 from .config import Config
 from .logging_setup import log
 
+if TYPE_CHECKING:
+    from .llm_scheduler import LLMScheduler
+
+LLM_HTTP_REQUESTS = Counter("wakili_ai_llm_http_requests_total",
+                            "HTTP requests sent by pooled LLM provider clients", ["provider"])
+LLM_HTTP_CONNECTIONS = Counter("wakili_ai_llm_http_connections_opened_total",
+                               "TCP connections opened by LLM provider clients; "
+                               "1 - opened/requests is the connection reuse rate", ["provider"])
+
+_CALL_LABELS = ["provider", "model", "site"]
+LLM_COMPLETE_SECONDS = Histogram("wakili_ai_llm_complete_seconds",
+                                 "LLM complete() latency, excluding time queued for a provider slot",
+                                 _CALL_LABELS,
+                                 buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120, 300))
+LLM_TTFT = Histogram("wakili_ai_llm_stream_ttft_seconds",
+                     "LLM stream() time from the call to the first token, excluding time "
+                     "queued for a provider slot", _CALL_LABELS,
+                     buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60))
+LLM_TOKENS_PER_SECOND = Histogram("wakili_ai_llm_tokens_per_second",
+                                  "Completion tokens per second of generation (streams: after "
+                                  "the first token), where the provider reports usage",
+                                  _CALL_LABELS, buckets=(1, 2, 5, 10, 20, 40, 80, 160, 320))
+LLM_INTER_TOKEN = Histogram("wakili_ai_llm_inter_token_seconds",
+                            "Gap between consecutive pieces of an LLM stream", _CALL_LABELS,
+                            buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5))
+LLM_TOKENS = Counter("wakili_ai_llm_tokens_total",
+                     "Tokens reported by LLM providers", _CALL_LABELS + ["kind"])  # prompt|completion
+LLM_FALLBACKS = Counter("wakili_ai_llm_fallbacks_total",
+                        "Calls served by the fallback provider after the primary failed",
+                        ["primary", "secondary", "site"])
+LLM_ERRORS = Counter("wakili_ai_llm_errors_total", "LLM calls that raised", _CALL_LABELS)
+
+llm_site_var: contextvars.ContextVar[str] = contextvars.ContextVar("llm_site", default="other")
+# The tenant on whose behalf LLM calls are made: set per RPC by
+# ``check_tenant``; the scheduler queues each tenant's calls fairly.
+llm_tenant_var: contextvars.ContextVar[str] = contextvars.ContextVar("llm_tenant", default="")
+
+
+@contextmanager
+def llm_call_site(site: str, tenant_id: Optional[str] = None) -> Iterator[None]:
+    """Label the LLM calls made inside the block, and attribute them to
+    ``tenant_id`` when given (a stream is labelled by where ``stream()`` was
+    called, not where it is consumed)."""
+    token = llm_site_var.set(site)
+    tenant = llm_tenant_var.set(tenant_id) if tenant_id is not None else None
+    try:
+        yield
+    finally:
+        if tenant is not None:
+            llm_tenant_var.reset(tenant)
+        llm_site_var.reset(token)
+
+
+@dataclass
+class _Call:
+    """What a provider reports about the call ``MeteredProvider`` is timing."""
+    site: str
+    provider: str
+    model: str
+    tenant_id: str = ""
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    queued_seconds: float = 0.0  # waiting for a scheduler slot
+
+
+_call_var: contextvars.ContextVar[Optional[_Call]] = contextvars.ContextVar("llm_call", default=None)
+
+
+def _report(provider: str, model: Optional[str] = None, prompt_tokens: Optional[int] = None,
+            completion_tokens: Optional[int] = None) -> None:
+    """Providers report who served the call and its token usage here; a
+    no-op outside a metered call."""
+    call = _call_var.get()
+    if call is None:
+        return
+    call.provider = provider
+    if model:
+        call.model = model
+    if prompt_tokens is not None:
+        call.prompt_tokens = prompt_tokens
+    if completion_tokens is not None:
+        call.completion_tokens = completion_tokens
+
 # Reasoning models served through Ollama (e.g. DeepSeek-R1) prepend their chain
 # of thought as a <think>...</think> block before the actual answer. The rest of
 # the platform expects a clean, citable answer, so the block is stripped here —
@@ -40,16 +138,110 @@ CONFIDENTIALITY_PREAMBLE = (
 )
 
 
+@dataclass(frozen=True)
+class PromptSegment:
+    """One piece of a system/user prompt. ``cacheable`` marks text that is
+    identical across calls (instructions, a template skeleton, a firm's clause
+    library); callers put those segments first so providers can reuse the
+    prefix. Segments are concatenated as-is, separators included."""
+    text: str
+    cacheable: bool = False
+
+
+Prompt = Union[str, Sequence[PromptSegment]]
+
+
+def prompt_text(prompt: Prompt) -> str:
+    return prompt if isinstance(prompt, str) else "".join(s.text for s in prompt)
+
+
 class LLMProvider(Protocol):
-    async def complete(self, system: str, prompt: str, max_tokens: int = 2048, fast: bool = False) -> str: ...
+    async def complete(self, system: Prompt, prompt: Prompt, max_tokens: int = 2048, fast: bool = False) -> str: ...
+
+    def stream(self, system: Prompt, prompt: Prompt, max_tokens: int = 8192) -> AsyncIterator[str]: ...
+
+    async def aclose(self) -> None: ...
+
+
+def _pooled_client(cfg: Config, provider: str):
+    """The long-lived HTTP client an HTTP provider owns for its lifetime:
+    pooled keep-alive connections (HTTP/2 when ``h2`` is installed and the
+    endpoint speaks it), so a call — above all a short fast-model
+    classification — does not pay for TCP/TLS setup. Closed by ``aclose``."""
+    import httpx  # already a service dependency
+
+    http2 = cfg.llm_http2 and importlib.util.find_spec("h2") is not None
+
+    async def count_request(request) -> None:
+        LLM_HTTP_REQUESTS.labels(provider).inc()
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(max_connections=cfg.llm_http_max_connections,
+                            max_keepalive_connections=cfg.llm_http_max_keepalive,
+                            keepalive_expiry=cfg.llm_http_keepalive_seconds),
+        timeout=httpx.Timeout(cfg.llm_http_read_timeout, connect=cfg.llm_http_connect_timeout),
+        event_hooks={"request": [count_request]},
+    )
+
 
-    def stream(self, system: str, prompt: str, max_tokens: int = 8192) -> AsyncIterator[str]: ...
+def _stream_timeout(cfg: Config):
+    """Streams may sit between tokens for a long time: no read timeout."""
+    import httpx
+
+    return httpx.Timeout(None, connect=cfg.llm_http_connect_timeout)
+
+
+def _connection_trace(provider: str) -> dict:
+    """Request extensions whose httpcore trace hook counts new connections
+    (a request served from the pool never connects)."""
+    async def trace(event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.complete":
+            LLM_HTTP_CONNECTIONS.labels(provider).inc()
+
+    return {"trace": trace}
+
+
+# Anthropic allows at most four cache breakpoints per request.
+_MAX_CACHE_BREAKPOINTS = 4
+
+
+def _anthropic_blocks(system: Prompt, prompt: Prompt) -> tuple[list[dict], list[dict]]:
+    """Text blocks for ``system`` and the user message, with a cache
+    breakpoint closing each run of cacheable segments (the last four win —
+    each one caches everything before it). A cache entry is only ever hit by
+    a request carrying the identical prefix, so one firm's clause library can
+    never be served to another."""
+    parts: list[list[dict]] = [[], []]
+    for i, p in enumerate((system, prompt)):
+        segments = [PromptSegment(p)] if isinstance(p, str) else p
+        for seg in segments:
+            if not seg.text:
+                continue
+            blocks = parts[i]
+            if blocks and blocks[-1]["cacheable"] == seg.cacheable:
+                blocks[-1]["text"] += seg.text
+            else:
+                blocks.append({"text": seg.text, "cacheable": seg.cacheable})
+    ends = [b for blocks in parts for j, b in enumerate(blocks)
+            if b["cacheable"] and (j + 1 == len(blocks) or not blocks[j + 1]["cacheable"])]
+    marked = {id(b) for b in ends[-_MAX_CACHE_BREAKPOINTS:]}
+    out: tuple[list[dict], list[dict]] = ([], [])
+    for i, blocks in enumerate(parts):
+        for b in blocks:
+            block = {"type": "text", "text": b["text"]}
+            if id(b) in marked:
+                block["cache_control"] = {"type": "ephemeral"}
+            out[i].append(block)
+    return out
 
 
 class AnthropicProvider:
     """Claude via the official Anthropic SDK. Opus 4.8 with adaptive thinking
     for reasoning/drafting; Haiku 4.5 for cheap classification calls."""
 
+    name = "anthropic"
+
     def __init__(self, cfg: Config) -> None:
         import anthropic  # imported here so mock-mode deployments don't need the key
 
@@ -57,30 +249,58 @@ class AnthropicProvider:
         self._model = cfg.anthropic_model
         self._fast_model = cfg.anthropic_fast_model
 
-    async def complete(self, system: str, prompt: str, max_tokens: int = 2048, fast: bool = False) -> str:
+    @staticmethod
+    def _log_usage(model: str, usage, latency_ms: float) -> None:
+        """Per-call token usage, including prompt-cache reads/writes."""
+        log().info(
+            "anthropic call model=%s latency_ms=%.0f input_tokens=%s cache_read_tokens=%s "
+            "cache_write_tokens=%s output_tokens=%s",
+            model, latency_ms, getattr(usage, "input_tokens", None),
+            getattr(usage, "cache_read_input_tokens", None),
+            getattr(usage, "cache_creation_input_tokens", None),
+            getattr(usage, "output_tokens", None),
+        )
+        # Cached prefix tokens are still prompt tokens.
+        prompt = [t for t in (getattr(usage, k, None) for k in (
+            "input_tokens", "cache_read_input_tokens", "cache_creation_input_tokens"))
+            if isinstance(t, int)]
+        _report("anthropic", model, sum(prompt) if prompt else None,
+                getattr(usage, "output_tokens", None))
+
+    async def complete(self, system: Prompt, prompt: Prompt, max_tokens: int = 2048, fast: bool = False) -> str:
         kwargs: dict = {}
         model = self._fast_model if fast else self._model
         if not fast:
             kwargs["thinking"] = {"type": "adaptive"}
+        system_blocks, user_blocks = _anthropic_blocks(system, prompt)
+        started = time.perf_counter()
         resp = await self._client.messages.create(
             model=model,
             max_tokens=max_tokens,
-            system=system,
-            messages=[{"role": "user", "content": prompt}],
+            system=system_blocks,
+            messages=[{"role": "user", "content": user_blocks}],
             **kwargs,
         )
+        self._log_usage(model, resp.usage, (time.perf_counter() - started) * 1000)
         return "".join(block.text for block in resp.content if block.type == "text")
 
-    async def stream(self, system: str, prompt: str, max_tokens: int = 8192) -> AsyncIterator[str]:
+    async def stream(self, system: Prompt, prompt: Prompt, max_tokens: int = 8192) -> AsyncIterator[str]:
+        system_blocks, user_blocks = _anthropic_blocks(system, prompt)
+        started = time.perf_counter()
         async with self._client.messages.stream(
             model=self._model,
             max_tokens=max_tokens,
-            system=system,
+            system=system_blocks,
             thinking={"type": "adaptive"},
-            messages=[{"role": "user", "content": prompt}],
+            messages=[{"role": "user", "content": user_blocks}],
         ) as stream:
             async for text in stream.text_stream:
                 yield text
+            final = await stream.get_final_message()
+        self._log_usage(self._model, final.usage, (time.perf_counter() - started) * 1000)
+
+    async def aclose(self) -> None:
+        await self._client.close()
 
 
 class OllamaProvider:
@@ -88,76 +308,98 @@ class OllamaProvider:
     data-residency deployments where prompts must not leave the box. Same
     interface as AnthropicProvider so business logic is provider-agnostic."""
 
-    def __init__(self, cfg: Config) -> None:
-        import httpx  # already a service dependency
+    name = "ollama"
 
-        self._httpx = httpx
+    def __init__(self, cfg: Config) -> None:
+        self._client = _pooled_client(cfg, "ollama")
+        self._stream_timeout = _stream_timeout(cfg)
+        self._trace = _connection_trace("ollama")
         self._base = cfg.ollama_base_url.rstrip("/")
         self._model = cfg.ollama_model
         self._fast_model = cfg.ollama_fast_model
+        # Keeps the model — and with it the KV cache of the last prompt — loaded
+        # between calls, so a request sharing the previous one's stable prefix
+        # (system text, template, clause library) only evaluates the new tail.
+        self._keep_alive = cfg.ollama_keep_alive
 
-    async def complete(self, system: str, prompt: str, max_tokens: int = 2048, fast: bool = False) -> str:
-        model = self._fast_model if fast else self._model
-        payload = {
+    def _payload(self, model: str, system: Prompt, prompt: Prompt, stream: bool, max_tokens: int) -> dict:
+        return {
             "model": model,
-            "system": system,
-            "prompt": prompt,
-            "stream": False,
+            "system": prompt_text(system),
+            "prompt": prompt_text(prompt),
+            "stream": stream,
+            "keep_alive": self._keep_alive,
             "options": {"num_predict": max_tokens},
         }
-        async with self._httpx.AsyncClient(timeout=300) as client:
-            resp = await client.post(f"{self._base}/api/generate", json=payload)
-            resp.raise_for_status()
-            return _strip_reasoning(resp.json().get("response", ""))
 
-    async def stream(self, system: str, prompt: str, max_tokens: int = 8192) -> AsyncIterator[str]:
+    @staticmethod
+    def _log_usage(model: str, done: dict) -> None:
+        """``prompt_eval_count`` only counts prompt tokens Ollama had to
+        evaluate; a reused prefix shows up as the gap to the full prompt."""
+        log().info(
+            "ollama call model=%s prompt_eval_tokens=%s prompt_eval_ms=%.0f eval_tokens=%s total_ms=%.0f",
+            model, done.get("prompt_eval_count"), (done.get("prompt_eval_duration") or 0) / 1e6,
+            done.get("eval_count"), (done.get("total_duration") or 0) / 1e6,
+        )
+        _report("ollama", model, done.get("prompt_eval_count"), done.get("eval_count"))
+
+    async def complete(self, system: Prompt, prompt: Prompt, max_tokens: int = 2048, fast: bool = False) -> str:
+        model = self._fast_model if fast else self._model
+        payload = self._payload(model, system, prompt, False, max_tokens)
+        resp = await self._client.post(f"{self._base}/api/generate", json=payload,
+                                       extensions=self._trace)
+        resp.raise_for_status()
+        data = resp.json()
+        self._log_usage(model, data)
+        return _strip_reasoning(data.get("response", ""))
+
+    async def stream(self, system: Prompt, prompt: Prompt, max_tokens: int = 8192) -> AsyncIterator[str]:
         import json as _json
 
-        payload = {
-            "model": self._model,
-            "system": system,
-            "prompt": prompt,
-            "stream": True,
-            "options": {"num_predict": max_tokens},
-        }
+        payload = self._payload(self._model, system, prompt, True, max_tokens)
         # Reasoning models stream their <think>...</think> block first; suppress
         # it token-by-token (tags may split across chunks) so only the answer is
         # streamed to the client. "gate": deciding -> thinking -> passthrough.
         buf, gate = "", "deciding"
-        async with self._httpx.AsyncClient(timeout=None) as client:
-            async with client.stream("POST", f"{self._base}/api/generate", json=payload) as resp:
-                resp.raise_for_status()
-                async for line in resp.aiter_lines():
-                    if not line.strip():
-                        continue
-                    try:
-                        chunk = _json.loads(line)
-                    except ValueError:
-                        continue
-                    piece = chunk.get("response", "")
-                    if not piece:
-                        continue
-                    if gate == "passthrough":
-                        yield piece
-                        continue
-                    buf += piece
-                    if gate == "deciding":
-                        if "<think>" in buf.lstrip()[:8]:
-                            gate = "thinking"
-                        elif len(buf) >= 8:  # no think block opening — flush and pass through
-                            gate, out, buf = "passthrough", buf, ""
-                            yield out
-                        continue
-                    if gate == "thinking":
-                        end = buf.find("</think>")
-                        if end != -1:
-                            rest = buf[end + len("</think>"):].lstrip()
-                            gate, buf = "passthrough", ""
-                            if rest:
-                                yield rest
+        async with self._client.stream("POST", f"{self._base}/api/generate", json=payload,
+                                       timeout=self._stream_timeout, extensions=self._trace) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line.strip():
+                    continue
+                try:
+                    chunk = _json.loads(line)
+                except ValueError:
+                    continue
+                if chunk.get("done"):
+                    self._log_usage(self._model, chunk)
+                piece = chunk.get("response", "")
+                if not piece:
+                    continue
+                if gate == "passthrough":
+                    yield piece
+                    continue
+                buf += piece
+                if gate == "deciding":
+                    if "<think>" in buf.lstrip()[:8]:
+                        gate = "thinking"
+                    elif len(buf) >= 8:  # no think block opening — flush and pass through
+                        gate, out, buf = "passthrough", buf, ""
+                        yield out
+                    continue
+                if gate == "thinking":
+                    end = buf.find("</think>")
+                    if end != -1:
+                        rest = buf[end + len("</think>"):].lstrip()
+                        gate, buf = "passthrough", ""
+                        if rest:
+                            yield rest
         if gate == "deciding" and buf:  # short response, never decided — emit it
             yield buf
 
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
 
 class GMICloudProvider:
     """A GMI Cloud hosted model via its OpenAI-compatible chat API.
@@ -175,10 +417,12 @@ class GMICloudProvider:
         endpoint and we want real cost signal during testing, not just latency.
     """
 
-    def __init__(self, cfg: Config, model: Optional[str] = None) -> None:
-        import httpx  # already a service dependency
+    name = "gmi"
 
-        self._httpx = httpx
+    def __init__(self, cfg: Config, model: Optional[str] = None) -> None:
+        self._client = _pooled_client(cfg, "gmi")
+        self._stream_timeout = _stream_timeout(cfg)
+        self._trace = _connection_trace("gmi")
         self._cfg = cfg
         self._base = cfg.gmi_cloud_base_url.rstrip("/")
         self._api_key = cfg.gmi_cloud_api_key
@@ -217,35 +461,37 @@ class GMICloudProvider:
         self.last_usage = usage or {}
         self.last_latency_ms = latency_ms
         log().info(
-            "gmi_cloud call model=%s latency_ms=%.0f prompt_tokens=%s completion_tokens=%s total_tokens=%s",
+            "gmi_cloud call model=%s latency_ms=%.0f prompt_tokens=%s cached_tokens=%s "
+            "completion_tokens=%s total_tokens=%s",
             self._model, latency_ms,
-            (usage or {}).get("prompt_tokens"), (usage or {}).get("completion_tokens"),
-            (usage or {}).get("total_tokens"),
+            (usage or {}).get("prompt_tokens"),
+            ((usage or {}).get("prompt_tokens_details") or {}).get("cached_tokens"),
+            (usage or {}).get("completion_tokens"), (usage or {}).get("total_tokens"),
         )
+        _report("gmi", self._model, (usage or {}).get("prompt_tokens"),
+                (usage or {}).get("completion_tokens"))
 
-    async def complete(self, system: str, prompt: str, max_tokens: int = 2048, fast: bool = False) -> str:
-        import time
-
+    async def complete(self, system: Prompt, prompt: Prompt, max_tokens: int = 2048, fast: bool = False) -> str:
         self._guard_synthetic()
         payload = {
             "model": self._model,
             "max_tokens": max_tokens,
             "messages": [
-                {"role": "system", "content": system},
-                {"role": "user", "content": prompt},
+                {"role": "system", "content": prompt_text(system)},
+                {"role": "user", "content": prompt_text(prompt)},
             ],
         }
         started = time.perf_counter()
-        async with self._httpx.AsyncClient(timeout=300) as client:
-            resp = await client.post(f"{self._base}/chat/completions", json=payload, headers=self._headers())
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await self._client.post(f"{self._base}/chat/completions", json=payload,
+                                       headers=self._headers(), extensions=self._trace)
+        resp.raise_for_status()
+        data = resp.json()
         self._log_usage(data.get("usage") or {}, (time.perf_counter() - started) * 1000)
         text = data["choices"][0]["message"]["content"] or ""
         # Only chain-of-thought models wrap the answer in <think>...</think>.
         return _strip_reasoning(text) if self._reasoning else text.strip()
 
-    async def stream(self, system: str, prompt: str, max_tokens: int = 8192) -> AsyncIterator[str]:
+    async def stream(self, system: Prompt, prompt: Prompt, max_tokens: int = 8192) -> AsyncIterator[str]:
         import json as _json
 
         self._guard_synthetic()
@@ -254,60 +500,66 @@ class GMICloudProvider:
             "max_tokens": max_tokens,
             "stream": True,
             "messages": [
-                {"role": "system", "content": system},
-                {"role": "user", "content": prompt},
+                {"role": "system", "content": prompt_text(system)},
+                {"role": "user", "content": prompt_text(prompt)},
             ],
         }
         # For reasoning models, suppress the leading <think>...</think> block
         # token-by-token (tags may split across chunks) exactly like Ollama; for
         # instruct models pass every delta straight through.
         buf, gate = "", ("deciding" if self._reasoning else "passthrough")
-        async with self._httpx.AsyncClient(timeout=None) as client:
-            async with client.stream(
-                "POST", f"{self._base}/chat/completions", json=payload, headers=self._headers()
-            ) as resp:
-                resp.raise_for_status()
-                async for line in resp.aiter_lines():
-                    line = line.strip()
-                    if not line or not line.startswith("data:"):
-                        continue
-                    data = line[len("data:"):].strip()
-                    if data == "[DONE]":
-                        break
-                    try:
-                        chunk = _json.loads(data)
-                    except ValueError:
-                        continue
-                    piece = (chunk.get("choices") or [{}])[0].get("delta", {}).get("content") or ""
-                    if not piece:
-                        continue
-                    if gate == "passthrough":
-                        yield piece
-                        continue
-                    buf += piece
-                    if gate == "deciding":
-                        if "<think>" in buf.lstrip()[:8]:
-                            gate = "thinking"
-                        elif len(buf) >= 8:  # no think block — flush and pass through
-                            gate, out, buf = "passthrough", buf, ""
-                            yield out
-                        continue
-                    if gate == "thinking":
-                        end = buf.find("</think>")
-                        if end != -1:
-                            rest = buf[end + len("</think>"):].lstrip()
-                            gate, buf = "passthrough", ""
-                            if rest:
-                                yield rest
+        async with self._client.stream(
+            "POST", f"{self._base}/chat/completions", json=payload, headers=self._headers(),
+            timeout=self._stream_timeout, extensions=self._trace,
+        ) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                line = line.strip()
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = _json.loads(data)
+                except ValueError:
+                    continue
+                piece = (chunk.get("choices") or [{}])[0].get("delta", {}).get("content") or ""
+                if not piece:
+                    continue
+                if gate == "passthrough":
+                    yield piece
+                    continue
+                buf += piece
+                if gate == "deciding":
+                    if "<think>" in buf.lstrip()[:8]:
+                        gate = "thinking"
+                    elif len(buf) >= 8:  # no think block — flush and pass through
+                        gate, out, buf = "passthrough", buf, ""
+                        yield out
+                    continue
+                if gate == "thinking":
+                    end = buf.find("</think>")
+                    if end != -1:
+                        rest = buf[end + len("</think>"):].lstrip()
+                        gate, buf = "passthrough", ""
+                        if rest:
+                            yield rest
         if gate == "deciding" and buf:  # short response, never decided — emit it
             yield buf
 
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
 
 class MockProvider:
     """Deterministic offline provider: answers by quoting the highest-ranked
     context, drafts by returning the grounded template. Clearly watermarked."""
 
-    async def complete(self, system: str, prompt: str, max_tokens: int = 2048, fast: bool = False) -> str:
+    name = "mock"
+
+    async def complete(self, system: Prompt, prompt: Prompt, max_tokens: int = 2048, fast: bool = False) -> str:
+        system, prompt = prompt_text(system), prompt_text(prompt)
         if "classify" in system.lower():
             p = prompt.lower()
             if any(w in p for w in ("draft", "prepare", "write a")):
@@ -327,11 +579,14 @@ class MockProvider:
             + "\n".join(lines[:8])
         )
 
-    async def stream(self, system: str, prompt: str, max_tokens: int = 8192) -> AsyncIterator[str]:
+    async def stream(self, system: Prompt, prompt: Prompt, max_tokens: int = 8192) -> AsyncIterator[str]:
         text = await self.complete(system, prompt, max_tokens)
         for i in range(0, len(text), 24):
             yield text[i : i + 24]
 
+    async def aclose(self) -> None:
+        return None
+
 
 class FallbackProvider:
     """Tries a primary provider and, on failure, transparently falls back to a
@@ -347,15 +602,22 @@ class FallbackProvider:
         self._secondary = secondary
         self._pn = primary_name
         self._sn = secondary_name
+        self.name = primary_name
+
+    def _fell_back(self) -> None:
+        call = _call_var.get()
+        LLM_FALLBACKS.labels(self._pn, self._sn, call.site if call else llm_site_var.get()).inc()
+        _report(self._sn, getattr(self._secondary, "_model", None) or self._sn)
 
-    async def complete(self, system: str, prompt: str, max_tokens: int = 2048, fast: bool = False) -> str:
+    async def complete(self, system: Prompt, prompt: Prompt, max_tokens: int = 2048, fast: bool = False) -> str:
         try:
             return await self._primary.complete(system, prompt, max_tokens, fast=fast)
         except Exception as e:
             log().warning("LLM primary (%s) complete failed, falling back to %s: %s", self._pn, self._sn, e)
+            self._fell_back()
             return await self._secondary.complete(system, prompt, max_tokens, fast=fast)
 
-    async def stream(self, system: str, prompt: str, max_tokens: int = 8192) -> AsyncIterator[str]:
+    async def stream(self, system: Prompt, prompt: Prompt, max_tokens: int = 8192) -> AsyncIterator[str]:
         agen = self._primary.stream(system, prompt, max_tokens)
         try:
             first = await agen.__anext__()
@@ -364,6 +626,7 @@ class FallbackProvider:
         except Exception as e:
             log().warning("LLM primary (%s) stream failed before first token, falling back to %s: %s",
                           self._pn, self._sn, e)
+            self._fell_back()
             async for tok in self._secondary.stream(system, prompt, max_tokens):
                 yield tok
             return
@@ -371,6 +634,90 @@ class FallbackProvider:
         async for tok in agen:
             yield tok
 
+    async def aclose(self) -> None:
+        await self._primary.aclose()
+        await self._secondary.aclose()
+
+
+class MeteredProvider:
+    """Times and counts every call of the provider it wraps (see the module
+    docstring). The provider and model labels are whoever actually served
+    the call: providers report it, with token usage, through ``_report``."""
+
+    def __init__(self, inner: LLMProvider) -> None:
+        self._inner = inner
+        self.name = getattr(inner, "name", type(inner).__name__)
+        self._model = getattr(inner, "_model", "")
+        self._fast_model = getattr(inner, "_fast_model", "")
+
+    def _call(self, fast: bool = False) -> _Call:
+        model = (self._fast_model if fast else self._model) or self.name
+        return _Call(llm_site_var.get(), self.name, model, llm_tenant_var.get())
+
+    @staticmethod
+    def _count(call: _Call, generation_seconds: float) -> None:
+        labels = (call.provider, call.model, call.site)
+        if call.prompt_tokens is not None:
+            LLM_TOKENS.labels(*labels, "prompt").inc(call.prompt_tokens)
+        if call.completion_tokens is not None:
+            LLM_TOKENS.labels(*labels, "completion").inc(call.completion_tokens)
+            if call.completion_tokens and generation_seconds > 0:
+                LLM_TOKENS_PER_SECOND.labels(*labels).observe(call.completion_tokens / generation_seconds)
+
+    async def complete(self, system: Prompt, prompt: Prompt, max_tokens: int = 2048, fast: bool = False) -> str:
+        call = self._call(fast)
+        token = _call_var.set(call)
+        started = time.perf_counter()
+        try:
+            out = await self._inner.complete(system, prompt, max_tokens, fast=fast)
+        except Exception:
+            LLM_ERRORS.labels(call.provider, call.model, call.site).inc()
+            raise
+        finally:
+            _call_var.reset(token)
+        elapsed = time.perf_counter() - started - call.queued_seconds
+        LLM_COMPLETE_SECONDS.labels(call.provider, call.model, call.site).observe(elapsed)
+        self._count(call, elapsed)
+        return out
+
+    def stream(self, system: Prompt, prompt: Prompt, max_tokens: int = 8192) -> AsyncIterator[str]:
+        # Not a generator itself: the call site is captured here, where the
+        # stream is requested, even if it is consumed by another task.
+        return self._stream(self._call(), system, prompt, max_tokens)
+
+    async def _stream(self, call: _Call, system: Prompt, prompt: Prompt,
+                      max_tokens: int) -> AsyncIterator[str]:
+        started = time.perf_counter()
+        first = last = None
+        try:
+            async with aclosing(self._inner.stream(system, prompt, max_tokens)) as pieces:
+                while True:
+                    # The call is only current while the provider runs, never
+                    # across our own yield to the consumer.
+                    token = _call_var.set(call)
+                    try:
+                        piece = await pieces.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    finally:
+                        _call_var.reset(token)
+                    now = time.perf_counter()
+                    if first is None:
+                        first = now
+                        LLM_TTFT.labels(call.provider, call.model, call.site).observe(
+                            now - started - call.queued_seconds)
+                    else:
+                        LLM_INTER_TOKEN.labels(call.provider, call.model, call.site).observe(now - last)
+                    last = now
+                    yield piece
+        except Exception:
+            LLM_ERRORS.labels(call.provider, call.model, call.site).inc()
+            raise
+        self._count(call, (last - first) if first is not None else 0.0)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
 
 def _ollama_reachable(cfg: Config) -> bool:
     """Best-effort liveness probe so 'auto' only picks Ollama when it answers."""
@@ -412,12 +759,21 @@ def _make_primary(cfg: Config) -> LLMProvider:
     return MockProvider()
 
 
-def make_llm(cfg: Config) -> LLMProvider:
-    primary = _make_primary(cfg)
+def make_llm(cfg: Config, scheduler: Optional["LLMScheduler"] = None) -> LLMProvider:
+    """The configured provider (with its fallback), metered. With
+    ``scheduler``, each underlying provider's calls wait for one of its slots."""
+    return MeteredProvider(_make_unmetered(cfg, scheduler))
+
+
+def _make_unmetered(cfg: Config, scheduler: Optional["LLMScheduler"]) -> LLMProvider:
+    def scheduled(provider: LLMProvider) -> LLMProvider:
+        return scheduler.bind(provider) if scheduler is not None else provider
+
+    primary = scheduled(_make_primary(cfg))
     fb = (cfg.llm_fallback_provider or "").strip()
     if fb and fb != cfg.llm_provider:
         try:
-            secondary = _build_named(cfg, fb)
+            secondary = scheduled(_build_named(cfg, fb))
         except ValueError:
             log().warning("ignoring unknown LLM_FALLBACK_PROVIDER=%r", fb)
             return primary
@@ -0,0 +1,111 @@
+"""Tenant-partitioned cache of LLM ``complete()`` results.
+
+Identical completions recur constantly — intent classification of repeated
+queries, the same research question re-asked over an unchanged corpus — and
+each one is a full model call. ``CompletionCache`` keeps their results keyed
+by a hash of (provider, model, system, prompt, max_tokens, fast), in one
+partition per tenant plus a shared ``public`` partition for prompts that
+carry no TENANT_PRIVATE context, so one firm's answer is never served to
+another. Entries expire after a TTL and the cache is size-bounded (LRU).
+
+Invalidation follows the data: a public-corpus ingestion pass drops every
+partition (tenant answers cite public law too); a firm ingestion or erasure
+drops that firm's partition. A completion that started before an
+invalidation is not stored afterwards.
+
+Caching is opt-in per call site: the site wraps its provider with
+``CompletionCache.bind`` and names the partition. Streams pass straight
+through — a stream is never cached, complete or not.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import AsyncIterator, Optional
+
+from prometheus_client import Counter
+
+from .llm import LLMProvider, Prompt, prompt_text
+from .logging_setup import log
+from .lru import LRU
+
+PUBLIC = "public"
+# How private context shows up in a prompt: a TENANT_PRIVATE-labelled chunk,
+# or the firm's judge pattern block.
+_PRIVATE_MARKERS = ("(TENANT_PRIVATE", "FIRM-INTERNAL HISTORICAL PATTERN")
+
+LLM_CACHE_LOOKUPS = Counter("wakili_ai_llm_cache_lookups_total",
+                            "Completion cache lookups by call site; hit/(hit+miss) is the hit rate",
+                            ["site", "result"])  # result: hit|miss|bypass
+
+
+def _provider_id(llm: LLMProvider) -> list[str]:
+    return [getattr(llm, "name", type(llm).__name__), getattr(llm, "_model", ""),
+            getattr(llm, "_fast_model", "")]
+
+
+class CompletionCache:
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 3600.0) -> None:
+        self._lru = LRU(max_entries, ttl_seconds)
+        self._generation = 0                  # bumped by a public-corpus pass
+        self._tenant_gen: dict[str, int] = {}
+
+    def generation(self, partition: str) -> tuple[int, int]:
+        return self._generation, self._tenant_gen.get(partition, 0)
+
+    def get(self, partition: str, key: str) -> Optional[str]:
+        return self._lru.get((partition, key))
+
+    def put(self, partition: str, key: str, value: str, generation: tuple[int, int]) -> None:
+        if generation == self.generation(partition):
+            self._lru.put((partition, key), value)
+
+    def invalidate(self, tenant_id: Optional[str] = None) -> None:
+        """Drop one tenant's partition, or — for a corpus change — all of them."""
+        if tenant_id is None:
+            self._generation += 1
+            self._lru.drop(lambda k: True)
+        else:
+            self._tenant_gen[tenant_id] = self._tenant_gen.get(tenant_id, 0) + 1
+            self._lru.drop(lambda k: k[0] == tenant_id)
+
+    def bind(self, llm: LLMProvider, tenant_id: Optional[str], site: str) -> "CachingProvider":
+        """``llm`` with completions cached in ``tenant_id``'s partition, or the
+        public one when ``tenant_id`` is None (the prompt holds no private
+        context). ``site`` labels the hit-rate metrics."""
+        return CachingProvider(llm, self, tenant_id or PUBLIC, site)
+
+
+class CachingProvider:
+    def __init__(self, inner: LLMProvider, cache: CompletionCache, partition: str, site: str) -> None:
+        self._inner = inner
+        self._cache = cache
+        self._partition = partition
+        self._site = site
+
+    async def complete(self, system: Prompt, prompt: Prompt, max_tokens: int = 2048, fast: bool = False) -> str:
+        user = prompt_text(prompt)
+        if self._partition == PUBLIC and any(m in user for m in _PRIVATE_MARKERS):
+            # Private context bound to the shared partition: a call-site bug,
+            # never a reason to share a firm's answer.
+            log().warning("completion cache bypassed: private context at public site %s", self._site)
+            LLM_CACHE_LOOKUPS.labels(self._site, "bypass").inc()
+            return await self._inner.complete(system, prompt, max_tokens, fast=fast)
+        key = hashlib.sha256(json.dumps(
+            _provider_id(self._inner) + [prompt_text(system), user, max_tokens, fast]).encode()).hexdigest()
+        hit = self._cache.get(self._partition, key)
+        if hit is not None:
+            LLM_CACHE_LOOKUPS.labels(self._site, "hit").inc()
+            return hit
+        LLM_CACHE_LOOKUPS.labels(self._site, "miss").inc()
+        generation = self._cache.generation(self._partition)
+        out = await self._inner.complete(system, prompt, max_tokens, fast=fast)
+        self._cache.put(self._partition, key, out, generation)
+        return out
+
+    def stream(self, system: Prompt, prompt: Prompt, max_tokens: int = 8192) -> AsyncIterator[str]:
+        return self._inner.stream(system, prompt, max_tokens)
+
+    async def aclose(self) -> None:
+        """The wrapped provider belongs to whoever bound it."""
+        return None
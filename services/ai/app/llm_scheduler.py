@@ -0,0 +1,237 @@
+"""Priority-aware concurrency limits in front of each LLM provider.
+
+Interactive synthesis, drafting streams and background recording summaries
+all share one backend; on a CPU-only Ollama a couple of concurrent summaries
+are enough to push an advocate's answer past the gateway deadline.
+``LLMScheduler`` gives every provider (by name — the main service and the
+recording processor share one lane per backend) at most
+``LLM_CONCURRENCY_<PROVIDER>`` calls in flight; a stream holds its slot until
+it is closed. Calls waiting for a slot are served by priority class:
+
+  * ``interactive`` — ``complete()`` calls made for an RPC (intent, answer,
+    reasoning synthesis);
+  * ``streaming`` — ``stream()`` calls (reasoning answers, drafts);
+  * ``background`` — call sites in ``BACKGROUND_SITES`` (recording summaries).
+
+Within a class, tenants take turns (round-robin), so one firm's burst cannot
+starve another's. Background calls back off while advocates are active: one
+only starts when no foreground call is queued or in flight and none has
+finished for ``LLM_BACKGROUND_IDLE_SECONDS``, with at most
+``LLM_BACKGROUND_CONCURRENCY`` running — unless it has already waited
+``LLM_BACKGROUND_MAX_WAIT_SECONDS``, after which it only waits for a slot.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+
+from prometheus_client import Gauge, Histogram
+
+from .config import Config
+from .llm import LLMProvider, Prompt, _call_var, llm_site_var, llm_tenant_var
+
+INTERACTIVE, STREAMING, BACKGROUND = "interactive", "streaming", "background"
+PRIORITIES = (INTERACTIVE, STREAMING, BACKGROUND)
+BACKGROUND_SITES = frozenset({"summary"})
+
+LLM_QUEUE_DEPTH = Gauge("wakili_ai_llm_queue_depth", "LLM calls waiting for a provider slot",
+                        ["provider", "priority"])
+LLM_IN_FLIGHT = Gauge("wakili_ai_llm_in_flight", "LLM calls holding a provider slot",
+                      ["provider", "priority"])
+LLM_QUEUE_WAIT = Histogram("wakili_ai_llm_queue_wait_seconds",
+                           "Time an LLM call waited for a provider slot", ["provider", "priority"],
+                           buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120))
+
+
+def _classify(stream: bool) -> tuple[str, str]:
+    """(priority class, tenant) of the call being made: from the metered
+    call record when there is one, else the caller's labels."""
+    call = _call_var.get()
+    site = call.site if call is not None else llm_site_var.get()
+    tenant = call.tenant_id if call is not None else llm_tenant_var.get()
+    if site in BACKGROUND_SITES:
+        return BACKGROUND, tenant
+    return (STREAMING if stream else INTERACTIVE), tenant
+
+
+@dataclass
+class _Waiter:
+    priority: str
+    tenant: str
+    enqueued: float
+    granted: asyncio.Future = field(repr=False)
+
+
+class _Lane:
+    """The slots of one provider and the calls queued for them."""
+
+    def __init__(self, provider: str, limit: int, background_limit: int,
+                 background_idle: float, background_max_wait: float) -> None:
+        self.provider = provider
+        self.limit = limit
+        self.background_limit = max(1, background_limit)
+        self.background_idle = background_idle
+        self.background_max_wait = background_max_wait
+        # priority -> tenant -> FIFO; tenants rotate to the back once served.
+        self._queues: dict[str, OrderedDict[str, deque[_Waiter]]] = {p: OrderedDict() for p in PRIORITIES}
+        self.in_flight = {p: 0 for p in PRIORITIES}
+        self._foreground_at = float("-inf")  # last foreground start/finish
+        self._wake: Optional[asyncio.TimerHandle] = None
+
+    @asynccontextmanager
+    async def slot(self, priority: str, tenant: str) -> AsyncIterator[None]:
+        await self._acquire(priority, tenant)
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    async def _acquire(self, priority: str, tenant: str) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(priority, tenant, loop.time(), loop.create_future())
+        self._queues[priority].setdefault(tenant, deque()).append(waiter)
+        LLM_QUEUE_DEPTH.labels(self.provider, priority).inc()
+        self._dispatch()
+        try:
+            await waiter.granted
+        except asyncio.CancelledError:
+            if waiter.granted.done() and not waiter.granted.cancelled():
+                self._release(priority)  # granted just as the caller gave up
+            else:
+                self._discard(waiter)
+            raise
+        waited = loop.time() - waiter.enqueued
+        LLM_QUEUE_WAIT.labels(self.provider, priority).observe(waited)
+        call = _call_var.get()
+        if call is not None:
+            call.queued_seconds += waited
+
+    def _release(self, priority: str) -> None:
+        self.in_flight[priority] -= 1
+        LLM_IN_FLIGHT.labels(self.provider, priority).dec()
+        if priority != BACKGROUND:
+            self._foreground_at = asyncio.get_running_loop().time()
+        self._dispatch()
+
+    def _discard(self, waiter: _Waiter) -> None:
+        tenants = self._queues[waiter.priority]
+        queue = tenants.get(waiter.tenant)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del tenants[waiter.tenant]
+            LLM_QUEUE_DEPTH.labels(self.provider, waiter.priority).dec()
+
+    def _dispatch(self) -> None:
+        while sum(self.in_flight.values()) < self.limit:
+            waiter = self._next()
+            if waiter is None:
+                return
+            self.in_flight[waiter.priority] += 1
+            LLM_IN_FLIGHT.labels(self.provider, waiter.priority).inc()
+            if waiter.priority != BACKGROUND:
+                self._foreground_at = asyncio.get_running_loop().time()
+            waiter.granted.set_result(None)
+
+    def _next(self) -> Optional[_Waiter]:
+        """Dequeue the next call to run: the highest class with a runnable
+        call, the tenant whose turn it is within that class."""
+        for priority in PRIORITIES:
+            tenants = self._queues[priority]
+            while tenants:
+                tenant, queue = next(iter(tenants.items()))
+                waiter = queue[0]
+                if waiter.granted.done():  # cancelled while queued
+                    self._discard(waiter)
+                    continue
+                if priority == BACKGROUND and not self._background_may_start(waiter):
+                    return None
+                queue.popleft()
+                if queue:
+                    tenants.move_to_end(tenant)
+                else:
+                    del tenants[tenant]
+                LLM_QUEUE_DEPTH.labels(self.provider, priority).dec()
+                return waiter
+        return None
+
+    def _background_may_start(self, waiter: _Waiter) -> bool:
+        # Only reached with no foreground call queued.
+        if self.in_flight[BACKGROUND] >= self.background_limit:
+            return False
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        recheck = waiter.enqueued + self.background_max_wait
+        if now >= recheck:
+            return True
+        if not (self.in_flight[INTERACTIVE] or self.in_flight[STREAMING]):
+            quiet = self._foreground_at + self.background_idle
+            if now >= quiet:
+                return True
+            recheck = min(recheck, quiet)
+        # Foreground work is running (a release dispatches again) or only
+        # just finished: look again once it has been quiet, or the waiter
+        # has aged, long enough.
+        if self._wake is None or self._wake.when() > recheck:
+            if self._wake is not None:
+                self._wake.cancel()
+            self._wake = loop.call_at(recheck, self._woken)
+        return False
+
+    def _woken(self) -> None:
+        self._wake = None
+        self._dispatch()
+
+
+class ScheduledProvider:
+    """A provider whose calls wait for a slot in its lane."""
+
+    def __init__(self, inner: LLMProvider, lane: _Lane) -> None:
+        self._inner = inner
+        self._lane = lane
+        self.name = getattr(inner, "name", type(inner).__name__)
+        self._model = getattr(inner, "_model", "")
+        self._fast_model = getattr(inner, "_fast_model", "")
+
+    async def complete(self, system: Prompt, prompt: Prompt, max_tokens: int = 2048, fast: bool = False) -> str:
+        async with self._lane.slot(*_classify(stream=False)):
+            return await self._inner.complete(system, prompt, max_tokens, fast=fast)
+
+    async def stream(self, system: Prompt, prompt: Prompt, max_tokens: int = 8192) -> AsyncIterator[str]:
+        async with self._lane.slot(*_classify(stream=True)):
+            async with aclosing(self._inner.stream(system, prompt, max_tokens)) as pieces:
+                async for piece in pieces:
+                    yield piece
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class LLMScheduler:
+    """One lane per provider name, shared by every provider bound to it."""
+
+    def __init__(self, cfg: Config) -> None:
+        self.cfg = cfg
+        self._limits = {
+            "anthropic": cfg.llm_concurrency_anthropic,
+            "gmi": cfg.llm_concurrency_gmi,
+            "ollama": cfg.llm_concurrency_ollama,
+        }
+        self._lanes: dict[str, _Lane] = {}
+
+    def bind(self, llm: LLMProvider) -> LLMProvider:
+        """``llm`` with its calls scheduled in its provider's lane; unchanged
+        for providers without a limit (the mock, or a limit <= 0)."""
+        name = getattr(llm, "name", type(llm).__name__)
+        limit = self._limits.get(name, 0)
+        if limit <= 0:
+            return llm
+        lane = self._lanes.get(name)
+        if lane is None:
+            lane = self._lanes[name] = _Lane(
+                name, limit, self.cfg.llm_background_concurrency,
+                self.cfg.llm_background_idle_seconds, self.cfg.llm_background_max_wait_seconds)
+        return ScheduledProvider(llm, lane)
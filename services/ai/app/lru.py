@@ -0,0 +1,34 @@
+"""Small in-process LRU with a TTL, shared by the judge-context and LLM
+completion caches. Not thread-safe: both are used from the event loop only."""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRU:
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._items: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        hit = self._items.get(key)
+        if hit is None:
+            return None
+        if time.monotonic() - hit[0] > self.ttl:
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return hit[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._items[key] = (time.monotonic(), value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+    def drop(self, pred: Callable[[Hashable], bool]) -> None:
+        for key in [k for k in self._items if pred(k)]:
+            del self._items[key]
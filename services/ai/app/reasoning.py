@@ -1,20 +1,38 @@
 """Multi-hop graph reasoning across the public law graph and one tenant's
 private partition, producing an explainable trace.
+
+``reason`` returns the finished trace; ``reason_stream`` yields each hop as it
+resolves, then the evidence, then the answer text, so a client sees progress
+after the first hop and can cancel a long run.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Optional
+import asyncio
+from contextlib import aclosing
+from dataclasses import dataclass, field, replace
+from typing import AsyncIterator, Optional, Sequence, Union
 
 import asyncpg
 
 from . import db as dbx
 from .config import Config
+from .deadline import Budget
 from .graph import Graph, PublicGraphQuery, TenantScopedGraphQuery
-from .llm import CONFIDENTIALITY_PREAMBLE, LLMProvider
+from .graph.pagerank import personalized_pagerank
+from .graph.snapshot import EXPANDABLE_LABELS, REASONING_RELS, Edge, PublicGraphCache, best_edges
+from .llm import CONFIDENTIALITY_PREAMBLE, LLMProvider, PromptSegment, llm_call_site
 from .logging_setup import log
 from .retrieval import RankedChunk, RetrievalOrchestrator
 
+# Synthesis context cap: on CPU-only Ollama deployments a large prompt + long
+# generation blows past the gateway/proxy timeout. 8 chunks keeps the
+# doctrinal chain intact while staying inside the latency budget.
+EVIDENCE_SLOTS = 8
+
+# Streamed answers stop this far ahead of the RPC deadline so the final frame
+# (degraded stages) still reaches the client.
+FINAL_FRAME_MARGIN_SECONDS = 0.25
+
 
 @dataclass
 class Step:
@@ -24,14 +42,22 @@ class Step:
     edge_types: list[str] = field(default_factory=list)
 
 
+# What ``reason_stream`` yields: a resolved hop, the evidence set (once), or a
+# chunk of answer text.
+ReasoningEvent = Union[Step, list[RankedChunk], str]
+
+
 class ReasoningEngine:
     def __init__(self, pool: asyncpg.Pool, graph: Graph, retriever: RetrievalOrchestrator,
-                 llm: LLMProvider, cfg: Config) -> None:
+                 llm: LLMProvider, cfg: Config, snapshot: Optional[PublicGraphCache] = None) -> None:
         self.pool = pool
         self.graph = graph
         self.retriever = retriever
         self.llm = llm
         self.cfg = cfg
+        # In-process public graph; public hops fall back to Neo4j until the
+        # first snapshot is built (or when the snapshot is disabled).
+        self.snapshot = snapshot
 
     async def reason(
         self,
@@ -40,125 +66,229 @@ class ReasoningEngine:
         max_hops: int = 3,
         matter_id: Optional[str] = None,
         include_superseded: bool = False,
+        budget: Optional[Budget] = None,
     ) -> tuple[list[Step], list[RankedChunk], str]:
-        max_hops = max(1, min(max_hops or 3, 5))
+        budget = budget or Budget()
+        evidence: list[RankedChunk] = []
+        steps = [s async for s in self._explore(
+            tenant_id, query, max_hops, matter_id, include_superseded, budget, evidence)]
+        try:
+            answer = await asyncio.wait_for(
+                self._synthesize(query, steps, evidence), timeout=budget.timeout())
+        except asyncio.TimeoutError:
+            budget.degrade("answer_synthesis")
+            log().warning("reasoning synthesis exceeded the RPC deadline; returning trace only")
+            answer = ("The reasoning answer could not be synthesized within the request "
+                      "deadline. The traversal trace and evidence below are complete.")
+        return steps, evidence, answer
+
+    async def reason_stream(
+        self,
+        tenant_id: str,
+        query: str,
+        max_hops: int = 3,
+        matter_id: Optional[str] = None,
+        include_superseded: bool = False,
+        budget: Optional[Budget] = None,
+    ) -> AsyncIterator[ReasoningEvent]:
+        """Same run as ``reason``, yielding each ``Step`` as its hop resolves,
+        then the evidence list, then answer text chunks. Closing or cancelling
+        the consumer cancels whatever is in flight (a Neo4j read, the evidence
+        query or the LLM stream, which is closed rather than left to the GC)."""
+        budget = budget or Budget()
+        evidence: list[RankedChunk] = []
         steps: list[Step] = []
+        async with aclosing(self._explore(tenant_id, query, max_hops, matter_id,
+                                          include_superseded, budget, evidence)) as hops:
+            async for step in hops:
+                steps.append(step)
+                yield step
+        yield evidence
+
+        system, prompt = self._synthesis_prompt(query, steps, evidence)
+        with llm_call_site("reason"):
+            answer = self.llm.stream(system=system, prompt=prompt, max_tokens=1024)
+        async with aclosing(answer) as tokens:
+            async for token in tokens:
+                yield token
+                remaining = budget.remaining()
+                if remaining is not None and remaining < FINAL_FRAME_MARGIN_SECONDS:
+                    budget.degrade("answer_synthesis")
+                    log().warning("streamed reasoning answer cut short at the RPC deadline")
+                    break
+
+    async def _explore(
+        self,
+        tenant_id: str,
+        query: str,
+        max_hops: int,
+        matter_id: Optional[str],
+        include_superseded: bool,
+        budget: Budget,
+        evidence: list[RankedChunk],
+    ) -> AsyncIterator[Step]:
+        """Anchor, traverse and rank: yields the trace hop by hop and leaves
+        the ranked evidence in ``evidence``."""
+        max_hops = max(1, min(max_hops or 3, 5))
 
         # Hop 0 — anchor selection: the matter node if given, else the
-        # top vector hits become graph anchors.
+        # top vector hits become graph anchors. The query embedding is kept
+        # to pick each discovered authority's most relevant passage later.
+        [qvec] = await self.retriever.embedder.embed([query])
         chunks, intent = await self.retriever.retrieve(
-            tenant_id, query, top_k=8, include_superseded=include_superseded, matter_id=matter_id
+            tenant_id, query, top_k=8, include_superseded=include_superseded, matter_id=matter_id,
+            budget=budget, query_vec=qvec,
         )
         public_anchor_ids = [c.source_id for c in chunks if c.source_type == "PUBLIC"][:4]
-        steps.append(Step(
+        yield Step(
             hop=0,
             description=f"Anchored on intent '{intent}': "
                         + (f"matter {matter_id} and " if matter_id else "")
                         + f"{len(public_anchor_ids)} public source(s) from hybrid retrieval",
             node_ids=([matter_id] if matter_id else []) + public_anchor_ids,
             edge_types=[],
-        ))
+        )
 
         # Hop 1 — tenant subgraph around the matter (private partition only,
         # composed through TenantScopedGraphQuery).
         touched_private_docs: list[str] = []
-        if matter_id:
+        if matter_id and budget.allows("tenant_traversal"):
             try:
                 q = (TenantScopedGraphQuery(tenant_id)
                      .match("m", "Matter", id=matter_id)
                      .expand("m", ["LINKED_TO", "CITES", "INVOLVES", "SIMILAR_TO"], "n", max_hops=2)
                      .returns("n.id AS id", "labels(n) AS labels")
                      .limit(50).build())
-                rows = await self.graph.read(q)
+                rows = await self.graph.read(q, timeout=budget.timeout(reserve=True))
                 ids = [r["id"] for r in rows if r.get("id")]
                 touched_private_docs = ids
-                steps.append(Step(
+                step = Step(
                     hop=1,
                     description=f"Traversed the firm's private graph around the matter: "
                                 f"{len(ids)} connected node(s) (documents, parties, precedent notes)",
                     node_ids=ids[:20],
                     edge_types=["LINKED_TO", "CITES", "INVOLVES", "SIMILAR_TO"],
-                ))
+                )
             except Exception as exc:
                 log().warning("tenant traversal failed: %s", exc)
+            else:
+                yield step
 
         # Hop 2..n — public-graph expansion from the anchors: citations,
         # interpretations, and the versioning/treatment edges that tell us
         # whether the law is still good.
         frontier = list(public_anchor_ids)
         seen = set(frontier)
+        traversed: list[Edge] = []
         hop_no = 2 if matter_id else 1
+        snapshot = self.snapshot.current if self.snapshot else None
         while frontier and hop_no <= max_hops:
-            next_frontier: list[str] = []
-            found: list[tuple[str, str, str]] = []
-            try:
-                for label in ("Statute", "CaseLaw", "Judgment"):
-                    q = (PublicGraphQuery()
-                         .match("a", label)
-                         .where_in("a", "doc_id", frontier)
-                         .expand("a", ["CITES", "INTERPRETS", "AMENDS", "OVERTURNS",
-                                       "DISTINGUISHES", "HAS_OPINION", "AUTHORED", "PART_OF"],
-                                 "b", max_hops=1)
-                         .returns("a.doc_id AS src", "b.doc_id AS dst", "b.title AS title")
-                         .limit(60).build())
-                    for r in await self.graph.read(q):
-                        dst = r.get("dst")
-                        if dst and dst not in seen:
-                            seen.add(dst)
-                            next_frontier.append(dst)
-                            found.append((r.get("src", ""), dst, r.get("title") or ""))
-            except Exception as exc:
-                log().warning("public traversal failed: %s", exc)
-                break
+            if snapshot is not None:
+                # Array slices, no round trip — never worth degrading.
+                found = snapshot.expand(frontier, seen)
+            else:
+                # Extra hops are optional: stop expanding (keeping what was
+                # found) once the remaining deadline is needed for synthesis.
+                if not budget.allows("reasoning_hop"):
+                    break
+                try:
+                    found = await self._expand_live(frontier, seen, budget)
+                except Exception as exc:
+                    log().warning("public traversal failed: %s", exc)
+                    break
             if not found:
                 break
-            steps.append(Step(
+            # ``found`` is ranked by edge-type weight, so the capped frontier
+            # keeps the most authoritative neighbours (treatment edges first).
+            yield Step(
                 hop=hop_no,
                 description=f"Expanded the public law graph: reached {len(found)} related "
                             f"authorities (citations, interpretations, amendment/overturn treatment)",
-                node_ids=[dst for _, dst, _ in found][:20],
-                edge_types=["CITES", "INTERPRETS", "AMENDS", "OVERTURNS", "DISTINGUISHES"],
-            ))
-            frontier = next_frontier[:8]
+                node_ids=[dst for _, dst, _, _ in found][:20],
+                edge_types=list(dict.fromkeys(rel for _, _, _, rel in found)),
+            )
+            traversed.extend(found)
+            frontier = [dst for _, dst, _, _ in found][:8]
             hop_no += 1
 
-        # Pull text for newly discovered public authorities so the answer can
-        # cite them (provenance-tagged like everything else).
-        extra = await self._chunks_for_docs(list(seen - set(public_anchor_ids)))
-        # Cap the synthesis context: on CPU-only Ollama deployments a large
-        # prompt + long generation blows past the gateway/proxy timeout. 8 chunks
-        # keeps the doctrinal chain intact while staying inside the latency budget.
-        evidence = (chunks + extra)[:8]
+        # Rank what traversal reached and let the ranking decide which public
+        # authorities get the evidence slots. The snapshot gives the full
+        # induced subgraph; the live path only knows the BFS tree it walked.
+        if snapshot is not None:
+            traversed = snapshot.subgraph(seen)
+        if budget.allows("graph_evidence"):
+            evidence[:] = await self._rank_evidence(chunks, traversed, qvec)
+        else:
+            evidence[:] = chunks[:EVIDENCE_SLOTS]
 
-        answer = await self._synthesize(query, steps, evidence)
-        return steps, evidence, answer
+    async def _expand_live(self, frontier: list[str], seen: set[str],
+                           budget: Budget) -> list[Edge]:
+        """One public hop against Neo4j: a single query for the whole
+        frontier (multi-label anchor, fixed one-hop pattern)."""
+        q = (PublicGraphQuery()
+             .match_labels("a", EXPANDABLE_LABELS)
+             .where_in("a", "doc_id", frontier)
+             .match_hop("a", REASONING_RELS, "b", rel_alias="r")
+             .returns("a.doc_id AS src", "b.doc_id AS dst", "b.title AS title", "type(r) AS rel")
+             .limit(180).build())
+        rows = await self.graph.read(q, timeout=budget.timeout(reserve=True))
+        return best_edges(((r.get("src") or "", r["dst"], r.get("title") or "", r.get("rel") or "")
+                           for r in rows if r.get("dst")), seen)
+
+    async def _rank_evidence(self, chunks: list[RankedChunk], traversed: list[Edge],
+                             qvec: Sequence[float]) -> list[RankedChunk]:
+        """Fill the evidence slots. Tenant chunks keep the slots retrieval
+        gave them; the public slots go to anchors and graph-discovered
+        authorities in personalized-PageRank order, seeded by the public
+        retrieval hits (by rank) and walking edges by ``EDGE_WEIGHTS``.
+
+        Anchors and discovered authorities are ranked and scored on the same
+        scale, PPR mass normalised to the best document (0..1]; an anchor's
+        retrieval score is kept as ``metadata["retrieval_score"]``."""
+        seeds: dict[str, float] = {}
+        for c in chunks:
+            if c.source_type == "PUBLIC" and c.source_id not in seeds:
+                seeds[c.source_id] = 1.0 / (len(seeds) + 1)
+        scores = personalized_pagerank(traversed, seeds)
+        top = max(scores.values(), default=0.0) or 1.0
 
-    async def _chunks_for_docs(self, doc_ids: list[str]) -> list[RankedChunk]:
-        out: list[RankedChunk] = []
+        def on_ppr_scale(c: RankedChunk) -> RankedChunk:
+            return replace(c, score=round(scores.get(c.source_id, 0.0) / top, 4))
+
+        discovered = sorted((d for d in scores if d not in seeds), key=lambda d: -scores[d])
+        extra = [on_ppr_scale(c) for c in await self._chunks_for_docs(discovered[:EVIDENCE_SLOTS], qvec)]
+        anchors = [on_ppr_scale(replace(c, metadata={**c.metadata, "retrieval_score": c.score}))
+                   for c in chunks if c.source_type == "PUBLIC"]
+        # Stable sort: an anchor's chunks stay in retrieval order and ahead
+        # of a discovered authority with an equal score.
+        public = sorted(anchors + extra, key=lambda c: -scores.get(c.source_id, 0.0))
+
+        slots = [c if c.source_type != "PUBLIC" else None for c in chunks[:EVIDENCE_SLOTS]]
+        slots += [None] * (EVIDENCE_SLOTS - len(slots))
+        ranked = iter(public)
+        evidence = [c if c is not None else next(ranked, None) for c in slots]
+        return [c for c in evidence if c is not None]
+
+    async def _chunks_for_docs(self, doc_ids: list[str],
+                               qvec: Sequence[float]) -> list[RankedChunk]:
+        """Each doc's passage closest to the query, in ``doc_ids`` order."""
         if not doc_ids:
-            return out
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch(
-                """SELECT DISTINCT ON (v.doc_id) v.id::text AS chunk_id, v.doc_id, v.chunk_text,
-                          d.title, d.citation, d.source_url, d.court, d.year, d.status
-                   FROM public.public_vectors v
-                   JOIN public.public_documents d ON d.doc_id = v.doc_id
-                   WHERE v.doc_id = ANY($1::text[])
-                   ORDER BY v.doc_id, v.chunk_index
-                   LIMIT 6""",
-                doc_ids[:6],
-            )
-        for r in rows:
-            out.append(RankedChunk(
-                chunk_id=r["chunk_id"], text=r["chunk_text"], score=0.5,
+            return []
+        rows = await dbx.best_public_chunks(self.pool, doc_ids, qvec)
+        return [
+            RankedChunk(
+                chunk_id=r["chunk_id"], text=r["chunk_text"], score=float(r["score"]),
                 source_type="PUBLIC", source_id=r["doc_id"],
                 citation=r["citation"] or r["title"] or "", source_url=r["source_url"] or "",
                 status=r["status"] or "current", court=r["court"] or "", year=int(r["year"] or 0),
-                metadata={"title": r["title"] or "", "via": "graph_traversal"},
-            ))
-        return out
+                metadata={"title": r["title"] or "", "via": "graph_traversal",
+                          "similarity": round(float(r["score"]), 4)},
+            )
+            for r in rows
+        ]
 
-    async def _synthesize(self, query: str, steps: list[Step], evidence: list[RankedChunk]) -> str:
+    def _synthesis_prompt(self, query: str, steps: list[Step],
+                          evidence: list[RankedChunk]) -> tuple[list[PromptSegment], str]:
         trace_lines = [f"hop {s.hop}: {s.description}" for s in steps]
         ctx_lines = [
             f"[{i}] ({c.source_type}, status={c.status}) {c.citation or c.source_id}\n{c.text}"
@@ -178,6 +308,11 @@ class ReasoningEngine:
             "the doctrinal chain and about current vs superseded authority. "
             + CONFIDENTIALITY_PREAMBLE
         )
+        return [PromptSegment(system, cacheable=True)], prompt
+
+    async def _synthesize(self, query: str, steps: list[Step], evidence: list[RankedChunk]) -> str:
+        system, prompt = self._synthesis_prompt(query, steps, evidence)
         # 1024 is enough for a cited reasoning answer; larger budgets time out on
         # CPU-only local models (see evidence cap above).
-        return await self.llm.complete(system=system, prompt=prompt, max_tokens=1024)
+        with llm_call_site("reason"):
+            return await self.llm.complete(system=system, prompt=prompt, max_tokens=1024)
@@ -18,12 +18,14 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from typing import Optional
 
 from minio import Minio
 
 from .config import Config
 from .db import tenant_tx
-from .llm import OllamaProvider
+from .llm import MeteredProvider, OllamaProvider, llm_call_site
+from .llm_scheduler import LLMScheduler
 from .tenancy import validate_tenant_id
 from .transcription import make_transcriber
 
@@ -50,9 +52,12 @@ _MAX_TRANSCRIPT_CHARS = 12000
 
 
 class RecordingProcessor:
-    def __init__(self, pool, cfg: Config) -> None:
+    def __init__(self, pool, cfg: Config, llm_scheduler: Optional[LLMScheduler] = None) -> None:
         self.pool = pool
         self.cfg = cfg
+        # Summaries queue as background work behind the service's own calls
+        # to the same Ollama.
+        self.llm_scheduler = llm_scheduler
         self._task = None
         self._stopping = False
         self._transcriber = None  # lazily built (Whisper model load is heavy)
@@ -85,6 +90,9 @@ class RecordingProcessor:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        if self._llm:
+            await self._llm.aclose()
+            self._llm = None
 
     async def run_once(self) -> int:
         """Process every pending recording across all active tenants. Returns the
@@ -126,7 +134,7 @@ class RecordingProcessor:
             await self._update(tenant_id, rec_id,
                                status="summarizing", transcript_text=transcript)
 
-            summary, err = await self._summarize(transcript)
+            summary, err = await self._summarize(tenant_id, transcript)
             await self._update(tenant_id, rec_id, status="complete",
                                summary_text=summary, error=err)
             log.info("recording %s transcribed (%d chars) + summarized", rec_id, len(transcript))
@@ -134,17 +142,21 @@ class RecordingProcessor:
             log.exception("recording %s failed", rec_id)
             await self._update(tenant_id, rec_id, status="failed", error=str(exc)[:500])
 
-    async def _summarize(self, transcript: str) -> tuple[str, str]:
+    async def _summarize(self, tenant_id: str, transcript: str) -> tuple[str, str]:
         """Summarize with the LOCAL provider only. Best-effort: if the local LLM
         is unavailable we still deliver the transcript (empty summary + note)."""
         if not transcript:
             return "", "empty transcript"
         try:
             if not self._llm:
-                self._llm = OllamaProvider(self.cfg)  # hard local pin — never GMI
+                local = OllamaProvider(self.cfg)  # hard local pin — never GMI
+                if self.llm_scheduler is not None:
+                    local = self.llm_scheduler.bind(local)
+                self._llm = MeteredProvider(local)
             clipped = transcript[:_MAX_TRANSCRIPT_CHARS]
             prompt = _SUMMARY_TEMPLATE.format(transcript=clipped)
-            summary = await self._llm.complete(_SUMMARY_SYSTEM, prompt, max_tokens=1500)
+            with llm_call_site("summary", tenant_id):
+                summary = await self._llm.complete(_SUMMARY_SYSTEM, prompt, max_tokens=1500)
             return (summary or "").strip(), ""
         except Exception as exc:  # noqa: BLE001
             log.warning("recording summary (local LLM) failed: %s", exc)
@@ -4,17 +4,20 @@ provenance tagging -> cited answer synthesis.
 """
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 
 import asyncpg
 
 from . import db as dbx
 from .config import Config
+from .deadline import Budget
 from .embeddings import EmbeddingProvider
 from .graph import Graph, PublicGraphQuery, TenantScopedGraphQuery
-from .judge import JudgeReasoner
-from .llm import CONFIDENTIALITY_PREAMBLE, LLMProvider
+from .judge import JudgeContextCache, JudgeGazetteerCache, JudgeReasoner
+from .llm import CONFIDENTIALITY_PREAMBLE, LLMProvider, PromptSegment, llm_call_site
+from .llm_cache import CompletionCache
 from .logging_setup import log
 
 INTENTS = ("statute_lookup", "case_law_research", "matter_reasoning", "drafting")
@@ -37,13 +40,25 @@ class RankedChunk:
 
 class RetrievalOrchestrator:
     def __init__(self, pool: asyncpg.Pool, graph: Graph, embedder: EmbeddingProvider,
-                 llm: LLMProvider, cfg: Config) -> None:
+                 llm: LLMProvider, cfg: Config,
+                 judge_cache: Optional[JudgeContextCache] = None,
+                 gazetteer: Optional[JudgeGazetteerCache] = None,
+                 completion_cache: Optional[CompletionCache] = None) -> None:
         self.pool = pool
         self.graph = graph
         self.embedder = embedder
         self.llm = llm
         self.cfg = cfg
-        self.judge = JudgeReasoner(pool, graph, cfg)
+        self.judge = JudgeReasoner(pool, graph, cfg, cache=judge_cache)
+        self.gazetteer = gazetteer
+        self.completion_cache = completion_cache
+
+    def _llm_for(self, tenant_id: Optional[str], site: str) -> LLMProvider:
+        """The provider for a call site that opts into completion caching,
+        partitioned by ``tenant_id`` (None: the prompt is public-only)."""
+        if self.completion_cache is None:
+            return self.llm
+        return self.completion_cache.bind(self.llm, tenant_id, site)
 
     # -- 1. intent -----------------------------------------------------------
     async def classify_intent(self, query: str) -> str:
@@ -61,11 +76,13 @@ class RetrievalOrchestrator:
         if heuristic:
             return heuristic
         try:
-            answer = await self.llm.complete(
-                system="You classify Kenyan legal research queries. Reply with exactly one of: "
-                       "statute_lookup, case_law_research, matter_reasoning, drafting.",
-                prompt=query, max_tokens=16, fast=True,
-            )
+            # The label depends on the query text alone: public partition.
+            with llm_call_site("intent"):
+                answer = await self._llm_for(None, "intent").complete(
+                    system="You classify Kenyan legal research queries. Reply with exactly one of: "
+                           "statute_lookup, case_law_research, matter_reasoning, drafting.",
+                    prompt=query, max_tokens=16, fast=True,
+                )
             label = answer.strip().lower()
             if label in INTENTS:
                 return label
@@ -82,9 +99,18 @@ class RetrievalOrchestrator:
         include_superseded: bool = False,
         matter_id: Optional[str] = None,
         as_of: Optional[str] = None,
+        budget: Optional[Budget] = None,
+        query_vec: Optional[Sequence[float]] = None,
     ) -> tuple[list[RankedChunk], str]:
+        """``budget`` (the caller's RPC deadline) gates the optional graph
+        stages; skipped stages are recorded on ``budget.degraded``. Callers
+        that need the query embedding themselves pass it as ``query_vec``."""
+        budget = budget or Budget()
         intent = await self.classify_intent(query)
-        [qvec] = await self.embedder.embed([query])
+        if query_vec is not None:
+            qvec = query_vec
+        else:
+            [qvec] = await self.embedder.embed([query])
 
         fetch_n = max(top_k, 8)
         # as_of => period-accurate law (the version in force on that date).
@@ -96,9 +122,13 @@ class RetrievalOrchestrator:
         # Graph expansion: docs connected to the anchor matter get boosted, and
         # status edges on retrieved public docs surface "overturned by X" facts.
         matter_doc_ids: set[str] = set()
-        if matter_id:
-            matter_doc_ids = await self._matter_document_ids(tenant_id, matter_id)
-        status_notes = await self._status_annotations([r["doc_id"] for r in public_rows])
+        if matter_id and budget.allows("matter_expansion"):
+            matter_doc_ids = await self._matter_document_ids(
+                tenant_id, matter_id, timeout=budget.timeout(reserve=True))
+        status_notes: dict[str, str] = {}
+        if budget.allows("status_annotations"):
+            status_notes = await self._status_annotations(
+                [r["doc_id"] for r in public_rows], timeout=budget.timeout(reserve=True))
 
         chunks: list[RankedChunk] = []
         for r in public_rows:
@@ -135,19 +165,21 @@ class RetrievalOrchestrator:
         chunks.sort(key=lambda c: c.score, reverse=True)
         return chunks[:top_k], intent
 
-    async def _matter_document_ids(self, tenant_id: str, matter_id: str) -> set[str]:
+    async def _matter_document_ids(self, tenant_id: str, matter_id: str,
+                                   timeout: Optional[float] = None) -> set[str]:
         try:
             q = (TenantScopedGraphQuery(tenant_id)
                  .match("m", "Matter", id=matter_id)
                  .match_rel("m", ["LINKED_TO", "CITES", "INVOLVES"], "d", "Document")
                  .returns("d.id AS doc_id").limit(100).build())
-            rows = await self.graph.read(q)
+            rows = await self.graph.read(q, timeout=timeout)
             return {r["doc_id"] for r in rows if r.get("doc_id")}
         except Exception as exc:
             log().warning("matter graph expansion failed: %s", exc)
             return set()
 
-    async def _status_annotations(self, doc_ids: list[str]) -> dict[str, str]:
+    async def _status_annotations(self, doc_ids: list[str],
+                                  timeout: Optional[float] = None) -> dict[str, str]:
         """For each retrieved public doc, check AMENDS/OVERTURNS/DISTINGUISHES
         edges so stale law is flagged instead of silently served."""
         notes: dict[str, str] = {}
@@ -162,7 +194,7 @@ class RetrievalOrchestrator:
                                 "new", label, direction="any")
                      .returns("old.doc_id AS old_id", "new.title AS new_title", "new.doc_id AS new_id")
                      .limit(50).build())
-                for r in await self.graph.read(q):
+                for r in await self.graph.read(q, timeout=timeout):
                     if r.get("old_id") and r.get("new_title"):
                         notes[r["old_id"]] = f"related version/treatment: {r['new_title']} ({r.get('new_id','')})"
         except Exception as exc:
@@ -210,35 +242,76 @@ class RetrievalOrchestrator:
         return system, prompt
 
     async def answer(self, query: str, chunks: list[RankedChunk], intent: str,
-                     judge_context: str = "") -> str:
+                     judge_context: str = "", budget: Optional[Budget] = None,
+                     tenant_id: Optional[str] = None) -> str:
+        """Synthesize a cited answer. With ``tenant_id`` the completion is
+        cached — in the tenant's partition when firm-private context is in the
+        prompt, otherwise in the public one."""
         if not chunks and not judge_context:
             return ("No relevant sources found in the corpus yet. If this deployment is fresh, "
                     "run the public-corpus ingestion (it runs automatically at startup) or "
                     "ingest firm documents first.")
+        budget = budget or Budget()
         system, prompt = self.build_answer_prompt(query, chunks, intent, judge_context)
-        return await self.llm.complete(system=system, prompt=prompt, max_tokens=2048)
+        llm = self.llm
+        if tenant_id is not None:
+            private = bool(judge_context) or any(c.source_type == "TENANT_PRIVATE" for c in chunks)
+            llm = self._llm_for(tenant_id if private else None, "answer")
+        try:
+            with llm_call_site("answer"):
+                return await asyncio.wait_for(
+                    llm.complete(system=[PromptSegment(system, cacheable=True)], prompt=prompt,
+                                 max_tokens=2048),
+                    timeout=budget.timeout())
+        except asyncio.TimeoutError:
+            # Keep the retrieved sources: the caller still gets ranked,
+            # provenance-tagged chunks even when synthesis runs out of time.
+            budget.degrade("answer_synthesis")
+            log().warning("answer synthesis exceeded the RPC deadline; returning sources only")
+            return ("The answer could not be synthesized within the request deadline. "
+                    "The sources below were retrieved and ranked for your question.")
 
     async def _judge_context(self, tenant_id: str, query: str,
-                             judge_name: Optional[str] = None) -> str:
+                             judge_name: Optional[str] = None,
+                             budget: Optional[Budget] = None) -> str:
         """Firm-internal + public pattern summary for a judge named in the query
-        (or passed explicitly). Empty string unless ENABLE_JUDGE_REASONING."""
+        (or passed explicitly). Empty string unless ENABLE_JUDGE_REASONING.
+        Once the gazetteer is built, a query naming no known judge returns
+        before any graph read."""
         if not self.cfg.enable_judge_reasoning:
             return ""
-        name = judge_name or JudgeReasoner.detect_judge_name(query)
+        name, public_name = judge_name, None
+        gazetteer = self.gazetteer.current if self.gazetteer is not None else None
+        if not name and gazetteer is not None:
+            match = gazetteer.find(query)
+            if match is not None:
+                name, public_name = match.name, match.public_name
+        elif not name:
+            name = JudgeReasoner.detect_judge_name(query)
         if not name:
             return ""
+        budget = budget or Budget()
+        if not budget.allows("judge_context"):
+            return ""
         try:
-            return await self.judge.context_block(tenant_id, name)
+            return await asyncio.wait_for(
+                self.judge.context_block(tenant_id, name, public_name),
+                timeout=budget.timeout(reserve=True))
+        except asyncio.TimeoutError:
+            budget.degrade("judge_context")
+            return ""
         except Exception as exc:
             log().warning("judge context assembly failed: %s", exc)
             return ""
 
     async def answer_with_judge(self, tenant_id: str, query: str,
-                                chunks: list[RankedChunk], intent: str) -> str:
+                                chunks: list[RankedChunk], intent: str,
+                                budget: Optional[Budget] = None) -> str:
         """answer(), transparently enriched with judge pattern context when a
         judge is named in the query and the feature flag is on."""
-        judge_context = await self._judge_context(tenant_id, query)
-        return await self.answer(query, chunks, intent, judge_context)
+        judge_context = await self._judge_context(tenant_id, query, budget=budget)
+        return await self.answer(query, chunks, intent, judge_context, budget=budget,
+                                 tenant_id=tenant_id)
 
     async def judge_aware_retrieve(
         self, tenant_id: str, query: str, judge_name: Optional[str] = None,
@@ -253,5 +326,5 @@ class RetrievalOrchestrator:
             tenant_id, query, top_k=top_k,
             include_superseded=include_superseded, matter_id=matter_id)
         judge_context = await self._judge_context(tenant_id, query, judge_name)
-        answer = await self.answer(query, chunks, intent, judge_context)
+        answer = await self.answer(query, chunks, intent, judge_context, tenant_id=tenant_id)
         return chunks, intent, answer
@@ -9,8 +9,11 @@ from __future__ import annotations
 
 import asyncio
 import sys
+import time
 import uuid
+from contextlib import aclosing
 from pathlib import Path
+from typing import Optional
 
 _GEN = Path(__file__).resolve().parent.parent / "gen"
 if str(_GEN) not in sys.path:
@@ -18,30 +21,46 @@ if str(_GEN) not in sys.path:
 
 import grpc
 from aiohttp import web
-from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
 
 from wakili.v1 import common_pb2, drafting_pb2, drafting_pb2_grpc, ingestion_pb2, \
     ingestion_pb2_grpc, reasoning_pb2, reasoning_pb2_grpc, retrieval_pb2, retrieval_pb2_grpc
 
 from . import db as dbx
+from .clauses import ClauseEmbedder
 from .config import Config, load
+from .deadline import Budget
+from .draft_streams import COMPLETE, DraftStreams, skip_bytes
 from .drafting import DraftingEngine
 from .embeddings import make_embedder
 from .graph import Graph
+from .graph.snapshot import PublicGraphCache
 from .ingestion.auto_update import AutoUpdateWatcher
+from .ingestion.citations import CitationResolver
 from .recordings import RecordingProcessor
 from .ingestion.firm_queue import FirmIngestQueue, IngestJob
 from .ingestion.judge_profile import JudgeProfiler
 from .ingestion.pipeline import IngestionPipeline
-from .ingestion.scheduler import IngestionScheduler
+from .ingestion.scheduler import IngestionScheduler, PostRunSteps
 from .ingestion.tenant_ingest import TenantIngestor
-from .llm import make_llm
+from .judge import JudgeContextCache, JudgeGazetteerCache, JudgeHistoryBackfill
+from .llm import llm_tenant_var, make_llm
+from .llm_cache import CompletionCache
+from .llm_scheduler import LLMScheduler
 from .logging_setup import init as log_init, log, trace_id_var
-from .reasoning import ReasoningEngine
+from .reasoning import ReasoningEngine, Step
 from .retrieval import RankedChunk, RetrievalOrchestrator
 from .tenancy import TenantValidationError, validate_tenant_id
 
 RPC_COUNTER = Counter("wakili_ai_rpcs_total", "RPCs handled", ["method", "status"])
+DEGRADED_COUNTER = Counter("wakili_ai_degraded_stages_total",
+                           "Optional stages skipped to meet the RPC deadline", ["method", "stage"])
+DRAFT_TTFT = Histogram("wakili_ai_draft_ttft_seconds",
+                       "DraftDocument time from request to the first streamed token",
+                       buckets=(0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 8, 13, 21))
+DRAFT_MESSAGES = Histogram("wakili_ai_draft_messages",
+                           "DraftChunk messages sent per completed drafting stream",
+                           ["method"], buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500))
 
 _INTENT_TO_PROTO = {
     "statute_lookup": common_pb2.QUERY_INTENT_STATUTE_LOOKUP,
@@ -88,9 +107,22 @@ async def check_tenant(tenant_ctx: common_pb2.TenantContext, context: grpc.aio.S
             grpc.StatusCode.PERMISSION_DENIED,
             "tenant mismatch between request message and channel metadata",
         )
+    llm_tenant_var.set(tid)
     return tid
 
 
+def rpc_budget(context: grpc.aio.ServicerContext, cfg: Config) -> Budget:
+    return Budget.from_context(context, cfg.deadline_reserve_seconds)
+
+
+def record_degraded(method: str, budget: Budget) -> list[str]:
+    for stage in budget.degraded:
+        DEGRADED_COUNTER.labels(method, stage).inc()
+    if budget.degraded:
+        log().info("%s degraded to meet deadline: %s", method, ", ".join(budget.degraded))
+    return list(budget.degraded)
+
+
 def chunk_to_proto(c: RankedChunk) -> common_pb2.ContextChunk:
     return common_pb2.ContextChunk(
         chunk_id=c.chunk_id,
@@ -116,22 +148,26 @@ class RetrievalService(retrieval_pb2_grpc.RetrievalServiceServicer):
 
     async def Retrieve(self, request, context):
         tid = await check_tenant(request.tenant, context)
+        budget = rpc_budget(context, self.orchestrator.cfg)
         try:
             chunks, intent = await self.orchestrator.retrieve(
                 tid, request.query,
                 top_k=request.top_k or 12,
                 include_superseded=request.include_superseded,
                 matter_id=request.matter_id or None,
+                budget=budget,
             )
             # answer_with_judge no-ops unless ENABLE_JUDGE_REASONING and the
             # query names a judge, so the standard path is unchanged otherwise.
-            answer = await self.orchestrator.answer_with_judge(tid, request.query, chunks, intent)
+            answer = await self.orchestrator.answer_with_judge(
+                tid, request.query, chunks, intent, budget=budget)
             RPC_COUNTER.labels("Retrieve", "ok").inc()
             return retrieval_pb2.RankedContext(
                 chunks=[chunk_to_proto(c) for c in chunks],
                 classified_intent=_INTENT_TO_PROTO.get(intent, common_pb2.QUERY_INTENT_UNSPECIFIED),
                 answer=answer,
                 trace_id=request.trace_id,
+                degraded_stages=record_degraded("Retrieve", budget),
             )
         except Exception:
             RPC_COUNTER.labels("Retrieve", "error").inc()
@@ -139,61 +175,159 @@ class RetrievalService(retrieval_pb2_grpc.RetrievalServiceServicer):
             await context.abort(grpc.StatusCode.INTERNAL, "retrieval failed")
 
 
+def _step_to_proto(s: Step) -> reasoning_pb2.ReasoningStep:
+    return reasoning_pb2.ReasoningStep(
+        hop=s.hop, description=s.description, node_ids=s.node_ids, edge_types=s.edge_types)
+
+
 class ReasoningService(reasoning_pb2_grpc.ReasoningServiceServicer):
     def __init__(self, engine: ReasoningEngine) -> None:
         self.engine = engine
 
     async def Reason(self, request, context):
         tid = await check_tenant(request.tenant, context)
+        budget = rpc_budget(context, self.engine.cfg)
         try:
             steps, evidence, answer = await self.engine.reason(
                 tid, request.query,
                 max_hops=request.max_hops or 3,
                 matter_id=request.matter_id or None,
                 include_superseded=request.include_superseded,
+                budget=budget,
             )
             RPC_COUNTER.labels("Reason", "ok").inc()
             return reasoning_pb2.ReasoningTrace(
-                steps=[reasoning_pb2.ReasoningStep(
-                    hop=s.hop, description=s.description,
-                    node_ids=s.node_ids, edge_types=s.edge_types,
-                ) for s in steps],
+                steps=[_step_to_proto(s) for s in steps],
                 context=[chunk_to_proto(c) for c in evidence],
                 answer=answer,
                 trace_id=request.trace_id,
+                degraded_stages=record_degraded("Reason", budget),
             )
         except Exception:
             RPC_COUNTER.labels("Reason", "error").inc()
             log().exception("Reason failed")
             await context.abort(grpc.StatusCode.INTERNAL, "reasoning failed")
 
+    async def ReasonStream(self, request, context):
+        tid = await check_tenant(request.tenant, context)
+        budget = rpc_budget(context, self.engine.cfg)
+        try:
+            # A client cancel cancels this handler; aclosing propagates it
+            # into the engine so in-flight Neo4j/LLM work stops with it.
+            async with aclosing(self.engine.reason_stream(
+                tid, request.query,
+                max_hops=request.max_hops or 3,
+                matter_id=request.matter_id or None,
+                include_superseded=request.include_superseded,
+                budget=budget,
+            )) as events:
+                async for event in events:
+                    if isinstance(event, Step):
+                        yield reasoning_pb2.ReasoningEvent(step=_step_to_proto(event))
+                    elif isinstance(event, str):
+                        yield reasoning_pb2.ReasoningEvent(answer_delta=event)
+                    else:
+                        yield reasoning_pb2.ReasoningEvent(
+                            context=[chunk_to_proto(c) for c in event])
+            RPC_COUNTER.labels("ReasonStream", "ok").inc()
+            yield reasoning_pb2.ReasoningEvent(
+                is_final=True, trace_id=request.trace_id,
+                degraded_stages=record_degraded("ReasonStream", budget))
+        except asyncio.CancelledError:
+            RPC_COUNTER.labels("ReasonStream", "cancelled").inc()
+            log().info("ReasonStream cancelled by the caller")
+            raise
+        except Exception:
+            RPC_COUNTER.labels("ReasonStream", "error").inc()
+            log().exception("ReasonStream failed")
+            await context.abort(grpc.StatusCode.INTERNAL, "reasoning failed")
+
 
 class DraftingService(drafting_pb2_grpc.DraftingServiceServicer):
-    def __init__(self, engine: DraftingEngine) -> None:
+    def __init__(self, engine: DraftingEngine, streams: DraftStreams) -> None:
         self.engine = engine
+        self.streams = streams
 
     async def DraftDocument(self, request, context):
         tid = await check_tenant(request.tenant, context)
         doc_type = _DOCTYPE_TO_KEY.get(request.doc_type, "correspondence")
+        budget = rpc_budget(context, self.engine.cfg)
+        started = time.perf_counter()
         try:
             stream, citations = await self.engine.draft(
                 tid, doc_type, request.instructions,
                 matter_id=request.matter_id or None,
                 template_id=request.template_id or None,
                 context_query=request.context_query or None,
+                budget=budget,
             )
-            async for token in stream:
-                yield drafting_pb2.DraftChunk(text=token, is_final=False)
-            final = drafting_pb2.DraftChunk(is_final=True, draft_id=str(uuid.uuid4()))
-            for c in citations:
-                final.citations.append(chunk_to_proto(c).provenance)
+            # Generation runs detached from this call: if the gateway drops,
+            # it carries on and ResumeDraft re-attaches by draft_id.
+            session = self.streams.start(tid, stream, citations,
+                                         record_degraded("DraftDocument", budget))
+            sent = 0
+            # aclosing detaches this follower as soon as the client goes away,
+            # which is what starts the detached-generation clock.
+            async with aclosing(self.streams.follow(session)) as texts:
+                async for text in texts:
+                    chunk = drafting_pb2.DraftChunk(text=text, is_final=False)
+                    if not sent:
+                        DRAFT_TTFT.observe(time.perf_counter() - started)
+                        chunk.draft_id = session.draft_id
+                    sent += 1
+                    yield chunk
+            if session.status != COMPLETE:
+                raise RuntimeError(f"draft generation {session.status}")
             RPC_COUNTER.labels("DraftDocument", "ok").inc()
-            yield final
+            DRAFT_MESSAGES.labels("DraftDocument").observe(sent + 1)
+            yield _final_draft_chunk(session.draft_id, session.citations, session.degraded_stages)
         except Exception:
             RPC_COUNTER.labels("DraftDocument", "error").inc()
             log().exception("DraftDocument failed")
             await context.abort(grpc.StatusCode.INTERNAL, "drafting failed")
 
+    async def ResumeDraft(self, request, context):
+        tid = await check_tenant(request.tenant, context)
+        try:
+            uuid.UUID(request.draft_id)
+        except ValueError:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "invalid draft_id")
+        offset = max(0, request.offset)
+        session = self.streams.live(tid, request.draft_id)
+        sent = 0
+        if session is not None:
+            async with aclosing(self.streams.follow(session, offset)) as texts:
+                async for text in texts:
+                    sent += 1
+                    yield drafting_pb2.DraftChunk(text=text, draft_id=request.draft_id)
+            status, citations, degraded = session.status, session.citations, session.degraded_stages
+        else:
+            # Generation is over (or ran in a previous process): replay storage.
+            row = await self.streams.persisted(tid, request.draft_id)
+            if row is None:
+                RPC_COUNTER.labels("ResumeDraft", "not_found").inc()
+                await context.abort(grpc.StatusCode.NOT_FOUND, "draft not found")
+            rest, _ = skip_bytes(row["content"], offset)
+            if rest:
+                sent += 1
+                yield drafting_pb2.DraftChunk(text=rest, draft_id=request.draft_id)
+            status, citations, degraded = row["status"], row["citations"], row["degraded_stages"]
+        if status != COMPLETE:
+            RPC_COUNTER.labels("ResumeDraft", "incomplete").inc()
+            await context.abort(grpc.StatusCode.ABORTED, f"draft generation {status}")
+        RPC_COUNTER.labels("ResumeDraft", "ok").inc()
+        DRAFT_MESSAGES.labels("ResumeDraft").observe(sent + 1)
+        yield _final_draft_chunk(request.draft_id, citations, degraded)
+
+
+def _final_draft_chunk(draft_id: str, citations: list[RankedChunk],
+                       degraded_stages: list[str]) -> drafting_pb2.DraftChunk:
+    final = drafting_pb2.DraftChunk(is_final=True, draft_id=draft_id,
+                                    degraded_stages=degraded_stages)
+    for c in citations:
+        final.citations.append(chunk_to_proto(c).provenance)
+    return final
+
 
 class IngestionService(ingestion_pb2_grpc.IngestionServiceServicer):
     def __init__(self, ingestor: TenantIngestor, firm_queue: FirmIngestQueue, cfg: Config) -> None:
@@ -285,6 +419,30 @@ class IngestionService(ingestion_pb2_grpc.IngestionServiceServicer):
 
 # --- assembly -----------------------------------------------------------------
 
+def corpus_post_run(citations: CitationResolver, graph_snapshot: Optional[PublicGraphCache],
+                    profiler: Optional[JudgeProfiler], gazetteer: Optional[JudgeGazetteerCache],
+                    completion_cache: Optional[CompletionCache]) -> PostRunSteps:
+    """What follows every public-corpus change, from a scheduled pass or an
+    auto-update run alike: re-index public titles for citation linking,
+    rebuild the public graph snapshot, recompute the public judge profile
+    (Task 4) of the changed documents' judges, recompile the judge-name
+    gazetteer and drop cached completions, which may cite what changed."""
+    post_run = PostRunSteps()
+    post_run.add("citation index", lambda _: citations.refresh())
+    if graph_snapshot is not None:
+        post_run.add("graph snapshot", lambda _: graph_snapshot.refresh())
+    if profiler is not None:
+        post_run.add("judge profile", lambda reports: profiler.recompute(
+            None if reports is None else [d for r in reports for d in r.changed_doc_ids]))
+    if gazetteer is not None:
+        post_run.add("judge gazetteer", lambda _: gazetteer.refresh())
+    if completion_cache is not None:
+        async def invalidate_completions(_) -> None:
+            completion_cache.invalidate()
+        post_run.add("completion cache", invalidate_completions)
+    return post_run
+
+
 class App:
     def __init__(self, cfg: Config) -> None:
         self.cfg = cfg
@@ -294,6 +452,13 @@ class App:
         self.firm_queue = None
         self.auto_update = None
         self.recordings = None
+        self.clause_embedder = None
+        self.draft_streams = None
+        self.llm = None
+        self.llm_scheduler = None
+        self.graph_snapshot = None
+        self.judge_gazetteer = None
+        self.judge_backfill = None
         self.server = None
 
     async def build_server(self) -> grpc.aio.Server:
@@ -302,27 +467,46 @@ class App:
         await self.graph.ensure_indexes()
 
         embedder = make_embedder(self.cfg)
-        llm = make_llm(self.cfg)
-        retriever = RetrievalOrchestrator(self.pool, self.graph, embedder, llm, self.cfg)
-        reasoner = ReasoningEngine(self.pool, self.graph, retriever, llm, self.cfg)
+        self.llm_scheduler = LLMScheduler(self.cfg) if self.cfg.enable_llm_scheduler else None
+        llm = self.llm = make_llm(self.cfg, self.llm_scheduler)
+        judge_cache = JudgeContextCache(self.cfg.judge_context_cache_size,
+                                        self.cfg.judge_context_cache_ttl_seconds)
+        self.judge_gazetteer = (JudgeGazetteerCache(self.graph)
+                                if self.cfg.enable_judge_reasoning else None)
+        self.judge_backfill = (JudgeHistoryBackfill(self.pool, self.graph, judge_cache)
+                               if self.cfg.enable_judge_reasoning else None)
+        completion_cache = (CompletionCache(self.cfg.llm_cache_size, self.cfg.llm_cache_ttl_seconds)
+                            if self.cfg.enable_llm_cache else None)
+        retriever = RetrievalOrchestrator(self.pool, self.graph, embedder, llm, self.cfg,
+                                          judge_cache=judge_cache,
+                                          gazetteer=self.judge_gazetteer,
+                                          completion_cache=completion_cache)
+        self.graph_snapshot = (PublicGraphCache(self.graph)
+                               if self.cfg.enable_graph_snapshot else None)
+        reasoner = ReasoningEngine(self.pool, self.graph, retriever, llm, self.cfg,
+                                   snapshot=self.graph_snapshot)
         drafter = DraftingEngine(self.pool, retriever, llm, self.cfg)
-        ingestor = TenantIngestor(self.pool, self.graph, embedder, self.cfg)
+        self.draft_streams = DraftStreams(self.pool, self.cfg)
+        citations = CitationResolver(self.pool, self.cfg)
+        ingestor = TenantIngestor(self.pool, self.graph, embedder, self.cfg,
+                                  citations=citations, judge_cache=judge_cache,
+                                  completion_cache=completion_cache)
 
         pipeline = IngestionPipeline(self.pool, self.graph, embedder, self.cfg)
-        # Recompute the public judge profile after each corpus pass (Task 4).
-        post_run = None
-        if self.cfg.enable_judge_reasoning:
-            profiler = JudgeProfiler(self.pool, self.graph, self.cfg)
-            post_run = profiler.recompute
+        profiler = (JudgeProfiler(self.pool, self.graph, self.cfg, judge_cache=judge_cache)
+                    if self.cfg.enable_judge_reasoning else None)
+        post_run = corpus_post_run(citations, self.graph_snapshot, profiler,
+                                   self.judge_gazetteer, completion_cache)
         self.scheduler = IngestionScheduler(pipeline, self.cfg, post_run=post_run)
         self.firm_queue = FirmIngestQueue(ingestor, self.cfg)
-        self.auto_update = AutoUpdateWatcher(self.pool, pipeline, self.cfg)
-        self.recordings = RecordingProcessor(self.pool, self.cfg)
+        self.auto_update = AutoUpdateWatcher(self.pool, pipeline, self.cfg, post_run=post_run)
+        self.recordings = RecordingProcessor(self.pool, self.cfg, llm_scheduler=self.llm_scheduler)
+        self.clause_embedder = ClauseEmbedder(self.pool, embedder, self.cfg)
 
         server = grpc.aio.server()
         retrieval_pb2_grpc.add_RetrievalServiceServicer_to_server(RetrievalService(retriever), server)
         reasoning_pb2_grpc.add_ReasoningServiceServicer_to_server(ReasoningService(reasoner), server)
-        drafting_pb2_grpc.add_DraftingServiceServicer_to_server(DraftingService(drafter), server)
+        drafting_pb2_grpc.add_DraftingServiceServicer_to_server(DraftingService(drafter, self.draft_streams), server)
         ingestion_pb2_grpc.add_IngestionServiceServicer_to_server(
             IngestionService(ingestor, self.firm_queue, self.cfg), server)
 
@@ -373,6 +557,13 @@ async def serve() -> None:
     site = web.TCPSite(runner, "0.0.0.0", cfg.health_port)
     await site.start()
 
+    if app.graph_snapshot is not None and not cfg.ingest_on_start:
+        # Otherwise the first corpus pass's post-run hook builds it.
+        await app.graph_snapshot.refresh()
+    if app.judge_gazetteer is not None and not cfg.ingest_on_start:
+        await app.judge_gazetteer.refresh()
+    if app.judge_backfill is not None:
+        await app.judge_backfill.start()
     await app.scheduler.start()
     if cfg.enable_firm_ingestion:
         await app.firm_queue.start()
@@ -383,15 +574,21 @@ async def serve() -> None:
     else:
         log().info("ENABLE_AUTO_UPDATE=false — auto-update watcher not started")
     await app.recordings.start()
+    await app.clause_embedder.start()
     try:
         await server.wait_for_termination()
     finally:
+        await app.draft_streams.close()
+        await app.clause_embedder.stop()
         await app.recordings.stop()
         if cfg.enable_auto_update:
             await app.auto_update.stop()
         if cfg.enable_firm_ingestion:
             await app.firm_queue.stop()
         await app.scheduler.stop()
+        if app.judge_backfill is not None:
+            await app.judge_backfill.stop()
+        await app.llm.aclose()
         await app.graph.close()
         await app.pool.close()
 
@@ -0,0 +1,14 @@
+"""Offline retrieval quality + latency benchmark.
+
+Scales the crawler ``samples()`` into a synthetic Kenyan-law corpus
+(``bench.corpus``), loads it into a dedicated Postgres+pgvector database with
+the deterministic ``HashingEmbedder``, replays a labelled query set through the
+production ``RetrievalOrchestrator.retrieve`` and reports recall@k, MRR and
+per-stage latency percentiles as JSON (``bench.run``). Nothing here talks to a
+network service other than the local Postgres, so runs are comparable across
+changes to ``chunk_text``, the score boosts in ``retrieve()`` or the search SQL.
+
+    python -m bench load  --chunks 10000
+    python -m bench query --out before.json
+    python -m bench compare before.json after.json
+"""
@@ -0,0 +1,59 @@
+"""CLI: ``python -m bench {load,query,compare}`` (run from services/ai)."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+
+from .run import DEFAULT_DSN, check_dsn, compare, dump, load, query
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(prog="python -m bench", description=__doc__)
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    def corpus_args(sp: argparse.ArgumentParser) -> None:
+        sp.add_argument("--dsn", default=os.environ.get("BENCH_DATABASE_URL", DEFAULT_DSN),
+                        help="admin DSN of a dedicated bench database (env BENCH_DATABASE_URL)")
+        sp.add_argument("--force", action="store_true",
+                        help="allow a database whose name does not contain 'bench'")
+        sp.add_argument("--chunks", type=int, default=10_000, help="corpus size in chunks")
+        sp.add_argument("--seed", type=int, default=7)
+
+    sp = sub.add_parser("load", help="generate the corpus and bulk-load it")
+    corpus_args(sp)
+    sp.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="embedding processes")
+
+    sp = sub.add_parser("query", help="replay the labelled queries and report")
+    corpus_args(sp)
+    sp.add_argument("--queries", type=int, default=500)
+    sp.add_argument("--top-k", type=int, default=12)
+    sp.add_argument("--k", type=int, action="append", help="recall cut-offs (default 1,5,10)")
+    sp.add_argument("--neo4j", action="store_true",
+                    help="use the configured Neo4j for graph stages (default: no-op graph)")
+    sp.add_argument("--out", help="write the JSON report here too")
+
+    sp = sub.add_parser("compare", help="diff two query reports")
+    sp.add_argument("before")
+    sp.add_argument("after")
+    sp.add_argument("--out")
+
+    args = p.parse_args()
+    if args.cmd == "compare":
+        before, after = (json.loads(Path(f).read_text()) for f in (args.before, args.after))
+        dump(compare(before, after), args.out)
+        return
+    check_dsn(args.dsn, args.force)
+    if args.cmd == "load":
+        dump(asyncio.run(load(args.dsn, args.chunks, args.seed, workers=args.workers)), None)
+    else:
+        dump(asyncio.run(query(args.dsn, args.chunks, args.seed, n_queries=args.queries,
+                               top_k=args.top_k, ks=args.k or (1, 5, 10),
+                               use_neo4j=args.neo4j)), args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Synthetic corpus + labelled query generator.
+
+Every synthetic document is a recombination of real paragraphs from the
+crawler samples (same doc_type family), headed by an *anchor* paragraph that
+carries identifiers unique to that document — a cause/act number and party or
+instrument names. The labelled query for a document is phrased from its anchor,
+so the document is the single known-relevant answer. Generation is seeded and
+fully deterministic: the same ``(n_chunks, seed)`` always yields the same
+corpus and queries, which is what makes two benchmark runs comparable.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Iterator
+
+from app.chunking import chunk_text
+from app.config import Config
+from app.ingestion import crawlers as _crawlers  # noqa: F401  (registers the crawlers)
+from app.ingestion.models import LegalDocument
+from app.ingestion.registry import all_crawlers
+
+_FIRST = ("Wanjiru", "Otieno", "Kamau", "Achieng", "Mwangi", "Njeri", "Kiprotich", "Wafula",
+          "Atieno", "Mutua", "Chebet", "Omondi", "Nyambura", "Kariuki", "Akinyi", "Barasa",
+          "Wambui", "Kipchumba", "Moraa", "Ouma", "Jeptoo", "Maina", "Adhiambo", "Kilonzo")
+_LAST = ("Holdings Ltd", "Sacco Society", "County Government", "Transporters Ltd",
+         "Estates Ltd", "Teachers Service Commission", "Bank Ltd", "Insurance Co Ltd",
+         "Hospital", "University", "Flower Farm Ltd", "Logistics Ltd", "Tea Factory",
+         "Water Services Board", "Construction Ltd", "Media Group")
+_TOPICS = ("unfair termination", "notice pay", "procedural fairness", "data protection",
+           "land registration", "fair administrative action", "breach of contract",
+           "compulsory acquisition", "redundancy", "maternity leave", "public procurement",
+           "defamation", "succession", "tenancy", "judicial review", "constitutional petition")
+_INSTRUMENTS = ("Employment", "Land Registration", "Data Protection", "Public Procurement",
+                "Fair Administrative Action", "Access to Information", "Physical Planning",
+                "Occupational Safety", "Consumer Protection", "Water", "Energy", "Tax Procedures")
+
+_CASE_TYPES = ("case_law", "judgment", "tribunal")
+
+
+@dataclass
+class LabelledQuery:
+    query: str
+    relevant_doc_id: str
+
+
+def _paragraph_pools() -> dict[str, list[str]]:
+    """doc_type -> real paragraphs from the crawler samples."""
+    pools: dict[str, list[str]] = {}
+    cfg = Config()
+    for crawler_cls in all_crawlers().values():
+        for doc in crawler_cls(cfg).samples():
+            family = "case" if doc.doc_type in _CASE_TYPES else doc.doc_type
+            paras = [p.strip() for p in doc.full_text.split("\n\n") if p.strip()]
+            paras += [op.text for op in doc.opinions]
+            pools.setdefault(family, []).extend(paras)
+    return pools
+
+
+def _perturb(rng: random.Random, para: str) -> str:
+    """Cheap variation so recombined paragraphs are not exact duplicates:
+    renumber sections/articles and occasionally swap a topic phrase in."""
+    words = para.split()
+    for i, w in enumerate(words):
+        if w.rstrip(".,").isdigit() and rng.random() < 0.5:
+            words[i] = str(rng.randint(1, 300)) + w[len(w.rstrip(".,")):]
+    if rng.random() < 0.3:
+        words.append(f"The issue of {rng.choice(_TOPICS)} was also considered.")
+    return " ".join(words)
+
+
+def _anchor(rng: random.Random, i: int, family: str) -> tuple[str, str, str, str, int]:
+    """(title, anchor paragraph, query, citation, year) for document ``i``."""
+    topic = rng.choice(_TOPICS)
+    year = rng.randint(1990, 2026)
+    if family in ("case", "cause_list"):
+        party_a = f"{rng.choice(_FIRST)} {rng.choice(_FIRST)}"
+        party_b = f"{rng.choice(_FIRST)} {rng.choice(_LAST)}"
+        ref = f"Cause No. E{i} of {year}"
+        title = f"{party_a} v {party_b} [{year}] eKLR"
+        anchor = (f"{title}. {ref}. The court considered {topic} in the dispute between "
+                  f"{party_a} and {party_b}.")
+        query = f"What did the court hold on {topic} in {party_a} v {party_b}, {ref}?"
+        return title, anchor, query, f"[{year}] eKLR", year
+    name = rng.choice(_INSTRUMENTS)
+    if family == "gazette":
+        ref = f"Gazette Notice No. {i} of {year}"
+        title = f"{ref} ({name})"
+    elif family == "guideline":
+        ref = f"LSK Practice Guideline No. {i} of {year}"
+        title = f"{ref} on {name}"
+    else:
+        ref = f"Act No. {i} of {year}"
+        title = f"{name} (Amendment No. {i}) Act, {year}"
+    section = rng.randint(1, 120)
+    anchor = (f"{title}. Section {section} of {ref} makes provision "
+              f"for {topic} under the {name} framework.")
+    query = f"What does section {section} of {ref} provide on {topic}?"
+    return title, anchor, query, ref, year
+
+
+def generate(n_chunks: int, seed: int = 7, paragraphs_per_doc: int = 6) -> Iterator[tuple[LegalDocument, LabelledQuery]]:
+    """Yield (document, labelled query) pairs until ``n_chunks`` chunks (as
+    counted by the production ``chunk_text``) have been produced."""
+    rng = random.Random(seed)
+    pools = _paragraph_pools()
+    families = sorted(pools)
+    produced, i = 0, 0
+    while produced < n_chunks:
+        family = families[i % len(families)]
+        title, anchor, query, citation, year = _anchor(rng, i, family)
+        body = [anchor] + [_perturb(rng, rng.choice(pools[family]))
+                           for _ in range(paragraphs_per_doc)]
+        doc = LegalDocument(
+            doc_id=f"bench-{i:07d}",
+            title=title,
+            doc_type="case_law" if family == "case" else family,
+            source_url="",
+            citation=citation,
+            full_text="\n\n".join(body),
+            year=year,
+        )
+        produced += len(chunk_text(doc.full_text))
+        yield doc, LabelledQuery(query=query, relevant_doc_id=doc.doc_id)
+        i += 1
+
+
+def sample_queries(queries: list[LabelledQuery], n: int, seed: int = 7) -> list[LabelledQuery]:
+    """Deterministic subset of the labelled queries to replay."""
+    if n >= len(queries):
+        return list(queries)
+    return random.Random(seed).sample(queries, n)
@@ -0,0 +1,80 @@
+"""Ranking-quality and latency metrics for the retrieval benchmark."""
+from __future__ import annotations
+
+import math
+import time
+from contextlib import contextmanager
+from typing import Iterator, Sequence
+
+
+def ranked_doc_ids(source_ids: Sequence[str]) -> list[str]:
+    """Chunk-level ranking -> document-level ranking (first occurrence wins)."""
+    seen: dict[str, None] = {}
+    for sid in source_ids:
+        seen.setdefault(sid, None)
+    return list(seen)
+
+
+def recall_at_k(ranked: Sequence[str], relevant: str, k: int) -> float:
+    return 1.0 if relevant in ranked[:k] else 0.0
+
+
+def reciprocal_rank(ranked: Sequence[str], relevant: str) -> float:
+    for i, doc_id in enumerate(ranked, start=1):
+        if doc_id == relevant:
+            return 1.0 / i
+    return 0.0
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(values: Sequence[float]) -> dict[str, float]:
+    """Latency summary in milliseconds for one stage."""
+    ms = [v * 1000.0 for v in values]
+    return {
+        "p50": round(percentile(ms, 50), 3),
+        "p95": round(percentile(ms, 95), 3),
+        "p99": round(percentile(ms, 99), 3),
+        "mean": round(sum(ms) / len(ms), 3) if ms else 0.0,
+    }
+
+
+class StageTimer:
+    """Accumulates wall time per stage for the current query; ``finish()``
+    closes the query and files its per-stage totals into the samples."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = {}
+        self._current: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._current[name] = self._current.get(name, 0.0) + time.perf_counter() - t0
+
+    def finish(self, total: float) -> None:
+        """Record the query; time not attributed to a stage is ``rank`` (the
+        Python scoring/merging in ``retrieve()``)."""
+        attributed = sum(self._current.values())
+        self._current["rank"] = max(0.0, total - attributed)
+        self._current["total"] = total
+        for name, seconds in self._current.items():
+            self.samples.setdefault(name, []).append(seconds)
+        self._current = {}
+
+    def discard(self) -> None:
+        """Drop the in-flight query (warm-up runs)."""
+        self._current = {}
+
+    def report(self) -> dict[str, dict[str, float]]:
+        return {name: summarize(values) for name, values in sorted(self.samples.items())}
@@ -25,7 +25,7 @@ _sym_db = _symbol_database.Default()
 from wakili.v1 import common_pb2 as wakili_dot_v1_dot_common__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x18wakili/v1/drafting.proto\x12\twakili.v1\x1a\x16wakili/v1/common.proto\"\xca\x01\n\x0c\x44raftRequest\x12(\n\x06tenant\x18\x01 \x01(\x0b\x32\x18.wakili.v1.TenantContext\x12)\n\x08\x64oc_type\x18\x02 \x01(\x0e\x32\x17.wakili.v1.DraftDocType\x12\x14\n\x0cinstructions\x18\x03 \x01(\t\x12\x11\n\tmatter_id\x18\x04 \x01(\t\x12\x13\n\x0btemplate_id\x18\x05 \x01(\t\x12\x15\n\rcontext_query\x18\x06 \x01(\t\x12\x10\n\x08trace_id\x18\x07 \x01(\t\"h\n\nDraftChunk\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x10\n\x08is_final\x18\x02 \x01(\x08\x12(\n\tcitations\x18\x03 \x03(\x0b\x32\x15.wakili.v1.Provenance\x12\x10\n\x08\x64raft_id\x18\x04 \x01(\t*\xcb\x01\n\x0c\x44raftDocType\x12\x1e\n\x1a\x44RAFT_DOC_TYPE_UNSPECIFIED\x10\x00\x12\x1b\n\x17\x44RAFT_DOC_TYPE_PLEADING\x10\x01\x12\x1c\n\x18\x44RAFT_DOC_TYPE_AFFIDAVIT\x10\x02\x12\x1b\n\x17\x44RAFT_DOC_TYPE_CONTRACT\x10\x03\x12!\n\x1d\x44RAFT_DOC_TYPE_CORRESPONDENCE\x10\x04\x12 \n\x1c\x44RAFT_DOC_TYPE_DEMAND_LETTER\x10\x05\x32T\n\x0f\x44raftingService\x12\x41\n\rDraftDocument\x12\x17.wakili.v1.DraftRequest\x1a\x15.wakili.v1.DraftChunk0\x01\x42\x33Z1github.com/wakiliai/gateway/gen/wakiliv1;wakiliv1b\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x18wakili/v1/drafting.proto\x12\twakili.v1\x1a\x16wakili/v1/common.proto\"\xca\x01\n\x0c\x44raftRequest\x12(\n\x06tenant\x18\x01 \x01(\x0b\x32\x18.wakili.v1.TenantContext\x12)\n\x08\x64oc_type\x18\x02 \x01(\x0e\x32\x17.wakili.v1.DraftDocType\x12\x14\n\x0cinstructions\x18\x03 \x01(\t\x12\x11\n\tmatter_id\x18\x04 \x01(\t\x12\x13\n\x0btemplate_id\x18\x05 \x01(\t\x12\x15\n\rcontext_query\x18\x06 \x01(\t\x12\x10\n\x08trace_id\x18\x07 \x01(\t\"r\n\x12ResumeDraftRequest\x12(\n\x06tenant\x18\x01 \x01(\x0b\x32\x18.wakili.v1.TenantContext\x12\x10\n\x08\x64raft_id\x18\x02 \x01(\t\x12\x0e\n\x06offset\x18\x03 \x01(\x03\x12\x10\n\x08trace_id\x18\x04 \x01(\t\"\x81\x01\n\nDraftChunk\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x10\n\x08is_final\x18\x02 \x01(\x08\x12(\n\tcitations\x18\x03 \x03(\x0b\x32\x15.wakili.v1.Provenance\x12\x10\n\x08\x64raft_id\x18\x04 \x01(\t\x12\x17\n\x0f\x64\x65graded_stages\x18\x05 \x03(\t*\xcb\x01\n\x0c\x44raftDocType\x12\x1e\n\x1a\x44RAFT_DOC_TYPE_UNSPECIFIED\x10\x00\x12\x1b\n\x17\x44RAFT_DOC_TYPE_PLEADING\x10\x01\x12\x1c\n\x18\x44RAFT_DOC_TYPE_AFFIDAVIT\x10\x02\x12\x1b\n\x17\x44RAFT_DOC_TYPE_CONTRACT\x10\x03\x12!\n\x1d\x44RAFT_DOC_TYPE_CORRESPONDENCE\x10\x04\x12 \n\x1c\x44RAFT_DOC_TYPE_DEMAND_LETTER\x10\x05\x32\x9b\x01\n\x0f\x44raftingService\x12\x41\n\rDraftDocument\x12\x17.wakili.v1.DraftRequest\x1a\x15.wakili.v1.DraftChunk0\x01\x12\x45\n\x0bResumeDraft\x12\x1d.wakili.v1.ResumeDraftRequest\x1a\x15.wakili.v1.DraftChunk0\x01\x42\x33Z1github.com/wakiliai/gateway/gen/wakiliv1;wakiliv1b\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -33,12 +33,14 @@ _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'wakili.v1.drafting_pb2', _g
 if not _descriptor._USE_C_DESCRIPTORS:
   _globals['DESCRIPTOR']._loaded_options = None
   _globals['DESCRIPTOR']._serialized_options = b'Z1github.com/wakiliai/gateway/gen/wakiliv1;wakiliv1'
-  _globals['_DRAFTDOCTYPE']._serialized_start=375
-  _globals['_DRAFTDOCTYPE']._serialized_end=578
+  _globals['_DRAFTDOCTYPE']._serialized_start=517
+  _globals['_DRAFTDOCTYPE']._serialized_end=720
   _globals['_DRAFTREQUEST']._serialized_start=64
   _globals['_DRAFTREQUEST']._serialized_end=266
-  _globals['_DRAFTCHUNK']._serialized_start=268
-  _globals['_DRAFTCHUNK']._serialized_end=372
-  _globals['_DRAFTINGSERVICE']._serialized_start=580
-  _globals['_DRAFTINGSERVICE']._serialized_end=664
+  _globals['_RESUMEDRAFTREQUEST']._serialized_start=268
+  _globals['_RESUMEDRAFTREQUEST']._serialized_end=382
+  _globals['_DRAFTCHUNK']._serialized_start=385
+  _globals['_DRAFTCHUNK']._serialized_end=514
+  _globals['_DRAFTINGSERVICE']._serialized_start=723
+  _globals['_DRAFTINGSERVICE']._serialized_end=878
 # @@protoc_insertion_point(module_scope)
@@ -39,6 +39,11 @@ class DraftingServiceStub:
                 request_serializer=wakili_dot_v1_dot_drafting__pb2.DraftRequest.SerializeToString,
                 response_deserializer=wakili_dot_v1_dot_drafting__pb2.DraftChunk.FromString,
                 _registered_method=True)
+        self.ResumeDraft = channel.unary_stream(
+                '/wakili.v1.DraftingService/ResumeDraft',
+                request_serializer=wakili_dot_v1_dot_drafting__pb2.ResumeDraftRequest.SerializeToString,
+                response_deserializer=wakili_dot_v1_dot_drafting__pb2.DraftChunk.FromString,
+                _registered_method=True)
 
 
 class DraftingServiceServicer:
@@ -51,6 +56,14 @@ class DraftingServiceServicer:
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ResumeDraft(self, request, context):
+        """Replays a draft by id and follows it to the end. Ends with the final
+        chunk when the draft completed; ABORTED when generation stopped short.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_DraftingServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -59,6 +72,11 @@ def add_DraftingServiceServicer_to_server(servicer, server):
                     request_deserializer=wakili_dot_v1_dot_drafting__pb2.DraftRequest.FromString,
                     response_serializer=wakili_dot_v1_dot_drafting__pb2.DraftChunk.SerializeToString,
             ),
+            'ResumeDraft': grpc.unary_stream_rpc_method_handler(
+                    servicer.ResumeDraft,
+                    request_deserializer=wakili_dot_v1_dot_drafting__pb2.ResumeDraftRequest.FromString,
+                    response_serializer=wakili_dot_v1_dot_drafting__pb2.DraftChunk.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'wakili.v1.DraftingService', rpc_method_handlers)
@@ -96,3 +114,30 @@ class DraftingService:
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def ResumeDraft(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/wakili.v1.DraftingService/ResumeDraft',
+            wakili_dot_v1_dot_drafting__pb2.ResumeDraftRequest.SerializeToString,
+            wakili_dot_v1_dot_drafting__pb2.DraftChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
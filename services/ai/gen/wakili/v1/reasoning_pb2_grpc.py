@@ -39,6 +39,11 @@ class ReasoningServiceStub:
                 request_serializer=wakili_dot_v1_dot_reasoning__pb2.ReasoningRequest.SerializeToString,
                 response_deserializer=wakili_dot_v1_dot_reasoning__pb2.ReasoningTrace.FromString,
                 _registered_method=True)
+        self.ReasonStream = channel.unary_stream(
+                '/wakili.v1.ReasoningService/ReasonStream',
+                request_serializer=wakili_dot_v1_dot_reasoning__pb2.ReasoningRequest.SerializeToString,
+                response_deserializer=wakili_dot_v1_dot_reasoning__pb2.ReasoningEvent.FromString,
+                _registered_method=True)
 
 
 class ReasoningServiceServicer:
@@ -53,6 +58,14 @@ class ReasoningServiceServicer:
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ReasonStream(self, request, context):
+        """Server-streaming variant of Reason: hops, evidence and answer tokens are
+        sent as they are produced; cancelling the call stops the run.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ReasoningServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -61,6 +74,11 @@ def add_ReasoningServiceServicer_to_server(servicer, server):
                     request_deserializer=wakili_dot_v1_dot_reasoning__pb2.ReasoningRequest.FromString,
                     response_serializer=wakili_dot_v1_dot_reasoning__pb2.ReasoningTrace.SerializeToString,
             ),
+            'ReasonStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.ReasonStream,
+                    request_deserializer=wakili_dot_v1_dot_reasoning__pb2.ReasoningRequest.FromString,
+                    response_serializer=wakili_dot_v1_dot_reasoning__pb2.ReasoningEvent.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'wakili.v1.ReasoningService', rpc_method_handlers)
@@ -98,3 +116,30 @@ class ReasoningService:
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def ReasonStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/wakili.v1.ReasoningService/ReasonStream',
+            wakili_dot_v1_dot_reasoning__pb2.ReasoningRequest.SerializeToString,
+            wakili_dot_v1_dot_reasoning__pb2.ReasoningEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -80,6 +80,8 @@ async def run(tenant: str, query: str, top_k: int) -> None:
             except Exception as exc:  # keep the other variant's result usable
                 print(f"\n### {label}\nmodel : {model}\nERROR : {exc}\n")
                 continue
+            finally:
+                await provider.aclose()
             print(f"\n{'#' * 100}")
             print(f"### {label}")
             print(f"model      : {model}")
@@ -10,6 +10,7 @@ from app.graph.builders import (
     GraphQuery,
     GraphQueryError,
     PublicGraphQuery,
+    RowField,
     TenantScopedGraphQuery,
     is_builder_query,
 )
@@ -98,3 +99,55 @@ def test_public_expand_only_walks_public_nodes():
 def test_handcrafted_queries_cannot_execute():
     forged = GraphQuery(cypher="MATCH (n) RETURN n", params={}, write=False, tenant_scoped=True)
     assert not is_builder_query(forged)
+
+
+def test_unwind_batches_rows_but_keeps_tenant_injection():
+    q = (TenantScopedGraphQuery(TID_A)
+         .unwind([{"id": "a-1", "name": "A"}, {"id": "a-2", "name": "B"}])
+         .merge_node("a", "Advocate", {"id": RowField("id")}, {"name": RowField("name")})
+         .merge_node("s", "Submission", {"id": "s-1"})
+         .merge_rel("a", "AUTHORED", "s")
+         .build())
+    assert q.cypher.startswith("UNWIND $p1 AS row")
+    assert "(a:Advocate {tenant_id: $tenant_id, id: row.id})" in q.cypher
+    assert "a.tenant_id = $tenant_id, a.name = row.name" in q.cypher
+    assert "r_authored.tenant_id = $tenant_id" in q.cypher
+    assert len(q.params["p1"]) == 2
+
+
+def test_unwind_misuse_and_caller_supplied_tenant_id_are_rejected():
+    with pytest.raises(GraphQueryError):
+        TenantScopedGraphQuery(TID_A).merge_node("a", "Advocate", {"id": RowField("id")})
+    with pytest.raises(GraphQueryError):
+        TenantScopedGraphQuery(TID_A).match("m", "Matter").unwind([{}])
+    with pytest.raises(GraphQueryError):
+        (TenantScopedGraphQuery(TID_A).unwind([{"t": "x"}])
+         .merge_node("a", "Advocate", {"id": "a-1"}, {"tenant_id": RowField("t")}))
+    with pytest.raises(GraphQueryError):
+        TenantScopedGraphQuery(TID_A).match("m", "Matter", tenant_id="other")
+    with pytest.raises(GraphQueryError):
+        TenantScopedGraphQuery(TID_A).unwind([{"id": 1}]).match("row", "Matter", id=RowField("id"))
+
+
+def test_match_labels_and_hop_cover_a_frontier_in_one_query():
+    q = (PublicGraphQuery().match_labels("a", ["Statute", "CaseLaw"])
+         .where_in("a", "doc_id", ["x", "y"])
+         .match_hop("a", ["CITES", "OVERTURNS"], "b", rel_alias="r")
+         .returns("a.doc_id AS src", "b.doc_id AS dst", "type(r) AS rel").build())
+    assert "MATCH (a:Public)" in q.cypher
+    assert "(a:Statute OR a:CaseLaw)" in q.cypher
+    assert "-[r:CITES|OVERTURNS]-(b:Public)" in q.cypher
+    assert "*" not in q.cypher
+    with pytest.raises(GraphQueryError):
+        PublicGraphQuery().match_labels("a", ["Statute"], public=False)
+    with pytest.raises(GraphQueryError):
+        PublicGraphQuery().match_labels("a", ["Matter"])
+    with pytest.raises(GraphQueryError):
+        PublicGraphQuery().match_labels("a", ["Statute"]).match_hop("a", ["DELETES"], "b")
+
+
+def test_tenant_hop_guards_the_neighbour():
+    q = (TenantScopedGraphQuery(TID_A).match_labels("m", ["Matter"])
+         .match_hop("m", ["CITES"], "b").returns("b.doc_id AS id").build())
+    assert "MATCH (m {tenant_id: $tenant_id})" in q.cypher
+    assert "(b:Public OR b.tenant_id = $tenant_id)" in q.cypher
@@ -0,0 +1,65 @@
+"""In-memory citation resolver: ILIKE-equivalent substring matching from a
+trigram index, all needles in one call, one DB load per refresh."""
+from types import SimpleNamespace
+
+import pytest
+
+from app.ingestion import citations as citations_mod
+from app.ingestion.citations import CitationResolver, TitleIndex
+
+DOCS = [
+    {"doc_id": "act-2007-11", "title": "Employment Act, No. 11 of 2007", "doc_type": "statute"},
+    {"doc_id": "act-2019-24", "title": "Data Protection Act, 2019", "doc_type": "statute"},
+    {"doc_id": "act-2007-11-amend", "title": "The Employment (Amendment) Act and Employment Act, No. 11 of 2007 schedule", "doc_type": "statute"},
+    {"doc_id": "case-1", "title": "Kenfreight (E.A.) Limited v Benson K. Nguti [2016] eKLR", "doc_type": "case_law"},
+    {"doc_id": "const", "title": "Constitution of Kenya, 2010", "doc_type": "constitution"},
+]
+
+
+def test_lookup_matches_case_insensitive_substrings_shortest_title_first():
+    idx = TitleIndex(DOCS)
+    assert [d["doc_id"] for d in idx.lookup("employment act", limit=5)] == \
+        ["act-2007-11", "act-2007-11-amend"]
+    assert idx.lookup("EMPLOYMENT   ACT")[0]["doc_id"] == "act-2007-11"
+    assert idx.lookup("Kenfreight (E.A.) Limited v Benson")[0]["doc_id"] == "case-1"
+    assert idx.lookup("Constitution of Kenya")[0]["doc_type"] == "constitution"
+    assert idx.lookup("Land Registration Act") == []
+    assert idx.lookup("") == []
+
+
+@pytest.mark.asyncio
+async def test_resolver_answers_all_needles_from_one_load(monkeypatch):
+    loads = []
+
+    async def titles(pool):
+        loads.append(pool)
+        return DOCS
+
+    monkeypatch.setattr(citations_mod.dbx, "current_public_titles", titles)
+    resolver = CitationResolver("pool", SimpleNamespace(citation_resolver_ttl_seconds=3600))
+    needles = ["Employment Act", "Data Protection Act", "Unknown Act"] * 8
+    out = await resolver.resolve(needles)
+    await resolver.resolve(["Constitution of Kenya"])
+    assert len(loads) == 1
+    assert set(out) == {"Employment Act", "Data Protection Act", "Unknown Act"}
+    assert out["Data Protection Act"][0]["doc_id"] == "act-2019-24"
+    assert out["Unknown Act"] == []
+
+    assert await resolver.refresh() == len(DOCS)
+    assert len(loads) == 2
+
+
+@pytest.mark.asyncio
+async def test_resolver_reloads_once_stale(monkeypatch):
+    loads = []
+
+    async def titles(pool):
+        loads.append(pool)
+        return DOCS
+
+    monkeypatch.setattr(citations_mod.dbx, "current_public_titles", titles)
+    resolver = CitationResolver("pool", SimpleNamespace(citation_resolver_ttl_seconds=0))
+    await resolver.resolve(["Employment Act"])
+    resolver._loaded_at -= 1
+    await resolver.resolve(["Employment Act"])
+    assert len(loads) == 2
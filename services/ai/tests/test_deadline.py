@@ -0,0 +1,108 @@
+"""Deadline budget: optional stages degrade (and are reported) when the RPC
+deadline is tight; an unbounded budget never changes behaviour."""
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app import retrieval as retrieval_mod
+from app.deadline import STAGE_COST_SECONDS, Budget
+from app.llm import MockProvider
+from app.retrieval import RetrievalOrchestrator
+
+TENANT = "aaaaaaaa-1111-4111-8111-aaaaaaaaaaaa"
+
+
+def test_unbounded_budget_allows_everything():
+    b = Budget()
+    assert not b.bounded
+    assert all(b.allows(stage) for stage in STAGE_COST_SECONDS)
+    assert b.timeout() is None
+    assert b.degraded == []
+
+
+def test_tight_budget_degrades_and_records_once():
+    b = Budget(seconds=1.0, reserve=5.0)
+    assert not b.allows("status_annotations")
+    assert not b.allows("status_annotations")
+    assert b.degraded == ["status_annotations"]
+
+
+def test_timeout_holds_back_reserve():
+    b = Budget(seconds=10.0, reserve=4.0)
+    assert 9.0 < b.timeout() <= 10.0
+    assert 5.0 < b.timeout(reserve=True) <= 6.0
+
+
+def test_from_context_without_deadline_is_unbounded():
+    ctx = SimpleNamespace(time_remaining=lambda: None)
+    assert not Budget.from_context(ctx, reserve=8).bounded
+
+
+class _Graph:
+    def __init__(self):
+        self.reads = 0
+
+    async def read(self, q, timeout=None):
+        self.reads += 1
+        return []
+
+
+def _orchestrator(monkeypatch, graph):
+    async def public(pool, qvec, top_k, include_superseded, as_of=None):
+        return [{"chunk_id": 1, "doc_id": "act-1", "chunk_text": "Section 45", "score": 0.9,
+                 "title": "Employment Act", "doc_type": "statute", "status": "current"}]
+
+    async def tenant(conn, qvec, top_k):
+        return []
+
+    @asynccontextmanager
+    async def tx(pool, tenant_id):
+        yield None
+
+    monkeypatch.setattr(retrieval_mod.dbx, "search_public_chunks", public)
+    monkeypatch.setattr(retrieval_mod.dbx, "search_tenant_chunks", tenant)
+    monkeypatch.setattr(retrieval_mod.dbx, "tenant_tx", tx)
+
+    class _Embedder:
+        async def embed(self, texts):
+            return [[0.0] * 4 for _ in texts]
+
+    cfg = SimpleNamespace(enable_judge_reasoning=False)
+    return RetrievalOrchestrator(None, graph, _Embedder(), MockProvider(), cfg)
+
+
+def test_retrieve_skips_graph_stages_under_tight_deadline(monkeypatch):
+    graph = _Graph()
+    orch = _orchestrator(monkeypatch, graph)
+    budget = Budget(seconds=0.2, reserve=5.0)
+    chunks, _ = asyncio.run(orch.retrieve(TENANT, "section 45 act", matter_id="m-1", budget=budget))
+    assert chunks  # vector results are still served
+    assert graph.reads == 0
+    assert budget.degraded == ["matter_expansion", "status_annotations"]
+
+
+def test_retrieve_runs_graph_stages_without_deadline(monkeypatch):
+    graph = _Graph()
+    orch = _orchestrator(monkeypatch, graph)
+    budget = Budget()
+    asyncio.run(orch.retrieve(TENANT, "section 45 act", matter_id="m-1", budget=budget))
+    assert graph.reads > 0
+    assert budget.degraded == []
+
+
+@pytest.mark.asyncio
+async def test_slow_synthesis_returns_sources_with_degraded_answer(monkeypatch):
+    class SlowLLM:
+        async def complete(self, system, prompt, max_tokens=2048, fast=False):
+            await asyncio.sleep(5)
+            return "late"
+
+    orch = _orchestrator(monkeypatch, _Graph())
+    orch.llm = SlowLLM()
+    budget = Budget(seconds=0.1)
+    chunks, intent = await orch.retrieve(TENANT, "section 45 act")
+    answer = await orch.answer("q", chunks, intent, budget=budget)
+    assert "deadline" in answer
+    assert "answer_synthesis" in budget.degraded
@@ -0,0 +1,216 @@
+"""Resumable drafts: generation outlives the client stream, its text is
+flushed to draft_streams as it grows, and ResumeDraft replays it and follows
+the live generation — or reports how it ended. What goes on the wire is
+coalesced into few frames."""
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import grpc
+import pytest
+from prometheus_client import REGISTRY
+
+from app.draft_streams import ABANDONED, COMPLETE, DraftStreams, coalesce
+from app.retrieval import RankedChunk
+from app.server import DraftingService
+
+TENANT = "aaaaaaaa-1111-4111-8111-aaaaaaaaaaaa"
+CITATION = RankedChunk(chunk_id="1", text="s.45", score=0.9, source_type="PUBLIC",
+                       source_id="act-1", citation="Employment Act")
+
+
+class Aborted(Exception):
+    def __init__(self, code, details):
+        super().__init__(details)
+        self.code = code
+
+
+class Context:
+    def time_remaining(self):
+        return None
+
+    def invocation_metadata(self):
+        return (("x-tenant-id", TENANT),)
+
+    async def abort(self, code, details):
+        raise Aborted(code, details)
+
+
+@pytest.fixture
+def table(monkeypatch):
+    """In-memory draft_streams."""
+    rows = {}
+
+    @asynccontextmanager
+    async def tenant_tx(pool, tenant_id):
+        yield None
+
+    async def append_draft_stream(conn, draft_id, text, status, citations, degraded_stages):
+        row = rows.setdefault(draft_id, {"content": "", "citations": citations,
+                                         "degraded_stages": degraded_stages, "flushes": 0})
+        row["content"] += text
+        row["status"] = status
+        row["flushes"] += 1
+
+    async def get_draft_stream(conn, draft_id):
+        return dict(rows[draft_id]) if draft_id in rows else None
+
+    monkeypatch.setattr("app.draft_streams.dbx.tenant_tx", tenant_tx)
+    monkeypatch.setattr("app.draft_streams.dbx.append_draft_stream", append_draft_stream)
+    monkeypatch.setattr("app.draft_streams.dbx.get_draft_stream", get_draft_stream)
+    return rows
+
+
+class Engine:
+    cfg = SimpleNamespace(deadline_reserve_seconds=0.0)
+
+    def __init__(self, tokens, gate=None):
+        self.tokens = tokens
+        self.gate = gate
+
+    async def draft(self, *args, **kw):
+        async def stream():
+            for i, t in enumerate(self.tokens):
+                if i and self.gate is not None:
+                    await self.gate.wait()
+                yield t
+        return stream(), [CITATION]
+
+
+def _service(engine, detached_seconds=60.0):
+    cfg = SimpleNamespace(draft_flush_ms=10, draft_detached_seconds=detached_seconds,
+                          draft_coalesce_ms=20, draft_coalesce_bytes=1024)
+    streams = DraftStreams(None, cfg)
+    return DraftingService(engine, streams), streams
+
+
+def _draft_request():
+    return SimpleNamespace(tenant=SimpleNamespace(tenant_id=TENANT), doc_type=0,
+                           instructions="x", matter_id="", template_id="", context_query="")
+
+
+def _resume_request(draft_id, offset=0):
+    return SimpleNamespace(tenant=SimpleNamespace(tenant_id=TENANT), draft_id=draft_id,
+                           offset=offset)
+
+
+async def _settle(streams):
+    while streams._sessions:
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_generation_outlives_a_dropped_stream_and_resumes(table):
+    gate = asyncio.Event()
+    service, streams = _service(Engine(["Dear ", "Sir, ", "pay."], gate))
+    frames = service.DraftDocument(_draft_request(), Context())
+    first = await frames.__anext__()
+    draft_id = first.draft_id
+    assert first.text == "Dear " and draft_id
+    await frames.aclose()  # the gateway's connection drops
+
+    assert streams.live(TENANT, draft_id).followers == 0
+    resumed = service.ResumeDraft(_resume_request(draft_id, offset=len(first.text.encode())),
+                                   Context())
+    gate.set()
+    tail = [f async for f in resumed]
+    assert "".join(f.text for f in tail) == "Sir, pay."
+    assert tail[-1].is_final and tail[-1].citations[0].source_id == "act-1"
+
+    await _settle(streams)
+    assert table[draft_id]["content"] == "Dear Sir, pay." and table[draft_id]["status"] == COMPLETE
+
+
+@pytest.mark.asyncio
+async def test_text_is_flushed_while_generating(table):
+    gate = asyncio.Event()
+    service, streams = _service(Engine(["Dear ", "Sir"], gate))
+    frames = service.DraftDocument(_draft_request(), Context())
+    draft_id = (await frames.__anext__()).draft_id
+    await asyncio.sleep(0.05)
+    assert table[draft_id]["content"] == "Dear " and table[draft_id]["status"] == "streaming"
+    gate.set()
+    assert [f.is_final async for f in frames] == [False, True]
+    await _settle(streams)
+    assert table[draft_id]["content"] == "Dear Sir"
+
+
+@pytest.mark.asyncio
+async def test_a_draft_nobody_follows_is_abandoned_after_the_limit(table):
+    service, streams = _service(Engine(["Dear ", "Sir"], asyncio.Event()), detached_seconds=0)
+    frames = service.DraftDocument(_draft_request(), Context())
+    draft_id = (await frames.__anext__()).draft_id
+    await frames.aclose()
+    await _settle(streams)
+    assert table[draft_id]["content"] == "Dear " and table[draft_id]["status"] == ABANDONED
+
+    resumed = service.ResumeDraft(_resume_request(draft_id), Context())
+    assert (await resumed.__anext__()).text == "Dear "
+    with pytest.raises(Aborted) as err:
+        await resumed.__anext__()
+    assert err.value.code == grpc.StatusCode.ABORTED
+
+
+@pytest.mark.asyncio
+async def test_finished_drafts_replay_from_storage(table):
+    service, streams = _service(Engine(["Dear ", "Sir"]))
+    frames = [f async for f in service.DraftDocument(_draft_request(), Context())]
+    await _settle(streams)
+
+    replay = [f async for f in service.ResumeDraft(_resume_request(frames[0].draft_id, 2), Context())]
+    assert [f.text for f in replay] == ["ar Sir", ""] and replay[-1].is_final
+    assert replay[-1].citations[0].citation == "Employment Act"
+
+    with pytest.raises(Aborted) as err:
+        await service.ResumeDraft(_resume_request("bbbbbbbb-1111-4111-8111-bbbbbbbbbbbb"),
+                                  Context()).__anext__()
+    assert err.value.code == grpc.StatusCode.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_resume_offsets_count_utf8_bytes(table):
+    gate = asyncio.Event()
+    service, streams = _service(Engine(["Mheshimiwa — ", "Bw. Ng’ang’a", ", lipa."], gate))
+    frames = service.DraftDocument(_draft_request(), Context())
+    first = await frames.__anext__()
+    await frames.aclose()
+    received = len(first.text.encode())  # what the gateway has counted
+    assert received > len(first.text)
+
+    live = service.ResumeDraft(_resume_request(first.draft_id, received), Context())
+    gate.set()
+    assert "".join(f.text for f in [f async for f in live]) == "Bw. Ng’ang’a, lipa."
+    await _settle(streams)
+
+    offset = len("Mheshimiwa — Bw. Ng’".encode())
+    stored = [f async for f in service.ResumeDraft(_resume_request(first.draft_id, offset), Context())]
+    assert stored[0].text == "ang’a, lipa."
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_coalesced_after_the_first():
+    async def tokens():
+        for t in ["Dear", " Sir", ",", " we", " act"]:  # a burst
+            yield t
+        await asyncio.sleep(0.05)  # longer than the window: the burst is flushed
+        for t in ["x" * 6, "y" * 6, "z"]:
+            yield t
+
+    pieces = [p async for p in coalesce(tokens(), window_seconds=0.02, max_bytes=10)]
+    assert pieces == ["Dear", " Sir, we act", "xxxxxxyyyyyy", "z"]
+
+
+@pytest.mark.asyncio
+async def test_messages_per_draft_are_exported(table):
+    service, streams = _service(Engine([f"t{i} " for i in range(200)]))
+    before = REGISTRY.get_sample_value("wakili_ai_draft_messages_count",
+                                       {"method": "DraftDocument"}) or 0
+    total = REGISTRY.get_sample_value("wakili_ai_draft_messages_sum",
+                                      {"method": "DraftDocument"}) or 0
+    frames = [f async for f in service.DraftDocument(_draft_request(), Context())]
+    assert "".join(f.text for f in frames) == "".join(f"t{i} " for i in range(200))
+    assert len(frames) < 10
+    assert REGISTRY.get_sample_value("wakili_ai_draft_messages_count",
+                                     {"method": "DraftDocument"}) == before + 1
+    assert REGISTRY.get_sample_value("wakili_ai_draft_messages_sum",
+                                     {"method": "DraftDocument"}) == total + len(frames)
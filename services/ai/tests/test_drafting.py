@@ -0,0 +1,263 @@
+"""Drafting context assembly: the tenant lookups share one transaction and
+run alongside grounding retrieval, clauses are ranked by similarity to the
+request, long instruments are drafted section-parallel, and
+time-to-first-token is exported."""
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.clauses import ClauseEmbedder, clause_text
+from app.deadline import Budget
+from app.draft_streams import DraftStreams
+from app.drafting import SECTIONS, DraftingEngine
+from app.embeddings import HashingEmbedder
+from app.llm import MockProvider
+from app.retrieval import RankedChunk
+from app.server import DraftingService
+
+TENANT = "aaaaaaaa-1111-4111-8111-aaaaaaaaaaaa"
+
+
+class FakeConn:
+    def __init__(self, fail_matters=False):
+        self.fail_matters = fail_matters
+        self.savepoints = 0
+        self.nearest = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.savepoints += 1
+        yield
+
+    async def fetchrow(self, sql, *args):
+        if self.fail_matters:
+            raise RuntimeError("matters: permission denied")
+        return {"reference": "ADV/1", "title": "Wanjiru v Acme", "description": "Dismissal",
+                "practice_area": "employment", "court": "ELRC", "court_case_number": "E1",
+                "client_name": "Jane Wanjiru"}
+
+    async def fetch(self, sql, *args):
+        self.clause_sql = sql
+        if "<=>" in sql:
+            return self.nearest
+        return [{"title": "Without prejudice", "body": "This letter is written without prejudice."}]
+
+
+def _engine(monkeypatch, conn, retriever):
+    txs = []
+
+    @asynccontextmanager
+    async def tenant_tx(pool, tenant_id):
+        txs.append(tenant_id)
+        yield conn
+
+    monkeypatch.setattr("app.drafting.dbx.tenant_tx", tenant_tx)
+    retriever.embedder = HashingEmbedder(8)
+    engine = DraftingEngine(None, retriever, MockProvider(), SimpleNamespace(draft_clause_top_k=3))
+    engine.txs = txs
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_tenant_lookups_and_grounding_run_concurrently(monkeypatch):
+    retrieving = asyncio.Event()
+
+    class Retriever:
+        async def retrieve(self, tenant_id, query, **kw):
+            retrieving.set()
+            return [RankedChunk(chunk_id="1", text="s.45", score=0.9, source_type="PUBLIC",
+                                source_id="act-1", citation="Employment Act")], "drafting"
+
+    class SlowConn(FakeConn):
+        async def fetchrow(self, sql, *args):
+            # Only returns once grounding retrieval is already under way.
+            await asyncio.wait_for(retrieving.wait(), timeout=1)
+            return await super().fetchrow(sql, *args)
+
+    conn = SlowConn()
+    engine = _engine(monkeypatch, conn, Retriever())
+    stream, citations = await engine.draft(TENANT, "demand_letter", "demand arrears",
+                                           matter_id="m-1", budget=Budget())
+    assert engine.txs == [TENANT] and conn.savepoints == 2
+    assert [c.source_id for c in citations] == ["act-1"]
+    assert "".join([t async for t in stream])
+
+
+@pytest.mark.asyncio
+async def test_a_failed_lookup_leaves_the_other_usable(monkeypatch):
+    class Retriever:
+        async def retrieve(self, tenant_id, query, **kw):
+            raise RuntimeError("vector store down")
+
+    engine = _engine(monkeypatch, FakeConn(fail_matters=True), Retriever())
+    facts, clauses = await engine._tenant_context(TENANT, "m-1", None, "demand_letter", "arrears")
+    assert facts == "" and "[Without prejudice]" in clauses
+    assert await engine._grounding(TENANT, "q", None, Budget()) == []
+
+
+@pytest.mark.asyncio
+async def test_clauses_nearest_the_request_are_used(monkeypatch):
+    class Retriever:
+        pass
+
+    conn = FakeConn()
+    conn.nearest = [{"title": "Interest on arrears", "body": "14% p.a."}]
+    engine = _engine(monkeypatch, conn, Retriever())
+    _, clauses = await engine._tenant_context(TENANT, None, None, "demand_letter", "rent arrears")
+    assert clauses == "[Interest on arrears]\n14% p.a."
+    assert "ORDER BY embedding <=> $1::vector" in conn.clause_sql
+
+    # Nothing embedded yet: the oldest clauses stand in.
+    conn.nearest = []
+    _, clauses = await engine._tenant_context(TENANT, None, None, "demand_letter", "rent arrears")
+    assert "[Without prejudice]" in clauses and "created_at" in conn.clause_sql
+
+
+@pytest.mark.asyncio
+async def test_only_unembedded_clauses_are_embedded(monkeypatch):
+    table = [{"id": str(i), "title": f"Clause {i}", "category": "boilerplate", "body": "text",
+              "embedding": None if i % 2 else [0.1]} for i in range(5)]
+
+    @asynccontextmanager
+    async def tenant_tx(pool, tenant_id):
+        yield None
+
+    async def unembedded_clauses(conn, limit):
+        return [c for c in table if c["embedding"] is None][:limit]
+
+    async def set_clause_embeddings(conn, clauses, embeddings):
+        for c, e in zip(clauses, embeddings):
+            next(t for t in table if t["id"] == c["id"])["embedding"] = e
+
+    class Embedder:
+        calls = []
+
+        async def embed(self, texts):
+            self.calls.append(texts)
+            return [[0.5] for _ in texts]
+
+    monkeypatch.setattr("app.clauses.dbx.tenant_tx", tenant_tx)
+    monkeypatch.setattr("app.clauses.dbx.unembedded_clauses", unembedded_clauses)
+    monkeypatch.setattr("app.clauses.dbx.set_clause_embeddings", set_clause_embeddings)
+    worker = ClauseEmbedder(None, Embedder(), SimpleNamespace())
+    assert await worker.embed_tenant(TENANT) == 2
+    assert Embedder.calls == [[clause_text(table[1]), clause_text(table[3])]]
+    assert clause_text(table[1]) == "boilerplate — Clause 1\ntext"
+    assert await worker.embed_tenant(TENANT) == 0
+
+
+@pytest.mark.asyncio
+async def test_draft_ttft_is_observed_once_per_draft(monkeypatch):
+    class Engine:
+        cfg = SimpleNamespace(deadline_reserve_seconds=0.0)
+
+        async def draft(self, *args, **kw):
+            async def tokens():
+                for t in ("Dear ", "Sir"):
+                    yield t
+            return tokens(), []
+
+    class Context:
+        def time_remaining(self):
+            return None
+
+        def invocation_metadata(self):
+            return (("x-tenant-id", TENANT),)
+
+    @asynccontextmanager
+    async def tenant_tx(pool, tenant_id):
+        yield None
+
+    async def append_draft_stream(conn, *args):
+        pass
+
+    monkeypatch.setattr("app.draft_streams.dbx.tenant_tx", tenant_tx)
+    monkeypatch.setattr("app.draft_streams.dbx.append_draft_stream", append_draft_stream)
+    streams = DraftStreams(None, SimpleNamespace(
+        draft_flush_ms=10, draft_detached_seconds=60, draft_coalesce_ms=20, draft_coalesce_bytes=1024))
+    before = REGISTRY.get_sample_value("wakili_ai_draft_ttft_seconds_count") or 0
+    request = SimpleNamespace(tenant=SimpleNamespace(tenant_id=TENANT), doc_type=0,
+                              instructions="x", matter_id="", template_id="", context_query="")
+    frames = [f async for f in DraftingService(Engine(), streams).DraftDocument(
+        request, Context())]
+    assert "".join(f.text for f in frames) == "Dear Sir" and frames[-1].is_final
+    assert REGISTRY.get_sample_value("wakili_ai_draft_ttft_seconds_count") == before + 1
+
+
+class SectionLLM:
+    """Streams each section's heading back; earlier sections are slower, so
+    they finish last."""
+
+    def __init__(self, fail=None):
+        self.fail = fail
+        self.running = self.peak = 0
+        self.prompts = []
+
+    async def stream(self, system, prompt, max_tokens=8192):
+        self.prompts.append(prompt)
+        heading = prompt[-1].text.split("section of the document: ")[1].split(" — ")[0]
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.02 * (10 - len(self.prompts)))
+            if heading == self.fail:
+                raise RuntimeError("model overloaded")
+            yield heading
+            yield "."
+        finally:
+            self.running -= 1
+
+
+def _sectioned_engine(monkeypatch, llm, retriever):
+    engine = _engine(monkeypatch, FakeConn(), retriever)
+    engine.llm = llm
+    engine.cfg = SimpleNamespace(draft_clause_top_k=3, draft_section_parallel=True,
+                                 draft_section_concurrency=3, draft_section_max_tokens=512)
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_contracts_are_drafted_section_parallel_in_document_order(monkeypatch):
+    queries = []
+
+    class Retriever:
+        async def retrieve(self, tenant_id, query, **kw):
+            queries.append(query)
+            shared = RankedChunk(chunk_id="arb", text="s.10", score=0.8, source_type="PUBLIC",
+                                 source_id="act-arb", citation="Arbitration Act")
+            own = RankedChunk(chunk_id=query[:12], text="...", score=0.7, source_type="PUBLIC",
+                              source_id=query[:12])
+            return [shared, own], "drafting"
+
+    llm = SectionLLM()
+    engine = _sectioned_engine(monkeypatch, llm, Retriever())
+    stream, citations = await engine.draft(TENANT, "contract", "supply of maize",
+                                           budget=Budget())
+    text = "".join([t async for t in stream])
+    headings = [s.heading for s in SECTIONS["contract"]]
+    assert text == "\n\n".join(f"{h}." for h in headings)
+    assert llm.peak == 3
+
+    # Only the grounded sections retrieve; a shared authority is cited once.
+    assert len(queries) == sum(s.grounded for s in SECTIONS["contract"])
+    assert [c.source_id for c in citations].count("act-arb") == 1
+    assert len(citations) == len(queries) + 1
+    assert all(p[0].cacheable and p[0].text == llm.prompts[0][0].text for p in llm.prompts)
+
+
+@pytest.mark.asyncio
+async def test_a_failed_section_fails_the_draft(monkeypatch):
+    class Retriever:
+        async def retrieve(self, tenant_id, query, **kw):
+            return [], "drafting"
+
+    engine = _sectioned_engine(monkeypatch, SectionLLM(fail="LEGAL BASIS"), Retriever())
+    stream, _ = await engine.draft(TENANT, "pleading", "unfair dismissal", budget=Budget())
+    seen = []
+    with pytest.raises(RuntimeError, match="overloaded"):
+        async for token in stream:
+            seen.append(token)
+    assert "".join(seen).startswith("HEADING, PARTIES AND MATERIAL FACTS.")
@@ -0,0 +1,149 @@
+"""CSR snapshot of the public graph: same one-hop semantics as the Neo4j
+expansion (undirected, only from Statute/CaseLaw/Judgment nodes), built from
+builder reads, and used by reasoning without per-hop graph round trips."""
+import pytest
+
+from app.graph.builders import is_builder_query
+from app.graph.snapshot import PublicGraphCache, PublicGraphSnapshot, best_edges
+from app.embeddings import HashingEmbedder
+from app.llm import MockProvider
+from app.reasoning import ReasoningEngine
+from app.retrieval import RankedChunk
+
+TENANT = "aaaaaaaa-1111-4111-8111-aaaaaaaaaaaa"
+
+
+def _snapshot():
+    nodes = {"act-1": ("Employment Act", "current"), "case-1": ("A v B", "current"),
+             "case-2": ("C v D", "overturned"), "case-1#opinion-0-dissent": ("Dissent", "current"),
+             "gz-1": ("Gazette Notice", "current"), "case-3": ("E v F", "current")}
+    expandable = {"act-1", "case-1", "case-2", "case-3"}
+    edges = {"CITES": {("case-1", "act-1"), ("gz-1", "case-3")},
+             "OVERTURNS": {("case-1", "case-2")},
+             "PART_OF": {("case-1#opinion-0-dissent", "case-1")},
+             "INTERPRETS": set()}
+    return PublicGraphSnapshot(nodes, expandable, edges)
+
+
+def test_expansion_is_undirected_and_deduplicated():
+    snap = _snapshot()
+    assert len(snap) == 6 and snap.edge_count == 4
+    seen = {"act-1"}
+    assert snap.expand(["act-1"], seen) == [("act-1", "case-1", "A v B", "CITES")]
+    found = snap.expand(["case-1"], seen)
+    # Ranked by edge-type weight: the overturning edge outranks the opinion link.
+    assert [(dst, rel) for _, dst, _, rel in found] == \
+        [("case-2", "OVERTURNS"), ("case-1#opinion-0-dissent", "PART_OF")]
+    assert snap.expand(["case-1"], seen) == []
+
+
+def test_best_edges_keeps_strongest_edge_per_neighbour():
+    edges = [("a", "x", "", "CITES"), ("b", "y", "", "PART_OF"), ("c", "x", "", "OVERTURNS"),
+             ("a", "seen", "", "AMENDS")]
+    seen = {"seen"}
+    assert best_edges(edges, seen) == [("c", "x", "", "OVERTURNS"), ("b", "y", "", "PART_OF")]
+    assert seen == {"seen", "x", "y"}
+
+
+def test_subgraph_returns_all_edges_among_reached_nodes():
+    snap = _snapshot()
+    edges = snap.subgraph(["act-1", "case-1", "case-2", "gz-1"])
+    assert sorted((a, b, rel) for a, b, _, rel in edges) == \
+        [("act-1", "case-1", "CITES"), ("case-1", "case-2", "OVERTURNS")]
+
+
+def test_only_anchor_labels_are_expanded_from():
+    snap = _snapshot()
+    # gz-1 is a GazetteNotice: reachable, but never a source of expansion.
+    assert snap.neighbors("gz-1") == []
+    assert [snap.ids[j] for j in snap.neighbors("case-3")] == ["gz-1"]
+    assert snap.neighbors("unknown") == []
+
+
+class FakeGraph:
+    def __init__(self):
+        self.reads = []
+
+    async def read(self, q, timeout=None):
+        assert is_builder_query(q) and not q.write
+        self.reads.append(q.cypher)
+        if "RETURN n.doc_id" in q.cypher:
+            return [{"doc_id": "act-1", "title": "Employment Act", "status": "current"}]
+        return [{"src": "act-1", "dst": "case-1", "title": "A v B", "status": "current", "rel": "CITES"},
+                {"src": "act-1", "dst": None, "title": None, "status": None, "rel": "AUTHORED"}]
+
+
+@pytest.mark.asyncio
+async def test_cache_builds_from_builder_reads_and_keeps_previous_on_failure():
+    graph = FakeGraph()
+    cache = PublicGraphCache(graph)
+    await cache.refresh()
+    snap = cache.current
+    assert snap is not None and snap.edge_count == 1
+    assert len(graph.reads) == 2 and all("LIMIT" not in c for c in graph.reads)
+
+    async def broken(q, timeout=None):
+        raise RuntimeError("neo4j down")
+
+    graph.read = broken
+    await cache.refresh()
+    assert cache.current is snap
+
+
+@pytest.mark.asyncio
+async def test_reasoning_hops_use_the_snapshot_not_neo4j():
+    class Retriever:
+        embedder = HashingEmbedder(8)
+
+        async def retrieve(self, tenant_id, query, **kw):
+            return [RankedChunk(chunk_id="1", text="s.45", score=0.9, source_type="PUBLIC",
+                                source_id="act-1")], "statute_lookup"
+
+    class NoGraph:
+        async def read(self, q, timeout=None):
+            raise AssertionError("public hops must not hit Neo4j")
+
+    cache = PublicGraphCache(NoGraph())
+    cache.current = _snapshot()
+    engine = ReasoningEngine(None, NoGraph(), Retriever(), MockProvider(), None, snapshot=cache)
+
+    async def no_chunks(doc_ids, qvec):
+        return []
+
+    engine._chunks_for_docs = no_chunks
+    steps, _, _ = await engine.reason(TENANT, "q", max_hops=3)
+    assert [s.hop for s in steps] == [0, 1, 2]
+    assert steps[1].node_ids == ["case-1"]
+    assert steps[2].node_ids == ["case-2", "case-1#opinion-0-dissent"]
+    assert steps[2].edge_types == ["OVERTURNS", "PART_OF"]
+
+
+@pytest.mark.asyncio
+async def test_live_hop_is_one_query_for_the_whole_frontier():
+    class Retriever:
+        embedder = HashingEmbedder(8)
+
+        async def retrieve(self, tenant_id, query, **kw):
+            return [RankedChunk(chunk_id=str(i), text="t", score=0.9, source_type="PUBLIC",
+                                source_id=f"act-{i}") for i in range(3)], "statute_lookup"
+
+    graph = FakeGraph()
+    graph.read_rows = [{"src": "act-0", "dst": "case-9", "title": "", "rel": "CITES"},
+                       {"src": "act-1", "dst": "case-8", "title": "", "rel": "AMENDS"}]
+
+    async def read(q, timeout=None):
+        graph.reads.append(q.cypher)
+        return graph.read_rows if len(graph.reads) == 1 else []
+
+    graph.read = read
+    engine = ReasoningEngine(None, graph, Retriever(), MockProvider(), None)
+
+    async def no_chunks(doc_ids, qvec):
+        return []
+
+    engine._chunks_for_docs = no_chunks
+    steps, _, _ = await engine.reason(TENANT, "q", max_hops=2)
+    assert steps[1].node_ids == ["case-8", "case-9"]
+    assert len(graph.reads) == 2  # hop 1 + hop 2, not one per label
+    assert "(a:Statute OR a:CaseLaw OR a:Judgment)" in graph.reads[0]
+    assert "*1.." not in graph.reads[0]
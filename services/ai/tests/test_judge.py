@@ -1,6 +1,7 @@
 """Judge-aware reasoning: detection, pattern assembly, and tenant isolation
 of the firm-internal history (Task 4)."""
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 from types import SimpleNamespace
 
@@ -8,43 +9,71 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from app.judge import JUDICIAL_ANALYTICS_DISCLAIMER, JudgeReasoner
+from app.ingestion.extraction import ExtractedEntities
+from app.ingestion.tenant_ingest import TenantIngestor
+from app.judge import (JUDICIAL_ANALYTICS_DISCLAIMER, JudgeContextCache, JudgeGazetteer,
+                       JudgeGazetteerCache, JudgeHistoryBackfill, JudgeMatch, JudgeReasoner)
+from app.retrieval import RetrievalOrchestrator
 
 TENANT = "aaaaaaaa-1111-4111-8111-aaaaaaaaaaaa"
 
 
 class FakeGraph:
-    """Returns canned rows and asserts every tenant read is tenant-scoped and
-    every public read is not — so a leak in query construction fails the test."""
+    """Public half: asserts every public read is not tenant-scoped."""
     def __init__(self):
-        self.tenant_reads = 0
         self.public_reads = 0
 
     async def read(self, q):
-        cy = q.cypher
-        if "Matter" in cy and "RESULTED_IN" in cy:
-            assert q.tenant_scoped and q.params.get("tenant_id") == TENANT
-            self.tenant_reads += 1
-            return [{"matter_id": "m1", "result": "won"},
-                    {"matter_id": "m2", "result": "lost"},
-                    {"matter_id": "m3", "result": "won"}]
-        if "FILED_IN" in cy and "Statute" in cy:
-            assert q.tenant_scoped and q.params.get("tenant_id") == TENANT
-            self.tenant_reads += 1
-            return [{"title": "Land Registration Act"}, {"title": "Land Registration Act"}]
-        if "FILED_IN" in cy and "CaseLaw" in cy:
-            assert q.tenant_scoped and q.params.get("tenant_id") == TENANT
-            self.tenant_reads += 1
-            return [{"title": "Kamau v Njoroge [2015] eKLR"}]
-        if "Judge" in cy and "rulings_count" in cy:
+        if "Judge" in q.cypher and "rulings_count" in q.cypher:
             assert not q.tenant_scoped  # public read: no tenant filter
             self.public_reads += 1
             return [{"rulings_count": 10, "favored_plaintiff": 6, "favored_defendant": 4}]
         return []
 
 
-def _reasoner(graph):
-    return JudgeReasoner(pool=None, graph=graph, cfg=SimpleNamespace(enable_judge_reasoning=True))
+class TenantAggregates:
+    """Each tenant schema's judge_aggregates table. A read only sees the rows
+    of the tenant its transaction was pinned to. Both tenants start with
+    their graph history already backfilled."""
+    def __init__(self):
+        self.reads = []
+        self.rows = {(TENANT, "Jane Mwangi"): {
+            "matters": 3, "favorable": 2,
+            "top_authorities": [["Land Registration Act", 2], ["Kamau v Njoroge [2015] eKLR", 1]]}}
+        self.backfilled = {TENANT, "bbbbbbbb-2222-4222-8222-bbbbbbbbbbbb"}
+        self.backfills = []
+
+    @asynccontextmanager
+    async def tenant_tx(self, pool, tenant_id):
+        yield tenant_id
+
+    async def judge_aggregate(self, conn, judge_name):
+        self.reads.append((conn, judge_name))
+        return self.rows.get((conn, judge_name))
+
+    async def judge_history_backfilled(self, conn):
+        return conn in self.backfilled
+
+    async def backfill_judge_matters(self, conn, matters, citations, favorable):
+        if conn in self.backfilled:  # another process got there first
+            return False
+        self.backfills.append((conn, matters, citations))
+        self.backfilled.add(conn)
+        return True
+
+
+@pytest.fixture
+def tenant_db(monkeypatch):
+    db = TenantAggregates()
+    for name in ("tenant_tx", "judge_aggregate", "judge_history_backfilled",
+                 "backfill_judge_matters"):
+        monkeypatch.setattr(f"app.judge.dbx.{name}", getattr(db, name))
+    return db
+
+
+def _reasoner(graph, cache=None):
+    return JudgeReasoner(pool=None, graph=graph, cfg=SimpleNamespace(enable_judge_reasoning=True),
+                         cache=cache)
 
 
 @pytest.mark.parametrize("query,expected", [
@@ -59,7 +88,7 @@ def test_detect_judge_name(query, expected):
 
 
 @pytest.mark.asyncio
-async def test_context_block_merges_tenant_and_public_and_is_scoped():
+async def test_context_block_merges_tenant_and_public_and_is_scoped(tenant_db):
     graph = FakeGraph()
     block = await _reasoner(graph).context_block(TENANT, "Jane Mwangi")
     # firm-internal + public signals both present
@@ -68,12 +97,176 @@ async def test_context_block_merges_tenant_and_public_and_is_scoped():
     assert "2 had a favourable outcome" in block          # two 'won'
     assert "Land Registration Act (x2)" in block          # top winning authority
     assert "10 ruling(s)" in block                        # public profile
-    assert graph.tenant_reads >= 2 and graph.public_reads == 1
+    assert tenant_db.reads == [(TENANT, "Jane Mwangi")] and graph.public_reads == 1
+    # Another firm's aggregate for the same judge is a different schema.
+    other = await _reasoner(graph).build("bbbbbbbb-2222-4222-8222-bbbbbbbbbbbb", "Jane Mwangi")
+    assert other.tenant_cases == 0 and other.winning_authorities == []
 
 
 @pytest.mark.asyncio
-async def test_no_signal_returns_empty():
+async def test_no_signal_returns_empty(tenant_db):
     class Empty:
         async def read(self, q):
             return []
     assert await _reasoner(Empty()).context_block(TENANT, "Nobody") == ""
+
+
+@pytest.mark.asyncio
+async def test_graph_history_is_backfilled_once_per_tenant(tenant_db):
+    tenant = "cccccccc-3333-4333-8333-cccccccccccc"
+
+    class History(FakeGraph):
+        """Matters filed before the aggregate tables existed."""
+        def __init__(self):
+            super().__init__()
+            self.history_reads = 0
+
+        async def read(self, q):
+            if "Matter" not in q.cypher:
+                return await super().read(q)
+            assert q.tenant_scoped and q.params["tenant_id"] == tenant
+            self.history_reads += 1
+            if "Outcome" in q.cypher:
+                return [{"matter_key": "m-1", "result": "won"}]
+            if "Submission" in q.cypher:
+                return ([{"matter_key": "m-1", "submission_id": "s-1", "title": "Land Act"}]
+                        if ":Statute" in q.cypher else [])
+            return [{"matter_key": "m-1", "judge_name": "Jane Mwangi"},
+                    {"matter_key": "m-2", "judge_name": "Jane Mwangi"}]
+
+    graph = History()
+    cache = JudgeContextCache()
+    cache.put_tenant(tenant, "Jane Mwangi", (0, 0, []), cache.tenant_generation(tenant))
+    # Queries read the aggregate only; the history scan is the backfill's.
+    await _reasoner(graph, cache).build(tenant, "Jane Mwangi")
+    assert graph.history_reads == 0 and tenant_db.backfills == []
+
+    backfill = JudgeHistoryBackfill(pool=None, graph=graph, cache=cache)
+    assert await backfill.backfill_tenant(tenant) is True
+    [(conn, matters, citations)] = tenant_db.backfills
+    assert conn == tenant
+    assert matters == [{"matter_key": "m-1", "judge_name": "Jane Mwangi", "result": "won"},
+                       {"matter_key": "m-2", "judge_name": "Jane Mwangi", "result": ""}]
+    assert citations == [{"matter_key": "m-1", "submission_id": "s-1", "title": "Land Act"}]
+
+    assert cache.get_tenant(tenant, "Jane Mwangi") is None  # the pre-backfill answer is dropped
+
+    reads = graph.history_reads
+    # Another process, or the next start: already marked done, no graph scan.
+    assert await JudgeHistoryBackfill(pool=None, graph=graph).backfill_tenant(tenant) is False
+    assert len(tenant_db.backfills) == 1 and graph.history_reads == reads
+
+
+@pytest.mark.asyncio
+async def test_filing_is_folded_into_the_tenant_judge_aggregates(monkeypatch):
+    recorded = []
+
+    @asynccontextmanager
+    async def tenant_tx(pool, tenant_id):
+        yield tenant_id
+
+    async def record_judge_matter(conn, *args):
+        recorded.append((conn, *args))
+
+    monkeypatch.setattr("app.ingestion.tenant_ingest.dbx.tenant_tx", tenant_tx)
+    monkeypatch.setattr("app.ingestion.tenant_ingest.dbx.record_judge_matter", record_judge_matter)
+
+    class Citations:
+        async def resolve(self, needles, limit=1):
+            return {n: [{"doc_id": f"pub-{n}", "title": n}] for n in needles}
+
+    ingestor = TenantIngestor.__new__(TenantIngestor)
+    ingestor.pool, ingestor.citations = None, Citations()
+    entities = ExtractedEntities(case_ref="ELRC E123 of 2026", judge_name="Mwangi",
+                                 outcome={"result": "won"}, act_citations=["Employment Act"])
+    await ingestor._record_judge_matter(TENANT, "doc-1", None, entities)
+    assert recorded == [(TENANT, "elrc-e123-of-2026", "doc-1", "Mwangi", "won",
+                         ["Employment Act"], ("won", "settled"))]
+
+    # No matter to hang it on: nothing to aggregate.
+    await ingestor._record_judge_matter(TENANT, "doc-2", None, ExtractedEntities(judge_name="Mwangi"))
+    assert len(recorded) == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_halves_are_reused_and_invalidated_separately(tenant_db):
+    graph = FakeGraph()
+    cache = JudgeContextCache()
+    reasoner = _reasoner(graph, cache)
+    first = await reasoner.context_block(TENANT, "Jane Mwangi")
+    assert await reasoner.context_block(TENANT, "Jane Mwangi") == first
+    assert len(tenant_db.reads) == 1 and graph.public_reads == 1
+
+    cache.invalidate_tenant(TENANT, "Jane Mwangi")
+    await reasoner.context_block(TENANT, "Jane Mwangi")
+    assert len(tenant_db.reads) == 2 and graph.public_reads == 1
+
+    cache.invalidate_public()
+    await reasoner.context_block(TENANT, "Jane Mwangi")
+    assert len(tenant_db.reads) == 2 and graph.public_reads == 2
+
+
+@pytest.mark.asyncio
+async def test_tenant_entries_never_cross_tenants_and_racing_reads_are_not_stored():
+    cache = JudgeContextCache()
+    cache.put_tenant(TENANT, "Mwangi", (3, 2, []), cache.tenant_generation(TENANT))
+    assert cache.get_tenant("bbbbbbbb-2222-4222-8222-bbbbbbbbbbbb", "Mwangi") is None
+
+    stale = cache.tenant_generation(TENANT)
+    cache.invalidate_tenant(TENANT)  # e.g. a filing lands mid-read
+    assert cache.get_tenant(TENANT, "Mwangi") is None
+    cache.put_tenant(TENANT, "Mwangi", (3, 2, []), stale)
+    assert cache.get_tenant(TENANT, "Mwangi") is None
+
+
+def test_lru_evicts_and_expires():
+    cache = JudgeContextCache(max_entries=2, ttl_seconds=600)
+    for name in ("a", "b", "c"):
+        cache.put_public(name, {"rulings_count": 1}, cache.public_generation())
+    assert cache.get_public("a") is None and cache.get_public("c") == {"rulings_count": 1}
+    expired = JudgeContextCache(ttl_seconds=-1)
+    expired.put_public("a", {}, 0)
+    assert expired.get_public("a") is None
+
+
+GAZETTEER = JudgeGazetteer(["Maureen Onyango J", "Maraga CJ", "Jane Mwangi J", "Paul Mwangi JA"])
+
+
+@pytest.mark.parametrize("query,expected", [
+    ("how has Onyango J ruled on unfair termination?", JudgeMatch("Maureen Onyango", "Maureen Onyango J")),
+    ("before Lady Justice Maureen Onyango", JudgeMatch("Maureen Onyango", "Maureen Onyango J")),
+    ("what did Maraga C.J. hold in the 2017 petition", JudgeMatch("Maraga", "Maraga CJ")),
+    ("Paul Mwangi JA on stay pending appeal", JudgeMatch("Paul Mwangi", "Paul Mwangi JA")),
+    ("Mwangi JA in the Court of Appeal", JudgeMatch("Paul Mwangi", "Paul Mwangi JA")),
+    ("before Justice Mwangi", JudgeMatch("Mwangi", None)),
+    ("Onyango v Republic", None),  # a party, not an anchored mention
+    ("cases before Judge Peter Omondi", None),  # not a known judge
+])
+def test_gazetteer_matches_known_forms_only(query, expected):
+    assert GAZETTEER.find(query) == expected
+
+
+@pytest.mark.asyncio
+async def test_unknown_judge_costs_no_graph_work_once_the_gazetteer_is_built(tenant_db):
+    class JudgeNodes(FakeGraph):
+        async def read(self, q):
+            if q.cypher.endswith("j.name AS name"):
+                return [{"name": "Maureen Onyango J"}, {"name": None}]
+            return await super().read(q)
+
+    graph = JudgeNodes()
+    gazetteer = JudgeGazetteerCache(graph)
+    orch = RetrievalOrchestrator(None, graph, None, None,
+                                 SimpleNamespace(enable_judge_reasoning=True), gazetteer=gazetteer)
+    # Before the first build the regex still detects "Peter Omondi".
+    await orch._judge_context(TENANT, "cases before Judge Peter Omondi")
+    reads = len(tenant_db.reads) + graph.public_reads
+    assert reads == 2
+
+    await gazetteer.refresh()
+    assert len(gazetteer.current) == 1
+    assert await orch._judge_context(TENANT, "cases before Judge Peter Omondi") == ""
+    assert len(tenant_db.reads) + graph.public_reads == reads
+
+    block = await orch._judge_context(TENANT, "what has worked before Onyango J?")
+    assert "Judge: Maureen Onyango" in block and graph.public_reads == 2
@@ -0,0 +1,193 @@
+"""Judge-profile recompute: driven by ingestion deltas (only judges who
+authored new/changed documents are revisited; a pass that changed nothing
+costs no graph work) and done in bulk (one pair read, one text query per
+batch, each case classified once, UNWIND write-back)."""
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from app.graph.builders import is_builder_query
+from app.ingestion.auto_update import AutoUpdateWatcher
+from app.ingestion.judge_profile import JudgeProfiler
+from app.judge import JudgeContextCache
+from app.ingestion.models import LegalDocument, RunReport
+from app.ingestion.registry import all_crawlers
+from app.ingestion.scheduler import PostRunSteps
+
+BENCH = ("Koome CJ", "Mwilu DCJ", "Ibrahim SCJ")
+
+
+class FakeGraph:
+    def __init__(self, judges=BENCH):
+        self.judges = judges
+        self.reads = []
+        self.batches = []
+
+    async def read(self, q, timeout=None):
+        assert is_builder_query(q) and not q.write
+        self.reads.append((q.cypher, q.params))
+        if "c.doc_id AS doc_id" not in q.cypher:
+            return [{"name": j} for j in self.judges]
+        pairs = [{"name": j, "doc_id": "sc-1", "title": "A v B", "labels": ["Judgment", "Public"]}
+                 for j in self.judges]
+        pairs.append({"name": self.judges[0], "doc_id": "ca-9", "title": "C v D",
+                      "labels": ["CaseLaw", "Public"]})
+        return pairs
+
+    async def _run_internal_batch(self, statements):
+        self.batches.append(list(statements))
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    fetched = []
+
+    async def docs_text(pool, doc_ids, max_chunks=6):
+        fetched.append(list(doc_ids))
+        return {"sc-1": "The appeal is allowed.", "ca-9": "The suit is dismissed with costs."}
+
+    monkeypatch.setattr("app.ingestion.judge_profile.dbx.public_docs_text", docs_text)
+    cfg = SimpleNamespace(judge_profile_batch_cases=2000, judge_profile_workers=1)
+    make = lambda graph, cache=None, cfg=cfg: JudgeProfiler(None, graph, cfg, judge_cache=cache)  # noqa: E731
+    make.fetched = fetched
+    return make
+
+
+@pytest.mark.asyncio
+async def test_no_changed_documents_means_no_graph_work(profiler):
+    graph = FakeGraph()
+    assert await profiler(graph).recompute([]) == 0
+    assert graph.reads == [] and graph.batches == []
+
+
+@pytest.mark.asyncio
+async def test_only_authors_of_changed_documents_are_recomputed(profiler):
+    graph = FakeGraph(judges=("Koome CJ", "Koome CJ", "Mwilu DCJ"))
+    assert await profiler(graph).recompute(["sc-1", "sc-2", "sc-1"]) == 2
+    cypher, params = graph.reads[0]
+    assert "[:AUTHORED]" in cypher and "(j:Judge:Public)" in cypher
+    assert ["sc-1", "sc-2"] in params.values()
+    # The pair read is restricted to those judges, and never LIMITed.
+    assert ["Koome CJ", "Mwilu DCJ"] in graph.reads[1][1].values()
+    assert all("LIMIT" not in c for c, _ in graph.reads)
+
+
+@pytest.mark.asyncio
+async def test_full_recompute_is_bulk(profiler):
+    graph = FakeGraph()
+    assert await profiler(graph).recompute(None) == 3
+    assert len(graph.reads) == 2 and "j.name IN" not in graph.reads[1][0]
+    # Each case's text is fetched once, however many judges sat on it.
+    assert profiler.fetched == [["sc-1", "ca-9"]]
+
+    edges, [counters] = graph.batches
+    by_label = {next(lb for lb in ("Judgment", "CaseLaw") if f":{lb}:Public" in c): p["rows"]
+                for c, p in edges}
+    assert len(by_label["Judgment"]) == 3
+    assert by_label["CaseLaw"] == [{"name": "Koome CJ", "doc_id": "ca-9", "align": "favored_defendant"}]
+    cypher, params = counters
+    assert cypher.startswith("UNWIND $rows")
+    koome = next(r for r in params["rows"] if r["name"] == "Koome CJ")
+    assert koome == {"name": "Koome CJ", "n": 2, "fp": 1, "fd": 1}
+
+
+@pytest.mark.asyncio
+async def test_more_than_one_batch_is_aligned_in_the_process_pool(profiler, monkeypatch):
+    pools = []
+
+    class Pool(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(args)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr("app.ingestion.judge_profile.ProcessPoolExecutor", Pool)
+    # One batch (an incremental pass): aligned in a thread, no interpreters started.
+    one_batch = SimpleNamespace(judge_profile_batch_cases=2000, judge_profile_workers=2)
+    assert await profiler(FakeGraph(), cfg=one_batch).recompute(["sc-1"]) == 3
+    assert pools == []
+
+    profiler.fetched.clear()
+    graph = FakeGraph()
+    cfg = SimpleNamespace(judge_profile_batch_cases=1, judge_profile_workers=2)
+    assert await profiler(graph, cfg=cfg).recompute(None) == 3
+    assert pools == [(2,)]
+    assert profiler.fetched == [["sc-1"], ["ca-9"]]
+    rows = [row for c, p in graph.batches[0] + graph.batches[1] if ":RULED_ON]" in c
+            for row in p["rows"]]
+    assert {r["doc_id"]: r["align"] for r in rows} == {"sc-1": "favored_plaintiff",
+                                                       "ca-9": "favored_defendant"}
+
+
+@pytest.mark.asyncio
+async def test_recompute_drops_cached_public_profiles(profiler):
+    cache = JudgeContextCache()
+    cache.put_public("Koome CJ", {"rulings_count": 1}, cache.public_generation())
+    await profiler(FakeGraph(), cache).recompute(["sc-1"])
+    assert cache.get_public("Koome CJ") is None
+
+
+class OneJudgmentWatcher(AutoUpdateWatcher):
+    """Watches one source that yields ``docs``, none of them seen before."""
+
+    def __init__(self, docs, post_run):
+        class Pipeline:
+            async def _ingest_doc(self, doc, report):
+                report.new_docs += 1
+                report.changed_doc_ids.append(doc.doc_id)
+
+            async def flush_graph(self, errors):
+                return None
+
+        cfg = SimpleNamespace(ingest_offline_samples=True)
+        super().__init__(None, Pipeline(), cfg, post_run=post_run)
+        self.docs = docs
+
+    def _watched_sources(self):
+        return [next(iter(all_crawlers()))]
+
+    async def _existing_hash(self, doc_id):
+        return None
+
+    async def _fetch(self, crawler, http):
+        return list(self.docs)
+
+
+@pytest.fixture
+def no_watermark(monkeypatch):
+    async def get_watermark(pool, source_type):
+        return None
+
+    async def set_watermark(pool, source_type, ts):
+        return None
+
+    monkeypatch.setattr("app.ingestion.auto_update.dbx.get_watermark", get_watermark)
+    monkeypatch.setattr("app.ingestion.auto_update.dbx.set_watermark", set_watermark)
+
+
+@pytest.mark.asyncio
+async def test_auto_updated_judgment_recomputes_its_judge(profiler, no_watermark):
+    graph = FakeGraph(judges=("Koome CJ",))
+    cache = JudgeContextCache()
+    cache.put_public("Koome CJ", {"rulings_count": 1}, cache.public_generation())
+    post_run = PostRunSteps()
+    post_run.add("judge profile", lambda reports: profiler(graph, cache).recompute(
+        [d for r in reports for d in r.changed_doc_ids]))
+    judgment = LegalDocument(doc_id="sc-1", title="A v B", doc_type="judgment",
+                             source_url="", full_text="...", authored_by=["Koome CJ"])
+
+    summary = await OneJudgmentWatcher([judgment], post_run).run_once(http=object())
+    assert summary["new"] == ["sc-1"]
+    assert ["sc-1"] in graph.reads[0][1].values()
+    assert cache.get_public("Koome CJ") is None
+
+
+@pytest.mark.asyncio
+async def test_auto_update_that_changed_nothing_skips_post_run(no_watermark):
+    seen = []
+
+    async def post_run(reports):
+        seen.append(reports)
+
+    await OneJudgmentWatcher([], post_run).run_once(http=object())
+    assert seen == []
@@ -27,9 +27,10 @@ TENANT_B = "bbbbbbbb-2222-4222-8222-bbbbbbbbbbbb"
 MARKER_A = "MWANGI-CONFIDENTIAL-ALPHA settlement floor KES 1,400,000"
 MARKER_B = "ODHIAMBO-CONFIDENTIAL-BRAVO settlement ceiling KES 9,900,000"
 
-TENANT_MIGRATION = (
-    Path(__file__).resolve().parents[3] / "infra" / "migrations" / "tenant" / "0001_init.sql"
-)
+TENANT_MIGRATIONS = [
+    Path(__file__).resolve().parents[3] / "infra" / "migrations" / "tenant" / name
+    for name in ("0001_init.sql", "0010_judge_aggregates.sql", "0013_judge_backfill.sql")
+]
 
 
 @pytest.fixture(scope="module")
@@ -59,7 +60,7 @@ def env(event_loop):
         embedder = HashingEmbedder(cfg.embedding_dim)
         retriever = RetrievalOrchestrator(pool, graph, embedder, MockProvider(), cfg)
 
-        ddl = TENANT_MIGRATION.read_text()
+        ddl = "\n".join(m.read_text() for m in TENANT_MIGRATIONS)
         docs = {}
         for tid, marker in ((TENANT_A, MARKER_A), (TENANT_B, MARKER_B)):
             schema = schema_for(tid)
@@ -268,6 +269,14 @@ async def _seed_judge_history(env, tid, matter_id, result, judge="Jane Mwangi"):
             .merge_node("s", "Submission", {"id": sub_id})
             .match_public("st", "Statute", doc_id="act-2007-11-employment")
             .merge_rel("s", "CITES", "st").build())
+    # What tenant ingestion records alongside the graph stage.
+    from app import db as dbx
+    from app.judge import FAVORABLE_RESULTS
+
+    cited = ["Employment Act"] if result == "won" else []
+    async with dbx.tenant_tx(env["pool"], tid) as conn:
+        await dbx.record_judge_matter(conn, matter_id, sub_id, judge, result, cited,
+                                      FAVORABLE_RESULTS)
 
 
 def test_judge_aware_history_is_tenant_scoped(env):
@@ -294,6 +303,34 @@ def test_judge_aware_history_is_tenant_scoped(env):
     assert "Employment Act" not in block_b  # LEAKAGE guard
 
 
+def test_concurrent_filings_for_one_judge_both_reach_the_aggregate(env):
+    from app import db as dbx
+    from app.judge import FAVORABLE_RESULTS
+
+    judge = "Concurrent Kariuki"
+
+    async def record(conn, matter_id, result):
+        await dbx.record_judge_matter(conn, matter_id, matter_id + "-sub", judge, result,
+                                      [], FAVORABLE_RESULTS)
+
+    async def second():
+        async with dbx.tenant_tx(env["pool"], TENANT_A) as conn:
+            await record(conn, "A-CC-2-2026", "lost")
+
+    async def both():
+        # The second filing recomputes while the first is still uncommitted.
+        async with dbx.tenant_tx(env["pool"], TENANT_A) as conn:
+            await record(conn, "A-CC-1-2026", "won")
+            task = asyncio.create_task(second())
+            await asyncio.sleep(0.3)
+        await task
+        async with dbx.tenant_tx(env["pool"], TENANT_A) as conn:
+            return await dbx.judge_aggregate(conn, judge)
+
+    row = run(env, both())
+    assert row["matters"] == 2 and row["favorable"] == 1
+
+
 # --- 6. Temporal correctness: law as it stood on a past date ------------------
 
 def test_temporal_versioning_returns_law_in_force_then(env):
@@ -0,0 +1,181 @@
+"""Completion cache: hits only within a partition (tenant, or public when the
+prompt carries no firm-private context), bounded by size, dropped by
+invalidation (including after auto-update ingestion), never applied to
+streams, and hit rates exported."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.ingestion.auto_update import AutoUpdateWatcher
+from app.ingestion.models import LegalDocument
+from app.ingestion.registry import all_crawlers
+from app.llm_cache import CompletionCache
+from app.retrieval import RankedChunk, RetrievalOrchestrator
+from app.server import corpus_post_run
+
+TENANT_A = "aaaaaaaa-1111-4111-8111-aaaaaaaaaaaa"
+TENANT_B = "bbbbbbbb-2222-4222-8222-bbbbbbbbbbbb"
+
+
+class CountingLLM:
+    _model, _fast_model = "big", "small"
+
+    def __init__(self):
+        self.calls = 0
+        self.gate = None
+
+    async def complete(self, system, prompt, max_tokens=2048, fast=False):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return f"answer {self.calls}"
+
+    async def stream(self, system, prompt, max_tokens=8192):
+        self.calls += 1
+        yield "streamed"
+
+
+def _lookups(site, result):
+    return REGISTRY.get_sample_value("wakili_ai_llm_cache_lookups_total",
+                                     {"site": site, "result": result}) or 0
+
+
+@pytest.mark.asyncio
+async def test_hits_stay_within_their_partition():
+    llm, cache = CountingLLM(), CompletionCache()
+    hits = _lookups("test", "hit")
+    a = cache.bind(llm, TENANT_A, "test")
+    assert await a.complete("s", "q") == await a.complete("s", "q") == "answer 1"
+    assert await cache.bind(llm, TENANT_B, "test").complete("s", "q") == "answer 2"
+    assert await cache.bind(llm, None, "test").complete("s", "q") == "answer 3"
+    # Every key component matters.
+    assert await a.complete("s", "q", fast=True) == "answer 4"
+    assert await a.complete("s", "q", max_tokens=16) == "answer 5"
+    assert _lookups("test", "hit") == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_private_context_never_lands_in_the_public_partition():
+    llm, cache = CountingLLM(), CompletionCache()
+    public = cache.bind(llm, None, "test")
+    for _ in range(2):
+        await public.complete("s", "[1] (TENANT_PRIVATE) Wanjiru file note\n...")
+    assert llm.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidation_and_size_bound():
+    llm, cache = CountingLLM(), CompletionCache(max_entries=2)
+    a, b = cache.bind(llm, TENANT_A, "test"), cache.bind(llm, TENANT_B, "test")
+    await a.complete("s", "q")
+    await b.complete("s", "q")
+    cache.invalidate(TENANT_A)
+    assert await b.complete("s", "q") == "answer 2"
+    assert await a.complete("s", "q") == "answer 3"
+    cache.invalidate()  # public corpus changed
+    assert await b.complete("s", "q") == "answer 4"
+
+    for q in ("q1", "q2", "q3"):
+        await a.complete("s", q)
+    calls = llm.calls
+    await a.complete("s", "q1")  # evicted
+    assert llm.calls == calls + 1
+
+
+@pytest.mark.asyncio
+async def test_a_completion_racing_an_invalidation_is_not_stored():
+    llm, cache = CountingLLM(), CompletionCache()
+    a = cache.bind(llm, TENANT_A, "test")
+    llm.gate = asyncio.Event()
+    pending = asyncio.create_task(a.complete("s", "q"))
+    await asyncio.sleep(0)
+    cache.invalidate(TENANT_A)  # a document was ingested meanwhile
+    llm.gate.set()
+    await pending
+    assert await a.complete("s", "q") == "answer 2"
+
+
+@pytest.mark.asyncio
+async def test_streams_are_not_cached():
+    llm, cache = CountingLLM(), CompletionCache()
+    a = cache.bind(llm, TENANT_A, "test")
+    for _ in range(2):
+        assert [t async for t in a.stream("s", "q")] == ["streamed"]
+    assert llm.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_answers_are_partitioned_by_the_context_they_carry():
+    llm, cache = CountingLLM(), CompletionCache()
+    orch = RetrievalOrchestrator(None, None, None, llm, SimpleNamespace(), completion_cache=cache)
+    public = [RankedChunk(chunk_id="1", text="s.45", score=0.9, source_type="PUBLIC",
+                          source_id="act-1", citation="Employment Act")]
+    private = public + [RankedChunk(chunk_id="2", text="note", score=0.8,
+                                    source_type="TENANT_PRIVATE", source_id="doc-9")]
+
+    # Public-only context: one firm's identical question is another's hit.
+    first = await orch.answer("q", public, "statute_lookup", tenant_id=TENANT_A)
+    assert await orch.answer("q", public, "statute_lookup", tenant_id=TENANT_B) == first
+    # Firm-private context: per-tenant.
+    await orch.answer("q", private, "statute_lookup", tenant_id=TENANT_A)
+    await orch.answer("q", private, "statute_lookup", tenant_id=TENANT_B)
+    assert llm.calls == 3
+    # Call sites that do not opt in are never cached.
+    await orch.answer("q", public, "statute_lookup")
+    assert llm.calls == 4
+
+
+class GazetteWatcher(AutoUpdateWatcher):
+    """One watched source yielding ``docs``; nothing seen before."""
+
+    def __init__(self, docs, post_run):
+        class Pipeline:
+            async def _ingest_doc(self, doc, report):
+                report.changed_doc_ids.append(doc.doc_id)
+
+            async def flush_graph(self, errors):
+                return None
+
+        super().__init__(None, Pipeline(), SimpleNamespace(ingest_offline_samples=True),
+                         post_run=post_run)
+        self.docs = docs
+
+    def _watched_sources(self):
+        return [next(iter(all_crawlers()))]
+
+    async def _existing_hash(self, doc_id):
+        return None
+
+    async def _fetch(self, crawler, http):
+        return list(self.docs)
+
+
+@pytest.mark.asyncio
+async def test_auto_update_ingestion_drops_cached_completions(monkeypatch):
+    async def get_watermark(pool, source_type):
+        return None
+
+    async def set_watermark(pool, source_type, ts):
+        return None
+
+    monkeypatch.setattr("app.ingestion.auto_update.dbx.get_watermark", get_watermark)
+    monkeypatch.setattr("app.ingestion.auto_update.dbx.set_watermark", set_watermark)
+
+    class Citations:
+        async def refresh(self):
+            return None
+
+    llm, cache = CountingLLM(), CompletionCache()
+    post_run = corpus_post_run(Citations(), None, None, None, cache)
+    a = cache.bind(llm, TENANT_A, "test")
+    await a.complete("s", "q")
+
+    await GazetteWatcher([], post_run).run_once(http=object())
+    assert await a.complete("s", "q") == "answer 1"  # nothing ingested: still cached
+
+    notice = LegalDocument(doc_id="gz-1", title="Finance Act amendment", doc_type="gazette",
+                           source_url="", full_text="...")
+    await GazetteWatcher([notice], post_run).run_once(http=object())
+    assert await a.complete("s", "q") == "answer 2"
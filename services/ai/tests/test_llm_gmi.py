@@ -1,7 +1,5 @@
 """GMICloudProvider: model selection, conditional <think> stripping,
 per-request usage capture, and the non-prod synthetic-data gate."""
-import types
-
 import pytest
 
 from app.config import Config
@@ -51,19 +49,13 @@ class _FakeClient:
     async def __aexit__(self, *exc):
         return False
 
-    async def post(self, url, json=None, headers=None):
+    async def post(self, url, json=None, headers=None, **kw):
         self._sink["url"] = url
         self._sink["json"] = json
         self._sink["headers"] = headers
         return _FakeResp(self._payload)
 
 
-def _fake_httpx(payload, sink):
-    mod = types.SimpleNamespace()
-    mod.AsyncClient = lambda *a, **k: _FakeClient(payload, sink)
-    return mod
-
-
 def _payload(content, usage=None):
     return {
         "choices": [{"message": {"content": content}}],
@@ -85,7 +77,7 @@ async def test_deepseek_strips_think_block():
     cfg = _cfg()
     sink = {}
     p = GMICloudProvider(cfg, model=cfg.gmi_cloud_deepseek_model)
-    p._httpx = _fake_httpx(_payload("<think>weighing options</think>The Act says X."), sink)
+    p._client = _FakeClient(_payload("<think>weighing options</think>The Act says X."), sink)
     out = await p.complete(system="s", prompt="q")
     assert out == "The Act says X."
     assert sink["json"]["model"] == cfg.gmi_cloud_deepseek_model
@@ -97,7 +89,7 @@ async def test_qwen_does_not_strip_think_block():
     cfg = _cfg()
     p = GMICloudProvider(cfg, model=cfg.gmi_cloud_qwen_model)
     # Even if the text contained think-like tags, Qwen output must pass through.
-    p._httpx = _fake_httpx(_payload("<think>should stay</think>final"), {})
+    p._client = _FakeClient(_payload("<think>should stay</think>final"), {})
     out = await p.complete(system="s", prompt="q")
     assert out == "<think>should stay</think>final"
 
@@ -106,7 +98,7 @@ async def test_qwen_does_not_strip_think_block():
 async def test_usage_and_latency_captured():
     cfg = _cfg()
     p = GMICloudProvider(cfg, model=cfg.gmi_cloud_qwen_model)
-    p._httpx = _fake_httpx(_payload("ok", {"prompt_tokens": 5, "completion_tokens": 7, "total_tokens": 12}), {})
+    p._client = _FakeClient(_payload("ok", {"prompt_tokens": 5, "completion_tokens": 7, "total_tokens": 12}), {})
     await p.complete(system="s", prompt="q")
     assert p.last_usage == {"prompt_tokens": 5, "completion_tokens": 7, "total_tokens": 12}
     assert p.last_latency_ms >= 0
@@ -116,7 +108,7 @@ async def test_usage_and_latency_captured():
 async def test_synthetic_gate_blocks_non_prod_without_attestation():
     cfg = _cfg(gmi_synthetic_data_ok=False)  # gate closed, non-prod
     p = GMICloudProvider(cfg, model=cfg.gmi_cloud_qwen_model)
-    p._httpx = _fake_httpx(_payload("nope"), {})
+    p._client = _FakeClient(_payload("nope"), {})
     with pytest.raises(RuntimeError, match="synthetic-data-only gate"):
         await p.complete(system="s", prompt="q")
 
@@ -125,5 +117,5 @@ async def test_synthetic_gate_blocks_non_prod_without_attestation():
 async def test_synthetic_gate_allows_prod():
     cfg = _cfg(env="prod", gmi_synthetic_data_ok=False)
     p = GMICloudProvider(cfg, model=cfg.gmi_cloud_qwen_model)
-    p._httpx = _fake_httpx(_payload("prod answer"), {})
+    p._client = _FakeClient(_payload("prod answer"), {})
     assert await p.complete(system="s", prompt="q") == "prod answer"
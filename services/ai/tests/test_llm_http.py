@@ -0,0 +1,76 @@
+"""HTTP LLM providers keep one pooled keep-alive client: consecutive calls
+reuse a connection (exported as requests vs connections opened), and the
+client is closed with the provider."""
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+from aiohttp import web
+from prometheus_client import REGISTRY
+
+from app.config import Config
+from app.llm import FallbackProvider, MockProvider, OllamaProvider
+
+
+def _sample(name):
+    return REGISTRY.get_sample_value(name, {"provider": "ollama"}) or 0
+
+
+@asynccontextmanager
+async def ollama_server():
+    async def generate(request):
+        body = await request.json()
+        if body["stream"]:
+            resp = web.StreamResponse()
+            await resp.prepare(request)
+            for piece in ("Section 45 ", "of the Employment Act"):
+                await resp.write(json.dumps({"response": piece}).encode() + b"\n")
+            await resp.write(json.dumps({"done": True, "eval_count": 2}).encode() + b"\n")
+            await resp.write_eof()
+            return resp
+        return web.json_response({"response": f"ok:{body['model']}", "done": True})
+
+    app = web.Application()
+    app.router.add_post("/api/generate", generate)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    try:
+        yield f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_calls_reuse_one_pooled_connection():
+    cfg = Config()
+    requests, opened = (_sample("wakili_ai_llm_http_requests_total"),
+                        _sample("wakili_ai_llm_http_connections_opened_total"))
+    async with ollama_server() as cfg.ollama_base_url:
+        provider = OllamaProvider(cfg)
+        try:
+            for _ in range(3):
+                assert await provider.complete("classify", "q", fast=True) == f"ok:{cfg.ollama_fast_model}"
+            assert "".join([t async for t in provider.stream("s", "q")]) == \
+                "Section 45 of the Employment Act"
+        finally:
+            await provider.aclose()
+    assert _sample("wakili_ai_llm_http_requests_total") == requests + 4
+    assert _sample("wakili_ai_llm_http_connections_opened_total") == opened + 1
+    assert provider._client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_fallback_closes_both_providers():
+    closed = []
+
+    class Provider(MockProvider):
+        def __init__(self, name):
+            self.name = name
+
+        async def aclose(self):
+            closed.append(self.name)
+
+    await FallbackProvider(Provider("gmi"), Provider("ollama")).aclose()
+    assert closed == ["gmi", "ollama"]
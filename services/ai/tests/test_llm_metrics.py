@@ -0,0 +1,112 @@
+"""Every LLM call is metered by provider, model and call site: complete
+latency, stream TTFT and inter-token gaps, token counts and tokens/sec where
+the provider reports usage, fallbacks taken and errors."""
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.llm import FallbackProvider, MeteredProvider, _report, llm_call_site
+
+
+class Reporting:
+    """Reports usage the way the HTTP providers do."""
+    name = "fake"
+    _model, _fast_model = "fake-large", "fake-small"
+
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    async def complete(self, system, prompt, max_tokens=2048, fast=False):
+        if self.fail:
+            raise RuntimeError("backend down")
+        _report("fake", self._fast_model if fast else self._model, 12, 3)
+        return "statute_lookup"
+
+    async def stream(self, system, prompt, max_tokens=8192):
+        if self.fail:
+            raise RuntimeError("backend down")
+        for piece in ("Section ", "45 ", "applies"):
+            await asyncio.sleep(0.01)
+            yield piece
+        _report("fake", self._model, 40, 6)
+
+    async def aclose(self):
+        return None
+
+
+class Silent(Reporting):
+    """Reports nothing, like the mock provider."""
+    name = "silent"
+    _model = _fast_model = ""
+
+    async def complete(self, system, prompt, max_tokens=2048, fast=False):
+        return "ok"
+
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.asyncio
+async def test_completions_are_timed_and_counted_per_site():
+    labels = {"provider": "fake", "model": "fake-small", "site": "intent"}
+    before = (_value("wakili_ai_llm_complete_seconds_count", **labels),
+              _value("wakili_ai_llm_tokens_total", kind="prompt", **labels),
+              _value("wakili_ai_llm_tokens_total", kind="completion", **labels))
+    llm = MeteredProvider(Reporting())
+    with llm_call_site("intent"):
+        assert await llm.complete("classify", "q", fast=True) == "statute_lookup"
+    assert _value("wakili_ai_llm_complete_seconds_count", **labels) == before[0] + 1
+    assert _value("wakili_ai_llm_tokens_total", kind="prompt", **labels) == before[1] + 12
+    assert _value("wakili_ai_llm_tokens_total", kind="completion", **labels) == before[2] + 3
+    assert _value("wakili_ai_llm_tokens_per_second_count", **labels) >= 1
+
+    # Unlabelled calls, and providers without usage, are still timed.
+    other = {"provider": "silent", "model": "silent", "site": "other"}
+    count = _value("wakili_ai_llm_complete_seconds_count", **other)
+    await MeteredProvider(Silent()).complete("s", "q")
+    assert _value("wakili_ai_llm_complete_seconds_count", **other) == count + 1
+
+
+@pytest.mark.asyncio
+async def test_streams_are_labelled_where_requested_not_where_consumed():
+    labels = {"provider": "fake", "model": "fake-large", "site": "draft"}
+    before = (_value("wakili_ai_llm_stream_ttft_seconds_count", **labels),
+              _value("wakili_ai_llm_inter_token_seconds_count", **labels),
+              _value("wakili_ai_llm_tokens_total", kind="completion", **labels))
+    with llm_call_site("draft"):
+        stream = MeteredProvider(Reporting()).stream("s", "q")
+
+    async def consume():
+        return "".join([t async for t in stream])
+
+    assert await asyncio.create_task(consume()) == "Section 45 applies"
+    assert _value("wakili_ai_llm_stream_ttft_seconds_count", **labels) == before[0] + 1
+    assert _value("wakili_ai_llm_inter_token_seconds_count", **labels) == before[1] + 2
+    assert _value("wakili_ai_llm_tokens_total", kind="completion", **labels) == before[2] + 6
+    assert _value("wakili_ai_llm_tokens_per_second_sum", **labels) > 0
+
+
+@pytest.mark.asyncio
+async def test_fallbacks_and_errors_are_counted():
+    fallbacks = _value("wakili_ai_llm_fallbacks_total", primary="gmi", secondary="fake", site="answer")
+    served = {"provider": "fake", "model": "fake-large", "site": "answer"}
+    count = _value("wakili_ai_llm_complete_seconds_count", **served)
+    llm = MeteredProvider(FallbackProvider(Reporting(fail=True), Reporting(), "gmi", "fake"))
+    with llm_call_site("answer"):
+        await llm.complete("s", "q")
+        assert [t async for t in llm.stream("s", "q")] == ["Section ", "45 ", "applies"]
+    assert _value("wakili_ai_llm_fallbacks_total", primary="gmi", secondary="fake",
+                  site="answer") == fallbacks + 2
+    assert _value("wakili_ai_llm_complete_seconds_count", **served) == count + 1
+
+    failed = {"provider": "fake", "model": "fake-large", "site": "summary"}
+    errors = _value("wakili_ai_llm_errors_total", **failed)
+    llm = MeteredProvider(Reporting(fail=True))
+    with llm_call_site("summary"):
+        with pytest.raises(RuntimeError):
+            await llm.complete("s", "q")
+        with pytest.raises(RuntimeError):
+            [t async for t in llm.stream("s", "q")]
+    assert _value("wakili_ai_llm_errors_total", **failed) == errors + 2
@@ -0,0 +1,176 @@
+"""LLM scheduler: per-provider concurrency limits, queued calls served
+interactive > streaming > background and round-robin across tenants, and
+background work held back while advocates are active."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.llm import MeteredProvider, MockProvider, llm_call_site
+from app.llm_scheduler import LLMScheduler
+
+TENANT_A = "aaaaaaaa-1111-4111-8111-aaaaaaaaaaaa"
+TENANT_B = "bbbbbbbb-2222-4222-8222-bbbbbbbbbbbb"
+
+
+def _cfg(ollama=1, idle=0.0, max_wait=60.0):
+    return SimpleNamespace(llm_concurrency_anthropic=0, llm_concurrency_gmi=0,
+                           llm_concurrency_ollama=ollama, llm_background_concurrency=1,
+                           llm_background_idle_seconds=idle,
+                           llm_background_max_wait_seconds=max_wait)
+
+
+class Backend:
+    """Records the order calls start in; each runs until released."""
+    name = "ollama"
+    _model, _fast_model = "llama3", "llama3.2:1b"
+
+    def __init__(self):
+        self.started = []
+        self.running = 0
+        self.peak = 0
+        self.release = {}
+
+    async def _run(self, tag):
+        self.started.append(tag)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        gate = self.release.setdefault(tag, asyncio.Event())
+        try:
+            await gate.wait()
+        finally:
+            self.running -= 1
+
+    async def complete(self, system, prompt, max_tokens=2048, fast=False):
+        await self._run(prompt)
+        return prompt
+
+    async def stream(self, system, prompt, max_tokens=8192):
+        await self._run(prompt)
+        yield prompt
+
+    def finish(self, tag):
+        self.release.setdefault(tag, asyncio.Event()).set()
+
+    async def aclose(self):
+        return None
+
+
+async def _call(llm, tag, site="answer", tenant=TENANT_A, stream=False):
+    with llm_call_site(site, tenant):
+        if stream:
+            pieces = llm.stream("s", tag)
+            return await asyncio.create_task(_drain(pieces))
+        return await llm.complete("s", tag)
+
+
+async def _drain(pieces):
+    return "".join([p async for p in pieces])
+
+
+async def _started(backend, n):
+    while len(backend.started) < n:
+        await asyncio.sleep(0.001)
+
+
+async def _run_in_order(backend, llm, calls):
+    """Block the only slot, queue ``calls``, then let them through one at a
+    time; returns the order they ran in."""
+    blocker = asyncio.create_task(_call(llm, "blocker"))
+    await _started(backend, 1)
+    tasks = []
+    for kw in calls:
+        tasks.append(asyncio.create_task(_call(llm, **kw)))
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.01)
+    backend.finish("blocker")
+    for i in range(len(calls)):
+        await _started(backend, i + 2)
+        backend.finish(backend.started[-1])
+    await asyncio.gather(blocker, *tasks)
+    return backend.started[1:]
+
+
+@pytest.mark.asyncio
+async def test_queued_calls_run_by_priority_class():
+    backend = Backend()
+    llm = MeteredProvider(LLMScheduler(_cfg()).bind(backend))
+    order = await _run_in_order(backend, llm, [
+        dict(tag="summary", site="summary"),
+        dict(tag="draft", site="draft", stream=True),
+        dict(tag="answer", site="answer"),
+    ])
+    assert order == ["answer", "draft", "summary"]
+    assert backend.peak == 1
+
+
+@pytest.mark.asyncio
+async def test_tenants_take_turns_within_a_class():
+    backend = Backend()
+    llm = LLMScheduler(_cfg()).bind(backend)
+    order = await _run_in_order(backend, llm, [
+        dict(tag="a1"), dict(tag="a2"), dict(tag="a3"), dict(tag="b1", tenant=TENANT_B),
+    ])
+    assert order == ["a1", "b1", "a2", "a3"]
+
+
+@pytest.mark.asyncio
+async def test_background_work_waits_for_advocates_to_go_quiet():
+    backend = Backend()
+    llm = LLMScheduler(_cfg(ollama=2, idle=0.05)).bind(backend)
+    answer = asyncio.create_task(_call(llm, "answer"))
+    await _started(backend, 1)
+    summary = asyncio.create_task(_call(llm, "summary", site="summary"))
+    await asyncio.sleep(0.02)
+    assert backend.started == ["answer"]  # a slot is free, but an advocate is active
+
+    backend.finish("answer")
+    await answer
+    await asyncio.sleep(0.02)
+    assert backend.started == ["answer"]  # not idle for long enough yet
+    await _started(backend, 2)
+    backend.finish("summary")
+    assert await summary == "summary"
+
+
+@pytest.mark.asyncio
+async def test_background_work_is_not_starved_forever():
+    backend = Backend()
+    llm = LLMScheduler(_cfg(ollama=2, idle=60, max_wait=0.05)).bind(backend)
+    answer = asyncio.create_task(_call(llm, "answer"))
+    await _started(backend, 1)
+    summary = asyncio.create_task(_call(llm, "summary", site="summary"))
+    await _started(backend, 2)  # aged past the max wait: runs beside the answer
+    for tag in ("answer", "summary"):
+        backend.finish(tag)
+    await asyncio.gather(answer, summary)
+
+
+@pytest.mark.asyncio
+async def test_queue_metrics_and_cancelled_waiters():
+    labels = {"provider": "ollama", "priority": "interactive"}
+    waits = REGISTRY.get_sample_value("wakili_ai_llm_queue_wait_seconds_count", labels) or 0
+    backend = Backend()
+    llm = LLMScheduler(_cfg()).bind(backend)
+    blocker = asyncio.create_task(_call(llm, "blocker"))
+    await _started(backend, 1)
+    gone = asyncio.create_task(_call(llm, "gone"))
+    queued = asyncio.create_task(_call(llm, "queued"))
+    await asyncio.sleep(0.01)
+    assert REGISTRY.get_sample_value("wakili_ai_llm_queue_depth", labels) == 2
+
+    gone.cancel()  # the client hung up while waiting
+    await asyncio.gather(gone, return_exceptions=True)
+    backend.finish("blocker")
+    backend.finish("queued")
+    await asyncio.gather(blocker, queued)
+    assert backend.started == ["blocker", "queued"]
+    assert REGISTRY.get_sample_value("wakili_ai_llm_queue_depth", labels) == 0
+    assert REGISTRY.get_sample_value("wakili_ai_llm_in_flight", labels) == 0
+    assert REGISTRY.get_sample_value("wakili_ai_llm_queue_wait_seconds_count", labels) == waits + 2
+
+
+def test_providers_without_a_limit_are_not_scheduled():
+    mock = MockProvider()
+    assert LLMScheduler(_cfg()).bind(mock) is mock
@@ -0,0 +1,86 @@
+"""Personalized PageRank evidence ranking: treatment edges and multiple
+anchors pull an authority up, and the ranking decides which public chunks
+fill the synthesis slots while tenant chunks keep theirs."""
+import pytest
+
+from app.graph.pagerank import personalized_pagerank
+from app.reasoning import EVIDENCE_SLOTS, ReasoningEngine
+from app.retrieval import RankedChunk
+
+
+def test_scores_are_a_distribution_weighted_by_edge_type():
+    edges = [("act-1", "case-cites", "", "CITES"), ("act-1", "case-overturns", "", "OVERTURNS"),
+             ("case-overturns", "case-far", "", "CITES")]
+    scores = personalized_pagerank(edges, {"act-1": 1.0})
+    assert sum(scores.values()) == pytest.approx(1.0)
+    assert scores["act-1"] > scores["case-overturns"] > scores["case-cites"]
+    assert scores["case-cites"] > scores["case-far"]
+
+
+def test_authority_reached_from_several_anchors_outranks_a_single_hop():
+    edges = [("a", "shared", "", "CITES"), ("b", "shared", "", "CITES"), ("a", "lone", "", "CITES")]
+    scores = personalized_pagerank(edges, {"a": 1.0, "b": 0.5})
+    assert scores["shared"] > scores["lone"]
+
+
+def test_seeds_without_edges_keep_their_restart_mass():
+    scores = personalized_pagerank([("x", "n", "", "CITES")], {"x": 1.0, "y": 0.5, "z": 0.5})
+    assert scores["y"] == pytest.approx(0.25) and scores["z"] == pytest.approx(0.25)
+    assert scores["x"] + scores["n"] == pytest.approx(0.5)
+    assert personalized_pagerank([], {}) == {}
+
+
+def _chunk(doc_id, source_type="PUBLIC"):
+    return RankedChunk(chunk_id=doc_id, text="t", score=0.9, source_type=source_type,
+                       source_id=doc_id)
+
+
+@pytest.mark.asyncio
+async def test_ranking_fills_public_slots_and_keeps_tenant_slots():
+    engine = ReasoningEngine(None, None, None, None, None)
+    asked = []
+
+    async def chunks_for_docs(doc_ids, qvec):
+        asked.append(list(doc_ids))
+        return [_chunk(d) for d in doc_ids]
+
+    engine._chunks_for_docs = chunks_for_docs
+    retrieved = [_chunk(f"act-{i}") for i in range(6)]
+    retrieved.insert(1, _chunk("memo", "TENANT_PRIVATE"))
+    traversed = [("act-0", "case-x", "", "OVERTURNS"), ("act-1", "case-x", "", "AMENDS"),
+                 ("act-5", "case-y", "", "AUTHORED")]
+    evidence = await engine._rank_evidence(retrieved, traversed, [0.0] * 8)
+
+    assert len(evidence) <= EVIDENCE_SLOTS
+    assert evidence[1].source_id == "memo"
+    ids = [c.source_id for c in evidence]
+    # Overturning/amending the two strongest anchors lifts case-x above them.
+    assert ids[0] == "case-x" and ids[2] == "act-0"
+    # case-y hangs off the weakest anchor by an AUTHORED edge: no slot left.
+    assert ids[3:] == ["act-1", "act-2", "act-3", "act-4", "act-5"]
+    assert asked == [["case-x", "case-y"]]
+    case_x = evidence[ids.index("case-x")]
+    assert case_x.score == 1.0
+    # Anchors are scored on the same PPR scale, so scores follow the ranking.
+    public = [c for c in evidence if c.source_type == "PUBLIC"]
+    assert [c.score for c in public] == sorted((c.score for c in public), reverse=True)
+    assert all(0 < c.score < 1.0 and c.metadata["retrieval_score"] == 0.9 for c in public[1:])
+    assert retrieved[0].score == 0.9 and "retrieval_score" not in retrieved[0].metadata
+
+
+@pytest.mark.asyncio
+async def test_discovered_authorities_use_their_query_closest_chunk(monkeypatch):
+    calls = []
+
+    async def best_public_chunks(pool, doc_ids, query_vec):
+        calls.append((list(doc_ids), list(query_vec)))
+        return [{"chunk_id": "9", "doc_id": "case-x", "chunk_text": "held: unfair", "score": 0.81,
+                 "title": "X v Y", "citation": "[2020] eKLR", "source_url": "", "court": "ELRC",
+                 "year": 2020, "status": "current"}]
+
+    monkeypatch.setattr("app.reasoning.dbx.best_public_chunks", best_public_chunks)
+    engine = ReasoningEngine(None, None, None, None, None)
+    [c] = await engine._chunks_for_docs(["case-x"], [0.5, 0.5])
+    assert calls == [(["case-x"], [0.5, 0.5])]
+    assert c.text == "held: unfair" and c.metadata["similarity"] == 0.81
+    assert await engine._chunks_for_docs([], [0.5, 0.5]) == [] and len(calls) == 1
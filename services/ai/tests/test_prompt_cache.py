@@ -0,0 +1,94 @@
+"""Prompt-prefix caching: cacheable segments become Anthropic cache
+breakpoints (cache hits are logged per call), Ollama keeps the model warm,
+and drafting puts its stable segments first."""
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import Config
+from app.deadline import Budget
+from app.drafting import DRAFTING_SYSTEM, DraftingEngine
+from app.embeddings import HashingEmbedder
+from app.llm import AnthropicProvider, OllamaProvider, PromptSegment, _anthropic_blocks, prompt_text
+
+
+def test_each_cacheable_run_ends_in_a_breakpoint():
+    system, user = _anthropic_blocks(
+        [PromptSegment("rules ", cacheable=True), PromptSegment("more rules", cacheable=True)],
+        [PromptSegment("template ", cacheable=True), PromptSegment("question")])
+    assert system == [{"type": "text", "text": "rules more rules",
+                       "cache_control": {"type": "ephemeral"}}]
+    assert user == [{"type": "text", "text": "template ", "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": "question"}]
+    assert _anthropic_blocks("sys", "plain") == ([{"type": "text", "text": "sys"}],
+                                                 [{"type": "text", "text": "plain"}])
+
+
+def test_only_the_last_four_breakpoints_are_kept():
+    prompt = [PromptSegment(f"s{i}", cacheable=i % 2 == 0) for i in range(12)]
+    _, user = _anthropic_blocks("", prompt)
+    marked = [b["text"] for b in user if "cache_control" in b]
+    assert marked == ["s4", "s6", "s8", "s10"]
+
+
+@pytest.mark.asyncio
+async def test_anthropic_logs_cache_hit_tokens(caplog):
+    sent = {}
+
+    class Messages:
+        async def create(self, **kw):
+            sent.update(kw)
+            usage = SimpleNamespace(input_tokens=40, cache_read_input_tokens=2100,
+                                    cache_creation_input_tokens=0, output_tokens=300)
+            return SimpleNamespace(content=[SimpleNamespace(type="text", text="draft")], usage=usage)
+
+    provider = AnthropicProvider.__new__(AnthropicProvider)
+    provider._client = SimpleNamespace(messages=Messages())
+    provider._model, provider._fast_model = "big", "small"
+    with caplog.at_level("INFO"):
+        out = await provider.complete([PromptSegment("sys", cacheable=True)], "q")
+    assert out == "draft"
+    assert sent["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_read_tokens=2100" in caplog.text
+
+
+def test_ollama_flattens_segments_and_keeps_the_model_warm():
+    cfg = Config()
+    cfg.ollama_keep_alive = "1h"
+    payload = OllamaProvider(cfg)._payload(
+        "llama3", [PromptSegment("sys", cacheable=True)], [PromptSegment("a ", True), PromptSegment("b")],
+        False, 64)
+    assert payload["system"] == "sys" and payload["prompt"] == "a b"
+    assert payload["keep_alive"] == "1h"
+
+
+@pytest.mark.asyncio
+async def test_draft_prompt_puts_stable_segments_first(monkeypatch):
+    class Conn:
+        @asynccontextmanager
+        async def transaction(self):
+            yield
+
+        async def fetch(self, sql, *args):
+            return [{"title": "Interest", "body": "Interest at 14% p.a."}]
+
+    @asynccontextmanager
+    async def tenant_tx(pool, tenant_id):
+        yield Conn()
+
+    class Recorder:
+        def stream(self, system, prompt, max_tokens=8192):
+            self.system, self.prompt = system, prompt
+            return None
+
+    monkeypatch.setattr("app.drafting.dbx.tenant_tx", tenant_tx)
+    llm = Recorder()
+    engine = DraftingEngine(None, SimpleNamespace(embedder=HashingEmbedder(8)), llm,
+                            SimpleNamespace(draft_clause_top_k=6))
+    await engine.draft("aaaaaaaa-1111-4111-8111-aaaaaaaaaaaa", "demand_letter", "demand KES 50,000",
+                       budget=Budget(0.0))
+    assert llm.system == [PromptSegment(DRAFTING_SYSTEM, cacheable=True)]
+    assert [s.cacheable for s in llm.prompt] == [True, True, False]
+    assert "LETTER OF DEMAND" in llm.prompt[0].text and "Interest" in llm.prompt[1].text
+    assert prompt_text(llm.prompt).endswith("demand KES 50,000\n")
@@ -0,0 +1,98 @@
+"""Batched public-corpus writer: a whole run's graph mutations are flushed as
+a few UNWIND statements in one transaction, with the allowlists still
+enforced; a failed batch is retried document by document."""
+import pytest
+
+from app.ingestion.models import LegalDocument, Opinion
+from app.ingestion.pipeline import PublicCorpusWriter
+
+
+class FakeGraph:
+    def __init__(self):
+        self.batches = []
+
+    async def _run_internal_batch(self, statements):
+        self.batches.append(list(statements))
+
+
+def _judgment(doc_id="sc-2026-1"):
+    bench = ["Koome CJ", "Mwilu DCJ", "Ibrahim SCJ", "Wanjala SCJ", "Lenaola SCJ"]
+    return LegalDocument(
+        doc_id=doc_id, title="A v B", doc_type="judgment", source_url="",
+        full_text="...", authored_by=bench,
+        opinions=[Opinion(judge=j, kind="majority" if i else "dissent", text="...")
+                  for i, j in enumerate(bench)])
+
+
+@pytest.mark.asyncio
+async def test_run_flushes_in_one_transaction_of_unwind_statements():
+    graph = FakeGraph()
+    w = PublicCorpusWriter(graph)
+    await w.rename("sc-2026-1", "sc-2026-1@v1")
+    await w.set_status("sc-2026-1@v1", "superseded")
+    await w.upsert_document(_judgment())
+    await w.upsert_document(_judgment("sc-2026-2"))
+    await w.link("sc-2026-1@v1", "SUPERSEDED_BY", "sc-2026-1")
+    await w.link("sc-2026-2", "CITES", "sc-2026-1")
+    assert w.pending_docs == 2
+    assert graph.batches == []  # nothing sent until flush
+
+    assert await w.flush() == []
+    assert len(graph.batches) == 1
+    stmts = graph.batches[0]
+    assert len(stmts) == 7
+    assert all(c.lstrip().startswith("UNWIND $rows") for c, _ in stmts)
+    # Rename precedes the MERGE of the successor; edges come last.
+    assert "SET d.doc_id = row.new" in stmts[0][0]
+    assert ":Judgment:Public" in stmts[1][0] and len(stmts[1][1]["rows"]) == 2
+    assert len(stmts[2][1]["rows"]) == 10  # AUTHORED rows for both benches
+    assert ":SUPERSEDED_BY]" in stmts[-2][0] and ":CITES]" in stmts[-1][0]
+    assert w.pending_docs == 0
+    assert await w.flush() == [] and len(graph.batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_disallowed_relation_is_rejected_when_queued():
+    w = PublicCorpusWriter(FakeGraph())
+    with pytest.raises(ValueError):
+        await w.link("a", "DELETES", "b")
+    with pytest.raises(ValueError):
+        await w.link("a", "AUTHORED", "b")  # allowed elsewhere, not as a treatment edge
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_per_document():
+    class Flaky(FakeGraph):
+        """Rejects any transaction that touches sc-2026-2."""
+        async def _run_internal_batch(self, statements):
+            if any(r.get("doc_id") == "sc-2026-2" for _, p in statements for r in p["rows"]):
+                raise RuntimeError("constraint violated")
+            await super()._run_internal_batch(statements)
+
+    graph = Flaky()
+    w = PublicCorpusWriter(graph)
+    for doc_id in ("sc-2026-1", "sc-2026-2", "sc-2026-3"):
+        w.begin(doc_id)
+        await w.upsert_document(_judgment(doc_id))
+    w.begin("sc-2026-1")
+    await w.link("sc-2026-1", "CITES", "sc-2026-3")  # endpoint later in the batch
+    assert w.pending_doc_ids() == ["sc-2026-1", "sc-2026-2", "sc-2026-3"]
+
+    assert await w.flush() == ["sc-2026-2"]
+    written = [r["doc_id"] for batch in graph.batches for _, p in batch
+               for r in p["rows"] if "title" in r and "op_id" not in r]
+    assert written == ["sc-2026-1", "sc-2026-3"]
+    # The edge is linked again once both endpoints exist.
+    assert ":CITES]" in graph.batches[-1][0][0]
+    assert w.pending_docs == 0 and w._statements() == []
+
+
+@pytest.mark.asyncio
+async def test_replayed_rename_only_moves_the_archived_version():
+    graph = FakeGraph()
+    w = PublicCorpusWriter(graph)
+    await w.rename("sc-2026-1", "sc-2026-1@v1", 1)
+    await w.flush()
+    cypher, params = graph.batches[0][0]
+    assert "d.version = row.version" in cypher
+    assert params["rows"] == [{"old": "sc-2026-1", "new": "sc-2026-1@v1", "version": 1}]
@@ -0,0 +1,94 @@
+"""Streaming reasoning: hops are emitted as they resolve, before evidence and
+answer text, and cancelling the consumer stops in-flight graph/LLM work."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.embeddings import HashingEmbedder
+from app.graph.snapshot import PublicGraphCache, PublicGraphSnapshot
+from app.llm import MockProvider
+from app.reasoning import ReasoningEngine, Step
+from app.retrieval import RankedChunk
+from app.server import ReasoningService
+
+TENANT = "aaaaaaaa-1111-4111-8111-aaaaaaaaaaaa"
+
+
+class Retriever:
+    embedder = HashingEmbedder(8)
+
+    async def retrieve(self, tenant_id, query, **kw):
+        return [RankedChunk(chunk_id="1", text="s.45", score=0.9, source_type="PUBLIC",
+                            source_id="act-1", citation="Employment Act")], "statute_lookup"
+
+
+def _engine(llm=None, graph=None):
+    cache = PublicGraphCache(graph)
+    cache.current = PublicGraphSnapshot(
+        {"act-1": ("Employment Act", "current"), "case-1": ("A v B", "current")},
+        {"act-1", "case-1"}, {"CITES": {("case-1", "act-1")}})
+    engine = ReasoningEngine(None, graph, Retriever(), llm or MockProvider(),
+                             SimpleNamespace(deadline_reserve_seconds=0.0), snapshot=cache)
+
+    async def no_chunks(doc_ids, qvec):
+        return []
+
+    engine._chunks_for_docs = no_chunks
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_stream_order_is_steps_then_evidence_then_answer():
+    events = [e async for e in _engine().reason_stream(TENANT, "q", max_hops=2)]
+    kinds = ["step" if isinstance(e, Step) else "text" if isinstance(e, str) else "evidence"
+             for e in events]
+    assert kinds[:3] == ["step", "step", "evidence"]
+    assert set(kinds[3:]) == {"text"}
+    assert "mock answer" in "".join(events[3:])
+    assert [c.source_id for c in events[2]] == ["act-1"]
+
+
+class SlowLLM:
+    def __init__(self):
+        self.closed = False
+        self.started = asyncio.Event()
+
+    async def stream(self, system, prompt, max_tokens=8192):
+        try:
+            yield "first "
+            self.started.set()
+            await asyncio.sleep(30)
+            yield "never"
+        finally:
+            self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_rpc_closes_the_llm_stream():
+    llm = SlowLLM()
+    service = ReasoningService(_engine(llm))
+
+    class Context:
+        def invocation_metadata(self):
+            return (("x-tenant-id", TENANT),)
+
+        def time_remaining(self):
+            return None
+
+    request = SimpleNamespace(tenant=SimpleNamespace(tenant_id=TENANT), query="q", max_hops=2,
+                              matter_id="", include_superseded=False, trace_id="t-1")
+    frames = []
+
+    async def consume():
+        async for frame in service.ReasonStream(request, Context()):
+            frames.append(frame)
+
+    task = asyncio.create_task(consume())
+    await asyncio.wait_for(llm.started.wait(), timeout=2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert llm.closed
+    assert [f.step.hop for f in frames[:2]] == [0, 1]
+    assert frames[-1].answer_delta == "first " and not frames[-1].is_final
@@ -0,0 +1,49 @@
+"""Ingestion scheduler: a pass's reports reach the post-run hook, and each
+post-run refresh step runs in isolation."""
+from types import SimpleNamespace
+
+import pytest
+
+from app.ingestion.models import RunReport
+from app.ingestion.scheduler import IngestionScheduler, PostRunSteps
+
+
+@pytest.mark.asyncio
+async def test_scheduler_hands_the_pass_reports_to_post_run():
+    report = RunReport(source_type="gazette", changed_doc_ids=["gz-1"])
+    seen = []
+
+    class Pipeline:
+        async def run(self, source_types=None):
+            return [report]
+
+    async def post_run(reports):
+        seen.append(reports)
+
+    cfg = SimpleNamespace(ingest_on_start=True, ingest_daily_seconds=3600,
+                          ingest_weekly_seconds=3600)
+    scheduler = IngestionScheduler(Pipeline(), cfg, post_run=post_run)
+    await scheduler.start()
+    await scheduler.stop()
+    assert seen == [[report]]
+
+
+@pytest.mark.asyncio
+async def test_a_failing_post_run_step_does_not_skip_the_rest():
+    ran = []
+
+    async def citations(reports):
+        raise RuntimeError("citation index unavailable")
+
+    async def recompute(reports):
+        ran.append(("judge profile", [d for r in reports for d in r.changed_doc_ids]))
+
+    async def invalidate(reports):
+        ran.append(("completion cache", None))
+
+    post_run = PostRunSteps()
+    post_run.add("citation index", citations)
+    post_run.add("judge profile", recompute)
+    post_run.add("completion cache", invalidate)
+    await post_run([RunReport(source_type="gazette", changed_doc_ids=["gz-1"])])
+    assert ran == [("judge profile", ["gz-1"]), ("completion cache", None)]
@@ -0,0 +1,57 @@
+"""Tenant document ingestion writes its whole graph stage through one
+Graph.write_many transaction, and write_many keeps the write() guards."""
+from types import SimpleNamespace
+
+import pytest
+
+from app.graph import Graph, GraphQueryError, PublicGraphQuery, TenantScopedGraphQuery
+from app.ingestion.extraction import ExtractedEntities
+from app.ingestion.tenant_ingest import TenantIngestor
+
+TID_A = "aaaaaaaa-aaaa-4aaa-8aaa-aaaaaaaaaaaa"
+TID_B = "bbbbbbbb-bbbb-4bbb-8bbb-bbbbbbbbbbbb"
+
+
+def _graph():
+    cfg = SimpleNamespace(neo4j_uri="bolt://localhost:7687", neo4j_user="neo4j", neo4j_password="x")
+    return Graph(cfg)
+
+
+@pytest.mark.asyncio
+async def test_write_many_validates_every_query_before_running():
+    g = _graph()
+    node = lambda tid: TenantScopedGraphQuery(tid).merge_node("d", "Document", {"id": "d-1"}).build()
+    with pytest.raises(GraphQueryError):
+        await g.write_many([node(TID_A), node(TID_B)])
+    with pytest.raises(GraphQueryError):
+        await g.write_many([node(TID_A), PublicGraphQuery().match("s", "Statute").returns("s.doc_id").build()])
+    assert await g.write_many([]) == {"nodes_created": 0, "nodes_deleted": 0, "relationships_created": 0}
+    await g.close()
+
+
+@pytest.mark.asyncio
+async def test_submission_graph_stage_is_a_handful_of_queries():
+    class Citations:
+        async def resolve(self, needles, limit=1):
+            return {n: [{"doc_id": f"pub-{n}", "doc_type": "statute" if "Act" in n else "case_law"}]
+                    for n in needles}
+
+    ingestor = TenantIngestor.__new__(TenantIngestor)
+    ingestor.citations = Citations()
+    entities = ExtractedEntities(
+        advocates=["Jane Wanjiru", "Peter Otieno", "Ali Hassan"], case_ref="ELRC E123 of 2026",
+        judge_name="Justice Mwangi", outcome={"result": "allowed"},
+        act_citations=["Employment Act", "Data Protection Act"], case_citations=["A v B"])
+
+    queries = await ingestor._graph_upsert(TID_A, "doc-1", "sub.pdf", None, entities)
+    queries += await ingestor._graph_upsert_submission(TID_A, "doc-1", "sub.pdf", None, entities)
+
+    # Document + 2 citation labels, then Submission, advocates (one UNWIND),
+    # FILED_IN, DECIDED_BY, RESULTED_IN + 2 citation labels.
+    assert len(queries) == 3 + 7
+    assert all(q.write and q.tenant_scoped and q.params["tenant_id"] == TID_A for q in queries)
+    advocates = [q for q in queries if ":AUTHORED]" in q.cypher]
+    assert len(advocates) == 1 and len(advocates[0].params["p1"]) == 3
+    cites = [q for q in queries if ":CITES]" in q.cypher and "Submission" in q.cypher]
+    assert all("(pub:" in q.cypher for q in cites)
+
@@ -171,19 +171,91 @@ func (x *DraftRequest) GetTraceId() string {
 	return ""
 }
 
-type DraftChunk struct {
+// Re-attach to a draft whose DraftDocument stream was lost: the text from
+// `offset` is replayed, then live tokens follow while the draft is still
+// generating.
+type ResumeDraftRequest struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
-	Text          string                 `protobuf:"bytes,1,opt,name=text,proto3" json:"text,omitempty"`                       // token-by-token draft text
-	IsFinal       bool                   `protobuf:"varint,2,opt,name=is_final,json=isFinal,proto3" json:"is_final,omitempty"` // true on the terminating chunk
-	Citations     []*Provenance          `protobuf:"bytes,3,rep,name=citations,proto3" json:"citations,omitempty"`             // populated on the final chunk
-	DraftId       string                 `protobuf:"bytes,4,opt,name=draft_id,json=draftId,proto3" json:"draft_id,omitempty"`  // populated on the final chunk
+	Tenant        *TenantContext         `protobuf:"bytes,1,opt,name=tenant,proto3" json:"tenant,omitempty"`
+	DraftId       string                 `protobuf:"bytes,2,opt,name=draft_id,json=draftId,proto3" json:"draft_id,omitempty"`
+	Offset        int64                  `protobuf:"varint,3,opt,name=offset,proto3" json:"offset,omitempty"` // UTF-8 bytes of draft text already received
+	TraceId       string                 `protobuf:"bytes,4,opt,name=trace_id,json=traceId,proto3" json:"trace_id,omitempty"`
 	unknownFields protoimpl.UnknownFields
 	sizeCache     protoimpl.SizeCache
 }
 
+func (x *ResumeDraftRequest) Reset() {
+	*x = ResumeDraftRequest{}
+	mi := &file_wakili_v1_drafting_proto_msgTypes[1]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *ResumeDraftRequest) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*ResumeDraftRequest) ProtoMessage() {}
+
+func (x *ResumeDraftRequest) ProtoReflect() protoreflect.Message {
+	mi := &file_wakili_v1_drafting_proto_msgTypes[1]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use ResumeDraftRequest.ProtoReflect.Descriptor instead.
+func (*ResumeDraftRequest) Descriptor() ([]byte, []int) {
+	return file_wakili_v1_drafting_proto_rawDescGZIP(), []int{1}
+}
+
+func (x *ResumeDraftRequest) GetTenant() *TenantContext {
+	if x != nil {
+		return x.Tenant
+	}
+	return nil
+}
+
+func (x *ResumeDraftRequest) GetDraftId() string {
+	if x != nil {
+		return x.DraftId
+	}
+	return ""
+}
+
+func (x *ResumeDraftRequest) GetOffset() int64 {
+	if x != nil {
+		return x.Offset
+	}
+	return 0
+}
+
+func (x *ResumeDraftRequest) GetTraceId() string {
+	if x != nil {
+		return x.TraceId
+	}
+	return ""
+}
+
+type DraftChunk struct {
+	state          protoimpl.MessageState `protogen:"open.v1"`
+	Text           string                 `protobuf:"bytes,1,opt,name=text,proto3" json:"text,omitempty"`                                           // token-by-token draft text
+	IsFinal        bool                   `protobuf:"varint,2,opt,name=is_final,json=isFinal,proto3" json:"is_final,omitempty"`                     // true on the terminating chunk
+	Citations      []*Provenance          `protobuf:"bytes,3,rep,name=citations,proto3" json:"citations,omitempty"`                                 // populated on the final chunk
+	DraftId        string                 `protobuf:"bytes,4,opt,name=draft_id,json=draftId,proto3" json:"draft_id,omitempty"`                      // populated on the first and final chunks
+	DegradedStages []string               `protobuf:"bytes,5,rep,name=degraded_stages,json=degradedStages,proto3" json:"degraded_stages,omitempty"` // final chunk: stages skipped for the deadline
+	unknownFields  protoimpl.UnknownFields
+	sizeCache      protoimpl.SizeCache
+}
+
 func (x *DraftChunk) Reset() {
 	*x = DraftChunk{}
-	mi := &file_wakili_v1_drafting_proto_msgTypes[1]
+	mi := &file_wakili_v1_drafting_proto_msgTypes[2]
 	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 	ms.StoreMessageInfo(mi)
 }
@@ -195,7 +267,7 @@ func (x *DraftChunk) String() string {
 func (*DraftChunk) ProtoMessage() {}
 
 func (x *DraftChunk) ProtoReflect() protoreflect.Message {
-	mi := &file_wakili_v1_drafting_proto_msgTypes[1]
+	mi := &file_wakili_v1_drafting_proto_msgTypes[2]
 	if x != nil {
 		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 		if ms.LoadMessageInfo() == nil {
@@ -208,7 +280,7 @@ func (x *DraftChunk) ProtoReflect() protoreflect.Message {
 
 // Deprecated: Use DraftChunk.ProtoReflect.Descriptor instead.
 func (*DraftChunk) Descriptor() ([]byte, []int) {
-	return file_wakili_v1_drafting_proto_rawDescGZIP(), []int{1}
+	return file_wakili_v1_drafting_proto_rawDescGZIP(), []int{2}
 }
 
 func (x *DraftChunk) GetText() string {
@@ -239,6 +311,13 @@ func (x *DraftChunk) GetDraftId() string {
 	return ""
 }
 
+func (x *DraftChunk) GetDegradedStages() []string {
+	if x != nil {
+		return x.DegradedStages
+	}
+	return nil
+}
+
 var File_wakili_v1_drafting_proto protoreflect.FileDescriptor
 
 const file_wakili_v1_drafting_proto_rawDesc = "" +
@@ -252,22 +331,29 @@ const file_wakili_v1_drafting_proto_rawDesc = "" +
 	"\vtemplate_id\x18\x05 \x01(\tR\n" +
 	"templateId\x12#\n" +
 	"\rcontext_query\x18\x06 \x01(\tR\fcontextQuery\x12\x19\n" +
-	"\btrace_id\x18\a \x01(\tR\atraceId\"\x8b\x01\n" +
+	"\btrace_id\x18\a \x01(\tR\atraceId\"\x94\x01\n" +
+	"\x12ResumeDraftRequest\x120\n" +
+	"\x06tenant\x18\x01 \x01(\v2\x18.wakili.v1.TenantContextR\x06tenant\x12\x19\n" +
+	"\bdraft_id\x18\x02 \x01(\tR\adraftId\x12\x16\n" +
+	"\x06offset\x18\x03 \x01(\x03R\x06offset\x12\x19\n" +
+	"\btrace_id\x18\x04 \x01(\tR\atraceId\"\xb4\x01\n" +
 	"\n" +
 	"DraftChunk\x12\x12\n" +
 	"\x04text\x18\x01 \x01(\tR\x04text\x12\x19\n" +
 	"\bis_final\x18\x02 \x01(\bR\aisFinal\x123\n" +
 	"\tcitations\x18\x03 \x03(\v2\x15.wakili.v1.ProvenanceR\tcitations\x12\x19\n" +
-	"\bdraft_id\x18\x04 \x01(\tR\adraftId*\xcb\x01\n" +
+	"\bdraft_id\x18\x04 \x01(\tR\adraftId\x12'\n" +
+	"\x0fdegraded_stages\x18\x05 \x03(\tR\x0edegradedStages*\xcb\x01\n" +
 	"\fDraftDocType\x12\x1e\n" +
 	"\x1aDRAFT_DOC_TYPE_UNSPECIFIED\x10\x00\x12\x1b\n" +
 	"\x17DRAFT_DOC_TYPE_PLEADING\x10\x01\x12\x1c\n" +
 	"\x18DRAFT_DOC_TYPE_AFFIDAVIT\x10\x02\x12\x1b\n" +
 	"\x17DRAFT_DOC_TYPE_CONTRACT\x10\x03\x12!\n" +
 	"\x1dDRAFT_DOC_TYPE_CORRESPONDENCE\x10\x04\x12 \n" +
-	"\x1cDRAFT_DOC_TYPE_DEMAND_LETTER\x10\x052T\n" +
+	"\x1cDRAFT_DOC_TYPE_DEMAND_LETTER\x10\x052\x9b\x01\n" +
 	"\x0fDraftingService\x12A\n" +
-	"\rDraftDocument\x12\x17.wakili.v1.DraftRequest\x1a\x15.wakili.v1.DraftChunk0\x01B3Z1github.com/wakiliai/gateway/gen/wakiliv1;wakiliv1b\x06proto3"
+	"\rDraftDocument\x12\x17.wakili.v1.DraftRequest\x1a\x15.wakili.v1.DraftChunk0\x01\x12E\n" +
+	"\vResumeDraft\x12\x1d.wakili.v1.ResumeDraftRequest\x1a\x15.wakili.v1.DraftChunk0\x01B3Z1github.com/wakiliai/gateway/gen/wakiliv1;wakiliv1b\x06proto3"
 
 var (
 	file_wakili_v1_drafting_proto_rawDescOnce sync.Once
@@ -282,25 +368,29 @@ func file_wakili_v1_drafting_proto_rawDescGZIP() []byte {
 }
 
 var file_wakili_v1_drafting_proto_enumTypes = make([]protoimpl.EnumInfo, 1)
-var file_wakili_v1_drafting_proto_msgTypes = make([]protoimpl.MessageInfo, 2)
+var file_wakili_v1_drafting_proto_msgTypes = make([]protoimpl.MessageInfo, 3)
 var file_wakili_v1_drafting_proto_goTypes = []any{
-	(DraftDocType)(0),     // 0: wakili.v1.DraftDocType
-	(*DraftRequest)(nil),  // 1: wakili.v1.DraftRequest
-	(*DraftChunk)(nil),    // 2: wakili.v1.DraftChunk
-	(*TenantContext)(nil), // 3: wakili.v1.TenantContext
-	(*Provenance)(nil),    // 4: wakili.v1.Provenance
+	(DraftDocType)(0),          // 0: wakili.v1.DraftDocType
+	(*DraftRequest)(nil),       // 1: wakili.v1.DraftRequest
+	(*ResumeDraftRequest)(nil), // 2: wakili.v1.ResumeDraftRequest
+	(*DraftChunk)(nil),         // 3: wakili.v1.DraftChunk
+	(*TenantContext)(nil),      // 4: wakili.v1.TenantContext
+	(*Provenance)(nil),         // 5: wakili.v1.Provenance
 }
 var file_wakili_v1_drafting_proto_depIdxs = []int32{
-	3, // 0: wakili.v1.DraftRequest.tenant:type_name -> wakili.v1.TenantContext
+	4, // 0: wakili.v1.DraftRequest.tenant:type_name -> wakili.v1.TenantContext
 	0, // 1: wakili.v1.DraftRequest.doc_type:type_name -> wakili.v1.DraftDocType
-	4, // 2: wakili.v1.DraftChunk.citations:type_name -> wakili.v1.Provenance
-	1, // 3: wakili.v1.DraftingService.DraftDocument:input_type -> wakili.v1.DraftRequest
-	2, // 4: wakili.v1.DraftingService.DraftDocument:output_type -> wakili.v1.DraftChunk
-	4, // [4:5] is the sub-list for method output_type
-	3, // [3:4] is the sub-list for method input_type
-	3, // [3:3] is the sub-list for extension type_name
-	3, // [3:3] is the sub-list for extension extendee
-	0, // [0:3] is the sub-list for field type_name
+	4, // 2: wakili.v1.ResumeDraftRequest.tenant:type_name -> wakili.v1.TenantContext
+	5, // 3: wakili.v1.DraftChunk.citations:type_name -> wakili.v1.Provenance
+	1, // 4: wakili.v1.DraftingService.DraftDocument:input_type -> wakili.v1.DraftRequest
+	2, // 5: wakili.v1.DraftingService.ResumeDraft:input_type -> wakili.v1.ResumeDraftRequest
+	3, // 6: wakili.v1.DraftingService.DraftDocument:output_type -> wakili.v1.DraftChunk
+	3, // 7: wakili.v1.DraftingService.ResumeDraft:output_type -> wakili.v1.DraftChunk
+	6, // [6:8] is the sub-list for method output_type
+	4, // [4:6] is the sub-list for method input_type
+	4, // [4:4] is the sub-list for extension type_name
+	4, // [4:4] is the sub-list for extension extendee
+	0, // [0:4] is the sub-list for field type_name
 }
 
 func init() { file_wakili_v1_drafting_proto_init() }
@@ -315,7 +405,7 @@ func file_wakili_v1_drafting_proto_init() {
 			GoPackagePath: reflect.TypeOf(x{}).PkgPath(),
 			RawDescriptor: unsafe.Slice(unsafe.StringData(file_wakili_v1_drafting_proto_rawDesc), len(file_wakili_v1_drafting_proto_rawDesc)),
 			NumEnums:      1,
-			NumMessages:   2,
+			NumMessages:   3,
 			NumExtensions: 0,
 			NumServices:   1,
 		},
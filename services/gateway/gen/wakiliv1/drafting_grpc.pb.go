@@ -20,6 +20,7 @@ const _ = grpc.SupportPackageIsVersion9
 
 const (
 	DraftingService_DraftDocument_FullMethodName = "/wakili.v1.DraftingService/DraftDocument"
+	DraftingService_ResumeDraft_FullMethodName   = "/wakili.v1.DraftingService/ResumeDraft"
 )
 
 // DraftingServiceClient is the client API for DraftingService service.
@@ -28,6 +29,9 @@ const (
 type DraftingServiceClient interface {
 	// Server-streaming: tokens flow Python -> Go -> SSE -> Next.js.
 	DraftDocument(ctx context.Context, in *DraftRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[DraftChunk], error)
+	// Replays a draft by id and follows it to the end. Ends with the final
+	// chunk when the draft completed; ABORTED when generation stopped short.
+	ResumeDraft(ctx context.Context, in *ResumeDraftRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[DraftChunk], error)
 }
 
 type draftingServiceClient struct {
@@ -57,12 +61,34 @@ func (c *draftingServiceClient) DraftDocument(ctx context.Context, in *DraftRequ
 // This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
 type DraftingService_DraftDocumentClient = grpc.ServerStreamingClient[DraftChunk]
 
+func (c *draftingServiceClient) ResumeDraft(ctx context.Context, in *ResumeDraftRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[DraftChunk], error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	stream, err := c.cc.NewStream(ctx, &DraftingService_ServiceDesc.Streams[1], DraftingService_ResumeDraft_FullMethodName, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	x := &grpc.GenericClientStream[ResumeDraftRequest, DraftChunk]{ClientStream: stream}
+	if err := x.ClientStream.SendMsg(in); err != nil {
+		return nil, err
+	}
+	if err := x.ClientStream.CloseSend(); err != nil {
+		return nil, err
+	}
+	return x, nil
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type DraftingService_ResumeDraftClient = grpc.ServerStreamingClient[DraftChunk]
+
 // DraftingServiceServer is the server API for DraftingService service.
 // All implementations must embed UnimplementedDraftingServiceServer
 // for forward compatibility.
 type DraftingServiceServer interface {
 	// Server-streaming: tokens flow Python -> Go -> SSE -> Next.js.
 	DraftDocument(*DraftRequest, grpc.ServerStreamingServer[DraftChunk]) error
+	// Replays a draft by id and follows it to the end. Ends with the final
+	// chunk when the draft completed; ABORTED when generation stopped short.
+	ResumeDraft(*ResumeDraftRequest, grpc.ServerStreamingServer[DraftChunk]) error
 	mustEmbedUnimplementedDraftingServiceServer()
 }
 
@@ -76,6 +102,9 @@ type UnimplementedDraftingServiceServer struct{}
 func (UnimplementedDraftingServiceServer) DraftDocument(*DraftRequest, grpc.ServerStreamingServer[DraftChunk]) error {
 	return status.Error(codes.Unimplemented, "method DraftDocument not implemented")
 }
+func (UnimplementedDraftingServiceServer) ResumeDraft(*ResumeDraftRequest, grpc.ServerStreamingServer[DraftChunk]) error {
+	return status.Error(codes.Unimplemented, "method ResumeDraft not implemented")
+}
 func (UnimplementedDraftingServiceServer) mustEmbedUnimplementedDraftingServiceServer() {}
 func (UnimplementedDraftingServiceServer) testEmbeddedByValue()                         {}
 
@@ -108,6 +137,17 @@ func _DraftingService_DraftDocument_Handler(srv interface{}, stream grpc.ServerS
 // This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
 type DraftingService_DraftDocumentServer = grpc.ServerStreamingServer[DraftChunk]
 
+func _DraftingService_ResumeDraft_Handler(srv interface{}, stream grpc.ServerStream) error {
+	m := new(ResumeDraftRequest)
+	if err := stream.RecvMsg(m); err != nil {
+		return err
+	}
+	return srv.(DraftingServiceServer).ResumeDraft(m, &grpc.GenericServerStream[ResumeDraftRequest, DraftChunk]{ServerStream: stream})
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type DraftingService_ResumeDraftServer = grpc.ServerStreamingServer[DraftChunk]
+
 // DraftingService_ServiceDesc is the grpc.ServiceDesc for DraftingService service.
 // It's only intended for direct use with grpc.RegisterService,
 // and not to be introspected or modified (even as a copy)
@@ -121,6 +161,11 @@ var DraftingService_ServiceDesc = grpc.ServiceDesc{
 			Handler:       _DraftingService_DraftDocument_Handler,
 			ServerStreams: true,
 		},
+		{
+			StreamName:    "ResumeDraft",
+			Handler:       _DraftingService_ResumeDraft_Handler,
+			ServerStreams: true,
+		},
 	},
 	Metadata: "wakili/v1/drafting.proto",
 }
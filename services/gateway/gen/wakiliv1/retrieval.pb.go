@@ -119,8 +119,11 @@ type RankedContext struct {
 	ClassifiedIntent QueryIntent            `protobuf:"varint,2,opt,name=classified_intent,json=classifiedIntent,proto3,enum=wakili.v1.QueryIntent" json:"classified_intent,omitempty"`
 	Answer           string                 `protobuf:"bytes,3,opt,name=answer,proto3" json:"answer,omitempty"` // synthesized, cited answer
 	TraceId          string                 `protobuf:"bytes,4,opt,name=trace_id,json=traceId,proto3" json:"trace_id,omitempty"`
-	unknownFields    protoimpl.UnknownFields
-	sizeCache        protoimpl.SizeCache
+	// Optional stages skipped or cut short to meet the RPC deadline
+	// (e.g. "status_annotations", "judge_context", "answer_synthesis").
+	DegradedStages []string `protobuf:"bytes,5,rep,name=degraded_stages,json=degradedStages,proto3" json:"degraded_stages,omitempty"`
+	unknownFields  protoimpl.UnknownFields
+	sizeCache      protoimpl.SizeCache
 }
 
 func (x *RankedContext) Reset() {
@@ -181,6 +184,13 @@ func (x *RankedContext) GetTraceId() string {
 	return ""
 }
 
+func (x *RankedContext) GetDegradedStages() []string {
+	if x != nil {
+		return x.DegradedStages
+	}
+	return nil
+}
+
 var File_wakili_v1_retrieval_proto protoreflect.FileDescriptor
 
 const file_wakili_v1_retrieval_proto_rawDesc = "" +
@@ -194,12 +204,13 @@ const file_wakili_v1_retrieval_proto_rawDesc = "" +
 	"\x05top_k\x18\x04 \x01(\x05R\x04topK\x12-\n" +
 	"\x12include_superseded\x18\x05 \x01(\bR\x11includeSuperseded\x12\x1b\n" +
 	"\tmatter_id\x18\x06 \x01(\tR\bmatterId\x12\x19\n" +
-	"\btrace_id\x18\a \x01(\tR\atraceId\"\xb8\x01\n" +
+	"\btrace_id\x18\a \x01(\tR\atraceId\"\xe1\x01\n" +
 	"\rRankedContext\x12/\n" +
 	"\x06chunks\x18\x01 \x03(\v2\x17.wakili.v1.ContextChunkR\x06chunks\x12C\n" +
 	"\x11classified_intent\x18\x02 \x01(\x0e2\x16.wakili.v1.QueryIntentR\x10classifiedIntent\x12\x16\n" +
 	"\x06answer\x18\x03 \x01(\tR\x06answer\x12\x19\n" +
-	"\btrace_id\x18\x04 \x01(\tR\atraceId2V\n" +
+	"\btrace_id\x18\x04 \x01(\tR\atraceId\x12'\n" +
+	"\x0fdegraded_stages\x18\x05 \x03(\tR\x0edegradedStages2V\n" +
 	"\x10RetrievalService\x12B\n" +
 	"\bRetrieve\x12\x1c.wakili.v1.TenantScopedQuery\x1a\x18.wakili.v1.RankedContextB3Z1github.com/wakiliai/gateway/gen/wakiliv1;wakiliv1b\x06proto3"
 
@@ -186,6 +186,9 @@ func (s *Server) DraftStream(c *gin.Context) {
 		}
 	}
 
+	// The AI service announces the draft id on the first chunk and keeps the
+	// in-flight text under it; store the finished draft under the same id.
+	draftID := uuid.NewString()
 	var full strings.Builder
 	var citations []*wakiliv1.Provenance
 	for {
@@ -198,6 +201,9 @@ func (s *Server) DraftStream(c *gin.Context) {
 			sse("error", gin.H{"error": "stream interrupted"})
 			return
 		}
+		if chunk.DraftId != "" {
+			draftID = chunk.DraftId
+		}
 		if chunk.Text != "" {
 			full.WriteString(chunk.Text)
 			sse("", gin.H{"text": chunk.Text})
@@ -208,7 +214,6 @@ func (s *Server) DraftStream(c *gin.Context) {
 	}
 
 	// Persist the completed draft with its provenance-tagged citations.
-	draftID := uuid.NewString()
 	citJSON := make([]gin.H, 0, len(citations))
 	for _, p := range citations {
 		citJSON = append(citJSON, provenanceJSON(p))